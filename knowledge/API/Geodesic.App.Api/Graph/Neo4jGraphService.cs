@@ -8,6 +8,9 @@ public sealed class Neo4jGraphService : INeo4jGraphService
 {
     private const int CypherLogMaxLength = 2000;
 
+    // Bookkeeping labels written by the data loader (batch idempotency markers), not domain types
+    private static readonly string[] InternalNodeLabels = { "_DataLoadBatch" };
+
     private readonly IDriver _driver;
     private readonly string? _database;
     private readonly ILogger<Neo4jGraphService>? _logger;
@@ -135,7 +138,8 @@ public sealed class Neo4jGraphService : INeo4jGraphService
         return await session.ExecuteReadAsync<IReadOnlyList<string>>(async tx =>
         {
             var cursor = await tx.RunAsync(
-                "MATCH (n) UNWIND labels(n) as label RETURN DISTINCT label ORDER BY label");
+                "MATCH (n) UNWIND labels(n) as label WITH DISTINCT label WHERE NOT label IN $excludedLabels RETURN label ORDER BY label",
+                new { excludedLabels = InternalNodeLabels });
             var list = new List<string>();
             await cursor.ForEachAsync(r => list.Add(r["label"].As<string>()));
             return (IReadOnlyList<string>)list;
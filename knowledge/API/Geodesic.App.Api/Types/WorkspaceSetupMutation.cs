@@ -355,20 +355,83 @@ public sealed class WorkspaceSetupMutation
         };
     }
 
+    /// <summary>
+    /// Stage 3: Stage one chunk of execution results as workspace items
+    /// Called repeatedly by the AI worker before confirmDataReviewAndBuildTeam(itemsStaged: true)
+    /// so large scopes never travel in a single payload. Idempotent - node IDs already staged
+    /// for the workspace are skipped, so a failed chunk can simply be resent.
+    /// </summary>
+    public async Task<StagingChunkResult> StageWorkspaceItemsAsync(
+        Guid workspaceId,
+        string entityType,
+        List<string> nodeIds,
+        int chunkIndex,
+        [Service] IDbContextFactory<AppDbContext> dbFactory,
+        [Service] IHttpContextAccessor accessor,
+        [Service] ILogger<WorkspaceSetupMutation> logger,
+        CancellationToken ct)
+    {
+        var tenantId = GetTenantId(accessor);
+        await using var db = await dbFactory.CreateDbContextAsync(ct);
+
+        await ValidateWorkspaceAndStageAsync(db, workspaceId, tenantId, "data_review", ct);
+
+        var distinctIds = nodeIds.Where(id => !string.IsNullOrWhiteSpace(id)).Distinct().ToList();
+
+        var alreadyStaged = await db.WorkspaceItems
+            .Where(i => i.WorkspaceId == workspaceId && i.GraphNodeId != null && distinctIds.Contains(i.GraphNodeId))
+            .Select(i => i.GraphNodeId!)
+            .ToListAsync(ct);
+        var existing = alreadyStaged.ToHashSet();
+
+        var now = DateTimeOffset.UtcNow;
+        var workspaceItems = distinctIds
+            .Where(id => !existing.Contains(id))
+            .Select(id => new WorkspaceItem
+            {
+                WorkspaceItemId = Guid.NewGuid(),
+                WorkspaceId = workspaceId,
+                GraphNodeId = id,
+                GraphEdgeId = null,
+                Labels = new string[] { entityType },
+                PinnedBy = Guid.Empty, // System-added during setup
+                PinnedAt = now
+            })
+            .ToList();
+
+        db.WorkspaceItems.AddRange(workspaceItems);
+        await db.SaveChangesAsync(ct);
+
+        logger.LogInformation(
+            "Staged workspace items chunk. WorkspaceId={WorkspaceId}, EntityType={EntityType}, Chunk={ChunkIndex}, Inserted={Inserted}, AlreadyStaged={AlreadyStaged}",
+            workspaceId, entityType, chunkIndex, workspaceItems.Count, existing.Count);
+
+        return new StagingChunkResult
+        {
+            ChunkIndex = chunkIndex,
+            Inserted = workspaceItems.Count,
+            AlreadyStaged = existing.Count
+        };
+    }
+
     /// <summary>
     /// Stage 3→4: Confirm reviewed data and transition to team building
     /// Saves execution results, creates workspace items, and logs transition to scenario_run_logs
     /// Same RunId is maintained throughout the entire setup flow
+    /// When itemsStaged is true, items were already created via stageWorkspaceItems and
+    /// executionResults is a per-entity summary (node_ids may be empty)
     /// </summary>
     public async Task<StageTransitionResult> ConfirmDataReviewAndBuildTeamAsync(
         Guid workspaceId,
         string executionResults,
+        bool? itemsStaged,
         [Service] IDbContextFactory<AppDbContext> dbFactory,
         [Service] IHttpContextAccessor accessor,
         [Service] ILogger<WorkspaceSetupMutation> logger,
         CancellationToken ct)
     {
         var tenantId = GetTenantId(accessor);
+        var preStaged = itemsStaged == true;
         await using var db = await dbFactory.CreateDbContextAsync(ct);
 
         // Start transaction for atomic operations
@@ -402,7 +465,7 @@ public sealed class WorkspaceSetupMutation
                     .Build());
             }
 
-            if (executionData == null || !executionData.Any() || !executionData.Any(r => r.NodeIds.Any()))
+            if (executionData == null || !executionData.Any() || (!preStaged && !executionData.Any(r => r.NodeIds.Any())))
             {
                 throw new GraphQLException(ErrorBuilder.New()
                     .SetMessage("At least one node must be selected in execution results")
@@ -428,7 +491,7 @@ public sealed class WorkspaceSetupMutation
             // Create workspace items with labels from execution results
             var workspaceItems = new List<WorkspaceItem>();
             var allNodeIds = new List<string>();
-            foreach (var result in executionData)
+            foreach (var result in preStaged ? new List<ExecutionResultItem>() : executionData)
             {
                 foreach (var nodeId in result.NodeIds)
                 {
@@ -450,6 +513,18 @@ public sealed class WorkspaceSetupMutation
             db.WorkspaceItems.AddRange(workspaceItems);
             await db.SaveChangesAsync(ct);
 
+            var workspaceItemCount = preStaged
+                ? await db.WorkspaceItems.CountAsync(i => i.WorkspaceId == workspaceId, ct)
+                : workspaceItems.Count;
+
+            if (workspaceItemCount == 0)
+            {
+                throw new GraphQLException(ErrorBuilder.New()
+                    .SetMessage("At least one node must be selected in execution results")
+                    .SetCode("NO_NODES_SELECTED")
+                    .Build());
+            }
+
             // Log team building started event to scenario_run_logs
             // Worker's EventStreamReader will pick this up automatically
             await LogEventAsync(db, tenantId, runId, "end_data_review", new
@@ -458,8 +533,8 @@ public sealed class WorkspaceSetupMutation
                 previousStage = "data_review",
                 newStage = "team_building",
                 execution_results = executionResults,
-                selectedNodeCount = allNodeIds.Count,
-                workspaceItemCount = workspaceItems.Count,
+                selectedNodeCount = preStaged ? workspaceItemCount : allNodeIds.Count,
+                workspaceItemCount,
                 selected_node_ids = allNodeIds,
                 message = "Data review confirmed. Transitioning to team building stage."
             }, ct);
@@ -469,13 +544,13 @@ public sealed class WorkspaceSetupMutation
 
             logger.LogInformation(
                 "Data review confirmed, transitioning to team building. WorkspaceId={WorkspaceId}, RunId={RunId}, WorkspaceItems={Count}",
-                workspaceId, runId, workspaceItems.Count);
+                workspaceId, runId, workspaceItemCount);
 
             return new StageTransitionResult
             {
                 RunId = runId, // Same RunId - no new run created
                 Stage = SetupStage.TeamBuilding,
-                Message = $"Building your AI team... {workspaceItems.Count} workspace items created."
+                Message = $"Building your AI team... {workspaceItemCount} workspace items created."
             };
         }
         catch (Exception ex)
@@ -72,6 +72,16 @@ public sealed class StageTransitionResult
     public string? Message { get; set; }
 }
 
+/// <summary>
+/// Result for staging one chunk of workspace items (Stage 3)
+/// </summary>
+public sealed class StagingChunkResult
+{
+    public int ChunkIndex { get; set; }
+    public int Inserted { get; set; }
+    public int AlreadyStaged { get; set; }
+}
+
 /// <summary>
 /// Complete status of workspace setup for resume capability
 /// </summary>
@@ -96,11 +96,34 @@ class Config:
     CONVERSATION_IDLE_TIMEOUT_SECONDS: int = int(
         os.getenv("CONVERSATION_IDLE_TIMEOUT_SECONDS", "1200")  # 20 minutes default
     )
+    # Conversation history bounds: recent messages kept verbatim, token budget for
+    # verbatim history (workflow results included) and for the rolling summary of older turns
+    CONVERSATION_RECENT_TURNS: int = int(os.getenv("CONVERSATION_RECENT_TURNS", "6"))
+    CONVERSATION_HISTORY_TOKEN_BUDGET: int = int(
+        os.getenv("CONVERSATION_HISTORY_TOKEN_BUDGET", "8000")
+    )
+    CONVERSATION_SUMMARY_TOKEN_BUDGET: int = int(
+        os.getenv("CONVERSATION_SUMMARY_TOKEN_BUDGET", "1000")
+    )
+    # Summarize evicted turns with the chat conductor model instead of an extractive digest
+    CONVERSATION_LLM_SUMMARY: bool = os.getenv(
+        "CONVERSATION_LLM_SUMMARY", "false"
+    ).lower() == "true"
     # Ontology conversation: save a summary on session end for resume (experimental)
     ONTOLOGY_CONVERSATION_SAVE_SUMMARY: bool = os.getenv(
         "ONTOLOGY_CONVERSATION_SAVE_SUMMARY", "false"
     ).lower() == "true"
 
+    # Workspace chat: start the quick answer while ChatConductor.decide runs and
+    # only emit it if the decision is a quick answer (costs tokens on misses)
+    CHAT_SPECULATIVE_QUICK_ANSWER: bool = os.getenv(
+        "CHAT_SPECULATIVE_QUICK_ANSWER", "false"
+    ).lower() == "true"
+    # Workspace chat: skip ChatConductor.decide for obvious messages (greetings, explicit analyses)
+    CHAT_PRECLASSIFIER_ENABLED: bool = os.getenv(
+        "CHAT_PRECLASSIFIER_ENABLED", "false"
+    ).lower() == "true"
+
     # HTTP Connection Configuration
     MAX_HTTP_CONNECTIONS: int = int(
         os.getenv("MAX_HTTP_CONNECTIONS", "200")  # Max concurrent HTTP connections
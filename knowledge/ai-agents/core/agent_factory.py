@@ -4,11 +4,18 @@ Design philosophy: Use Pydantic AI natively, no custom abstraction layers.
 
 Why: Pydantic AI handles tool attachment, schema generation, and execution.
 Tradeoff: Less control over tool behavior, but 10x simpler and more maintainable.
+
+Compiled agents are cached: an Agent holds no per-run state (deps are passed to
+each run), so one instance per (agent id, version, model, provider, tool set)
+is shared by all runs and conversations. One-off helper agents (classifiers,
+synthesizers) are cached the same way through get_helper_agent().
 """
 
 import logging
 import os
-from typing import Dict, Any, Union
+import time
+from collections import Counter
+from typing import Dict, Any, Iterable, Optional, Union
 from pydantic_ai import Agent
 
 from app.models.agent import AgentDefinition
@@ -17,6 +24,61 @@ from app.core.model_config import model_config
 
 logger = logging.getLogger(__name__)
 
+# Helper agents by (name, model, provider, output type, retries, instructions)
+_helper_agents: Dict[tuple, Agent] = {}
+# Agent construction counters shared by AgentFactory and get_helper_agent
+_construction_stats: Counter = Counter()
+
+
+def get_helper_agent(
+    name: str,
+    instructions: str,
+    model_name: str,
+    provider: Optional[str] = None,
+    output_type: type = str,
+    retries: Optional[int] = None,
+) -> Agent:
+    """Get a cached tool-less agent with static instructions.
+
+    For helpers that used to build a new Agent (and model client) per call.
+    Safe to share across concurrent runs: the prompt is passed to each run.
+
+    Args:
+        name: Agent name (shows in traces)
+        instructions: Static instructions
+        model_name: Model name
+        provider: Optional provider override
+        output_type: Structured output type (default: str)
+        retries: Optional retry count
+
+    Returns:
+        Shared Agent instance
+    """
+    key = (name, model_name, provider, output_type, retries, instructions)
+    agent = _helper_agents.get(key)
+    if agent is not None:
+        _construction_stats["helper_hits"] += 1
+        return agent
+
+    start = time.perf_counter()
+    kwargs: Dict[str, Any] = {"model": create_model(model_name, provider), "name": name}
+    if output_type is not str:
+        kwargs["output_type"] = output_type
+    if retries is not None:
+        kwargs["retries"] = retries
+    agent = Agent(**kwargs)
+
+    @agent.instructions
+    def helper_instructions() -> str:
+        return instructions
+
+    elapsed = time.perf_counter() - start
+    _construction_stats["helper_builds"] += 1
+    _construction_stats["build_ms"] += elapsed * 1000
+    _helper_agents[key] = agent
+    logger.debug(f"Built helper agent '{name}' ({model_name}) in {elapsed * 1000:.1f}ms")
+    return agent
+
 
 class AgentFactory:
     """Factory for creating Pydantic AI agents from AgentDefinition configs.
@@ -28,8 +90,15 @@ class AgentFactory:
     4. Return configured agent
 
     Why: No adapter layer needed - Pydantic AI's @agent.tool() is perfect.
+
+    Built agents and their system prompts are cached at class level, so every
+    factory (one per workflow/engine) shares them. A changed YAML definition
+    needs a version bump, or clear_cache(), to be rebuilt.
     """
 
+    _agents: Dict[tuple, Agent] = {}
+    _system_prompts: Dict[tuple, str] = {}
+
     def __init__(
         self,
         tool_registry: Dict[str, Any] | None = None,
@@ -146,6 +215,23 @@ class AgentFactory:
 
         return system_prompt
 
+    def _cached_system_prompt(self, agent_def: AgentDefinition) -> str:
+        """System prompt for a definition, built once per (id, version)."""
+        key = (agent_def.id, agent_def.version)
+        prompt = self._system_prompts.get(key)
+        if prompt is None:
+            prompt = self.build_system_prompt(agent_def)
+            self._system_prompts[key] = prompt
+        return prompt
+
+    def _cache_key(self, agent_def: AgentDefinition, model_name: str, deps_type: type) -> tuple:
+        # Tools resolved against this factory's registry, so different registries don't collide
+        tools = tuple(
+            (name, id(self.tool_registry.get(name)))
+            for name in sorted(agent_def.capability.tools or [])
+        )
+        return (agent_def.id, agent_def.version, model_name, self._provider, tools, deps_type)
+
     def create_agent(
         self,
         agent_def: AgentDefinition,
@@ -166,7 +252,7 @@ class AgentFactory:
             deps_type: Type for agent dependencies (default: dict)
 
         Returns:
-            Configured Pydantic AI Agent instance
+            Configured Pydantic AI Agent instance (shared; pass per-run state as deps)
 
         Example:
             >>> factory = AgentFactory()
@@ -174,9 +260,17 @@ class AgentFactory:
             >>> agent = factory.create_agent(agent_def)
             >>> result = await agent.run("Research competitor pricing")
         """
-        # Use model factory to create the appropriate model
         model_to_use = model_name or self.model_name
+        cache_key = self._cache_key(agent_def, model_to_use, deps_type)
+        cached = self._agents.get(cache_key)
+        if cached is not None:
+            _construction_stats["agent_hits"] += 1
+            return cached
+
+        start = time.perf_counter()
+        # Use model factory to create the appropriate model
         model = create_model(model_to_use, self._provider)
+        system_prompt = self._cached_system_prompt(agent_def)
         
         logger.info(
             f"Creating agent '{agent_def.id}' v{agent_def.version}",
@@ -201,12 +295,9 @@ class AgentFactory:
             @agent.instructions
             def get_instructions(ctx) -> str:
                 """Build instructions dynamically with injected context."""
-                # Start with base prompt from YAML
-                base_prompt = self.build_system_prompt(agent_def)
-                
-                # For now, just return base prompt
+                # Base prompt from YAML, built once when the agent was compiled
                 # Future: Can inject memory context, user prefs, etc. from ctx.deps
-                return base_prompt
+                return system_prompt
 
             logger.debug(
                 f"Created Pydantic AI agent",
@@ -245,12 +336,18 @@ class AgentFactory:
                     }
                 )
 
+            elapsed = time.perf_counter() - start
+            _construction_stats["agent_builds"] += 1
+            _construction_stats["build_ms"] += elapsed * 1000
+            self._agents[cache_key] = agent
+
             # Success!
             logger.info(
-                f"Successfully created agent '{agent_def.id}'",
+                f"Successfully created agent '{agent_def.id}' in {elapsed * 1000:.1f}ms",
                 extra={
                     "agent_id": agent_def.id,
                     "num_tools": len(agent_def.capability.tools),
+                    "build_ms": round(elapsed * 1000, 1),
                 }
             )
 
@@ -273,6 +370,41 @@ class AgentFactory:
             ) from e
 
 
-__all__ = ["AgentFactory"]
+    def warm_up(self, agent_defs: Iterable[AgentDefinition]) -> float:
+        """Compile agents ahead of the first message.
+
+        Args:
+            agent_defs: Definitions to compile with the factory default model
+
+        Returns:
+            Seconds spent
+        """
+        start = time.perf_counter()
+        built = 0
+        for agent_def in agent_defs:
+            try:
+                self.create_agent(agent_def)
+                built += 1
+            except Exception as e:
+                logger.warning(f"Could not pre-build agent '{agent_def.id}': {e}")
+        elapsed = time.perf_counter() - start
+        logger.info(f"Pre-built {built} agents in {elapsed * 1000:.1f}ms")
+        return elapsed
+
+    @staticmethod
+    def construction_stats() -> Dict[str, float]:
+        """Agent builds, cache hits and total build time (ms) since start or clear_cache()."""
+        return dict(_construction_stats)
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop compiled agents, helper agents, prompts and stats (e.g. after reloading YAML)."""
+        cls._agents.clear()
+        cls._system_prompts.clear()
+        _helper_agents.clear()
+        _construction_stats.clear()
+
+
+__all__ = ["AgentFactory", "get_helper_agent"]
 
 
@@ -0,0 +1,75 @@
+"""
+agent_factory_benchmark.py - Agent construction overhead per chat message
+
+Simulates the agents a workspace chat message builds: the quick-answer helper,
+every specialist from agents/ (a decomposed message) and the synthesizer. Each
+message is run cold (caches cleared first, the behaviour before compiled agents
+were cached) and warm (after AgentFactory.warm_up at startup).
+
+Only constructs agents; no model requests are made. A placeholder OpenAI key is
+set if none is configured so model clients can be built offline.
+
+Usage:
+    python -m app.core.agent_factory_benchmark
+    python -m app.core.agent_factory_benchmark --messages 200 --model gpt-4o-mini
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from app.core.agent_factory import AgentFactory, get_helper_agent
+from app.core.registry import AgentRegistry
+
+
+def _message(factory: AgentFactory, agent_defs: list, model: str) -> float:
+    """Build the agents of one decomposed chat message; returns milliseconds."""
+    start = time.perf_counter()
+    get_helper_agent("chat_quick_answer", "Answer questions about a workspace.", model)
+    for agent_def in agent_defs:
+        factory.create_agent(agent_def)
+    get_helper_agent("conductor_synthesizer", "Synthesize subtask results.", model)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark agent construction per chat message")
+    parser.add_argument("--messages", type=int, default=50)
+    parser.add_argument("--model", default="gpt-4o-mini")
+    args = parser.parse_args()
+
+    registry = AgentRegistry()
+    registry.load_from_directory(Path(__file__).parent.parent / "agents")
+    agent_defs = registry.all_agents()
+
+    from app.tools import TOOL_REGISTRY
+    factory = AgentFactory(tool_registry=TOOL_REGISTRY, model=args.model)
+
+    cold = []
+    for _ in range(args.messages):
+        AgentFactory.clear_cache()
+        cold.append(_message(factory, agent_defs, args.model))
+
+    AgentFactory.clear_cache()
+    startup_ms = factory.warm_up(agent_defs) * 1000
+    warm = [_message(factory, agent_defs, args.model) for _ in range(args.messages)]
+
+    print(f"agents per message: {len(agent_defs) + 2} ({len(agent_defs)} specialists + 2 helpers)")
+    print(f"startup warm-up:    {startup_ms:.1f} ms")
+    print(f"{'':>8} {'p50 ms':>8} {'mean ms':>8} {'max ms':>8}")
+    for label, samples in (("cold", cold), ("cached", warm)):
+        print(f"{label:>8} {statistics.median(samples):>8.2f} {statistics.mean(samples):>8.2f} {max(samples):>8.2f}")
+    print(f"stats: {AgentFactory.construction_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,14 @@
 """Chat conductor that decides between quick answers and multi-agent decomposition."""
 
+import re
+
 from pydantic_ai import Agent
 from pydantic import BaseModel, Field
 from typing import Literal, Optional, Any
 from app.core.model_factory import create_model
+from app.core.agent_factory import get_helper_agent
 from app.core.model_config import model_config
+from app.core.conversation_context import build_history_context
 from app.utils.streaming import stream_with_logger
 
 logger = None
@@ -15,6 +19,59 @@ except ImportError:
     pass
 
 
+# Pre-classifier patterns: small talk that never needs agents, and wording of multi-step work
+_SMALL_TALK = re.compile(
+    r"^(hi|hello|hey|thanks|thank you|thx|ok|okay|great|cool|nice|perfect|got it|"
+    r"good (morning|afternoon|evening)|bye|goodbye)\b[\s!.,]*",
+    re.IGNORECASE,
+)
+_SMALL_TALK_MAX_EXTRA_WORDS = 2  # "thanks a lot", "hi there"
+# Words allowed after the greeting; anything else ("ok show them") may be a command
+_SMALL_TALK_FILLER = frozenset(
+    "there a lot so much very you all again everyone team folks guys for that the this it help "
+    "thanks thank thx ok okay great cool nice perfect bye".split()
+)
+_DECOMPOSITION_HINTS = re.compile(
+    r"\b(analy[sz]e|analysis|compare|comparison|investigate|research|breakdown|break down|"
+    r"step[- ]by[- ]step|for (each|every|all)|trends?|forecast|scenarios?|root cause|"
+    r"report on|deep dive)\b",
+    re.IGNORECASE,
+)
+_DECOMPOSITION_LONG_WORDS = 25
+
+
+_QUICK_ANSWER_INSTRUCTIONS = """You are a helpful assistant answering questions about a workspace.
+You have access to workflow results from previous executions in this conversation.
+
+Available tools through specialized agents:
+- graph_node_lookup: Get detailed information about nodes (members, medications, pharmacies, plans, etc.)
+- graph_nodes_lookup: Get details for many nodes at once (one call instead of repeated graph_node_lookup)
+- workspace_items_lookup: Find and list items in the workspace
+- graph_edge_lookup: Get information about relationships between nodes
+- graph_neighbors_lookup: Find connected nodes
+- web_search: Search the web for external information
+- calculator: Perform mathematical calculations
+- memory_retrieve: Retrieve information from memory
+- And more specialized tools...
+
+When answering questions:
+- If the user asks about "the result", "the report", "the workflow result", or refers to previous output, 
+  look for "WORKFLOW RESULT" sections in the context and use that information to answer.
+- If the user asks about specific entities (members, medications, pharmacies, etc.) and you only have IDs,
+  suggest that detailed information can be retrieved using the graph_node_lookup tool through a specialized agent.
+- If the user asks for more detailed information about something mentioned in workflow results,
+  suggest decomposing the task to use appropriate tools like graph_node_lookup.
+- Provide clear, concise, and accurate answers based on the workflow results when available.
+- Reference specific details from the workflow results when answering questions.
+- If you don't know something or can't find the information, suggest using available tools to get it.
+Be conversational and helpful."""
+
+_HISTORY_SUMMARY_INSTRUCTIONS = """You maintain a running summary of a conversation about a workspace.
+Merge the new entries into the existing summary. Keep the user's goals, decisions, entity names and IDs,
+key numbers and conclusions from workflow results. Drop pleasantries and repetition.
+Answer with the updated summary only, as short bullet points."""
+
+
 class ChatDecision(BaseModel):
     """Decision made by chat conductor."""
     needs_decomposition: bool = Field(..., description="True if question needs multi-agent decomposition, False for quick answer")
@@ -66,6 +123,36 @@ Multi-agent decomposition is needed for:
 
 Make your decision based on the complexity and scope of the question."""
     
+    @staticmethod
+    def preclassify(question: str) -> Optional[ChatDecision]:
+        """Decide obvious cases locally, without an LLM call.
+
+        Messages with several analysis cues (or one cue in a long request) are
+        decomposed. Greetings and acknowledgements get a quick answer, but only
+        when nothing after them could be a request ("ok compare them" is not
+        small talk). Anything else returns None and goes to decide().
+
+        Args:
+            question: User's question
+
+        Returns:
+            ChatDecision, or None when the question is not obvious
+        """
+        text = question.strip()
+        words = len(text.split())
+        hints = {m.group(0).lower() for m in _DECOMPOSITION_HINTS.finditer(text)}
+        if len(hints) >= 2 or (hints and words > _DECOMPOSITION_LONG_WORDS):
+            return ChatDecision(
+                needs_decomposition=True,
+                reasoning=f"Pre-classified: multi-step request ({', '.join(sorted(hints))})",
+            )
+        small_talk = _SMALL_TALK.match(text)
+        if small_talk and not hints and "?" not in text:
+            extra = re.findall(r"[a-z']+", text[small_talk.end():].lower())
+            if len(extra) <= _SMALL_TALK_MAX_EXTRA_WORDS and all(w in _SMALL_TALK_FILLER for w in extra):
+                return ChatDecision(needs_decomposition=False, reasoning="Pre-classified: small talk")
+        return None
+
     async def decide(self, question: str, conversation_history: list[str] = None) -> ChatDecision:
         """Decide if question needs decomposition or can be answered directly.
         
@@ -77,23 +164,7 @@ Make your decision based on the complexity and scope of the question."""
             ChatDecision with needs_decomposition flag and reasoning
         """
         # Build context with conversation history and workflow results
-        context_parts = []
-        
-        if conversation_history:
-            # Include workflow results (they start with "WORKFLOW RESULT")
-            workflow_results = [msg for msg in conversation_history if msg.startswith("WORKFLOW RESULT")]
-            other_history = [msg for msg in conversation_history if not msg.startswith("WORKFLOW RESULT")]
-            
-            # Always include workflow results if present
-            if workflow_results:
-                context_parts.append("WORKFLOW RESULTS FROM PREVIOUS EXECUTIONS:")
-                context_parts.extend(workflow_results)
-                context_parts.append("")  # Empty line separator
-            
-            # Include recent conversation history (last 3 non-workflow messages)
-            if other_history:
-                history_text = "\n".join([f"Previous: {msg}" for msg in other_history[-3:]])
-                context_parts.append(history_text)
+        context_parts = build_history_context(conversation_history)
         
         context_parts.append(f"Current question: {question}")
         context = "\n\n".join(context_parts)
@@ -120,59 +191,10 @@ Make your decision based on the complexity and scope of the question."""
         Returns:
             Direct answer to the question
         """
-        # Use model factory to create the appropriate model
-        model_instance = create_model(self.model_name)
-        
-        answer_agent = Agent(
-            model=model_instance,
-            name="chat_quick_answer",
-        )
-        
-        @answer_agent.instructions
-        def answer_instructions() -> str:
-            return """You are a helpful assistant answering questions about a workspace.
-You have access to workflow results from previous executions in this conversation.
-
-Available tools through specialized agents:
-- graph_node_lookup: Get detailed information about nodes (members, medications, pharmacies, plans, etc.)
-- workspace_items_lookup: Find and list items in the workspace
-- graph_edge_lookup: Get information about relationships between nodes
-- graph_neighbors_lookup: Find connected nodes
-- web_search: Search the web for external information
-- calculator: Perform mathematical calculations
-- memory_retrieve: Retrieve information from memory
-- And more specialized tools...
-
-When answering questions:
-- If the user asks about "the result", "the report", "the workflow result", or refers to previous output, 
-  look for "WORKFLOW RESULT" sections in the context and use that information to answer.
-- If the user asks about specific entities (members, medications, pharmacies, etc.) and you only have IDs,
-  suggest that detailed information can be retrieved using the graph_node_lookup tool through a specialized agent.
-- If the user asks for more detailed information about something mentioned in workflow results,
-  suggest decomposing the task to use appropriate tools like graph_node_lookup.
-- Provide clear, concise, and accurate answers based on the workflow results when available.
-- Reference specific details from the workflow results when answering questions.
-- If you don't know something or can't find the information, suggest using available tools to get it.
-Be conversational and helpful."""
+        answer_agent = get_helper_agent("chat_quick_answer", _QUICK_ANSWER_INSTRUCTIONS, self.model_name)
         
         # Build context with conversation history and workflow results
-        context_parts = []
-        
-        if conversation_history:
-            # Include workflow results (they start with "WORKFLOW RESULT")
-            workflow_results = [msg for msg in conversation_history if msg.startswith("WORKFLOW RESULT")]
-            other_history = [msg for msg in conversation_history if not msg.startswith("WORKFLOW RESULT")]
-            
-            # Always include workflow results if present
-            if workflow_results:
-                context_parts.append("WORKFLOW RESULTS FROM PREVIOUS EXECUTIONS:")
-                context_parts.extend(workflow_results)
-                context_parts.append("")  # Empty line separator
-            
-            # Include recent conversation history (last 3 non-workflow messages)
-            if other_history:
-                history_text = "\n".join([f"Previous message: {msg}" for msg in other_history[-3:]])
-                context_parts.append(history_text)
+        context_parts = build_history_context(conversation_history, message_label="Previous message")
         
         context_parts.append(f"Current question: {question}")
         context = "\n\n".join(context_parts)
@@ -193,4 +215,21 @@ Be conversational and helpful."""
             result = await answer_agent.run(context)
             return result.output
 
+    async def summarize_history(self, previous_summary: str, entries: list[str]) -> str:
+        """Fold conversation entries that left the verbatim window into a rolling summary.
+
+        Args:
+            previous_summary: Summary so far (may be empty)
+            entries: Messages and workflow results evicted from the history, oldest first
 
+        Returns:
+            Updated summary text
+        """
+        summary_agent = get_helper_agent("chat_history_summary", _HISTORY_SUMMARY_INSTRUCTIONS, self.model_name)
+
+        sections = []
+        if previous_summary:
+            sections.append(f"EXISTING SUMMARY:\n{previous_summary}")
+        sections.append("NEW ENTRIES:\n" + "\n\n".join(entries))
+        result = await summary_agent.run("\n\n".join(sections))
+        return result.output
@@ -6,10 +6,17 @@ from typing import Optional, Any
 from app.models.task import Task, Subtask
 from app.core.registry import AgentRegistry
 from app.core.model_factory import create_model
+from app.core.agent_factory import get_helper_agent
 from app.core.model_config import model_config
+from app.core.conversation_context import build_history_context
 from app.utils.streaming import stream_with_logger
 
 
+
+_SYNTHESIS_INSTRUCTIONS = """You are synthesizing results from multiple specialist agents.
+Create a coherent, comprehensive response that combines all subtask results.
+Be concise but complete. Focus on answering the original task."""
+
 class SubtaskSpec(BaseModel):
     """Specification for a single subtask."""
     description: str = Field(..., description="Clear description of what needs to be done")
@@ -130,22 +137,7 @@ Rules:
         deps = ConductorDeps(self.registry, self.tool_registry)
         
         # Build context from conversation history
-        context_parts = []
-        if conversation_history:
-            # Include workflow results (they start with "WORKFLOW RESULT")
-            workflow_results = [msg for msg in conversation_history if msg.startswith("WORKFLOW RESULT")]
-            other_history = [msg for msg in conversation_history if not msg.startswith("WORKFLOW RESULT")]
-            
-            # Always include workflow results if present
-            if workflow_results:
-                context_parts.append("WORKFLOW RESULTS FROM PREVIOUS EXECUTIONS:")
-                context_parts.extend(workflow_results)
-                context_parts.append("")  # Empty line separator
-            
-            # Include recent conversation history (last 3 non-workflow messages)
-            if other_history:
-                history_text = "\n".join([f"Previous: {msg}" for msg in other_history[-3:]])
-                context_parts.append(history_text)
+        context_parts = build_history_context(conversation_history)
         
         if current_plan:
             # Modify existing plan based on feedback
@@ -218,20 +210,8 @@ Return the complete updated plan with all subtasks."""
         Returns:
             Synthesized final output
         """
-        # Use model factory to create the appropriate model
         model_name = model or self.model_name
-        model_instance = create_model(model_name)
-        
-        synthesis_agent = Agent(
-            model=model_instance,
-            name="conductor_synthesizer",
-        )
-        
-        @synthesis_agent.instructions
-        def synthesis_instructions() -> str:
-            return """You are synthesizing results from multiple specialist agents.
-Create a coherent, comprehensive response that combines all subtask results.
-Be concise but complete. Focus on answering the original task."""
+        synthesis_agent = get_helper_agent("conductor_synthesizer", _SYNTHESIS_INSTRUCTIONS, model_name)
         
         subtask_results = "\n\n".join([
             f"Subtask: {st.description}\nAgent: {st.agent_id}\nResult: {st.result}"
@@ -1,24 +1,116 @@
 """Conversation context for isolated state per conversation."""
 
+import hashlib
 import logging
+from collections import deque
 from datetime import datetime
-from typing import Optional
+from typing import Awaitable, Callable, Optional
+
+from app.config import Config
 
 logger = logging.getLogger(__name__)
 
+WORKFLOW_RESULT_PREFIX = "WORKFLOW RESULT"
+SUMMARY_PREFIX = "CONVERSATION SUMMARY"
+
+# Characters of each workflow result shown to the decision step
+_DECIDE_RESULT_CHARS = 600
+# Characters kept per entry in the extractive digest
+_DIGEST_MESSAGE_CHARS = 200
+_DIGEST_RESULT_CHARS = 400
+
+# (previous summary, evicted entries) -> new summary
+Summarizer = Callable[[str, list[str]], Awaitable[str]]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token)."""
+    return len(text) // 4
+
+
+def _is_workflow_result(entry: str) -> bool:
+    return entry.startswith(WORKFLOW_RESULT_PREFIX)
+
+
+def _digest_line(entry: str) -> str:
+    """One-line extract of an evicted entry: its opening text, truncated."""
+    if _is_workflow_result(entry):
+        body = entry[len(WORKFLOW_RESULT_PREFIX):].strip()
+        text = " ".join(body.split())
+        limit, label = _DIGEST_RESULT_CHARS, "Earlier workflow result"
+    else:
+        text = " ".join(entry.split())
+        limit, label = _DIGEST_MESSAGE_CHARS, "Earlier message"
+    if len(text) > limit:
+        text = text[:limit].rsplit(" ", 1)[0] + "..."
+    return f"- {label}: {text}"
+
+
+def build_history_context(
+    conversation_history: Optional[list[str]],
+    message_label: str = "Previous",
+    recent_messages: int = 3,
+) -> list[str]:
+    """Prompt sections for a conversation history: summary, workflow results, recent messages.
+
+    Shared by the conductors and the team engine so every prompt lays out
+    history the same way.
+    """
+    if not conversation_history:
+        return []
+    context_parts = []
+    summaries = [msg for msg in conversation_history if msg.startswith(SUMMARY_PREFIX)]
+    workflow_results = [msg for msg in conversation_history if _is_workflow_result(msg)]
+    other_history = [
+        msg for msg in conversation_history
+        if not _is_workflow_result(msg) and not msg.startswith(SUMMARY_PREFIX)
+    ]
+
+    if summaries:
+        context_parts.extend(summaries)
+        context_parts.append("")  # Empty line separator
+
+    # Always include workflow results if present
+    if workflow_results:
+        context_parts.append("WORKFLOW RESULTS FROM PREVIOUS EXECUTIONS:")
+        context_parts.extend(workflow_results)
+        context_parts.append("")  # Empty line separator
+
+    # Include recent conversation history (last few non-workflow messages)
+    if other_history:
+        history_text = "\n".join([f"{message_label}: {msg}" for msg in other_history[-recent_messages:]])
+        context_parts.append(history_text)
+    return context_parts
+
 
 class ConversationContext:
     """Isolated state per conversation to prevent race conditions.
-    
+
     Each conversation gets its own context instance, ensuring that
     concurrent conversations don't interfere with each other's state.
+
+    History is bounded: the most recent turns (and workflow results) are kept
+    verbatim up to a token budget; older entries are compacted into a rolling
+    summary - an extractive digest, or an LLM summary when a summarizer is given
+    and compact() is awaited.
     """
-    
-    def __init__(self, run_id: str):
+
+    def __init__(
+        self,
+        run_id: str,
+        recent_turns: Optional[int] = None,
+        token_budget: Optional[int] = None,
+        summary_token_budget: Optional[int] = None,
+        summarizer: Optional[Summarizer] = None,
+    ):
         """Initialize conversation context.
-        
+
         Args:
             run_id: Unique identifier for this conversation
+            recent_turns: Messages kept verbatim (default Config.CONVERSATION_RECENT_TURNS)
+            token_budget: Tokens of verbatim history kept (default Config.CONVERSATION_HISTORY_TOKEN_BUDGET)
+            summary_token_budget: Tokens of rolling summary kept (default Config.CONVERSATION_SUMMARY_TOKEN_BUDGET)
+            summarizer: Optional async LLM summarizer used by compact()
         """
         self.run_id = run_id
         self.waiting_for_feedback: bool = False
@@ -27,49 +119,137 @@ class ConversationContext:
         self.created_at = datetime.utcnow()
         self.last_activity_at = datetime.utcnow()
         self.message_count = 0
-        
+
+        self.recent_turns = recent_turns or Config.CONVERSATION_RECENT_TURNS
+        self.token_budget = token_budget or Config.CONVERSATION_HISTORY_TOKEN_BUDGET
+        self.summary_token_budget = summary_token_budget or Config.CONVERSATION_SUMMARY_TOKEN_BUDGET
+        self.summarizer = summarizer
+        self._result_hashes: set[str] = set()
+        self._history_tokens = 0
+        self._message_entries = 0
+        self._llm_summary = ""
+        self._digest: deque[str] = deque()
+        self._digest_tokens = 0
+        self._pending_compaction: list[str] = []
+
     def add_message(self, message: str):
         """Add a message to conversation history."""
-        self.conversation_history.append(message)
+        self._append(message)
         self.message_count += 1
         self.last_activity_at = datetime.utcnow()
-    
+
     def add_workflow_result(self, result: str):
-        """Add a workflow result to the conversation context."""
-        workflow_result_text = f"WORKFLOW RESULT\n\n{result}"
-        if workflow_result_text not in self.workflow_results:
+        """Add a workflow result to the conversation context (once per distinct result)."""
+        workflow_result_text = f"{WORKFLOW_RESULT_PREFIX}\n\n{result}"
+        digest = hashlib.sha256(workflow_result_text.encode("utf-8")).hexdigest()
+        if digest not in self._result_hashes:
+            self._result_hashes.add(digest)
             self.workflow_results.append(workflow_result_text)
-        # Also add to conversation history if not already present
-        if workflow_result_text not in self.conversation_history:
-            self.conversation_history.append(workflow_result_text)
+            self._append(workflow_result_text)
         self.last_activity_at = datetime.utcnow()
-    
+
+    def _append(self, entry: str):
+        self.conversation_history.append(entry)
+        self._history_tokens += estimate_tokens(entry)
+        if not _is_workflow_result(entry):
+            self._message_entries += 1
+        self._enforce_bounds()
+
+    def _enforce_bounds(self):
+        """Evict the oldest entries beyond the turn count or token budget into the summary."""
+        while self._message_entries > self.recent_turns:
+            oldest = next(i for i, e in enumerate(self.conversation_history) if not _is_workflow_result(e))
+            self._evict(oldest)
+        # Over budget: drop oldest first, but keep the newest entry and newest workflow result
+        while self._history_tokens > self.token_budget and len(self.conversation_history) > 1:
+            newest_result = next(
+                (i for i in range(len(self.conversation_history) - 1, -1, -1)
+                 if _is_workflow_result(self.conversation_history[i])),
+                None,
+            )
+            candidates = [
+                i for i in range(len(self.conversation_history) - 1)
+                if i != newest_result
+            ]
+            if not candidates:
+                break
+            self._evict(candidates[0])
+
+    def _evict(self, index: int):
+        entry = self.conversation_history.pop(index)
+        self._history_tokens -= estimate_tokens(entry)
+        if _is_workflow_result(entry):
+            self.workflow_results.remove(entry)
+        else:
+            self._message_entries -= 1
+        line = _digest_line(entry)
+        self._digest.append(line)
+        self._digest_tokens += estimate_tokens(line)
+        while self._digest_tokens > self.summary_token_budget and len(self._digest) > 1:
+            self._digest_tokens -= estimate_tokens(self._digest.popleft())
+        if self.summarizer:
+            self._pending_compaction.append(entry)
+
+    @property
+    def summary(self) -> str:
+        """Rolling summary of entries no longer kept verbatim."""
+        parts = [self._llm_summary] if self._llm_summary else []
+        parts.extend(self._digest)
+        return "\n".join(parts)
+
+    async def compact(self):
+        """Fold evicted entries into the LLM summary (no-op without a summarizer)."""
+        if not self.summarizer or not self._pending_compaction:
+            return
+        pending, self._pending_compaction = self._pending_compaction, []
+        try:
+            summary = await self.summarizer(self._llm_summary, pending)
+        except Exception as e:
+            logger.warning(f"Conversation summary failed for run_id={self.run_id}, keeping digest: {e}")
+            return
+        max_chars = self.summary_token_budget * 4
+        self._llm_summary = summary.strip()[:max_chars]
+        # The LLM summary now covers what the digest held
+        self._digest.clear()
+        self._digest_tokens = 0
+
     def get_enhanced_history(self) -> list[str]:
-        """Get conversation history with workflow results included."""
-        return list(self.conversation_history)
-    
+        """Full synthesis view: rolling summary, then verbatim recent history and workflow results."""
+        history = list(self.conversation_history)
+        summary = self.summary
+        if summary:
+            history.insert(0, f"{SUMMARY_PREFIX} (earlier turns)\n\n{summary}")
+        return history
+
+    def get_decide_history(self) -> list[str]:
+        """Cheap view for routing decisions: summary, heads of workflow results, recent messages."""
+        history = []
+        for entry in self.get_enhanced_history():
+            if _is_workflow_result(entry) and len(entry) > _DECIDE_RESULT_CHARS:
+                entry = entry[:_DECIDE_RESULT_CHARS] + "\n... (truncated)"
+            history.append(entry)
+        return history
+
     def mark_waiting_for_feedback(self, waiting: bool = True):
         """Mark whether we're waiting for user feedback."""
         self.waiting_for_feedback = waiting
         if waiting:
             self.last_activity_at = datetime.utcnow()
-    
+
     def get_idle_seconds(self) -> float:
         """Get seconds since last activity."""
         return (datetime.utcnow() - self.last_activity_at).total_seconds()
-    
+
     def get_age_seconds(self) -> float:
         """Get seconds since conversation was created."""
         return (datetime.utcnow() - self.created_at).total_seconds()
-    
+
     def __repr__(self) -> str:
         """String representation."""
         return (
             f"ConversationContext(run_id={self.run_id}, "
             f"messages={self.message_count}, "
+            f"history_tokens={self._history_tokens}, "
             f"age={self.get_age_seconds():.1f}s, "
             f"idle={self.get_idle_seconds():.1f}s)"
         )
-
-
-
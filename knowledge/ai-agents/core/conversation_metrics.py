@@ -19,6 +19,12 @@ class ConversationMetrics:
     _max_concurrent: int = 0
     _total_duration_seconds: float = 0.0
     _durations: list[float] = []
+    # Chat routing: local pre-classifier decisions and speculative quick answers
+    _preclassified_quick: int = 0
+    _preclassified_decomposition: int = 0
+    _speculative_hits: int = 0
+    _speculative_misses: int = 0
+    _speculative_wasted_tokens: int = 0
     
     @classmethod
     def record_conversation_start(cls, run_id: str) -> None:
@@ -72,6 +78,39 @@ class ConversationMetrics:
                 f"Active: {cls._active_conversations}"
             )
     
+    @classmethod
+    def record_preclassified(cls, needs_decomposition: bool) -> None:
+        """Record a routing decision made without calling the chat conductor.
+        
+        Args:
+            needs_decomposition: Whether the message was routed to decomposition
+        """
+        with cls._lock:
+            if needs_decomposition:
+                cls._preclassified_decomposition += 1
+            else:
+                cls._preclassified_quick += 1
+    
+    @classmethod
+    def record_speculation(cls, run_id: str, hit: bool, wasted_tokens: int = 0) -> None:
+        """Record the outcome of a speculative quick answer.
+        
+        Args:
+            run_id: Unique identifier for the conversation
+            hit: True if the quick answer was used, False if it was cancelled
+            wasted_tokens: Estimated tokens spent on a cancelled answer
+        """
+        with cls._lock:
+            if hit:
+                cls._speculative_hits += 1
+            else:
+                cls._speculative_misses += 1
+                cls._speculative_wasted_tokens += wasted_tokens
+            logger.debug(
+                f"Speculative quick answer {'used' if hit else 'cancelled'}: {run_id}. "
+                f"Wasted tokens: {wasted_tokens}"
+            )
+    
     @classmethod
     def get_metrics(cls) -> Dict:
         """Get current metrics.
@@ -83,6 +122,7 @@ class ConversationMetrics:
             avg_duration = 0.0
             if cls._durations:
                 avg_duration = sum(cls._durations) / len(cls._durations)
+            speculations = cls._speculative_hits + cls._speculative_misses
             
             return {
                 "active_conversations": cls._active_conversations,
@@ -92,6 +132,12 @@ class ConversationMetrics:
                 "max_concurrent": cls._max_concurrent,
                 "average_duration_seconds": avg_duration,
                 "total_duration_seconds": cls._total_duration_seconds,
+                "preclassified_quick": cls._preclassified_quick,
+                "preclassified_decomposition": cls._preclassified_decomposition,
+                "speculative_hits": cls._speculative_hits,
+                "speculative_misses": cls._speculative_misses,
+                "speculative_hit_rate": cls._speculative_hits / speculations if speculations else 0.0,
+                "speculative_wasted_tokens": cls._speculative_wasted_tokens,
             }
     
     @classmethod
@@ -105,6 +151,11 @@ class ConversationMetrics:
             cls._max_concurrent = 0
             cls._total_duration_seconds = 0.0
             cls._durations = []
+            cls._preclassified_quick = 0
+            cls._preclassified_decomposition = 0
+            cls._speculative_hits = 0
+            cls._speculative_misses = 0
+            cls._speculative_wasted_tokens = 0
 
 
 
@@ -0,0 +1,227 @@
+"""
+In-process relevance index over agent memory (episodes and patterns).
+
+Why: memory_retrieve used to return the first N items regardless of the query,
+so agents saw the same episodes whatever they asked.
+Tradeoff: BM25 keyword ranking instead of embeddings - no vector DB, no network,
+no model calls; misses pure synonyms but is exact on task vocabulary and tool names.
+
+The index is built incrementally: add() indexes one item, sync() indexes items
+appended to its source list since the last call. Queries only touch the posting lists of
+their own terms, so top-k over thousands of episodes takes well under a millisecond.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, Optional
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were with "
+    "what which who how about into over our we you your".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase alphanumeric terms without stopwords; plural 's' is stripped."""
+    terms = []
+    for tok in _TOKEN.findall(text.lower()):
+        if tok in _STOPWORDS:
+            continue
+        if len(tok) > 3 and tok.endswith("s") and not tok.endswith("ss"):
+            tok = tok[:-1]
+        terms.append(tok)
+    return terms
+
+
+def _field(item: Any, name: str, default: Any = None) -> Any:
+    """Attribute of a pydantic model, or key of a dict."""
+    if isinstance(item, dict):
+        return item.get(name, default)
+    return getattr(item, name, default)
+
+
+def episode_text(episode: Any) -> str:
+    """Searchable text of an episode: task description, outcome and tools used."""
+    tools = _field(episode, "tools_used") or []
+    # Index tool names whole and split (web_search -> web_search web search)
+    tool_text = " ".join(f"{t} {str(t).replace('_', ' ')}" for t in tools)
+    return f"{_field(episode, 'task_description', '')} {_field(episode, 'outcome', '')} {tool_text}"
+
+
+def pattern_text(pattern: Any) -> str:
+    """Searchable text of a learned pattern: description and tool sequence."""
+    tools = _field(pattern, "tool_sequence") or []
+    tool_text = " ".join(f"{t} {str(t).replace('_', ' ')}" for t in tools)
+    return f"{_field(pattern, 'description', '')} {tool_text}"
+
+
+def _timestamp(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return _timestamp(datetime.fromisoformat(str(value).replace("Z", "+00:00")))
+    except ValueError:
+        return None
+
+
+class MemoryIndex:
+    """
+    Okapi BM25 over memory items, with optional exponential recency decay.
+
+    Args:
+        text_of: Item -> searchable text
+        time_of: Item -> created time (datetime, ISO string or epoch seconds), for decay
+        half_life_days: Score halves for every half_life_days of item age; None disables decay
+        k1, b: BM25 term-frequency saturation and length normalisation
+    """
+
+    def __init__(
+        self,
+        text_of: Callable[[Any], str],
+        time_of: Optional[Callable[[Any], Any]] = None,
+        half_life_days: Optional[float] = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        self.text_of = text_of
+        self.time_of = time_of
+        self.half_life_days = half_life_days
+        self.k1 = k1
+        self.b = b
+        self._source: Optional[list[Any]] = None
+        self._clear()
+
+    def _clear(self) -> None:
+        self.items: list[Any] = []
+        self._postings: dict[str, dict[int, int]] = {}
+        self._lengths: list[int] = []
+        self._times: list[Optional[float]] = []
+        self._total_length = 0
+        self._norms: Optional[list[float]] = None  # per-item BM25 length norms, rebuilt after adds
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def add(self, item: Any) -> int:
+        """Index one item; returns its position."""
+        doc = len(self.items)
+        terms = Counter(tokenize(self.text_of(item)))
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[doc] = tf
+        length = sum(terms.values())
+        self.items.append(item)
+        self._lengths.append(length)
+        self._total_length += length
+        self._norms = None
+        self._times.append(_timestamp(self.time_of(item)) if self.time_of else None)
+        return doc
+
+    def add_many(self, items: Iterable[Any]) -> None:
+        for item in items:
+            self.add(item)
+
+    def sync(self, source: list[Any]) -> None:
+        """
+        Mirror a list that only grows: index items appended since the last sync.
+
+        A different or shorter list than last time is re-indexed from scratch.
+        Use either sync() or add() on one index, not both.
+        """
+        if source is not self._source or len(source) < len(self.items):
+            self._clear()
+            self._source = source
+        self.add_many(source[len(self.items):])
+
+    def search(self, query: str, k: int = 3, now: Optional[float] = None) -> list[tuple[Any, float]]:
+        """Top-k (item, score) by BM25 relevance to the query; empty when nothing matches."""
+        terms = set(tokenize(query))
+        if not terms or not self.items:
+            return []
+        n = len(self.items)
+        if self._norms is None:
+            avg_length = self._total_length / n or 1.0
+            k1, b = self.k1, self.b
+            self._norms = [k1 * (1 - b + b * length / avg_length) for length in self._lengths]
+        norms = self._norms
+        factor = self._decay(now)
+
+        # Rarest terms first. Each term adds at most idf * (k1 + 1) to a score, so
+        # once the k-th best score so far beats what the remaining terms could add,
+        # documents not yet seen cannot reach the top k (MaxScore pruning) and
+        # common terms only update the candidates already found.
+        weighted = sorted(
+            (
+                (math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5)) * (self.k1 + 1), posting)
+                for posting in (self._postings.get(term) for term in terms)
+                if posting
+            ),
+            key=lambda wp: wp[0],
+            reverse=True,
+        )
+        remaining = sum(weight for weight, _ in weighted)
+        scores: dict[int, float] = {}
+        get = scores.get
+        for weight, posting in weighted:
+            if len(scores) >= k and self._kth_best(scores, k, factor) >= remaining:
+                for doc in scores:
+                    tf = posting.get(doc)
+                    if tf:
+                        scores[doc] += weight * tf / (tf + norms[doc])
+            else:
+                for doc, tf in posting.items():
+                    scores[doc] = get(doc, 0.0) + weight * tf / (tf + norms[doc])
+            remaining -= weight
+
+        top = heapq.nlargest(k, ((doc, score * factor(doc)) for doc, score in scores.items()), key=lambda kv: kv[1])
+        return [(self.items[doc], score) for doc, score in top]
+
+    def _decay(self, now: Optional[float]) -> Callable[[int], float]:
+        """Item -> recency multiplier in (0, 1] (memoized for one query)."""
+        if not (self.half_life_days and self.time_of):
+            return lambda doc: 1.0
+        now = now if now is not None else datetime.now(timezone.utc).timestamp()
+        half_life = self.half_life_days * 86400
+        times = self._times
+        memo: dict[int, float] = {}
+
+        def factor(doc: int) -> float:
+            value = memo.get(doc)
+            if value is None:
+                created = times[doc]
+                value = 1.0 if created is None else 0.5 ** (max(0.0, now - created) / half_life)
+                memo[doc] = value
+            return value
+
+        return factor
+
+    @staticmethod
+    def _kth_best(scores: dict[int, float], k: int, factor: Callable[[int], float]) -> float:
+        """k-th best decayed partial score: a lower bound on the final k-th best."""
+        return heapq.nlargest(k, (score * factor(doc) for doc, score in scores.items()))[-1]
+
+
+def episode_index(half_life_days: Optional[float] = None) -> MemoryIndex:
+    """Index for episodes (task description, outcome, tools), decayed by created_at."""
+    return MemoryIndex(
+        episode_text,
+        time_of=lambda ep: _field(ep, "created_at"),
+        half_life_days=half_life_days,
+    )
+
+
+def pattern_index() -> MemoryIndex:
+    """Index for learned patterns (description, tool sequence); no decay."""
+    return MemoryIndex(pattern_text)
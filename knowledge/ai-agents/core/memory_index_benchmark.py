@@ -0,0 +1,122 @@
+"""
+memory_index_benchmark.py - Recall and latency of MemoryIndex on synthetic episodes
+
+Each synthetic episode belongs to a topic (its own vocabulary plus shared filler
+words and a tool set). Queries are paraphrases built from a topic's vocabulary;
+recall@k is the share of the query topic's episodes (up to k) found in the
+top-k results, compared with the previous behaviour of returning the first k
+episodes.
+
+Usage:
+    python -m app.core.memory_index_benchmark
+    python -m app.core.memory_index_benchmark --episodes 500 2000 10000 --queries 500
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.memory_index import episode_index
+
+TOOLS = [
+    "web_search", "calculator", "cypher_query", "graph_node_lookup", "graph_neighbors_lookup",
+    "workspace_items_lookup", "data_aggregation", "scratchpad_notes_list", "date_time_utilities",
+]
+FILLER = "analysis report review summary check task data result update team overview findings".split()
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice("bcdfghjklmnprstvz") + rng.choice("aeiou") for _ in range(rng.randint(2, 4)))
+
+
+def make_topics(rng: random.Random, count: int, vocab: int = 12) -> list[dict]:
+    return [
+        {"vocab": [_word(rng) for _ in range(vocab)], "tools": rng.sample(TOOLS, 2)}
+        for _ in range(count)
+    ]
+
+
+def make_episodes(rng: random.Random, topics: list[dict], count: int) -> list[dict]:
+    now = datetime.now(timezone.utc)
+    episodes = []
+    for i in range(count):
+        topic_id = rng.randrange(len(topics))
+        topic = topics[topic_id]
+        words = rng.sample(topic["vocab"], 4) + rng.sample(FILLER, 3)
+        rng.shuffle(words)
+        episodes.append({
+            "topic": topic_id,
+            "task_description": " ".join(words[:5]),
+            "outcome": f"Completed {' '.join(words[5:])}",
+            "tools_used": topic["tools"] + rng.sample(TOOLS, 1),
+            "agent_id": "benchmark",
+            "created_at": now - timedelta(days=rng.uniform(0, 90)),
+        })
+    return episodes
+
+
+def run(n_episodes: int, n_queries: int, k: int, n_topics: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    topics = make_topics(rng, n_topics)
+    episodes = make_episodes(rng, topics, n_episodes)
+
+    index = episode_index(half_life_days=30)
+    start = time.perf_counter()
+    index.sync(episodes)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    topic_sizes = [0] * n_topics
+    for ep in episodes:
+        topic_sizes[ep["topic"]] += 1
+
+    hits = baseline_hits = relevant = 0
+    latencies = []
+    for _ in range(n_queries):
+        topic_id = rng.randrange(n_topics)
+        query = " ".join(rng.sample(topics[topic_id]["vocab"], 2) + rng.sample(FILLER, 1))
+        start = time.perf_counter()
+        results = index.search(query, k=k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        hits += sum(1 for ep, _ in results if ep["topic"] == topic_id)
+        baseline_hits += sum(1 for ep in episodes[:k] if ep["topic"] == topic_id)
+        relevant += min(k, topic_sizes[topic_id])
+
+    latencies.sort()
+    return {
+        "episodes": n_episodes,
+        "build_ms": build_ms,
+        "recall": hits / relevant,
+        "baseline_recall": baseline_hits / relevant,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MemoryIndex recall and latency")
+    parser.add_argument("--episodes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--topics", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'episodes':>9} {'build ms':>9} {'recall@' + str(args.k):>9} {'first-k':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for n in args.episodes:
+        r = run(n, args.queries, args.k, args.topics, args.seed)
+        print(
+            f"{r['episodes']:>9} {r['build_ms']:>9.1f} {r['recall']:>9.3f} "
+            f"{r['baseline_recall']:>8.3f} {r['p50_ms']:>8.3f} {r['p99_ms']:>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ from app.utils.streaming import stream_agent_text
 from app.models.task import Task, Subtask, ActivityEvent
 from app.models.agent import AgentDefinition
 from app.core.agent_factory import AgentFactory
+from app.core.conversation_context import build_history_context
 
 logger = logging.getLogger(__name__)
 
@@ -35,22 +36,16 @@ class TeamExecutionEngine:
             tool_registry=tool_registry,
             model="gpt-4o-mini",
         )
-        
-        self._agent_cache: dict[str, Agent] = {}
+        # Compile the registry's agents now rather than on the first message
+        self.agent_factory.warm_up(agent_registry.all_agents())
     
     def _create_pydantic_agent(self, agent_def: AgentDefinition) -> Agent:
-        """Create a Pydantic AI agent from definition using AgentFactory.
+        """Get the Pydantic AI agent for a definition from AgentFactory.
         
-        This ensures agents are created with proper tools attached.
+        This ensures agents are created with proper tools attached; the factory
+        caches compiled agents by id, version, model and tool set.
         """
-        if agent_def.id in self._agent_cache:
-            return self._agent_cache[agent_def.id]
-        
-        # Use AgentFactory to create agent with tools
-        agent = self.agent_factory.create_agent(agent_def)
-        
-        self._agent_cache[agent_def.id] = agent
-        return agent
+        return self.agent_factory.create_agent(agent_def)
     
     async def execute_subtask(
         self,
@@ -101,22 +96,7 @@ class TeamExecutionEngine:
             # Build enhanced prompt with conversation history
             enhanced_prompt = subtask.description
             if conversation_history:
-                # Include workflow results (they start with "WORKFLOW RESULT")
-                workflow_results = [msg for msg in conversation_history if msg.startswith("WORKFLOW RESULT")]
-                other_history = [msg for msg in conversation_history if not msg.startswith("WORKFLOW RESULT")]
-                
-                context_parts = []
-                
-                # Always include workflow results if present
-                if workflow_results:
-                    context_parts.append("WORKFLOW RESULTS FROM PREVIOUS EXECUTIONS:")
-                    context_parts.extend(workflow_results)
-                    context_parts.append("")  # Empty line separator
-                
-                # Include recent conversation history (last 3 non-workflow messages)
-                if other_history:
-                    history_text = "\n".join([f"Previous message: {msg}" for msg in other_history[-3:]])
-                    context_parts.append(history_text)
+                context_parts = build_history_context(conversation_history, message_label="Previous message")
                 
                 if context_parts:
                     context_section = "\n\n".join(context_parts)
@@ -0,0 +1,46 @@
+"""
+Tests for the chat conductor's local pre-classification of obvious messages.
+
+Usage:
+    pytest app/core/test_chat_conductor.py
+"""
+
+import pytest
+
+chat_conductor = pytest.importorskip("app.core.chat_conductor")
+preclassify = chat_conductor.ChatConductor.preclassify
+
+
+@pytest.mark.parametrize("message", ["hi", "Thanks a lot!", "ok", "hello there", "got it, thanks", "Good morning team"])
+def test_greetings_and_acknowledgements_are_small_talk(message):
+    decision = preclassify(message)
+
+    assert decision is not None
+    assert decision.needs_decomposition is False
+
+
+@pytest.mark.parametrize("message", ["ok compare them", "thanks, show me the claims", "ok list them", "hi find member 42"])
+def test_acknowledgement_followed_by_a_command_is_not_small_talk(message):
+    decision = preclassify(message)
+
+    assert decision is None or decision.needs_decomposition
+
+
+def test_acknowledgement_with_several_cues_is_decomposed():
+    decision = preclassify("ok now compare the trends for each pharmacy")
+
+    assert decision.needs_decomposition is True
+
+
+def test_question_after_greeting_goes_to_decide():
+    assert preclassify("hi, any news?") is None
+
+
+def test_single_cue_in_a_short_request_goes_to_decide():
+    assert preclassify("compare these two plans") is None
+
+
+def test_single_cue_in_a_long_request_is_decomposed():
+    message = "please analyze " + " ".join(["the member claims from last quarter"] * 5)
+
+    assert preclassify(message).needs_decomposition is True
@@ -0,0 +1,142 @@
+"""
+Tests for bounded conversation history and its rolling summary.
+
+Usage:
+    pytest app/core/test_conversation_context.py
+"""
+
+import pytest
+
+from app.core.conversation_context import (
+    SUMMARY_PREFIX,
+    WORKFLOW_RESULT_PREFIX,
+    ConversationContext,
+    build_history_context,
+    estimate_tokens,
+)
+
+
+def _context(**kwargs) -> ConversationContext:
+    kwargs.setdefault("recent_turns", 3)
+    kwargs.setdefault("token_budget", 10_000)
+    kwargs.setdefault("summary_token_budget", 1_000)
+    return ConversationContext("run-1", **kwargs)
+
+
+def test_oldest_messages_beyond_recent_turns_move_to_summary():
+    ctx = _context()
+    for i in range(5):
+        ctx.add_message(f"message {i}")
+
+    assert ctx.conversation_history == ["message 2", "message 3", "message 4"]
+    assert ctx.summary == "- Earlier message: message 0\n- Earlier message: message 1"
+    assert ctx.message_count == 5
+
+
+def test_workflow_results_do_not_count_as_turns():
+    ctx = _context(recent_turns=2)
+    ctx.add_workflow_result("revenue is up")
+    for i in range(3):
+        ctx.add_message(f"message {i}")
+
+    assert ctx.conversation_history == [f"{WORKFLOW_RESULT_PREFIX}\n\nrevenue is up", "message 1", "message 2"]
+
+
+def test_token_budget_keeps_newest_entry_and_newest_result():
+    ctx = _context(recent_turns=10, token_budget=60)
+    ctx.add_workflow_result("old result " + "x" * 80)
+    ctx.add_workflow_result("new result " + "y" * 80)
+    ctx.add_message("z" * 200)
+
+    newest_result = f"{WORKFLOW_RESULT_PREFIX}\n\nnew result " + "y" * 80
+    # Both kept entries together exceed the budget; neither is evicted
+    assert ctx.conversation_history == [newest_result, "z" * 200]
+    assert ctx.workflow_results == [newest_result]
+    assert "Earlier workflow result: old result" in ctx.summary
+
+
+def test_digest_truncates_long_entries_and_respects_its_budget():
+    ctx = _context(recent_turns=1, summary_token_budget=60)
+    for i in range(6):
+        ctx.add_message(f"message {i} " + "word " * 100)
+
+    lines = ctx.summary.splitlines()
+    assert all(line.endswith("...") for line in lines)
+    assert lines[-1].startswith("- Earlier message: message 4")
+    assert sum(estimate_tokens(line) for line in lines) <= 60
+    assert len(lines) < 5  # oldest digest lines dropped
+
+
+def test_identical_workflow_results_are_kept_once():
+    ctx = _context()
+    ctx.add_workflow_result("same")
+    ctx.add_workflow_result("same")
+    ctx.add_workflow_result("different")
+
+    assert len(ctx.workflow_results) == 2
+    assert len(ctx.conversation_history) == 2
+
+
+@pytest.mark.asyncio
+async def test_compact_replaces_digest_with_llm_summary():
+    calls = []
+
+    async def summarizer(previous: str, entries: list) -> str:
+        calls.append((previous, list(entries)))
+        return f"summary of {len(entries)} entries"
+
+    ctx = _context(recent_turns=1, summarizer=summarizer)
+    for i in range(3):
+        ctx.add_message(f"message {i}")
+    await ctx.compact()
+
+    assert calls == [("", ["message 0", "message 1"])]
+    assert ctx.summary == "summary of 2 entries"
+
+    ctx.add_message("message 3")
+    await ctx.compact()
+    await ctx.compact()  # nothing pending
+
+    assert calls[1] == ("summary of 2 entries", ["message 2"])
+    assert len(calls) == 2
+    assert ctx.summary == "summary of 1 entries"
+
+
+@pytest.mark.asyncio
+async def test_failed_compaction_keeps_the_digest():
+    async def summarizer(previous: str, entries: list) -> str:
+        raise RuntimeError("model unavailable")
+
+    ctx = _context(recent_turns=1, summarizer=summarizer)
+    ctx.add_message("message 0")
+    ctx.add_message("message 1")
+    await ctx.compact()
+
+    assert ctx.summary == "- Earlier message: message 0"
+
+
+def test_enhanced_history_leads_with_summary_for_prompt_layout():
+    ctx = _context(recent_turns=1)
+    ctx.add_message("message 0")
+    ctx.add_message("message 1")
+
+    history = ctx.get_enhanced_history()
+
+    assert history[0].startswith(SUMMARY_PREFIX)
+    assert history[1:] == ["message 1"]
+    sections = build_history_context(history)
+    assert sections[0] == history[0]
+    assert sections[-1] == "Previous: message 1"
+
+
+def test_decide_history_truncates_long_workflow_results():
+    ctx = _context()
+    ctx.add_workflow_result("r" * 2_000)
+    ctx.add_message("short message")
+
+    result, message = ctx.get_decide_history()
+
+    assert result.endswith("\n... (truncated)")
+    assert len(result) < 700
+    assert message == "short message"
+    assert len(ctx.conversation_history[0]) > 2_000  # synthesis view is untouched
@@ -0,0 +1,148 @@
+"""
+Tests for BM25 ranking of agent memory.
+
+Usage:
+    pytest app/core/test_memory_index.py
+"""
+
+import math
+import random
+from collections import Counter
+
+import pytest
+
+from app.core.memory_index import MemoryIndex, episode_index, pattern_index, tokenize
+
+DAY = 86400.0
+
+
+def _episode(task: str, tools=(), created_at=None, outcome: str = "success") -> dict:
+    return {"task_description": task, "outcome": outcome, "tools_used": list(tools), "created_at": created_at}
+
+
+@pytest.fixture
+def episodes() -> list:
+    return [
+        _episode("Summarize quarterly revenue for the finance team", ["cypher_query"]),
+        _episode("Find suppliers with late shipments", ["web_search"]),
+        _episode("Draft an email to the claims adjuster"),
+        _episode("Compare revenue growth across regions", ["cypher_query", "chart_builder"]),
+    ]
+
+
+def _texts(results) -> list:
+    return [item["task_description"] for item, _ in results]
+
+
+def test_tokenize_drops_stopwords_and_plural_s():
+    assert tokenize("What are the Shipments of Glass?") == ["shipment", "glass"]
+
+
+def test_ranks_by_relevance_not_insertion_order(episodes):
+    index = episode_index()
+    index.add_many(episodes)
+
+    results = index.search("late supplier shipments", k=2)
+
+    assert _texts(results)[0] == "Find suppliers with late shipments"
+    assert len(results) == 1  # nothing else shares a term
+
+
+def test_rare_terms_outweigh_common_ones(episodes):
+    index = episode_index()
+    index.add_many(episodes)
+
+    # "revenue" is in two episodes, "regions" in one
+    results = index.search("revenue regions", k=2)
+
+    assert _texts(results) == ["Compare revenue growth across regions", "Summarize quarterly revenue for the finance team"]
+    assert results[0][1] > results[1][1] > 0
+
+
+def test_tool_names_are_searchable_whole_and_split(episodes):
+    index = episode_index()
+    index.add_many(episodes)
+
+    assert _texts(index.search("chart_builder", k=1)) == ["Compare revenue growth across regions"]
+    assert _texts(index.search("chart", k=1)) == ["Compare revenue growth across regions"]
+
+
+def test_no_matching_terms_returns_nothing(episodes):
+    index = episode_index()
+    index.add_many(episodes)
+
+    assert index.search("the of and") == []
+    assert index.search("kubernetes") == []
+    assert episode_index().search("revenue") == []
+
+
+def test_recency_decay_prefers_newer_equal_matches():
+    now = 1_000 * DAY
+    old = _episode("Reconcile invoices", created_at=now - 30 * DAY)
+    new = _episode("Reconcile invoices", created_at=now - 1 * DAY)
+    index = episode_index(half_life_days=7)
+    index.add_many([old, new])
+
+    [(first, first_score), (second, second_score)] = index.search("invoices", now=now)
+
+    assert first is new and second is old
+    assert second_score / first_score == pytest.approx(0.5 ** (29 / 7))
+
+
+def test_sync_indexes_appended_items_and_rebuilds_for_a_new_list(episodes):
+    index = episode_index()
+    source = episodes[:2]
+    index.sync(source)
+    source.append(episodes[2])
+    index.sync(source)
+
+    assert len(index) == 3
+    assert _texts(index.search("claims adjuster", k=1)) == ["Draft an email to the claims adjuster"]
+
+    index.sync([episodes[3]])
+    assert len(index) == 1
+
+
+def test_pattern_index_searches_description_and_tool_sequence():
+    index = pattern_index()
+    index.add_many([
+        {"description": "Look up graph data then chart it", "tool_sequence": ["cypher_query", "chart_builder"]},
+        {"description": "Research a vendor online", "tool_sequence": ["web_search"]},
+    ])
+
+    assert index.search("web search vendor", k=1)[0][0]["tool_sequence"] == ["web_search"]
+
+
+def _exhaustive_bm25(docs: list, query: str, k: int, k1: float = 1.2, b: float = 0.75) -> list:
+    """Textbook BM25 scored over every document, for comparison with the pruned search."""
+    tokenized = [Counter(tokenize(doc)) for doc in docs]
+    n = len(docs)
+    avg_length = sum(sum(tf.values()) for tf in tokenized) / n
+    scores = []
+    for i, tf in enumerate(tokenized):
+        length = sum(tf.values())
+        score = 0.0
+        for term in set(tokenize(query)):
+            df = sum(1 for other in tokenized if term in other)
+            if not tf[term]:
+                continue
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            score += idf * tf[term] * (k1 + 1) / (tf[term] + k1 * (1 - b + b * length / avg_length))
+        if score:
+            scores.append((i, score))
+    return sorted(scores, key=lambda s: s[1], reverse=True)[:k]
+
+
+def test_pruned_search_matches_exhaustive_scoring():
+    rng = random.Random(7)
+    vocabulary = [f"term{i}" for i in range(60)]
+    docs = [" ".join(rng.choices(vocabulary, weights=range(60, 0, -1), k=rng.randint(3, 25))) for _ in range(400)]
+    index = MemoryIndex(lambda doc: doc)
+    index.add_many(docs)
+
+    for _ in range(25):
+        query = " ".join(rng.sample(vocabulary, 4))
+        expected = _exhaustive_bm25(docs, query, k=5)
+        results = index.search(query, k=5)
+
+        assert [score for _, score in results] == pytest.approx([score for _, score in expected])
@@ -44,6 +44,7 @@ from .memory_retrieve import memory_retrieve
 from .workspace_graphql import (
     workspace_items_lookup,
     graph_node_lookup,
+    graph_nodes_lookup,
     graph_edge_lookup,
     graph_neighbors_lookup,
     scratchpad_notes_list,
@@ -71,6 +72,7 @@ __all__ = [
     "memory_retrieve",
     "workspace_items_lookup",
     "graph_node_lookup",
+    "graph_nodes_lookup",
     "graph_edge_lookup",
     "graph_neighbors_lookup",
     "scratchpad_notes_list",
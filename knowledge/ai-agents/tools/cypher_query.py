@@ -143,6 +143,71 @@ async def cypher_query(
     if "LIMIT" not in scoped_query.upper():
         scoped_query = f"{scoped_query} LIMIT {max_results + 1}"  # +1 to detect truncation
 
+    async def execute() -> List[Dict[str, Any]]:
+        return await _execute_scoped_query(scoped_query, workspace_id, tenant_id)
+
+    # Phases of one analysis share results: identical queries run once
+    result_store = ctx.deps.get("cypher_result_store")
+    try:
+        if result_store is not None:
+            formatted_results = await result_store.fetch(
+                query, max_results, execute, requester=ctx.deps.get("cypher_requester")
+            )
+        else:
+            formatted_results = await execute()
+    except CypherExecutionError as e:
+        return {"error": str(e), "results": [], "count": 0, "truncated": False}
+
+    # Check if truncated
+    truncated = len(formatted_results) > max_results
+    if truncated:
+        formatted_results = formatted_results[:max_results]
+
+    # Update budget state
+    if budget_state is not None:
+        budget_state["calls_made"] += 1
+        budget_state["total_results_returned"] += len(formatted_results)
+        budget_state["queries"].append({
+            "query": query[:200],
+            "result_count": len(formatted_results),
+            "truncated": truncated,
+        })
+    # Check if compression is enabled
+    compress_results = ctx.deps.get("compress_cypher_results", False)
+    sample_rows = ctx.deps.get("compress_sample_rows", 10)
+
+    if compress_results and len(formatted_results) > sample_rows:
+        # Compress results: return summary + sample + aggregates instead of full data
+        result_dict = _compress_results(formatted_results, sample_rows, truncated)
+    else:
+        result_dict = {
+            "results": formatted_results,
+            "count": len(formatted_results),
+            "truncated": truncated,
+        }
+
+    # Include budget info for agent awareness
+    if budget_state is not None:
+        result_dict["budget_remaining_calls"] = (budget_max_calls or 999) - budget_state["calls_made"]
+
+    return result_dict
+
+
+class CypherExecutionError(Exception):
+    """A scoped Cypher query failed after retries."""
+
+
+async def _execute_scoped_query(
+    scoped_query: str,
+    workspace_id: str,
+    tenant_id: str,
+) -> List[Dict[str, Any]]:
+    """
+    Run a workspace-scoped query via GraphQL and flatten the returned nodes.
+
+    Raises:
+        CypherExecutionError: If the query fails (after retrying transient errors)
+    """
     # Execute via GraphQL with retry logic for transient failures
     last_error = None
     for attempt in range(1, CYPHER_MAX_RETRY_ATTEMPTS + 1):
@@ -166,7 +231,7 @@ async def cypher_query(
 
             if not is_retryable or attempt == CYPHER_MAX_RETRY_ATTEMPTS:
                 logger.error(f"Cypher query failed after {attempt} attempt(s): {error_msg}")
-                return {"error": f"Query execution failed: {error_msg}", "results": [], "count": 0, "truncated": False}
+                raise CypherExecutionError(f"Query execution failed: {error_msg}") from e
 
             # Calculate delay with exponential backoff and jitter
             delay = min(
@@ -182,7 +247,7 @@ async def cypher_query(
             await asyncio.sleep(delay)
     else:
         # Should not reach here, but safety fallback
-        return {"error": f"Query execution failed after {CYPHER_MAX_RETRY_ATTEMPTS} attempts: {last_error}", "results": [], "count": 0, "truncated": False}
+        raise CypherExecutionError(f"Query execution failed after {CYPHER_MAX_RETRY_ATTEMPTS} attempts: {last_error}")
 
     # Process results
     nodes = result.get("graphNodesByCypher", [])
@@ -200,39 +265,7 @@ async def cypher_query(
             **props
         })
 
-    # Check if truncated
-    truncated = len(formatted_results) > max_results
-    if truncated:
-        formatted_results = formatted_results[:max_results]
-
-    # Update budget state
-    if budget_state is not None:
-        budget_state["calls_made"] += 1
-        budget_state["total_results_returned"] += len(formatted_results)
-        budget_state["queries"].append({
-            "query": query[:200],
-            "result_count": len(formatted_results),
-            "truncated": truncated,
-        })
-    # Check if compression is enabled
-    compress_results = ctx.deps.get("compress_cypher_results", False)
-    sample_rows = ctx.deps.get("compress_sample_rows", 10)
-
-    if compress_results and len(formatted_results) > sample_rows:
-        # Compress results: return summary + sample + aggregates instead of full data
-        result_dict = _compress_results(formatted_results, sample_rows, truncated)
-    else:
-        result_dict = {
-            "results": formatted_results,
-            "count": len(formatted_results),
-            "truncated": truncated,
-        }
-
-    # Include budget info for agent awareness
-    if budget_state is not None:
-        result_dict["budget_remaining_calls"] = (budget_max_calls or 999) - budget_state["calls_made"]
-
-    return result_dict
+    return formatted_results
 
 
 def _inject_workspace_scope(
@@ -1,14 +1,29 @@
-"""Memory retrieval tool for accessing past context (stub implementation).
+"""Memory retrieval tool for accessing past context.
 
 Why: Agents need to remember past interactions to build on previous work.
-Tradeoff: Adds complexity (vector DB, embeddings) but enables continuity.
+Tradeoff: Ranks by BM25 keyword relevance (app.core.memory_index) rather than
+embeddings - no vector DB or network call, but no synonym matching.
 Alternative considered: Stateless agents (simpler but can't learn or maintain context).
 """
 
 from typing import List, Dict, Any
 from pydantic_ai import RunContext
+from app.core.memory_index import MemoryIndex, episode_index, pattern_index
 from app.tools import register_tool
 
+# Episode relevance halves every 30 days of age
+EPISODE_HALF_LIFE_DAYS = 30.0
+
+
+def _index_for(memory_context: dict, key: str, items: list, factory) -> MemoryIndex:
+    """Index kept in memory_context next to its items, synced with newly added ones."""
+    index = memory_context.get(key)
+    if index is None:
+        index = factory()
+        memory_context[key] = index
+    index.sync(items)
+    return index
+
 
 @register_tool("memory_retrieve")
 async def memory_retrieve(
@@ -51,6 +66,9 @@ async def memory_retrieve(
             - 'patterns': Learned workflows and tool sequences that worked well
         limit: Maximum number of items to retrieve (default: 3)
 
+    Items are ranked by relevance to the query, with older episodes discounted.
+    If nothing matches, the most recent items are returned.
+
     Returns:
         List of memory items with:
             - task: Original task description
@@ -58,6 +76,7 @@ async def memory_retrieve(
             - outcome/success: Whether task succeeded and what was learned
             - created_at: When it happened
             - agent: Which agent completed it
+            - relevance: Match score (absent when falling back to recent items)
 
     Examples:
         - memory_retrieve("pricing analysis") → Finds past pricing research episodes
@@ -88,17 +107,25 @@ async def memory_retrieve(
                 "note": "Complete a few tasks to build memory"
             }]
 
-        # Return most recent episodes (up to limit)
+        index = _index_for(
+            memory_context, "_episode_index", episodes,
+            lambda: episode_index(half_life_days=EPISODE_HALF_LIFE_DAYS),
+        )
+        ranked = index.search(query, k=limit) or [(ep, None) for ep in episodes[:limit]]
+
         results = []
-        for ep in episodes[:limit]:
+        for ep, score in ranked:
             # Episode is a Pydantic model, access attributes directly
-            results.append({
+            item = {
                 "task": ep.task_description,
                 "tools_used": ep.tools_used,
                 "outcome": ep.outcome,
                 "agent": ep.agent_id,
                 "created_at": ep.created_at.isoformat() if hasattr(ep.created_at, 'isoformat') else str(ep.created_at)
-            })
+            }
+            if score is not None:
+                item["relevance"] = round(score, 3)
+            results.append(item)
         return results
 
     # Return learned patterns
@@ -110,15 +137,21 @@ async def memory_retrieve(
                 "note": "Patterns form after completing similar tasks 3+ times"
             }]
 
+        index = _index_for(memory_context, "_pattern_index", patterns, pattern_index)
+        ranked = index.search(query, k=limit) or [(pattern, None) for pattern in patterns[:limit]]
+
         results = []
-        for pattern in patterns[:limit]:
+        for pattern, score in ranked:
             # Pattern is a Pydantic model, access attributes directly
-            results.append({
+            item = {
                 "pattern": pattern.description,
                 "tool_sequence": list(pattern.tool_sequence),
                 "confidence": pattern.confidence,
                 "evidence_count": pattern.evidence_count
-            })
+            }
+            if score is not None:
+                item["relevance"] = round(score, 3)
+            results.append(item)
         return results
 
     return [{"error": f"Unknown memory_type: {memory_type}"}]
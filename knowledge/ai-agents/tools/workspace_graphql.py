@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 from typing import Any
@@ -98,6 +99,139 @@ async def _run_graphql(query: str, variables: dict[str, Any], tenant_id: Optiona
     return await run_graphql(query, variables, graphql_endpoint=None, tenant_id=tenant_id)
 
 
+def _format_node(node: dict[str, Any]) -> dict[str, Any]:
+    """Flatten a GraphNode's key/value properties for LLM friendliness."""
+    properties = {prop["key"]: prop["value"] for prop in node.get("properties", [])}
+    return {
+        "id": node["id"],
+        "labels": node.get("labels", []),
+        **properties
+    }
+
+
+def _graph_nodes_query(count: int) -> str:
+    """One request fetching `count` nodes, each as an aliased graphNodeById field."""
+    params = ", ".join(f"$id{i}: String!" for i in range(count))
+    fields = "\n".join(
+        f"  n{i}: graphNodeById(id: $id{i}, workspaceId: $workspaceId) {{ id labels properties {{ key value }} }}"
+        for i in range(count)
+    )
+    return f"query graphNodesById({params}, $workspaceId: UUID) {{\n{fields}\n}}"
+
+
+# Most node ids fetched in one GraphQL request
+_NODE_BATCH_SIZE = 50
+
+_LOOKUP_CACHE_KEY = "_graph_lookup_cache"
+
+
+class GraphLookupCache:
+    """
+    Per-run cache for workspace graph lookups (DataLoader-style).
+
+    Node lookups made in the same event-loop tick are batched into one GraphQL
+    request, concurrent lookups of the same id share one fetch, and results
+    (including "not found") are kept for the rest of the run. Failed fetches are
+    not cached, so a later call retries. Edge and neighborhood lookups are
+    coalesced and cached per id.
+    """
+
+    def __init__(self, tenant_id: Optional[str], workspace_id: Optional[str]):
+        self.tenant_id = tenant_id
+        self.workspace_id = workspace_id
+        self._nodes: dict[str, asyncio.Future] = {}
+        self._edges: dict[str, asyncio.Future] = {}
+        self._neighbors: dict[str, asyncio.Future] = {}
+        self._pending: list[str] = []
+        self.requests = 0
+
+    def _variables(self, **variables: Any) -> dict[str, Any]:
+        if self.workspace_id:
+            variables["workspaceId"] = self.workspace_id
+        return variables
+
+    async def load_node(self, node_id: str) -> Optional[dict[str, Any]]:
+        """Formatted node, or None if it does not exist."""
+        future = self._nodes.get(node_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._nodes[node_id] = future
+            if not self._pending:
+                # Dispatch after the current tick so sibling lookups join the batch
+                loop.call_soon(self._dispatch)
+            self._pending.append(node_id)
+        return await asyncio.shield(future)
+
+    def _dispatch(self):
+        pending, self._pending = self._pending, []
+        for start in range(0, len(pending), _NODE_BATCH_SIZE):
+            asyncio.ensure_future(self._fetch_nodes(pending[start:start + _NODE_BATCH_SIZE]))
+
+    async def _fetch_nodes(self, node_ids: list[str]):
+        try:
+            if len(node_ids) == 1:
+                self.requests += 1
+                data = await _run_graphql(_GRAPH_NODE_QUERY, self._variables(id=node_ids[0]), tenant_id=self.tenant_id)
+                nodes = [data.get("graphNodeById")]
+            else:
+                self.requests += 1
+                variables = self._variables(**{f"id{i}": node_id for i, node_id in enumerate(node_ids)})
+                data = await _run_graphql(_graph_nodes_query(len(node_ids)), variables, tenant_id=self.tenant_id)
+                nodes = [data.get(f"n{i}") for i in range(len(node_ids))]
+        except Exception as e:
+            if len(node_ids) > 1:
+                # One bad id fails the whole request; fetch individually so the rest still resolve
+                logger.warning(f"Batched node lookup of {len(node_ids)} ids failed, retrying individually: {e}")
+                await asyncio.gather(*(self._fetch_nodes([node_id]) for node_id in node_ids))
+                return
+            future = self._nodes.pop(node_ids[0])
+            if not future.done():
+                future.set_exception(e)
+            return
+        for node_id, node in zip(node_ids, nodes):
+            future = self._nodes[node_id]
+            if not future.done():
+                future.set_result(_format_node(node) if node else None)
+
+    async def _cached(self, cache: dict[str, asyncio.Future], key: str, fetch) -> Any:
+        future = cache.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fetch())
+            cache[key] = future
+            try:
+                return await asyncio.shield(future)
+            except Exception:
+                cache.pop(key, None)
+                raise
+        return await asyncio.shield(future)
+
+    async def load_edge(self, edge_id: str) -> dict[str, Any]:
+        async def fetch():
+            self.requests += 1
+            data = await _run_graphql(_GRAPH_EDGE_QUERY, self._variables(id=edge_id), tenant_id=self.tenant_id)
+            return data.get("graphEdgeById") or {}
+        return await self._cached(self._edges, edge_id, fetch)
+
+    async def load_neighbors(self, node_id: str) -> dict[str, Any]:
+        async def fetch():
+            self.requests += 1
+            data = await _run_graphql(_GRAPH_NEIGHBORS_QUERY, self._variables(id=node_id), tenant_id=self.tenant_id)
+            return data.get("graphNeighbors", {})
+        return await self._cached(self._neighbors, node_id, fetch)
+
+
+def _lookup_cache(ctx: RunContext[dict]) -> GraphLookupCache:
+    """The run's GraphLookupCache, created in ctx.deps on first use."""
+    tenant_id = ctx.deps.get("tenant_id")
+    workspace_id = ctx.deps.get("workspace_id")
+    cache = ctx.deps.get(_LOOKUP_CACHE_KEY)
+    if cache is None or cache.tenant_id != tenant_id or cache.workspace_id != workspace_id:
+        cache = GraphLookupCache(tenant_id, workspace_id)
+        ctx.deps[_LOOKUP_CACHE_KEY] = cache
+    return cache
+
+
 @register_tool("workspace_items_lookup")
 async def workspace_items_lookup(ctx: RunContext[dict], workspace_id: str | None = None) -> dict[str, Any]:
     """Get the list of pinned items in a workspace (starting point for exploring workspace data).
@@ -204,32 +338,58 @@ async def graph_node_lookup(ctx: RunContext[dict], node_id: str) -> dict[str, An
     """
     tool_name = "graph_node_lookup"
     logger.info(f"Tool called: {tool_name} with node_id={node_id}")
-    tenant_id = ctx.deps.get("tenant_id")
-    workspace_id = ctx.deps.get("workspace_id")
-
-    variables = {"id": node_id}
-    if workspace_id:
-        variables["workspaceId"] = workspace_id
 
     try:
-        data = await _run_graphql(_GRAPH_NODE_QUERY, variables, tenant_id=tenant_id)
-        node = data.get("graphNodeById")
+        formatted_node = await _lookup_cache(ctx).load_node(node_id)
 
-        if not node:
+        if not formatted_node:
             logger.info(f"Tool '{tool_name}' succeeded but node not found")
             return {}
 
-        # Format properties as flat dict for LLM friendliness
-        properties = {prop["key"]: prop["value"] for prop in node.get("properties", [])}
+        logger.info(f"Tool '{tool_name}' succeeded")
+        return {**formatted_node}
+    except Exception as e:
+        logger.error(f"Tool '{tool_name}' failed with error: {type(e).__name__}: {str(e)}")
+        raise
+
 
-        formatted_node = {
-            "id": node["id"],
-            "labels": node.get("labels", []),
-            **properties
+@register_tool("graph_nodes_lookup")
+async def graph_nodes_lookup(ctx: RunContext[dict], node_ids: list[str]) -> dict[str, Any]:
+    """Get detailed information about several graph nodes in one call.
+
+    Prefer this over repeated graph_node_lookup calls when you already have a list
+    of node IDs (e.g. from workspace_items_lookup or graph_neighbors_lookup): all
+    nodes are fetched together in a single request.
+
+    Args:
+        node_ids: Graph node IDs (strings). Duplicates are fetched once.
+
+    Returns:
+        Dict with:
+        {
+            "nodes": [{"id": "...", "labels": [...], "property1": "value1", ...}, ...],
+            "not_found": ["id", ...],
+            "count": N,
+            "errors": {"id": "message"}  # only when some lookups failed
         }
+    """
+    tool_name = "graph_nodes_lookup"
+    unique_ids = list(dict.fromkeys(node_id for node_id in node_ids if node_id))
+    logger.info(f"Tool called: {tool_name} with {len(unique_ids)} node_ids")
 
-        logger.info(f"Tool '{tool_name}' succeeded")
-        return formatted_node
+    try:
+        cache = _lookup_cache(ctx)
+        nodes = await asyncio.gather(*(cache.load_node(node_id) for node_id in unique_ids), return_exceptions=True)
+        failures = {node_id: node for node_id, node in zip(unique_ids, nodes) if isinstance(node, Exception)}
+        if failures and len(failures) == len(unique_ids):
+            raise next(iter(failures.values()))
+        found = [{**node} for node in nodes if node and not isinstance(node, Exception)]
+        not_found = [node_id for node_id, node in zip(unique_ids, nodes) if node is None]
+        result = {"nodes": found, "not_found": not_found, "count": len(found)}
+        if failures:
+            result["errors"] = {node_id: str(e) for node_id, e in failures.items()}
+        logger.info(f"Tool '{tool_name}' succeeded: {len(found)} found, {len(not_found)} not found, {len(failures)} failed")
+        return result
     except Exception as e:
         logger.error(f"Tool '{tool_name}' failed with error: {type(e).__name__}: {str(e)}")
         raise
@@ -267,17 +427,11 @@ async def graph_edge_lookup(ctx: RunContext[dict], edge_id: str) -> dict[str, An
     """
     tool_name = "graph_edge_lookup"
     logger.info(f"Tool called: {tool_name} with edge_id={edge_id}")
-    tenant_id = ctx.deps.get("tenant_id")
-    workspace_id = ctx.deps.get("workspace_id")
-    
-    variables = {"id": edge_id}
-    if workspace_id:
-        variables["workspaceId"] = workspace_id
     
     try:
-        data = await _run_graphql(_GRAPH_EDGE_QUERY, variables, tenant_id=tenant_id)
+        edge = await _lookup_cache(ctx).load_edge(edge_id)
         logger.info(f"Tool '{tool_name}' succeeded")
-        return data.get("graphEdgeById") or {}
+        return edge
     except Exception as e:
         logger.error(f"Tool '{tool_name}' failed with error: {type(e).__name__}: {str(e)}")
         raise
@@ -329,36 +483,21 @@ async def graph_neighbors_lookup(ctx: RunContext[dict], node_id: str) -> dict[st
     """
     tool_name = "graph_neighbors_lookup"
     logger.info(f"Tool called: {tool_name} with node_id={node_id}")
-    tenant_id = ctx.deps.get("tenant_id")
-    workspace_id = ctx.deps.get("workspace_id")
-
-    variables = {"id": node_id}
-    if workspace_id:
-        variables["workspaceId"] = workspace_id
+    cache = _lookup_cache(ctx)
 
     try:
-        # Get neighbors data
-        neighbors_data = await _run_graphql(_GRAPH_NEIGHBORS_QUERY, variables, tenant_id=tenant_id)
-        neighbors = neighbors_data.get("graphNeighbors", {})
-
-        # Get focal node data
-        node_data = await _run_graphql(_GRAPH_NODE_QUERY, {"id": node_id}, tenant_id=tenant_id)
-        focal_node = node_data.get("graphNodeById")
+        # Neighborhood and focal node are independent; fetch them concurrently
+        neighbors, focal_node = await asyncio.gather(
+            cache.load_neighbors(node_id),
+            cache.load_node(node_id),
+        )
 
         if not focal_node:
             logger.warning(f"Tool '{tool_name}' succeeded but focal node not found")
             return {"error": "Node not found"}
 
-        # Format properties as flat dict
-        properties = {prop["key"]: prop["value"] for prop in focal_node.get("properties", [])}
-        formatted_focal_node = {
-            "id": focal_node["id"],
-            "labels": focal_node.get("labels", []),
-            **properties
-        }
-
         # Use formatting utility for rich context
-        formatted = format_node_with_neighbors(formatted_focal_node, neighbors)
+        formatted = format_node_with_neighbors(focal_node, neighbors)
 
         logger.info(f"Tool '{tool_name}' succeeded with {formatted['neighborhood_overview']['total_neighbors']} neighbors")
         return formatted
@@ -61,7 +61,7 @@ WHERE THIS IS USED
    - _execute_scenarios_parallel() - Shared context for parallel scenarios
 
 2. Workspace GraphQL Tools (app/tools/workspace_graphql.py)
-   - graph_node_lookup() - Formats individual nodes with flat properties
+   - graph_node_lookup() / graph_nodes_lookup() - Format nodes with flat properties
    - graph_neighbors_lookup() - Enriches neighborhood exploration
 
 3. Future Use Cases:
@@ -230,3 +230,46 @@ async def stream_with_logger(
 
     return full_text
 
+
+
+class BufferedLogStreamer:
+    """
+    Log streamer wrapper that holds events until the stream is committed.
+
+    Used to run an answer speculatively: events are buffered while the caller
+    decides whether the answer is wanted. commit() replays them in order to the
+    real streamer and passes later events straight through; discard() drops them.
+    """
+
+    def __init__(self, log_streamer: Any):
+        self._target = log_streamer
+        self._pending: list[dict] = []
+        self._committed = False
+        self._discarded = False
+        self.buffered_chars = 0
+
+    async def log_event(self, **kwargs) -> None:
+        if self._committed:
+            await self._target.log_event(**kwargs)
+        elif not self._discarded:
+            self._pending.append(kwargs)
+            self.buffered_chars += len(kwargs.get("message") or "")
+
+    async def flush(self) -> None:
+        if self._committed and hasattr(self._target, "flush"):
+            await self._target.flush()
+
+    async def commit(self) -> None:
+        """Replay buffered events, then stream through."""
+        # Events logged while replaying are appended to _pending and replayed too;
+        # pass-through starts only once the buffer is drained, so order is kept
+        while self._pending:
+            await self._target.log_event(**self._pending.pop(0))
+        self._committed = True
+        if hasattr(self._target, "flush"):
+            await self._target.flush()
+
+    def discard(self) -> None:
+        """Drop buffered events and ignore any further ones."""
+        self._discarded = True
+        self._pending.clear()
@@ -29,6 +29,7 @@ from .prompts import (
 
 from .progress import AnalysisProgressTracker
 from .report_persistence import ReportPersistence
+from .result_store import AnalysisResultStore
 from .config import AnalysisWorkflowConfig, load_config
 
 __all__ = [
@@ -49,6 +50,6 @@ __all__ = [
     "SCENARIO_PLANNER_PROMPT", "SCENARIO_EXECUTOR_PROMPT",
 
     # Components
-    "AnalysisProgressTracker", "ReportPersistence",
+    "AnalysisProgressTracker", "ReportPersistence", "AnalysisResultStore",
     "AnalysisWorkflowConfig", "load_config",
 ]
@@ -90,6 +90,13 @@ class AnalysisWorkflowConfig(BaseModel):
     max_parallel_scenarios_per_analysis: int = Field(
         default=3, ge=1, description="Maximum parallel scenarios per analysis"
     )
+    max_concurrent_llm_calls: int = Field(
+        default=4, ge=1,
+        description=(
+            "Maximum agent runs in flight at once across the analysis pipeline "
+            "(planning, analyses, scenario planning and execution) to avoid provider throttling"
+        ),
+    )
 
     # Feature flags
     enable_web_search: bool = Field(
@@ -123,6 +130,15 @@ class AnalysisWorkflowConfig(BaseModel):
         description="Number of sample rows to include when compress_cypher_results is True",
     )
 
+    # Query sharing within an analysis
+    share_analysis_query_results: bool = Field(
+        default=True,
+        description=(
+            "When True, the analysis executor, scenario planner and scenarios of one analysis share "
+            "cypher_query results: each distinct query is executed once per analysis."
+        ),
+    )
+
     # History compaction (post-turn context reduction)
     enable_history_compaction: bool = Field(
         default=True,
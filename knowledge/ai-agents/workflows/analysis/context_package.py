@@ -14,8 +14,11 @@ The context package includes:
 Target: ~5-10K tokens (vs 50K-200K for full data serialization)
 """
 
+import asyncio
 import json
 import logging
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import Dict, List, Any, Optional
 
@@ -226,6 +229,95 @@ query GetWorkspaceItems($workspaceId: UUID!) {
 }
 """.strip()
 
+# Get workspace items pinned since a timestamp (incremental refresh)
+WORKSPACE_ITEMS_SINCE_QUERY = """
+query GetWorkspaceItemsSince($workspaceId: UUID!, $since: DateTime!) {
+    workspaceItems(
+        where: {
+            workspaceId: { eq: $workspaceId }
+            pinnedAt: { gte: $since }
+        }
+    ) {
+        workspaceItemId
+        graphNodeId
+        labels
+    }
+}
+""".strip()
+
+# Cheap version fingerprint: item count + most recent pin
+WORKSPACE_VERSION_QUERY = """
+query WorkspaceItemsVersion($workspaceId: UUID!) {
+    workspaceNodes(workspaceId: $workspaceId, first: 1, order: [{ pinnedAt: DESC }]) {
+        totalCount
+        nodes {
+            pinnedAt
+        }
+    }
+}
+""".strip()
+
+# Aggregate relationship counts by (from label, type, to label)
+GRAPH_ROWS_QUERY = """
+query RelationshipCounts($cypherQuery: String!, $workspaceIds: [String!]) {
+    graphRowsByCypher(cypherQuery: $cypherQuery, workspaceIds: $workspaceIds) {
+        columns
+        rows
+    }
+}
+""".strip()
+
+# Scoped to relationships leaving workspace nodes; ids are inlined in chunks
+RELATIONSHIP_COUNTS_CYPHER = """
+MATCH (a)-[r]->(b)
+WHERE a.id IN {node_ids}
+RETURN head(labels(a)) AS from_label, type(r) AS rel_type, head(labels(b)) AS to_label, count(r) AS rel_count
+""".strip()
+RELATIONSHIP_COUNT_CHUNK_IDS = 1000
+# Larger workspaces fall back to the estimate rather than issue many count queries
+RELATIONSHIP_COUNT_MAX_IDS = 20000
+
+
+# =============================================================================
+# Context Package Cache
+# =============================================================================
+# Packages are cached per workspace and keyed by a cheap version fingerprint
+# (workspace item count + latest pinnedAt). When only new items were pinned
+# since the cached version, just those items are fetched and merged; schema is
+# fetched only for entity types not seen before.
+#
+# The fingerprint only sees pins, not edits to the graph data behind them, so
+# cached packages (schemas, ranges, relationship counts) are also rebuilt in
+# full once they are older than CONTEXT_CACHE_TTL_SECONDS.
+
+CONTEXT_CACHE_MAX_WORKSPACES = 32
+CONTEXT_CACHE_TTL_SECONDS = 600
+
+
+@dataclass
+class _CachedContext:
+    """Cached build state for one workspace."""
+    version: tuple  # (item_count, latest_pinned_at)
+    package: WorkspaceContextPackage
+    item_ids: set
+    entity_schemas: Dict[str, EntitySchema]
+    built_at: float = field(default_factory=time.monotonic)
+
+    def expired(self) -> bool:
+        return time.monotonic() - self.built_at > CONTEXT_CACHE_TTL_SECONDS
+
+
+_context_cache: "OrderedDict[tuple, _CachedContext]" = OrderedDict()
+
+
+def invalidate_context_package(workspace_id: Optional[str] = None) -> None:
+    """Drop cached context packages (all, or those for one workspace)."""
+    if workspace_id is None:
+        _context_cache.clear()
+        return
+    for key in [k for k in _context_cache if k[1] == workspace_id]:
+        del _context_cache[key]
+
 
 # =============================================================================
 # Context Building Functions
@@ -234,64 +326,132 @@ query GetWorkspaceItems($workspaceId: UUID!) {
 async def build_context_package(
     workspace_id: str,
     tenant_id: str,
-    timeout_seconds: int = 60
+    timeout_seconds: int = 60,
+    use_cache: bool = True,
 ) -> WorkspaceContextPackage:
     """
     Build compact context package for workspace.
 
     This fetches schema information and workspace statistics without
     retrieving all node data. The resulting context is ~5-10K tokens
-    regardless of workspace size.
+    regardless of workspace size. Independent fetches run concurrently, and
+    the result is cached per workspace version so repeat analyses on an
+    unchanged workspace skip the build entirely.
 
     Args:
         workspace_id: UUID of the workspace
         tenant_id: Tenant ID for authentication
         timeout_seconds: Timeout for GraphQL queries
+        use_cache: Set False to force a full rebuild
 
     Returns:
         WorkspaceContextPackage with schema, ranges, and statistics
     """
     logger.info(f"Building context package for workspace {workspace_id[:8]}...")
 
-    # Step 1: Fetch workspace items to get node IDs and labels
-    workspace_node_ids, entity_counts, labels_exist = await _fetch_workspace_items(
-        workspace_id, tenant_id, timeout_seconds
+    cache_key = (tenant_id, workspace_id)
+    version = await _fetch_workspace_version(workspace_id, tenant_id, timeout_seconds)
+    cached = _context_cache.get(cache_key) if use_cache and version else None
+    if cached and cached.expired():
+        logger.info(f"Cached context package for workspace {workspace_id[:8]} expired; rebuilding")
+        del _context_cache[cache_key]
+        cached = None
+
+    if cached and cached.version == version:
+        _context_cache.move_to_end(cache_key)
+        logger.info(f"Context package cache hit for workspace {workspace_id[:8]} (version {version})")
+        return cached.package
+
+    # Step 1: Fetch workspace items (delta when possible) and field ranges concurrently
+    delta_since = cached.version[1] if cached and _is_append_only(cached.version, version) else None
+    items_task = (
+        _fetch_workspace_items_since(workspace_id, tenant_id, timeout_seconds, delta_since)
+        if delta_since
+        else _fetch_workspace_item_rows(workspace_id, tenant_id, timeout_seconds)
+    )
+    item_rows, field_ranges = await asyncio.gather(
+        items_task,
+        _fetch_semantic_field_ranges(workspace_id, tenant_id, timeout_seconds),
     )
 
+    if delta_since is not None:
+        new_rows = [r for r in item_rows if r.get("workspaceItemId") not in cached.item_ids]
+        if len(cached.item_ids) + len(new_rows) == version[0]:
+            logger.info(f"Applying {len(new_rows)} new workspace items to cached context package")
+            item_ids = cached.item_ids | {r.get("workspaceItemId") for r in new_rows}
+            workspace_node_ids = {k: list(v) for k, v in cached.package.workspace_node_ids.items()}
+            entity_counts = dict(cached.package.entity_counts)
+            labels_exist = _group_items(new_rows, workspace_node_ids, entity_counts) or cached.package.labels_exist_in_graph
+            known_schemas = cached.entity_schemas
+        else:
+            # Items were also removed; counts no longer line up, rebuild from scratch
+            logger.info("Workspace items changed non-incrementally; rebuilding context package")
+            delta_since = None
+            item_rows = await _fetch_workspace_item_rows(workspace_id, tenant_id, timeout_seconds)
+
+    if delta_since is None:
+        item_ids = {r.get("workspaceItemId") for r in item_rows}
+        workspace_node_ids, entity_counts = {}, {}
+        labels_exist = _group_items(item_rows, workspace_node_ids, entity_counts)
+        known_schemas = cached.entity_schemas if cached else {}
+
     total_nodes = sum(entity_counts.values())
     logger.info(f"Workspace has {total_nodes} nodes across {len(entity_counts)} entity types")
 
-    # Step 2: Fetch schema (node types, properties, relationships)
-    entity_schemas, relationship_schemas = await _fetch_schema(
-        entity_types=list(entity_counts.keys()),
-        workspace_id=workspace_id,
-        tenant_id=tenant_id,
-        timeout_seconds=timeout_seconds
+    # Step 2: Fetch schema for unseen entity types + real relationship counts concurrently
+    entity_types = list(entity_counts.keys())
+    new_types = [t for t in entity_types if t not in known_schemas]
+    fetched_schemas, relationship_counts = await asyncio.gather(
+        _fetch_schema(
+            entity_types=new_types,
+            workspace_id=workspace_id,
+            tenant_id=tenant_id,
+            timeout_seconds=timeout_seconds
+        ),
+        _fetch_relationship_counts(
+            workspace_node_ids if labels_exist else {},
+            workspace_id,
+            tenant_id,
+            timeout_seconds,
+        ),
     )
+    schemas_by_type = {**known_schemas, **{e.entity_type: e for e in fetched_schemas}}
 
-    # Step 3: Fetch semantic fields with range info
-    field_ranges = await _fetch_semantic_field_ranges(workspace_id, tenant_id, timeout_seconds)
-
-    # Step 4: Enrich entity schemas with counts and ranges
-    for entity in entity_schemas:
-        entity.node_count = entity_counts.get(entity.entity_type, 0)
-
-        # Add range info to properties
-        for prop in entity.properties:
-            range_key = f"{entity.entity_type}.{prop.name}"
-            if range_key in field_ranges:
-                prop.range_info = field_ranges[range_key]
+    # Step 3: Enrich entity schemas with counts and ranges (copies, cached schemas stay untouched)
+    entity_schemas: List[EntitySchema] = []
+    for entity_type in entity_types:
+        base = schemas_by_type[entity_type]
+        properties = []
+        for prop in base.properties:
+            range_key = f"{entity_type}.{prop.name}"
+            properties.append(PropertySchema(
+                name=prop.name,
+                data_type=prop.data_type,
+                description=prop.description,
+                range_info=field_ranges.get(range_key),
+            ))
+        entity_schemas.append(EntitySchema(
+            entity_type=entity_type,
+            properties=properties,
+            relationship_types=list(base.relationship_types),
+            node_count=entity_counts.get(entity_type, 0),
+        ))
 
-    # Step 5: Estimate relationship count (approximate)
-    total_relationships = len(relationship_schemas) * (total_nodes // max(len(entity_counts), 1))
+    # Step 4: Relationship patterns and totals from aggregate counts when available
+    relationship_schemas = _build_relationship_schemas(entity_schemas, relationship_counts)
+    if relationship_counts is not None:
+        total_relationships = sum(relationship_counts.values())
+    else:
+        # Aggregate query unavailable: fall back to the rough estimate
+        total_relationships = len(relationship_schemas) * (total_nodes // max(len(entity_counts), 1))
 
     logger.info(
         f"Context package built: {len(entity_schemas)} entities, "
         f"{sum(len(e.properties) for e in entity_schemas)} properties, "
-        f"{len(relationship_schemas)} relationship types"
+        f"{len(relationship_schemas)} relationship types, {total_relationships} relationships"
     )
 
-    return WorkspaceContextPackage(
+    package = WorkspaceContextPackage(
         workspace_id=workspace_id,
         entity_schemas=entity_schemas,
         relationship_schemas=relationship_schemas,
@@ -302,18 +462,63 @@ async def build_context_package(
         labels_exist_in_graph=labels_exist,
     )
 
+    if version:
+        _context_cache[cache_key] = _CachedContext(
+            version=version,
+            package=package,
+            item_ids=item_ids,
+            entity_schemas=schemas_by_type,
+        )
+        _context_cache.move_to_end(cache_key)
+        while len(_context_cache) > CONTEXT_CACHE_MAX_WORKSPACES:
+            _context_cache.popitem(last=False)
+
+    return package
+
+
+def _is_append_only(cached_version: tuple, version: tuple) -> bool:
+    """True if the workspace could have only gained items since cached_version."""
+    return (
+        cached_version[1] is not None
+        and version[0] > cached_version[0]
+        and (version[1] or "") > cached_version[1]
+    )
+
 
-async def _fetch_workspace_items(
+async def _fetch_workspace_version(
     workspace_id: str,
     tenant_id: str,
     timeout_seconds: int
-) -> tuple[Dict[str, List[str]], Dict[str, int], bool]:
+) -> Optional[tuple]:
     """
-    Fetch workspace items and compute entity counts.
+    Fetch a cheap version fingerprint for the workspace's items.
 
     Returns:
-        Tuple of (workspace_node_ids by type, entity_counts, labels_exist)
+        (item_count, latest_pinned_at) or None if it could not be fetched
     """
+    try:
+        result = await run_graphql(
+            WORKSPACE_VERSION_QUERY,
+            {"workspaceId": workspace_id},
+            tenant_id=tenant_id,
+            timeout=timeout_seconds
+        )
+    except Exception as e:
+        logger.warning(f"Could not fetch workspace version, context cache disabled: {e}")
+        return None
+
+    connection = result.get("workspaceNodes") or {}
+    nodes = connection.get("nodes") or []
+    latest = nodes[0].get("pinnedAt") if nodes else None
+    return (connection.get("totalCount", 0), latest)
+
+
+async def _fetch_workspace_item_rows(
+    workspace_id: str,
+    tenant_id: str,
+    timeout_seconds: int
+) -> List[Dict[str, Any]]:
+    """Fetch all workspace item rows."""
     try:
         result = await run_graphql(
             WORKSPACE_ITEMS_QUERY,
@@ -323,14 +528,41 @@ async def _fetch_workspace_items(
         )
     except Exception as e:
         logger.error(f"Failed to fetch workspace items: {e}")
-        return {}, {}, False
+        return []
+    return result.get("workspaceItems", [])
 
-    items = result.get("workspaceItems", [])
 
-    # Group node IDs by entity type (first label)
-    workspace_node_ids: Dict[str, List[str]] = {}
-    entity_counts: Dict[str, int] = {}
+async def _fetch_workspace_items_since(
+    workspace_id: str,
+    tenant_id: str,
+    timeout_seconds: int,
+    since: str
+) -> List[Dict[str, Any]]:
+    """Fetch workspace item rows pinned at or after `since`."""
+    try:
+        result = await run_graphql(
+            WORKSPACE_ITEMS_SINCE_QUERY,
+            {"workspaceId": workspace_id, "since": since},
+            tenant_id=tenant_id,
+            timeout=timeout_seconds
+        )
+    except Exception as e:
+        logger.error(f"Failed to fetch new workspace items: {e}")
+        return []
+    return result.get("workspaceItems", [])
+
 
+def _group_items(
+    items: List[Dict[str, Any]],
+    workspace_node_ids: Dict[str, List[str]],
+    entity_counts: Dict[str, int],
+) -> bool:
+    """
+    Group item node IDs by entity type (first label) into the given dicts.
+
+    Returns:
+        True if any item carried an actual label
+    """
     labels_found = False  # Track if any nodes have actual labels
 
     for item in items:
@@ -353,7 +585,7 @@ async def _fetch_workspace_items(
         workspace_node_ids[entity_type].append(node_id)
         entity_counts[entity_type] += 1
 
-    return workspace_node_ids, entity_counts, labels_found
+    return labels_found
 
 
 def _infer_entity_type_from_id(node_id: str) -> str:
@@ -383,19 +615,15 @@ async def _fetch_schema(
     workspace_id: str,
     tenant_id: str,
     timeout_seconds: int
-) -> tuple[List[EntitySchema], List[RelationshipSchema]]:
+) -> List[EntitySchema]:
     """
-    Fetch schema for specified entity types.
+    Fetch schema for specified entity types (all types concurrently).
 
     Returns:
-        Tuple of (entity_schemas, relationship_schemas)
+        List of EntitySchema (relationship targets are resolved separately)
     """
-    entity_schemas: List[EntitySchema] = []
-    all_relationships: Dict[str, RelationshipSchema] = {}
 
-    for entity_type in entity_types:
-        # Fetch properties
-        properties: List[PropertySchema] = []
+    async def fetch_properties(entity_type: str) -> List[PropertySchema]:
         try:
             props_result = await run_graphql(
                 NODE_PROPERTY_METADATA_QUERY,
@@ -403,16 +631,18 @@ async def _fetch_schema(
                 tenant_id=tenant_id,
                 timeout=timeout_seconds
             )
-            for prop in props_result.get("graphNodePropertyMetadata", []):
-                properties.append(PropertySchema(
+            return [
+                PropertySchema(
                     name=prop["name"],
                     data_type=prop.get("dataType", "string"),
-                ))
+                )
+                for prop in props_result.get("graphNodePropertyMetadata", [])
+            ]
         except Exception as e:
             logger.warning(f"Could not fetch properties for {entity_type}: {e}")
+            return []
 
-        # Fetch relationship types
-        relationship_types: List[str] = []
+    async def fetch_relationship_types(entity_type: str) -> List[str]:
         try:
             rels_result = await run_graphql(
                 NODE_RELATIONSHIP_TYPES_QUERY,
@@ -420,27 +650,136 @@ async def _fetch_schema(
                 tenant_id=tenant_id,
                 timeout=timeout_seconds
             )
-            relationship_types = rels_result.get("graphNodeRelationshipTypes", [])
-
-            # Track unique relationships
-            for rel_type in relationship_types:
-                key = f"{entity_type}:{rel_type}"
-                if key not in all_relationships:
-                    all_relationships[key] = RelationshipSchema(
-                        name=rel_type,
-                        from_entity=entity_type,
-                        to_entity="Unknown"
-                    )
+            return rels_result.get("graphNodeRelationshipTypes", [])
         except Exception as e:
             logger.warning(f"Could not fetch relationships for {entity_type}: {e}")
+            return []
 
-        entity_schemas.append(EntitySchema(
+    async def fetch_entity(entity_type: str) -> EntitySchema:
+        properties, relationship_types = await asyncio.gather(
+            fetch_properties(entity_type),
+            fetch_relationship_types(entity_type),
+        )
+        return EntitySchema(
             entity_type=entity_type,
             properties=properties,
             relationship_types=relationship_types,
-        ))
+        )
 
-    return entity_schemas, list(all_relationships.values())
+    return list(await asyncio.gather(*[fetch_entity(t) for t in entity_types]))
+
+
+async def _fetch_relationship_counts(
+    workspace_node_ids: Dict[str, List[str]],
+    workspace_id: str,
+    tenant_id: str,
+    timeout_seconds: int
+) -> Optional[Dict[tuple, int]]:
+    """
+    Count relationships leaving the workspace's nodes by (from label, type, to label).
+
+    Only possible when nodes carry labels in the graph. Node IDs are inlined in
+    chunks of RELATIONSHIP_COUNT_CHUNK_IDS, one aggregate query per chunk.
+
+    Returns:
+        Dict mapping (from_entity, rel_type, to_entity) to count, or None if unavailable
+    """
+    node_ids = sorted({node_id for ids in workspace_node_ids.values() for node_id in ids})
+    if not node_ids:
+        return None
+    if len(node_ids) > RELATIONSHIP_COUNT_MAX_IDS:
+        logger.info(f"Workspace has {len(node_ids)} nodes; skipping exact relationship counts")
+        return None
+
+    chunks = [
+        node_ids[i:i + RELATIONSHIP_COUNT_CHUNK_IDS]
+        for i in range(0, len(node_ids), RELATIONSHIP_COUNT_CHUNK_IDS)
+    ]
+    chunk_counts = await asyncio.gather(*[
+        _fetch_relationship_counts_chunk(chunk, workspace_id, tenant_id, timeout_seconds)
+        for chunk in chunks
+    ])
+    if any(c is None for c in chunk_counts):
+        return None
+
+    counts: Dict[tuple, int] = {}
+    for chunk in chunk_counts:
+        for key, count in chunk.items():
+            counts[key] = counts.get(key, 0) + count
+    return counts
+
+
+async def _fetch_relationship_counts_chunk(
+    node_ids: List[str],
+    workspace_id: str,
+    tenant_id: str,
+    timeout_seconds: int
+) -> Optional[Dict[tuple, int]]:
+    """Relationship counts for relationships leaving one chunk of node IDs."""
+    try:
+        result = await run_graphql(
+            GRAPH_ROWS_QUERY,
+            {
+                "cypherQuery": RELATIONSHIP_COUNTS_CYPHER.format(node_ids=json.dumps(node_ids)),
+                "workspaceIds": [workspace_id],
+            },
+            tenant_id=tenant_id,
+            timeout=timeout_seconds
+        )
+    except Exception as e:
+        logger.warning(f"Could not fetch relationship counts: {e}")
+        return None
+
+    rows_result = result.get("graphRowsByCypher") or {}
+    columns = rows_result.get("columns") or []
+    try:
+        idx = {name: columns.index(name) for name in ("from_label", "rel_type", "to_label", "rel_count")}
+    except ValueError:
+        logger.warning(f"Unexpected relationship count columns: {columns}")
+        return None
+
+    counts: Dict[tuple, int] = {}
+    for row in rows_result.get("rows") or []:
+        try:
+            count = int(float(row[idx["rel_count"]]))
+        except (TypeError, ValueError):
+            continue
+        key = (row[idx["from_label"]], row[idx["rel_type"]], row[idx["to_label"]] or "Unknown")
+        counts[key] = counts.get(key, 0) + count
+    return counts
+
+
+def _build_relationship_schemas(
+    entity_schemas: List[EntitySchema],
+    relationship_counts: Optional[Dict[tuple, int]],
+) -> List[RelationshipSchema]:
+    """Build relationship patterns, using real targets from aggregate counts when known."""
+    all_relationships: Dict[str, RelationshipSchema] = {}
+    covered: set = set()
+
+    for (from_entity, rel_type, to_entity), _count in sorted((relationship_counts or {}).items()):
+        key = f"{from_entity}:{rel_type}:{to_entity}"
+        all_relationships[key] = RelationshipSchema(
+            name=rel_type,
+            from_entity=from_entity,
+            to_entity=to_entity,
+        )
+        covered.add((from_entity, rel_type))
+
+    # Track unique relationships reported by the schema API but absent from counts
+    for entity in entity_schemas:
+        for rel_type in entity.relationship_types:
+            if (entity.entity_type, rel_type) in covered:
+                continue
+            key = f"{entity.entity_type}:{rel_type}"
+            if key not in all_relationships:
+                all_relationships[key] = RelationshipSchema(
+                    name=rel_type,
+                    from_entity=entity.entity_type,
+                    to_entity="Unknown"
+                )
+
+    return list(all_relationships.values())
 
 
 async def _fetch_semantic_field_ranges(
@@ -462,25 +801,25 @@ async def _fetch_semantic_field_ranges(
     field_ranges: Dict[str, FieldRange] = {}
 
     try:
-        # Fetch semantic entities first (to map IDs to names)
-        entities_result = await run_graphql(
-            SEMANTIC_ENTITIES_QUERY,
-            {"workspaceId": workspace_id},
-            tenant_id=tenant_id,
-            timeout=timeout_seconds
+        # Fetch semantic entities (to map IDs to names) and fields with range info together
+        entities_result, fields_result = await asyncio.gather(
+            run_graphql(
+                SEMANTIC_ENTITIES_QUERY,
+                {"workspaceId": workspace_id},
+                tenant_id=tenant_id,
+                timeout=timeout_seconds
+            ),
+            run_graphql(
+                SEMANTIC_FIELDS_QUERY,
+                {},
+                tenant_id=tenant_id,
+                timeout=timeout_seconds
+            ),
         )
         entity_id_to_name: Dict[str, str] = {}
         for entity in entities_result.get("semanticEntities", []):
             entity_id_to_name[entity["semanticEntityId"]] = entity["name"]
 
-        # Fetch semantic fields with range info
-        fields_result = await run_graphql(
-            SEMANTIC_FIELDS_QUERY,
-            {},
-            tenant_id=tenant_id,
-            timeout=timeout_seconds
-        )
-
         for field_data in fields_result.get("semanticFields", []):
             entity_id = field_data.get("semanticEntityId")
             entity_name = entity_id_to_name.get(entity_id, "Unknown")
@@ -687,4 +1026,5 @@ __all__ = [
     "RelationshipSchema",
     "build_context_package",
     "build_cypher_guide",
+    "invalidate_context_package",
 ]
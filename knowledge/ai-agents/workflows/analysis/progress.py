@@ -1,6 +1,6 @@
 """Progress event emission for Levels 1 and 2."""
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable
 from app.core.graphql_logger import ScenarioRunLogger
 
 
@@ -12,6 +12,12 @@ class AnalysisProgressTracker:
     2. executing_analysis - Running each analysis workstream
     3. planning_scenarios - Creating scenario plans for each analysis
     4. executing_scenarios - Running scenario executions
+
+    Phases 2-4 run as a pipeline: each analysis moves on to scenario planning
+    and execution as soon as it finishes, so phases overlap. Use
+    begin_pipeline/item_phase/item_done to track items; a phase is reported
+    started when the first item enters it and completed once every item has
+    moved past it.
     """
 
     PHASES = [
@@ -33,6 +39,10 @@ class AnalysisProgressTracker:
         self.logger = logger
         self.agent_id = agent_id
         self.current_phase_index = 0
+        self._item_phases: Dict[str, int] = {}
+        self._phase_item_counts: Dict[int, int] = {}
+        self._started_phases: set = set()
+        self._completed_phases: set = set()
 
     # ==================
     # Level 1: Phase Events
@@ -59,12 +69,13 @@ class AnalysisProgressTracker:
 
     async def phase_complete(self, phase_name: str, metadata: Optional[Dict[str, Any]] = None):
         """Emit workflow_phase event for phase completion."""
+        phase_index = self.PHASES.index(phase_name) if phase_name in self.PHASES else self.current_phase_index
         await self.logger.log_event(
             event_type="workflow_phase",
             message=self.PHASE_MESSAGES.get(phase_name, self._format_phase_name(phase_name)),
             agent_id=self.agent_id,
             metadata={
-                "phase_index": self.current_phase_index + 1,
+                "phase_index": phase_index + 1,
                 "phase_total": len(self.PHASES),
                 "phase_name": phase_name,
                 "status": "completed",
@@ -72,6 +83,51 @@ class AnalysisProgressTracker:
             }
         )
 
+    # ==================
+    # Pipelined Phases
+    # ==================
+
+    async def begin_pipeline(self, item_ids: Iterable[str], first_phase: str = "executing_analysis"):
+        """Register pipeline items (one per analysis) and start the first phase."""
+        # Earlier phases were reported with phase_started/phase_complete directly
+        for phase_index in range(self.PHASES.index(first_phase)):
+            self._started_phases.add(phase_index)
+            self._completed_phases.add(phase_index)
+        for item_id in item_ids:
+            await self.item_phase(item_id, first_phase)
+        await self._complete_drained_phases()
+
+    async def item_phase(self, item_id: str, phase_name: str):
+        """Record that an item moved into phase_name."""
+        phase_index = self.PHASES.index(phase_name)
+        self._item_phases[item_id] = phase_index
+        self._phase_item_counts[phase_index] = self._phase_item_counts.get(phase_index, 0) + 1
+        if phase_index not in self._started_phases:
+            self._started_phases.add(phase_index)
+            await self.phase_started(phase_name)
+        await self._complete_drained_phases()
+
+    async def item_done(self, item_id: str):
+        """Record that an item finished (or dropped out of) the pipeline."""
+        self._item_phases[item_id] = len(self.PHASES)
+        await self._complete_drained_phases()
+
+    async def _complete_drained_phases(self):
+        """Complete every phase that no pending item can still enter."""
+        lowest = min(self._item_phases.values(), default=len(self.PHASES))
+        for phase_index in range(lowest):
+            if phase_index in self._completed_phases:
+                continue
+            phase_name = self.PHASES[phase_index]
+            if phase_index not in self._started_phases:
+                # Every item skipped this phase; still report it so the frontend advances
+                self._started_phases.add(phase_index)
+                await self.phase_started(phase_name)
+            self._completed_phases.add(phase_index)
+            await self.phase_complete(phase_name, metadata={
+                "items": self._phase_item_counts.get(phase_index, 0),
+            })
+
     # ==================
     # Level 2: Task Events
     # ==================
@@ -0,0 +1,124 @@
+"""Per-analysis store of Cypher query results.
+
+One store is created for each analysis chain (analysis execution, scenario
+planning and all of its scenarios) and passed to cypher_query through deps as
+"cypher_result_store". Identical queries from sibling phases are executed once:
+later callers get the stored rows, and concurrent callers wait on the same
+in-flight request. Failed queries are not stored.
+
+Queries are keyed by their normalized text and result limit. Workspace scoping
+is the same for every phase of a run, so the unscoped text identifies the data.
+"""
+
+import asyncio
+import re
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace and drop a trailing semicolon."""
+    return _WHITESPACE.sub(" ", query).strip().rstrip(";").strip()
+
+
+@dataclass
+class _StoredQuery:
+    query: str
+    rows: List[Dict[str, Any]]
+    requesters: List[str] = field(default_factory=list)
+    requests: int = 0
+
+
+class AnalysisResultStore:
+    """Cypher results shared by the phases of one analysis."""
+
+    def __init__(self, analysis_id: str):
+        self.analysis_id = analysis_id
+        self._results: Dict[Tuple[str, int], _StoredQuery] = {}
+        self._inflight: Dict[Tuple[str, int], asyncio.Future] = {}
+        self._pending_requesters: Dict[Tuple[str, int], List[Optional[str]]] = {}
+        self.executed = 0
+        self.served = 0
+
+    async def fetch(
+        self,
+        query: str,
+        max_results: int,
+        loader: Callable[[], Awaitable[List[Dict[str, Any]]]],
+        requester: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Rows for a query, running loader only if no sibling has run it.
+
+        Args:
+            query: Cypher query as written by the agent
+            max_results: Result limit the rows were fetched with
+            loader: Coroutine factory that executes the query (may raise)
+            requester: Label of the calling phase, for overlap reporting
+
+        Returns:
+            Result rows (shared; callers must not mutate them)
+        """
+        key = (normalize_query(query), max_results)
+        stored = self._results.get(key)
+        if stored is not None:
+            self._record(stored, requester)
+            self.served += 1
+            return stored.rows
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(loader())
+            self._inflight[key] = task
+            self._pending_requesters[key] = []
+            task.add_done_callback(lambda t, key=key, query=query: self._settle(key, query, t))
+            self.executed += 1
+        else:
+            self.served += 1
+        self._pending_requesters[key].append(requester)
+        # A cancelled caller must not cancel the request other siblings wait on
+        return await asyncio.shield(task)
+
+    def _settle(self, key: Tuple[str, int], query: str, task: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        requesters = self._pending_requesters.pop(key, [])
+        if task.cancelled() or task.exception() is not None:
+            return
+        stored = _StoredQuery(query=query, rows=task.result())
+        for requester in requesters:
+            self._record(stored, requester)
+        self._results[key] = stored
+
+    @staticmethod
+    def _record(stored: _StoredQuery, requester: Optional[str]) -> None:
+        stored.requests += 1
+        if requester and requester not in stored.requesters:
+            stored.requesters.append(requester)
+
+    def queries(self) -> List[Dict[str, Any]]:
+        """Stored queries in completion order, with full text and row counts."""
+        return [
+            {
+                "query": stored.query,
+                "result_count": len(stored.rows),
+                "requests": stored.requests,
+                "requesters": list(stored.requesters),
+            }
+            for stored in self._results.values()
+        ]
+
+    def overlapping(self) -> List[Dict[str, Any]]:
+        """Queries requested by more than one phase of the analysis."""
+        return [q for q in self.queries() if len(q["requesters"]) > 1]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "distinct_queries": len(self._results),
+            "executed": self.executed,
+            "served_from_store": self.served,
+            "overlapping_queries": len(self.overlapping()),
+        }
+
+
+__all__ = ["AnalysisResultStore", "normalize_query"]
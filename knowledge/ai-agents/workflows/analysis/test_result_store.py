@@ -0,0 +1,130 @@
+"""
+Tests for sharing Cypher results between the phases of one analysis.
+
+Usage:
+    pytest app/workflows/analysis/test_result_store.py
+"""
+
+import asyncio
+
+import pytest
+
+from app.workflows.analysis.result_store import AnalysisResultStore, normalize_query
+
+QUERY = "MATCH (c:Claim) RETURN c.id LIMIT 10"
+
+
+class FakeLoader:
+    """Counts executions; waits for release() so callers overlap, and can fail."""
+
+    def __init__(self, rows=None, fail_times: int = 0):
+        self.rows = rows if rows is not None else [{"c.id": "claim-1"}]
+        self.fail_times = fail_times
+        self.calls = 0
+        self.gate = asyncio.Event()
+
+    def release(self):
+        self.gate.set()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.gate.wait()
+        if self.fail_times:
+            self.fail_times -= 1
+            raise RuntimeError("Neo4j unavailable")
+        return self.rows
+
+
+def test_normalize_query_ignores_whitespace_and_trailing_semicolon():
+    assert normalize_query("  MATCH (n)\n\tRETURN n ;") == "MATCH (n) RETURN n"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_queries_run_once():
+    store = AnalysisResultStore("analysis-1")
+    loader = FakeLoader()
+
+    calls = [
+        asyncio.ensure_future(store.fetch(QUERY, 100, loader, requester="analysis")),
+        asyncio.ensure_future(store.fetch(QUERY + ";", 100, loader, requester="scenario_1")),
+        asyncio.ensure_future(store.fetch(f"  {QUERY}\n", 100, loader, requester="scenario_2")),
+    ]
+    await asyncio.sleep(0)
+    loader.release()
+    results = await asyncio.gather(*calls)
+
+    assert loader.calls == 1
+    assert results[0] is results[1] is results[2]
+    assert store.stats() == {"distinct_queries": 1, "executed": 1, "served_from_store": 2, "overlapping_queries": 1}
+    [stored] = store.overlapping()
+    assert stored["requesters"] == ["analysis", "scenario_1", "scenario_2"]
+    assert stored["requests"] == 3
+
+
+@pytest.mark.asyncio
+async def test_later_request_is_served_from_store():
+    store = AnalysisResultStore("analysis-1")
+    loader = FakeLoader()
+    loader.release()
+
+    await store.fetch(QUERY, 100, loader, requester="analysis")
+    rows = await store.fetch(QUERY, 100, loader, requester="analysis")
+
+    assert rows == loader.rows
+    assert loader.calls == 1
+    assert store.overlapping() == []  # one phase asking twice is not overlap
+    assert store.queries()[0]["requests"] == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_query_is_not_stored_and_runs_again():
+    store = AnalysisResultStore("analysis-1")
+    loader = FakeLoader(fail_times=1)
+
+    first = asyncio.ensure_future(store.fetch(QUERY, 100, loader, requester="analysis"))
+    second = asyncio.ensure_future(store.fetch(QUERY, 100, loader, requester="scenario_1"))
+    await asyncio.sleep(0)
+    loader.release()
+    results = await asyncio.gather(first, second, return_exceptions=True)
+
+    # Both waiters see the one failure
+    assert [type(r) for r in results] == [RuntimeError, RuntimeError]
+    assert loader.calls == 1
+    assert store.queries() == []
+
+    rows = await store.fetch(QUERY, 100, loader, requester="scenario_1")
+
+    assert rows == loader.rows
+    assert loader.calls == 2
+    assert store.stats()["distinct_queries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_different_result_limits_are_separate_queries():
+    store = AnalysisResultStore("analysis-1")
+    loader = FakeLoader()
+    loader.release()
+
+    await store.fetch(QUERY, 100, loader)
+    await store.fetch(QUERY, 500, loader)
+
+    assert loader.calls == 2
+    assert store.stats()["distinct_queries"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_sibling_request():
+    store = AnalysisResultStore("analysis-1")
+    loader = FakeLoader()
+
+    first = asyncio.ensure_future(store.fetch(QUERY, 100, loader, requester="scenario_1"))
+    second = asyncio.ensure_future(store.fetch(QUERY, 100, loader, requester="scenario_2"))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    loader.release()
+
+    assert await second == loader.rows
+    assert first.cancelled()
+    assert loader.calls == 1
+    assert store.stats()["distinct_queries"] == 1
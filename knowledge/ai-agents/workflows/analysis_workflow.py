@@ -4,11 +4,18 @@ Analysis Workflow - Multi-stage parallel analysis and scenario execution.
 Architecture (Schema + Tools):
   Stage 0: Build Context Package (schema, stats, ranges)
   Stage 1: Build Analysis Plan (with schema + cypher_query tool)
-  Stage 2-4: Execute Analysis/Scenarios (with cypher_query tool)
-  Stage 5: Persist All Reports
+  Stage 2-5: Per-analysis pipeline - Execute Analysis → Plan Scenarios →
+             Execute Scenarios → Persist Reports (with cypher_query tool)
+
+Within one analysis, all phases share an AnalysisResultStore, so a Cypher query
+run by the analysis, its scenario planner or any sibling scenario is executed
+once. Sibling scenarios share one executor whose system prompt (context package,
+parent analysis, queries already run) is identical, so only the scenario spec
+differs between their requests.
 """
 
 import asyncio
+import contextlib
 import json
 import logging
 from typing import Dict, Any, List, Optional
@@ -34,6 +41,7 @@ from app.workflows.analysis.prompts import (
 from app.workflows.analysis.progress import AnalysisProgressTracker
 from app.workflows.analysis.report_persistence import ReportPersistence
 from app.workflows.analysis.config import AnalysisWorkflowConfig, load_config
+from app.workflows.analysis.result_store import AnalysisResultStore
 
 from app.workflows.analysis.context_package import (
     WorkspaceContextPackage,
@@ -72,16 +80,45 @@ def _make_budget_deps(
     return phase_deps
 
 
+def _format_used_queries(
+    analysis_result: AnalysisResult,
+    result_store: Optional[AnalysisResultStore] = None,
+) -> str:
+    """Queries already run for an analysis, for scenario prompts.
+
+    With a result store, lists every stored query in full (the analysis records
+    only truncated text) so scenarios can re-run them verbatim and hit the store.
+    """
+    stored = result_store.queries() if result_store else []
+    if stored:
+        lines = [
+            f"- Query: `{q['query']}`\n  Results: {q['result_count']}"
+            for q in stored
+        ]
+        lines.append(
+            "(Results of these queries are stored for this analysis: re-running one verbatim "
+            "returns the same rows without querying the workspace again.)"
+        )
+        return "\n".join(lines)
+    if analysis_result.used_queries:
+        return "\n".join(
+            f"- Query: `{q.query}`\n  Results: {q.result_count}{' (truncated)' if q.truncated else ''}"
+            for q in analysis_result.used_queries
+        )
+    return "No queries were executed during the parent analysis."
+
+
 class AnalysisWorkflow(BaseWorkflow):
     """
     Multi-stage workflow for workspace analysis and scenario modeling.
 
     Flow:
       Event → Build Context Package → Plan (with schema + tools) →
-      [Analysis 1: Execute with cypher_query] (parallel)
-      [Analysis 2: Execute with cypher_query] (parallel)
-      [Analysis 3: Execute with cypher_query] (parallel)
-      → Plan Scenarios → Execute Scenarios → Persist All Reports
+      [Analysis 1 → Plan Scenarios → Execute Scenarios → Persist] (parallel)
+      [Analysis 2 → Plan Scenarios → Execute Scenarios → Persist] (parallel)
+      [Analysis 3 → Plan Scenarios → Execute Scenarios → Persist] (parallel)
+
+    Each chain advances independently; agent runs share one concurrency limit.
     """
 
     workflow_id = "ai:workspace-analyzer"
@@ -147,6 +184,9 @@ class AnalysisWorkflow(BaseWorkflow):
             config=self.config
         )
 
+        # Caps agent runs in flight across every stage of this run
+        llm_limiter = asyncio.Semaphore(self.config.max_concurrent_llm_calls)
+
         # Agent dependencies
         deps = {
             "workspace_id": workspace_id,
@@ -201,7 +241,8 @@ class AnalysisWorkflow(BaseWorkflow):
             analysis_plan = await self._build_analysis_plan(
                 intent_package=intent_package,
                 context_package=context_package,
-                deps=deps
+                deps=deps,
+                llm_limiter=llm_limiter,
             )
 
             await sse_logger.log_event(
@@ -213,210 +254,27 @@ class AnalysisWorkflow(BaseWorkflow):
             await progress.phase_complete("planning_analysis")
 
             # ==========================================
-            # PHASE 2: Executing Analysis
-            # (Run all analyses in parallel)
+            # PHASES 2-4 + Persistence: Per-analysis pipeline
+            # Each analysis flows into scenario planning, scenario execution and
+            # report persistence as soon as it finishes, instead of waiting for
+            # the slowest sibling at every phase boundary. A shared semaphore caps
+            # agent runs in flight across all chains.
             # ==========================================
-            await progress.phase_started("executing_analysis")
-
             total_analyses = len(analysis_plan.analyses)
-
-            async def run_analysis(entry: AnalysisEntry, index: int):
-                await progress.task_started(
-                    task_type="analysis",
-                    task_id=entry.id,
-                    task_index=index + 1,
-                    task_total=total_analyses,
-                    title=entry.title
-                )
-
-                analysis_result = await self._execute_analysis(
-                    entry=entry,
-                    context_package=context_package,
-                    intent_package=intent_package,
-                    deps=deps
-                )
-
-                await progress.task_complete(
-                    task_type="analysis",
-                    task_id=entry.id,
-                    task_index=index + 1,
-                    task_total=total_analyses,
-                    title=entry.title,
-                    success=True
-                )
-
-                return {
-                    "entry": entry,
-                    "analysis_result": analysis_result,
-                }
-
-            analysis_tasks = [
-                run_analysis(entry, i)
-                for i, entry in enumerate(analysis_plan.analyses)
-            ]
-
-            analysis_results = await asyncio.gather(*analysis_tasks, return_exceptions=True)
-
-            # Filter successful analyses
-            successful_analyses = [
-                r for r in analysis_results if not isinstance(r, Exception)
-            ]
-
-            if len(successful_analyses) < len(analysis_plan.analyses):
-                failed_count = len(analysis_plan.analyses) - len(successful_analyses)
-                await sse_logger.log_event(
-                    event_type="warning",
-                    message=f"{failed_count} analysis(es) failed",
-                    metadata={"successful": len(successful_analyses), "total": len(analysis_plan.analyses)}
-                )
-
-            await progress.phase_complete("executing_analysis", metadata={
-                "completed": len(successful_analyses),
-                "total": len(analysis_plan.analyses)
-            })
-
-            # ==========================================
-            # PHASE 3: Planning Scenarios
-            # (Plan scenarios for each completed analysis)
-            # ==========================================
-            await progress.phase_started("planning_scenarios")
-
-            await sse_logger.log_event(
-                event_type="message",
-                message=f"Modeling Scenarios for {len(successful_analyses)} Analyses",
-            )
-
-            async def plan_scenarios(analysis_data: dict):
-                scenario_plan = await self._plan_scenarios(
-                    analysis_result=analysis_data["analysis_result"],
-                    context_package=context_package,
-                    intent_package=intent_package,
-                    deps=deps
-                )
-                return {
-                    **analysis_data,
-                    "scenario_plan": scenario_plan
-                }
-
-            logger.info(f"Starting scenario planning for {len(successful_analyses)} successful analyses")
-            scenario_planning_tasks = [plan_scenarios(a) for a in successful_analyses if isinstance(a, dict)]
-
-            planned_results = await asyncio.gather(*scenario_planning_tasks, return_exceptions=True)
-
-            # Log any failures
-            for i, result in enumerate(planned_results):
-                if isinstance(result, Exception):
-                    logger.error(f"Scenario planning failed for analysis {i}: {result}")
-                    import traceback
-                    logger.error(traceback.format_exception(type(result), result, result.__traceback__))
-
-            # Filter successful scenario plans
-            successful_plans: List[dict] = [
-                r for r in planned_results if isinstance(r, dict)
-            ]
-            logger.info(f"Scenario planning complete: {len(successful_plans)} successful, {len(planned_results) - len(successful_plans)} failed")
-
-            # Collect all scenarios from all analyses
-            all_scenarios = []
-            for plan_data in successful_plans:
-                scenario_plan = plan_data["scenario_plan"]
-                logger.info(f"Analysis {plan_data['analysis_result'].analysis_id} has {len(scenario_plan.scenarios)} scenarios in plan")
-                for scenario in scenario_plan.scenarios:
-                    scenario_data = {
-                        "scenario": scenario,
-                        "parent_analysis": plan_data["analysis_result"],
-                    }
-                    all_scenarios.append(scenario_data)
-
-            logger.info(f"Total scenarios to execute: {len(all_scenarios)}")
-            await progress.phase_complete("planning_scenarios", metadata={
-                "scenarios_planned": len(all_scenarios)
-            })
-
-            # ==========================================
-            # PHASE 4: Executing Scenarios
-            # (Execute all scenarios in parallel)
-            # ==========================================
-            await progress.phase_started("executing_scenarios")
-
-            total_scenarios_to_run = len(all_scenarios)
+            chain_state = {
+                "scenarios_claimed": 0,
+                "scenarios_started": 0,
+                "scenario_slots": self.config.max_scenarios_total,
+            }
+            successful_analyses: List[AnalysisResult] = []
             scenario_results_all: List[ScenarioResult] = []
+            analysis_report_ids: Dict[str, str] = {}
+            persistence_errors: List[str] = []
+            persisted = {"scenarios": 0}
 
-            if all_scenarios:
-                async def run_scenario(scenario_data: dict, index: int):
-                    scenario = scenario_data["scenario"]
-
-                    await progress.task_started(
-                        task_type="scenario",
-                        task_id=scenario.scenario_id,
-                        task_index=index + 1,
-                        task_total=total_scenarios_to_run,
-                        title=scenario.title
-                    )
-
-                    try:
-                        result = await self._execute_scenario(
-                            scenario=scenario,
-                            parent_analysis=scenario_data["parent_analysis"],
-                            context_package=context_package,
-                            intent_package=intent_package,
-                            deps=deps
-                        )
-
-                        await progress.task_complete(
-                            task_type="scenario",
-                            task_id=scenario.scenario_id,
-                            task_index=index + 1,
-                            task_total=total_scenarios_to_run,
-                            title=scenario.title,
-                            success=True
-                        )
-                        return result
-                    except Exception as e:
-                        await progress.task_complete(
-                            task_type="scenario",
-                            task_id=scenario.scenario_id,
-                            task_index=index + 1,
-                            task_total=total_scenarios_to_run,
-                            title=scenario.title,
-                            success=False,
-                            error=str(e)
-                        )
-                        raise
-
-                scenario_tasks = [
-                    run_scenario(s, i)
-                    for i, s in enumerate(all_scenarios)
-                ]
-
-                scenario_results = await asyncio.gather(*scenario_tasks, return_exceptions=True)
-
-                # Collect successful results (filter out exceptions)
-                scenario_results_all = []
-                for i, r in enumerate(scenario_results):
-                    if isinstance(r, ScenarioResult):
-                        scenario_results_all.append(r)
-                    elif isinstance(r, Exception):
-                        logger.error(f"Scenario {i} execution failed with exception: {type(r).__name__}: {r}")
-                        import traceback
-                        logger.error(f"Traceback: {traceback.format_exception(type(r), r, r.__traceback__)}")
-
-            await progress.phase_complete("executing_scenarios", metadata={
-                "completed": len(scenario_results_all),
-                "total": total_scenarios_to_run
-            })
-
-            # ==========================================
-            # Persist All Reports (after all phases complete)
-            # With graceful degradation - partial failures don't block workflow completion
-            # ==========================================
-            analysis_report_ids = {}
-            persistence_errors = []
-            persisted_scenario_count = 0
+            await progress.begin_pipeline(entry.id for entry in analysis_plan.analyses)
 
-            # Persist each analysis report (each gets its own WorkspaceAnalysis)
-            for plan_data in successful_plans:
-                analysis_result = plan_data["analysis_result"]
+            async def persist_analysis(analysis_result: AnalysisResult) -> Optional[str]:
                 try:
                     # Create WorkspaceAnalysis using actual analysis title/description
                     workspace_analysis_id = await persistence.create_workspace_analysis(
@@ -432,28 +290,190 @@ class AnalysisWorkflow(BaseWorkflow):
                     )
                     analysis_report_ids[analysis_result.analysis_id] = report_id
                     logger.info(f"Persisted analysis report {report_id} for: {analysis_result.title}")
+                    return report_id
                 except Exception as e:
                     error_msg = f"Failed to persist analysis '{analysis_result.title}': {e}"
                     logger.error(error_msg)
                     persistence_errors.append(error_msg)
+                    return None
+
+            async def run_scenario(
+                scenario: ScenarioEntry,
+                executor: Agent,
+                chain_deps: Dict[str, Any],
+                report_task,
+            ):
+                chain_state["scenarios_started"] += 1
+                index = chain_state["scenarios_started"]
+                # Total grows as sibling chains finish planning
+                task_total = chain_state["scenarios_claimed"]
 
-            # Persist scenario reports (each creates its own Scenario object)
-            for scenario_result in scenario_results_all:
-                parent_report_id = analysis_report_ids.get(scenario_result.parent_analysis)
+                await progress.task_started(
+                    task_type="scenario",
+                    task_id=scenario.scenario_id,
+                    task_index=index,
+                    task_total=task_total,
+                    title=scenario.title
+                )
+
+                try:
+                    result = await self._execute_scenario(
+                        scenario=scenario,
+                        executor=executor,
+                        deps=chain_deps,
+                        llm_limiter=llm_limiter,
+                    )
+                except Exception as e:
+                    logger.error(f"Scenario {scenario.scenario_id} execution failed with exception: {type(e).__name__}: {e}")
+                    await progress.task_complete(
+                        task_type="scenario",
+                        task_id=scenario.scenario_id,
+                        task_index=index,
+                        task_total=task_total,
+                        title=scenario.title,
+                        success=False,
+                        error=str(e)
+                    )
+                    return None
+
+                await progress.task_complete(
+                    task_type="scenario",
+                    task_id=scenario.scenario_id,
+                    task_index=index,
+                    task_total=task_total,
+                    title=scenario.title,
+                    success=True
+                )
+                scenario_results_all.append(result)
+
+                # Persist as soon as the parent analysis report exists
+                parent_report_id = await report_task
                 if parent_report_id:
                     try:
                         # Pass scenario_id=None to force creation of new Scenario for each
                         await persistence.persist_scenario_report(
-                            scenario_result,
+                            result,
                             parent_report_id,
                             scenario_id=None
                         )
-                        persisted_scenario_count += 1
-                        logger.info(f"Persisted scenario report for: {scenario_result.title}")
+                        persisted["scenarios"] += 1
+                        logger.info(f"Persisted scenario report for: {result.title}")
                     except Exception as e:
-                        error_msg = f"Failed to persist scenario '{scenario_result.title}': {e}"
+                        error_msg = f"Failed to persist scenario '{result.title}': {e}"
                         logger.error(error_msg)
                         persistence_errors.append(error_msg)
+                return result
+
+            async def run_chain(entry: AnalysisEntry, index: int):
+                # Cypher results shared by this analysis, its planner and its scenarios
+                result_store = AnalysisResultStore(entry.id)
+                chain_deps = {**deps}
+                if self.config.share_analysis_query_results:
+                    chain_deps["cypher_result_store"] = result_store
+                try:
+                    await progress.task_started(
+                        task_type="analysis",
+                        task_id=entry.id,
+                        task_index=index + 1,
+                        task_total=total_analyses,
+                        title=entry.title
+                    )
+                    try:
+                        analysis_result = await self._execute_analysis(
+                            entry=entry,
+                            context_package=context_package,
+                            intent_package=intent_package,
+                            deps=chain_deps,
+                            llm_limiter=llm_limiter,
+                        )
+                    except Exception as e:
+                        logger.error(f"Analysis {entry.id} failed: {type(e).__name__}: {e}")
+                        await progress.task_complete(
+                            task_type="analysis",
+                            task_id=entry.id,
+                            task_index=index + 1,
+                            task_total=total_analyses,
+                            title=entry.title,
+                            success=False,
+                            error=str(e)
+                        )
+                        return
+
+                    await progress.task_complete(
+                        task_type="analysis",
+                        task_id=entry.id,
+                        task_index=index + 1,
+                        task_total=total_analyses,
+                        title=entry.title,
+                        success=True
+                    )
+                    successful_analyses.append(analysis_result)
+
+                    # Persist the analysis report while its scenarios are planned
+                    report_task = asyncio.create_task(persist_analysis(analysis_result))
+
+                    await progress.item_phase(entry.id, "planning_scenarios")
+                    try:
+                        scenario_plan = await self._plan_scenarios(
+                            analysis_result=analysis_result,
+                            context_package=context_package,
+                            intent_package=intent_package,
+                            deps=chain_deps,
+                            llm_limiter=llm_limiter,
+                        )
+                    except Exception as e:
+                        logger.exception(f"Scenario planning failed for analysis {analysis_result.analysis_id}: {e}")
+                        await report_task
+                        return
+
+                    # Claim slots against the run-wide scenario limit
+                    available = max(0, chain_state["scenario_slots"] - chain_state["scenarios_claimed"])
+                    scenarios = scenario_plan.scenarios[:available]
+                    if len(scenarios) < len(scenario_plan.scenarios):
+                        logger.warning(
+                            f"Limiting scenarios for {analysis_result.analysis_id} from "
+                            f"{len(scenario_plan.scenarios)} to {len(scenarios)} (max_scenarios_total)"
+                        )
+                    chain_state["scenarios_claimed"] += len(scenarios)
+                    logger.info(f"Analysis {analysis_result.analysis_id} has {len(scenarios)} scenarios in plan")
+
+                    if scenarios:
+                        await progress.item_phase(entry.id, "executing_scenarios")
+                        # One executor per analysis: siblings share its system prompt
+                        executor = self._build_scenario_executor(
+                            parent_analysis=analysis_result,
+                            context_package=context_package,
+                            intent_package=intent_package,
+                            result_store=chain_deps.get("cypher_result_store"),
+                        )
+                        await asyncio.gather(*[
+                            run_scenario(scenario, executor, chain_deps, report_task)
+                            for scenario in scenarios
+                        ])
+                    await report_task
+                finally:
+                    if "cypher_result_store" in chain_deps:
+                        logger.info(f"Analysis {entry.id} query sharing: {result_store.stats()}")
+                    await progress.item_done(entry.id)
+
+            await asyncio.gather(*[
+                run_chain(entry, i)
+                for i, entry in enumerate(analysis_plan.analyses)
+            ])
+
+            if len(successful_analyses) < total_analyses:
+                failed_count = total_analyses - len(successful_analyses)
+                await sse_logger.log_event(
+                    event_type="warning",
+                    message=f"{failed_count} analysis(es) failed",
+                    metadata={"successful": len(successful_analyses), "total": total_analyses}
+                )
+
+            persisted_scenario_count = persisted["scenarios"]
+            logger.info(
+                f"Pipeline complete: {len(successful_analyses)}/{total_analyses} analyses, "
+                f"{len(scenario_results_all)}/{chain_state['scenarios_claimed']} scenarios"
+            )
 
             # Log persistence summary
             if persistence_errors:
@@ -548,7 +568,8 @@ class AnalysisWorkflow(BaseWorkflow):
         self,
         intent_package: Dict[str, Any],
         context_package: WorkspaceContextPackage,
-        deps: Dict[str, Any]
+        deps: Dict[str, Any],
+        llm_limiter: Optional[asyncio.Semaphore] = None,
     ) -> AnalysisPlan:
         """Build analysis plan using schema + cypher_query tool.
 
@@ -596,10 +617,11 @@ class AnalysisWorkflow(BaseWorkflow):
             max_web_search_calls=self.config.planner_max_web_search_calls
         )
 
-        result = await planner.run(
-            "Explore the workspace data using cypher_query, then create an analysis plan.",
-            deps=planner_deps
-        )
+        async with llm_limiter or contextlib.nullcontext():
+            result = await planner.run(
+                "Explore the workspace data using cypher_query, then create an analysis plan.",
+                deps=planner_deps
+            )
         plan = result.output
 
         planner_elapsed = time.time() - planner_start
@@ -628,7 +650,8 @@ class AnalysisWorkflow(BaseWorkflow):
         entry: AnalysisEntry,
         context_package: WorkspaceContextPackage,
         intent_package: Dict[str, Any],
-        deps: Dict[str, Any]
+        deps: Dict[str, Any],
+        llm_limiter: Optional[asyncio.Semaphore] = None,
     ) -> AnalysisResult:
         """Execute a single analysis using schema + cypher_query tool."""
         import time
@@ -671,8 +694,10 @@ class AnalysisWorkflow(BaseWorkflow):
             max_cypher_calls=self.config.executor_max_cypher_calls,
             max_web_search_calls=self.config.executor_max_web_search_calls
         )
+        executor_deps["cypher_requester"] = f"analysis:{entry.id}"
 
-        result = await executor.run(prompt, deps=executor_deps)
+        async with llm_limiter or contextlib.nullcontext():
+            result = await executor.run(prompt, deps=executor_deps)
 
         exec_elapsed = time.time() - exec_start
         budget = executor_deps.get("cypher_budget_state", {})
@@ -702,7 +727,8 @@ class AnalysisWorkflow(BaseWorkflow):
         analysis_result: AnalysisResult,
         context_package: WorkspaceContextPackage,
         intent_package: Dict[str, Any],
-        deps: Dict[str, Any]
+        deps: Dict[str, Any],
+        llm_limiter: Optional[asyncio.Semaphore] = None,
     ) -> ScenarioPlanForAnalysis:
         """Plan scenarios for analysis using schema + cypher_query tool."""
         import time
@@ -730,10 +756,7 @@ class AnalysisWorkflow(BaseWorkflow):
         planner.model_settings = self.config.scenario_planner_model.get_model_settings()
 
         # Format used queries for prompt
-        used_queries_str = "\n".join(
-            f"- Query: `{q.query}`\n  Results: {q.result_count}{' (truncated)' if q.truncated else ''}"
-            for q in analysis_result.used_queries
-        ) if analysis_result.used_queries else "No queries were executed during the parent analysis."
+        used_queries_str = _format_used_queries(analysis_result, deps.get("cypher_result_store"))
 
         prompt = SCENARIO_PLANNER_PROMPT.format(
             intent_package=json.dumps(intent_package, indent=2),
@@ -750,8 +773,10 @@ class AnalysisWorkflow(BaseWorkflow):
             max_cypher_calls=self.config.scenario_planner_max_cypher_calls,
             max_web_search_calls=self.config.scenario_planner_max_web_search_calls
         )
+        planner_deps["cypher_requester"] = f"scenario_planner:{analysis_result.analysis_id}"
 
-        result = await planner.run(prompt, deps=planner_deps)
+        async with llm_limiter or contextlib.nullcontext():
+            result = await planner.run(prompt, deps=planner_deps)
         plan = result.output
 
         plan_elapsed = time.time() - plan_start
@@ -768,18 +793,19 @@ class AnalysisWorkflow(BaseWorkflow):
 
         return plan
 
-    async def _execute_scenario(
+    def _build_scenario_executor(
         self,
-        scenario: ScenarioEntry,
         parent_analysis: AnalysisResult,
         context_package: WorkspaceContextPackage,
         intent_package: Dict[str, Any],
-        deps: Dict[str, Any]
-    ) -> ScenarioResult:
-        """Execute a single scenario using schema + cypher_query tool."""
-        import time
-        exec_start = time.time()
+        result_store: Optional[AnalysisResultStore] = None,
+    ) -> Agent:
+        """Build the scenario executor shared by all scenarios of one analysis.
 
+        Everything except the scenario spec goes into the system prompt, rendered
+        once, so sibling requests start with an identical prefix (eligible for
+        provider prompt caching) and the spec is sent as the user prompt.
+        """
         context_str = context_package.to_prompt_string()
         cypher_guide = build_cypher_guide(context_package, labels_exist=context_package.labels_exist_in_graph)
 
@@ -792,28 +818,44 @@ class AnalysisWorkflow(BaseWorkflow):
         # Get history processors for context compaction
         history_processors = self._get_history_processors()
 
+        system_prompt = SCENARIO_EXECUTOR_PROMPT.format(
+            scenario_spec="(provided in the request message)",
+            parent_analysis=json.dumps(parent_analysis.model_dump(), indent=2),
+            context_package=context_str,
+            cypher_guide=cypher_guide,
+            intent_package=json.dumps(intent_package, indent=2),
+            used_queries=_format_used_queries(parent_analysis, result_store),
+        )
+        logger.info(
+            f"Scenario executor for analysis {parent_analysis.analysis_id}: "
+            f"shared system prompt {len(system_prompt):,} chars"
+        )
+
         executor = Agent(
             model=self.config.scenario_executor_model.create(),
+            system_prompt=system_prompt,
             output_type=ScenarioResult,
             tools=[TOOL_REGISTRY[t] for t in resolved_tools],
             deps_type=dict,
             history_processors=history_processors if history_processors else None,
         )
         executor.model_settings = self.config.scenario_executor_model.get_model_settings()
+        return executor
 
-        # Format used queries from parent analysis for prompt
-        used_queries_str = "\n".join(
-            f"- Query: `{q.query}`\n  Results: {q.result_count}{' (truncated)' if q.truncated else ''}"
-            for q in parent_analysis.used_queries
-        ) if parent_analysis.used_queries else "No queries were executed during the parent analysis."
+    async def _execute_scenario(
+        self,
+        scenario: ScenarioEntry,
+        executor: Agent,
+        deps: Dict[str, Any],
+        llm_limiter: Optional[asyncio.Semaphore] = None,
+    ) -> ScenarioResult:
+        """Execute a single scenario with its analysis' shared executor."""
+        import time
+        exec_start = time.time()
 
-        prompt = SCENARIO_EXECUTOR_PROMPT.format(
-            scenario_spec=json.dumps(scenario.model_dump(), indent=2),
-            parent_analysis=json.dumps(parent_analysis.model_dump(), indent=2),
-            context_package=context_str,
-            cypher_guide=cypher_guide,
-            intent_package=json.dumps(intent_package, indent=2),
-            used_queries=used_queries_str
+        prompt = (
+            f"Scenario Plan Entry:\n{json.dumps(scenario.model_dump(), indent=2)}\n\n"
+            "Execute this scenario."
         )
 
         logger.info(f"Starting scenario executor for {scenario.scenario_id}")
@@ -823,8 +865,10 @@ class AnalysisWorkflow(BaseWorkflow):
             max_cypher_calls=self.config.scenario_executor_max_cypher_calls,
             max_web_search_calls=self.config.scenario_executor_max_web_search_calls
         )
+        executor_deps["cypher_requester"] = f"scenario:{scenario.scenario_id}"
 
-        result = await executor.run(prompt, deps=executor_deps)
+        async with llm_limiter or contextlib.nullcontext():
+            result = await executor.run(prompt, deps=executor_deps)
 
         exec_elapsed = time.time() - exec_start
         budget = executor_deps.get("cypher_budget_state", {})
@@ -34,6 +34,16 @@ class DataLoadingConfig(BaseModel):
         description="Maximum number of nodes to create per batch"
     )
     
+    max_concurrent_writes: int = Field(
+        default=int(os.getenv("DATA_LOADING_MAX_CONCURRENT_WRITES", "4")),
+        description="Write transactions in flight at once (each on its own session); lowered automatically on transient errors"
+    )
+    
+    write_max_retries: int = Field(
+        default=int(os.getenv("DATA_LOADING_WRITE_RETRIES", "5")),
+        description="Retries per batch on transient Neo4j errors"
+    )
+    
     # Feature flags
     enable_preview: bool = Field(
         default=os.getenv("DATA_LOADING_ENABLE_PREVIEW", "true").lower() == "true",
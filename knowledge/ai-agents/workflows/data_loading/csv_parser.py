@@ -43,6 +43,63 @@ def detect_encoding(content: bytes) -> str:
         return 'utf-8'
 
 
+BOOLEAN_VALUES = ('true', 'false', 'yes', 'no', '1', '0', 'y', 'n')
+
+# Common date formats recognized for "date" columns
+DATE_FORMATS = [
+    '%Y-%m-%d',
+    '%m/%d/%Y',
+    '%d/%m/%Y',
+    '%Y-%m-%d %H:%M:%S',
+    '%m/%d/%Y %H:%M:%S',
+    '%d-%m-%Y',
+    '%Y/%m/%d',
+]
+
+
+def _is_integer(value: str) -> bool:
+    v_stripped = str(value).strip()
+    return bool(v_stripped) and v_stripped.replace('-', '').replace('+', '').isdigit()
+
+
+def _is_float(value: str) -> bool:
+    try:
+        float(str(value).strip())
+        return True
+    except (ValueError, TypeError):
+        return False
+
+
+def match_date_format(value: str) -> Optional[str]:
+    """Return the first DATE_FORMATS entry that parses value, if any."""
+    v_stripped = str(value).strip()
+    if not v_stripped:
+        return None
+    for fmt in DATE_FORMATS:
+        try:
+            datetime.strptime(v_stripped, fmt)
+            return fmt
+        except ValueError:
+            continue
+    return None
+
+
+def value_matches_type(value: str, data_type: str) -> bool:
+    """
+    Whether a non-empty CSV value coerces to data_type, using the same rules
+    as infer_data_type. Unknown types accept anything.
+    """
+    if data_type == "boolean":
+        return str(value).strip().lower() in BOOLEAN_VALUES
+    if data_type == "integer":
+        return _is_integer(value)
+    if data_type == "float":
+        return _is_float(value)
+    if data_type == "date":
+        return match_date_format(value) is not None
+    return True
+
+
 def infer_data_type(values: List[str], sample_size: int = 10) -> str:
     """
     Infer data type from sample values.
@@ -56,32 +113,17 @@ def infer_data_type(values: List[str], sample_size: int = 10) -> str:
     sample = values[:sample_size]
     
     # Check for boolean
-    bool_count = 0
-    for v in sample:
-        v_lower = str(v).strip().lower()
-        if v_lower in ('true', 'false', 'yes', 'no', '1', '0', 'y', 'n'):
-            bool_count += 1
+    bool_count = sum(1 for v in sample if value_matches_type(v, "boolean"))
     if bool_count == len(sample) and len(sample) > 0:
         return "boolean"
     
     # Check for integer
-    int_count = 0
-    for v in sample:
-        v_stripped = str(v).strip()
-        if v_stripped and v_stripped.replace('-', '').replace('+', '').isdigit():
-            int_count += 1
+    int_count = sum(1 for v in sample if _is_integer(v))
     if int_count == len(sample) and len(sample) > 0:
         return "integer"
     
     # Check for float
-    float_count = 0
-    for v in sample:
-        v_stripped = str(v).strip()
-        try:
-            float(v_stripped)
-            float_count += 1
-        except (ValueError, TypeError):
-            pass
+    float_count = sum(1 for v in sample if _is_float(v))
     if float_count == len(sample) and len(sample) > 0:
         # If all are integers, prefer integer
         if int_count == len(sample):
@@ -89,26 +131,7 @@ def infer_data_type(values: List[str], sample_size: int = 10) -> str:
         return "float"
     
     # Check for date (common formats)
-    date_formats = [
-        '%Y-%m-%d',
-        '%m/%d/%Y',
-        '%d/%m/%Y',
-        '%Y-%m-%d %H:%M:%S',
-        '%m/%d/%Y %H:%M:%S',
-        '%d-%m-%Y',
-        '%Y/%m/%d',
-    ]
-    date_count = 0
-    for v in sample:
-        v_stripped = str(v).strip()
-        if v_stripped:
-            for fmt in date_formats:
-                try:
-                    datetime.strptime(v_stripped, fmt)
-                    date_count += 1
-                    break
-                except ValueError:
-                    continue
+    date_count = sum(1 for v in sample if match_date_format(v))
     if date_count >= len(sample) * 0.8 and len(sample) > 0:  # 80% match
         return "date"
     
@@ -2,7 +2,9 @@
 graph_writer.py - Interface for writing nodes and relationships to graph database using Cypher
 """
 
+import asyncio
 import logging
+import uuid
 from typing import List, Dict, Any, Optional
 from app.config import Config
 
@@ -10,10 +12,36 @@ logger = logging.getLogger(__name__)
 
 try:
     from neo4j import AsyncGraphDatabase
+    from neo4j.exceptions import ServiceUnavailable, SessionExpired, TransientError
     _NEO4J_AVAILABLE = True
+    # Retryable failures: the batch itself is fine, the server was busy or moving
+    TRANSIENT_ERRORS: tuple = (TransientError, ServiceUnavailable, SessionExpired)
 except ImportError:
     _NEO4J_AVAILABLE = False
     AsyncGraphDatabase = None
+    TRANSIENT_ERRORS = ()
+
+# Label of the marker node committed with each keyed batch. A batch retried after
+# an ambiguous failure (connection lost during commit) finds its marker and is
+# not written twice. close() removes a load's markers; markers left by a crashed
+# load are swept once they are older than BATCH_MARKER_TTL_HOURS (retries of a
+# batch never span that long). Schema discovery skips the label.
+BATCH_MARKER_LABEL = "_DataLoadBatch"
+BATCH_MARKER_TTL_HOURS = 24
+BATCH_MARKER_SWEEP_LIMIT = 10000
+
+BATCH_MARKER_CONSTRAINT_QUERY = f"""
+CREATE CONSTRAINT data_load_batch_key IF NOT EXISTS
+FOR (b:{BATCH_MARKER_LABEL}) REQUIRE b.key IS UNIQUE
+"""
+
+STALE_BATCH_MARKERS_QUERY = f"""
+MATCH (b:{BATCH_MARKER_LABEL})
+WHERE b.created_at IS NULL OR b.created_at < datetime() - duration({{hours: $ttl_hours}})
+WITH b LIMIT $limit
+DELETE b
+RETURN count(b) AS removed
+"""
 
 
 def _is_neo4j_configured(uri: Optional[str] = None, username: Optional[str] = None, password: Optional[str] = None) -> bool:
@@ -90,12 +118,23 @@ class GraphWriter:
         self.neo4j_username = neo4j_username
         self.neo4j_password = neo4j_password
         self._driver: Optional[Any] = None
+        # Concurrent batch writes share one driver (one session each)
+        self._driver_lock = asyncio.Lock()
+        # Tags this writer's batch markers so close() can remove them
+        self.load_id = uuid.uuid4().hex
+        self._markers_written = False
     
     async def _get_or_create_driver(self):
         """Get or create Neo4j driver for this instance. Returns None if not configured."""
         if self._driver is not None:
             return self._driver
-        
+        async with self._driver_lock:
+            if self._driver is not None:
+                return self._driver
+            return await self._create_driver()
+    
+    async def _create_driver(self):
+        """Open and verify a driver (caller holds _driver_lock)."""
         # Use instance connection details or fall back to config
         uri = self.neo4j_uri or Config.NEO4J_URI
         username = self.neo4j_username or Config.NEO4J_USER
@@ -108,14 +147,83 @@ class GraphWriter:
             self._driver = AsyncGraphDatabase.driver(
                 uri,
                 auth=(username, password),
+                # The write pipeline owns retries and back-off; the driver retries once at most
+                max_transaction_retry_time=0,
             )
             await self._driver.verify_connectivity()
             logger.info(f"Neo4j driver initialized successfully (workspace: {self.workspace_id})")
+            await self._prepare_batch_markers(self._driver)
             return self._driver
         except Exception as e:
             logger.warning(f"Failed to create Neo4j driver: {e}")
             return None
     
+    async def _prepare_batch_markers(self, driver: Any):
+        """Index marker keys and sweep markers left behind by crashed loads."""
+        try:
+            async with driver.session() as session:
+                await session.run(BATCH_MARKER_CONSTRAINT_QUERY)
+                removed = 0
+                while True:
+                    result = await session.run(
+                        STALE_BATCH_MARKERS_QUERY,
+                        {"ttl_hours": BATCH_MARKER_TTL_HOURS, "limit": BATCH_MARKER_SWEEP_LIMIT}
+                    )
+                    record = await result.single()
+                    swept = record.get("removed", 0) if record else 0
+                    removed += swept
+                    if swept < BATCH_MARKER_SWEEP_LIMIT:
+                        break
+            if removed:
+                logger.info(f"Removed {removed} stale batch markers")
+        except Exception as e:
+            logger.warning(f"Failed to prepare batch markers: {e}")
+    
+    async def close(self):
+        """Remove this writer's batch markers and close the driver, if one was opened."""
+        if self._driver is None:
+            return
+        try:
+            if self._markers_written:
+                async with self._driver.session() as session:
+                    await session.run(
+                        f"MATCH (b:{BATCH_MARKER_LABEL} {{load: $load}}) DELETE b",
+                        {"load": self.load_id}
+                    )
+                self._markers_written = False
+        except Exception as e:
+            logger.warning(f"Failed to remove batch markers for load {self.load_id}: {e}")
+        finally:
+            await self._driver.close()
+            self._driver = None
+    
+    async def _committed_batch(self, tx: Any, batch_key: Optional[str], id_key: str) -> Optional[List[Dict[str, Any]]]:
+        """Results of an earlier attempt of this batch that did commit, or None."""
+        if not batch_key:
+            return None
+        result = await tx.run(
+            f"MATCH (b:{BATCH_MARKER_LABEL} {{key: $key}}) RETURN b.succeeded AS succeeded",
+            {"key": batch_key}
+        )
+        record = await result.single()
+        if not record:
+            return None
+        logger.info(f"Batch {batch_key} was committed by an earlier attempt, not rewriting it")
+        return [
+            {id_key: None, "success": ok, "error": None if ok else "Failed in an earlier attempt of this batch"}
+            for ok in record.get("succeeded") or []
+        ]
+    
+    async def _mark_batch(self, tx: Any, batch_key: Optional[str], results: List[Dict[str, Any]]):
+        """Commit the batch marker in the same transaction as the batch."""
+        if not batch_key:
+            return
+        await tx.run(
+            f"CREATE (:{BATCH_MARKER_LABEL} {{key: $key, load: $load, succeeded: $succeeded, created_at: datetime()}})",
+            {"key": batch_key, "load": self.load_id, "succeeded": [bool(r.get("success")) for r in results]}
+        )
+        self._markers_written = True
+    
     async def create_node(
         self,
         labels: List[str],
@@ -220,16 +328,23 @@ class GraphWriter:
     
     async def batch_create_nodes(
         self,
-        nodes: List[Dict[str, Any]]
+        nodes: List[Dict[str, Any]],
+        batch_key: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Create multiple nodes in a batch using Cypher UNWIND.
         
         Args:
             nodes: List of node dicts with 'labels' and 'properties' keys
+            batch_key: Stable key for this batch across retries; when given, the
+                batch commits with a marker and is not written again on retry
         
         Returns:
             List of results with 'nodeId', 'success', 'error' keys
+        
+        Raises:
+            TRANSIENT_ERRORS: the server was busy or unavailable; retry the batch
+                rather than falling back to per-node writes
         """
         if not nodes:
             return []
@@ -241,6 +356,9 @@ class GraphWriter:
                 return [{"nodeId": None, "success": False, "error": "Neo4j driver not available"} for _ in nodes]
             
             async def _write(tx: Any) -> List[Dict[str, Any]]:
+                committed = await self._committed_batch(tx, batch_key, "nodeId")
+                if committed is not None:
+                    return committed
                 results = []
                 
                 # Group nodes by labels for batch efficiency (same labels can use UNWIND)
@@ -289,6 +407,8 @@ class GraphWriter:
                                     "success": False,
                                     "error": "No record returned"
                                 })
+                    except TRANSIENT_ERRORS:
+                        raise
                     except Exception as e:
                         logger.error(f"Failed to create nodes in batch for {labels_str}: {e}")
                         # Fallback to individual creates for this label group
@@ -311,6 +431,8 @@ class GraphWriter:
                                         "success": False,
                                         "error": "No record returned"
                                     })
+                            except TRANSIENT_ERRORS:
+                                raise
                             except Exception as single_e:
                                 logger.error(f"Failed to create individual node: {single_e}")
                                 results.append({
@@ -319,6 +441,7 @@ class GraphWriter:
                                     "error": str(single_e)
                                 })
                 
+                await self._mark_batch(tx, batch_key, results)
                 return results
             
             async with driver.session() as session:
@@ -328,6 +451,8 @@ class GraphWriter:
             logger.info(f"Batch created {success_count}/{len(nodes)} nodes")
             return results
             
+        except TRANSIENT_ERRORS:
+            raise
         except Exception as e:
             logger.error(f"Failed to batch create nodes: {e}")
             # Fallback to individual creates
@@ -344,16 +469,22 @@ class GraphWriter:
     
     async def batch_create_relationships(
         self,
-        relationships: List[Dict[str, Any]]
+        relationships: List[Dict[str, Any]],
+        batch_key: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Create multiple relationships in a batch using Cypher UNWIND.
         
         Args:
             relationships: List of relationship dicts with 'fromId', 'toId', 'type', 'properties' keys
+            batch_key: Stable key for this batch across retries; when given, the
+                batch commits with a marker and is not written again on retry
         
         Returns:
             List of results with 'relationshipId', 'success', 'error' keys
+        
+        Raises:
+            TRANSIENT_ERRORS: the server was busy or unavailable; retry the batch
         """
         if not relationships:
             return []
@@ -365,6 +496,9 @@ class GraphWriter:
                 return [{"relationshipId": None, "success": False, "error": "Neo4j driver not available"} for _ in relationships]
             
             async def _write(tx: Any) -> List[Dict[str, Any]]:
+                committed = await self._committed_batch(tx, batch_key, "relationshipId")
+                if committed is not None:
+                    return committed
                 results = []
                 
                 # Group relationships by type for batch efficiency
@@ -415,6 +549,8 @@ class GraphWriter:
                                     "success": False,
                                     "error": "No record returned"
                                 })
+                        except TRANSIENT_ERRORS:
+                            raise
                         except Exception as e:
                             logger.error(f"Failed to create relationship in batch: {e}")
                             results.append({
@@ -423,6 +559,7 @@ class GraphWriter:
                                 "error": str(e)
                             })
                 
+                await self._mark_batch(tx, batch_key, results)
                 return results
             
             async with driver.session() as session:
@@ -432,6 +569,8 @@ class GraphWriter:
             logger.info(f"Batch created {success_count}/{len(relationships)} relationships")
             return results
             
+        except TRANSIENT_ERRORS:
+            raise
         except Exception as e:
             logger.error(f"Failed to batch create relationships: {e}")
             # Fallback to individual creates
@@ -0,0 +1,132 @@
+"""
+Tests for full-dataset mapping validation: which issues block a load and which only warn.
+
+Usage:
+    pytest app/workflows/data_loading/test_validator.py
+"""
+
+from typing import List
+
+import pytest
+
+from app.workflows.data_loading.models import ColumnMapping, DataMapping, EntityMapping, RelationshipMapping
+from app.workflows.data_loading.validator import _plan, _summarize, validate_rows
+
+COLUMNS = ["customer_id", "customer_name", "signup_date", "order_id", "order_total"]
+
+
+def _field(column: str, field_name: str, entity: str, data_type: str = "string", nullable: bool = True) -> ColumnMapping:
+    return ColumnMapping(csv_column=column, field_name=field_name, entity_name=entity, data_type=data_type, nullable=nullable)
+
+
+@pytest.fixture
+def mapping() -> DataMapping:
+    customer = EntityMapping(
+        entity_name="Customer",
+        csv_columns=["customer_id", "customer_name", "signup_date"],
+        field_mappings=[
+            _field("customer_id", "id", "Customer"),
+            _field("customer_name", "name", "Customer", nullable=False),
+            _field("signup_date", "signed_up", "Customer", data_type="date"),
+        ],
+        identifier_field="id",
+    )
+    order = EntityMapping(
+        entity_name="Order",
+        csv_columns=["order_id", "order_total"],
+        field_mappings=[_field("order_id", "id", "Order"), _field("order_total", "total", "Order", data_type="float")],
+        identifier_field="id",
+    )
+    placed = RelationshipMapping(
+        relationship_type="PLACED",
+        from_entity="Customer",
+        to_entity="Order",
+        csv_columns=["customer_id", "order_id"],
+        from_identifier_field="id",
+        to_identifier_field="id",
+    )
+    return DataMapping(entity_mappings=[customer, order], relationship_mappings=[placed])
+
+
+def _row(customer_id="c1", customer_name="Ada", signup_date="2024-01-05", order_id="o1", order_total="12.50"):
+    return {
+        "customer_id": customer_id,
+        "customer_name": customer_name,
+        "signup_date": signup_date,
+        "order_id": order_id,
+        "order_total": order_total,
+    }
+
+
+def _types(issues) -> List[str]:
+    return sorted(issue.error_type for issue in issues)
+
+
+def test_clean_file_passes(mapping):
+    rows = [_row(), _row(customer_id="c2", order_id="o2")]
+
+    result, stats = validate_rows(rows, mapping, COLUMNS)
+
+    assert result.is_valid
+    assert result.errors == [] and result.warnings == []
+    assert stats["entities"]["Customer"]["nodes"] == 2
+    assert stats["relationships"]["(Customer)-[PLACED]->(Order)"]["rows"] == 2
+
+
+def test_duplicate_identifiers_are_errors(mapping):
+    rows = [_row(), _row(order_id="o2"), _row(order_id="o3")]
+
+    result, stats = validate_rows(rows, mapping, COLUMNS)
+
+    assert not result.is_valid
+    assert _types(result.errors) == ["duplicate_identifier"]
+    assert result.errors[0].row_number == 2
+    assert stats["entities"]["Customer"]["duplicate_rows"] == 2
+    assert stats["entities"]["Customer"]["duplicated_values"] == 1
+
+
+def test_mapped_column_missing_from_csv_is_an_error(mapping):
+    result, _ = validate_rows([], mapping, [c for c in COLUMNS if c != "order_total"])
+
+    assert not result.is_valid
+    assert [e.column_name for e in result.errors] == ["order_total"]
+
+
+def test_type_failures_and_nulls_only_warn(mapping):
+    rows = [
+        _row(signup_date="not a date"),
+        _row(customer_id="c2", customer_name="", order_id="o2", order_total="twelve"),
+    ]
+
+    result, stats = validate_rows(rows, mapping, COLUMNS)
+
+    assert result.is_valid
+    assert _types(result.warnings) == ["missing_field", "type_mismatch", "type_mismatch"]
+    assert stats["entities"]["Customer"]["fields"]["signed_up"]["failure_rate"] == 0.5
+    assert stats["entities"]["Customer"]["fields"]["name"]["null_violations"] == 1
+
+
+def test_half_empty_relationship_row_only_warns(mapping):
+    rows = [_row(), _row(customer_id="", customer_name="", signup_date="", order_id="o2")]
+
+    result, stats = validate_rows(rows, mapping, COLUMNS)
+
+    assert result.is_valid
+    assert _types(result.warnings) == ["missing_field"]
+    assert stats["relationships"]["(Customer)-[PLACED]->(Order)"]["empty_endpoint_rows"] == 1
+
+
+def test_endpoint_missing_from_file_only_warns(mapping):
+    # create_graph_relationships matches endpoints against the whole graph, so a value
+    # with no node row in this file may still resolve to a node from an earlier load
+    entity_checks, [rel_check] = _plan(mapping, COLUMNS, [], [])
+    rel_check.source.check("c9", 7, max_examples=5)
+
+    result, stats = _summarize(1, entity_checks, [rel_check], [], [], max_examples=5)
+
+    assert result.is_valid
+    [warning] = result.warnings
+    assert warning.error_type == "invalid_identifier"
+    assert warning.column_name == "customer_id"
+    assert warning.row_number == 7
+    assert stats["relationships"]["(Customer)-[PLACED]->(Order)"]["dangling_from_rows"] == 1
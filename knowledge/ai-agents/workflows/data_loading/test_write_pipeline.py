@@ -0,0 +1,232 @@
+"""
+Tests for the batch write pipeline against an in-memory stand-in for the Neo4j driver.
+
+Usage:
+    pytest app/workflows/data_loading/test_write_pipeline.py
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+pytest.importorskip("neo4j")
+from neo4j.exceptions import ServiceUnavailable, TransientError
+
+from app.workflows.data_loading import write_pipeline
+from app.workflows.data_loading import graph_writer
+from app.workflows.data_loading.graph_writer import BATCH_MARKER_LABEL, GraphWriter
+from app.workflows.data_loading.write_pipeline import AdaptiveConcurrency, run_write_pipeline
+
+
+class FakeResult:
+    def __init__(self, records: List[Dict[str, Any]]):
+        self._records = records
+
+    async def data(self) -> List[Dict[str, Any]]:
+        return self._records
+
+    async def single(self) -> Optional[Dict[str, Any]]:
+        return self._records[0] if self._records else None
+
+
+class FakeGraph:
+    """Committed nodes and batch markers, plus failures to inject."""
+
+    def __init__(self, deadlocks: int = 0, lost_acks: int = 0):
+        self.nodes: List[Dict[str, Any]] = []
+        self.markers: Dict[str, Dict[str, Any]] = {}
+        self.deadlocks = deadlocks
+        self.lost_acks = lost_acks
+        self.transactions = 0
+
+
+class FakeTx:
+    def __init__(self, graph: FakeGraph):
+        self.graph = graph
+        self.nodes: List[Dict[str, Any]] = []
+        self.markers: Dict[str, Dict[str, Any]] = {}
+
+    async def run(self, query: str, params: Optional[Dict[str, Any]] = None) -> FakeResult:
+        params = params or {}
+        if f"MATCH (b:{BATCH_MARKER_LABEL}" in query:
+            marker = self.graph.markers.get(params["key"])
+            return FakeResult([{"succeeded": marker["succeeded"]}] if marker else [])
+        if f"CREATE (:{BATCH_MARKER_LABEL}" in query:
+            self.markers[params["key"]] = dict(params)
+            return FakeResult([])
+        if "UNWIND $nodes" in query:
+            if self.graph.deadlocks:
+                self.graph.deadlocks -= 1
+                raise TransientError("Neo.TransientError.Transaction.DeadlockDetected")
+            records = []
+            for props in params["nodes"]:
+                self.nodes.append(props)
+                records.append({"nodeId": len(self.graph.nodes) + len(self.nodes), "nodeIdProp": props.get("id")})
+            return FakeResult(records)
+        raise AssertionError(f"Unexpected query: {query}")
+
+
+class FakeSession:
+    def __init__(self, graph: FakeGraph):
+        self.graph = graph
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute_write(self, work):
+        self.graph.transactions += 1
+        tx = FakeTx(self.graph)
+        result = await work(tx)
+        # Commit
+        self.graph.nodes.extend(tx.nodes)
+        self.graph.markers.update(tx.markers)
+        if self.graph.lost_acks:
+            self.graph.lost_acks -= 1
+            raise ServiceUnavailable("Connection lost while committing")
+        return result
+
+    async def run(self, query: str, params: Dict[str, Any]):
+        assert f"MATCH (b:{BATCH_MARKER_LABEL}" in query and "DELETE b" in query
+        self.graph.markers = {k: m for k, m in self.graph.markers.items() if m["load"] != params["load"]}
+
+
+class FakeDriver:
+    def __init__(self, graph: FakeGraph):
+        self.graph = graph
+
+    def session(self) -> FakeSession:
+        return FakeSession(self.graph)
+
+    async def close(self):
+        pass
+
+
+def _writer(graph: FakeGraph) -> GraphWriter:
+    writer = GraphWriter("workspace-1", "tenant-1")
+    writer._driver = FakeDriver(graph)
+    return writer
+
+
+def _rows(count: int) -> List[Dict[str, str]]:
+    return [{"id": f"c{i}", "name": f"Customer {i}"} for i in range(count)]
+
+
+def _to_node(row: Dict[str, str]) -> Dict[str, Any]:
+    return {"labels": ["Customer"], "properties": row}
+
+
+@pytest.fixture
+def backoff_delays(monkeypatch) -> List[float]:
+    """Record retry back-off sleeps instead of waiting them out."""
+    delays: List[float] = []
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(delay, *args, **kwargs):
+        if delay:
+            delays.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(write_pipeline.asyncio, "sleep", fake_sleep)
+    monkeypatch.setattr(write_pipeline.random, "uniform", lambda low, high: 1.0)
+    return delays
+
+
+@pytest.mark.asyncio
+async def test_deadlock_from_tx_run_backs_off_and_retries(backoff_delays):
+    graph = FakeGraph(deadlocks=2)
+    writer = _writer(graph)
+    limiter = AdaptiveConcurrency(4)
+
+    result = await run_write_pipeline(_rows(3), _to_node, writer.batch_create_nodes, limiter, batch_size=10)
+
+    assert result.created == 3
+    assert result.errors == []
+    assert [n["id"] for n in graph.nodes] == ["c0", "c1", "c2"]
+    assert graph.transactions == 3
+    # Exponential back-off between attempts; concurrency halved per deadlock (4 -> 2 -> 1),
+    # then raised by one after the successful retry
+    assert backoff_delays == [write_pipeline.RETRY_BACKOFF_BASE, write_pipeline.RETRY_BACKOFF_BASE * 2]
+    assert limiter.limit == 2
+
+
+@pytest.mark.asyncio
+async def test_deadlock_retries_exhausted_reports_batch_failed(backoff_delays):
+    graph = FakeGraph(deadlocks=10)
+    writer = _writer(graph)
+
+    result = await run_write_pipeline(
+        _rows(2), _to_node, writer.batch_create_nodes, AdaptiveConcurrency(2), batch_size=10, max_retries=2
+    )
+
+    assert result.created == 0
+    assert result.total == 2
+    assert graph.nodes == []
+    assert len(backoff_delays) == 2
+    assert "Transient error after 2 retries" in result.errors[0]
+
+
+@pytest.mark.asyncio
+async def test_retry_after_lost_commit_ack_does_not_write_twice(backoff_delays):
+    graph = FakeGraph(lost_acks=1)
+    writer = _writer(graph)
+
+    result = await run_write_pipeline(_rows(3), _to_node, writer.batch_create_nodes, AdaptiveConcurrency(1), batch_size=10)
+
+    assert result.created == 3
+    assert graph.transactions == 2
+    assert len(graph.nodes) == 3
+    assert len(graph.markers) == 1
+
+    await writer.close()
+    assert graph.markers == {}
+
+
+@pytest.mark.asyncio
+async def test_unkeyed_batch_writes_no_marker():
+    graph = FakeGraph()
+    writer = _writer(graph)
+
+    results = await writer.batch_create_nodes([_to_node(row) for row in _rows(2)])
+
+    assert [r["success"] for r in results] == [True, True]
+    assert graph.markers == {}
+
+
+class MarkerSweepSession:
+    """Answers the marker constraint and stale-marker sweep; stale markers are removed per batch."""
+
+    def __init__(self, stale: int):
+        self.stale = stale
+        self.queries: List[str] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def run(self, query: str, params: Optional[Dict[str, Any]] = None) -> FakeResult:
+        if query == graph_writer.BATCH_MARKER_CONSTRAINT_QUERY:
+            self.queries.append("constraint")
+            return FakeResult([])
+        assert query == graph_writer.STALE_BATCH_MARKERS_QUERY
+        self.queries.append("sweep")
+        removed = min(self.stale, params["limit"])
+        self.stale -= removed
+        return FakeResult([{"removed": removed}])
+
+
+@pytest.mark.asyncio
+async def test_driver_setup_indexes_markers_and_sweeps_stale_ones(monkeypatch):
+    monkeypatch.setattr(graph_writer, "BATCH_MARKER_SWEEP_LIMIT", 2)
+    session = MarkerSweepSession(stale=3)
+    driver = type("Driver", (), {"session": lambda self: session})()
+
+    await _writer(FakeGraph())._prepare_batch_markers(driver)
+
+    assert session.queries == ["constraint", "sweep", "sweep"]
+    assert session.stale == 0
@@ -2,16 +2,19 @@
 tools.py - Tools for data loading agent
 """
 
+import asyncio
 import logging
 from typing import List, Dict, Any, Optional
 from pydantic_ai import RunContext
 
 from app.workflows.data_loading.models import (
     CSVStructure, DataMapping, EntityMapping, RelationshipMapping,
-    ColumnMapping, ValidationResult, ValidationError, InsertionPreview
+    ColumnMapping, InsertionPreview
 )
 from app.workflows.data_loading.csv_parser import parse_csv_from_blob, parse_csv
 from app.workflows.data_loading.graph_writer import GraphWriter
+from app.workflows.data_loading.validator import validate_rows, relationship_endpoint_columns
+from app.workflows.data_loading.write_pipeline import AdaptiveConcurrency, run_write_pipeline
 from app.workflows.ontology_creation.models import OntologyPackage
 
 logger = logging.getLogger(__name__)
@@ -285,17 +288,21 @@ async def map_csv_to_ontology(
 @register_tool("validate_mapping")
 async def validate_mapping(
     ctx: RunContext[Dict[str, Any]],
-    sample_rows: Optional[int] = 10
+    max_examples: Optional[int] = 5
 ) -> Dict[str, Any]:
     """
-    Validate the CSV-to-ontology mapping against sample data.
+    Validate the CSV-to-ontology mapping against every CSV row.
+    
+    Reports exact duplicate-identifier counts, per-field type-coercion
+    failure rates, and relationship rows whose endpoints match no node,
+    before anything is written.
     
     Args:
         ctx: Pydantic AI context
-        sample_rows: Number of rows to sample for validation
+        max_examples: Example row numbers to report per issue
     
     Returns:
-        Validation results with errors and warnings
+        Validation results with errors, warnings and per-entity/field/relationship stats
     """
     mapping: DataMapping = ctx.deps.get("mapping")
     csv_rows: List[Dict[str, str]] = ctx.deps.get("csv_rows", [])
@@ -307,84 +314,23 @@ async def validate_mapping(
     if not csv_rows:
         return {"error": "No CSV rows found. Call analyze_csv_structure first."}
     
-    errors = []
-    warnings = []
-    
-    # Sample rows for validation
-    sample = csv_rows[:min(sample_rows, len(csv_rows))]
-    
-    # Validate entity mappings
-    for em in mapping.entity_mappings:
-        identifier_field = em.identifier_field
-        if not identifier_field:
-            warnings.append(ValidationError(
-                error_type="missing_field",
-                message=f"Entity {em.entity_name} has no identifier field",
-                column_name=None
-            ))
-        
-        # Check for duplicate identifiers
-        identifiers = {}
-        for i, row in enumerate(sample):
-            id_value = row.get(identifier_field) if identifier_field else None
-            if id_value:
-                if id_value in identifiers:
-                    errors.append(ValidationError(
-                        error_type="duplicate_identifier",
-                        message=f"Duplicate identifier '{id_value}' for entity {em.entity_name}",
-                        row_number=i + 1,
-                        column_name=identifier_field
-                    ))
-                identifiers[id_value] = i
-        
-        # Validate field types
-        for fm in em.field_mappings:
-            csv_col = fm.csv_column
-            if csv_col not in [c.name for c in csv_structure.columns]:
-                errors.append(ValidationError(
-                    error_type="missing_field",
-                    message=f"CSV column '{csv_col}' not found",
-                    column_name=csv_col
-                ))
-                continue
-            
-            # Check type compatibility
-            csv_col_obj = next(c for c in csv_structure.columns if c.name == csv_col)
-            if csv_col_obj.data_type != fm.data_type:
-                # Allow some flexibility (e.g., integer -> float)
-                if not (csv_col_obj.data_type == "integer" and fm.data_type == "float"):
-                    warnings.append(ValidationError(
-                        error_type="type_mismatch",
-                        message=f"Type mismatch: CSV column '{csv_col}' is {csv_col_obj.data_type}, but field '{fm.field_name}' expects {fm.data_type}",
-                        column_name=csv_col
-                    ))
-    
-    # Validate relationship mappings
-    for rm in mapping.relationship_mappings:
-        # Check that required columns exist
-        for col in rm.csv_columns:
-            if col not in [c.name for c in csv_structure.columns]:
-                errors.append(ValidationError(
-                    error_type="missing_field",
-                    message=f"CSV column '{col}' not found for relationship {rm.relationship_type}",
-                    column_name=col
-                ))
-    
-    is_valid = len(errors) == 0
-    
-    result = ValidationResult(
-        is_valid=is_valid,
-        errors=errors,
-        warnings=warnings,
-        summary=f"Validation {'passed' if is_valid else 'failed'}: {len(errors)} errors, {len(warnings)} warnings"
+    # Linear in rows x mapped columns; run off the event loop for large files
+    result, stats = await asyncio.to_thread(
+        validate_rows,
+        csv_rows,
+        mapping,
+        [c.name for c in csv_structure.columns],
+        max_examples or 5
     )
+    logger.info(f"validate_mapping: {result.summary}")
     
     ctx.deps["validation_result"] = result
     
     return {
-        "is_valid": is_valid,
-        "errors": [{"type": e.error_type, "message": e.message, "row": e.row_number, "column": e.column_name} for e in errors],
-        "warnings": [{"type": w.error_type, "message": w.message, "row": w.row_number, "column": w.column_name} for w in warnings],
+        "is_valid": result.is_valid,
+        "errors": [{"type": e.error_type, "message": e.message, "row": e.row_number, "column": e.column_name} for e in result.errors],
+        "warnings": [{"type": w.error_type, "message": w.message, "row": w.row_number, "column": w.column_name} for w in result.warnings],
+        "stats": stats,
         "summary": result.summary
     }
 
@@ -472,6 +418,129 @@ async def preview_insertion(
     }
 
 
+def _make_writer(ctx: RunContext[Dict[str, Any]]) -> GraphWriter:
+    """Graph writer on the per-ontology connection if available."""
+    workspace_id = ctx.deps.get("workspace_id")
+    tenant_id = ctx.deps.get("tenant_id")
+    neo4j_connection = ctx.deps.get("neo4j_connection")
+    if neo4j_connection:
+        return GraphWriter(
+            workspace_id,
+            tenant_id,
+            neo4j_uri=neo4j_connection.get("uri"),
+            neo4j_username=neo4j_connection.get("username"),
+            neo4j_password=neo4j_connection.get("password")
+        )
+    return GraphWriter(workspace_id, tenant_id)
+
+
+async def _cancel_and_wait(tasks: List[asyncio.Task]):
+    """Cancel unfinished tasks and wait until they have stopped."""
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _write_settings(batch_size: Optional[int]) -> tuple:
+    """(batch_size, shared concurrency limit, retries) from config unless overridden."""
+    from app.workflows.data_loading.config import load_config
+    config = load_config()
+    return (
+        batch_size or config.max_batch_size,
+        AdaptiveConcurrency(config.max_concurrent_writes),
+        config.write_max_retries
+    )
+
+
+async def _load_entity(
+    ctx: RunContext[Dict[str, Any]],
+    writer: GraphWriter,
+    limiter: AdaptiveConcurrency,
+    em: EntityMapping,
+    batch_size: int,
+    max_retries: int
+) -> Dict[str, Any]:
+    """Stream one entity's nodes from the CSV rows into the graph."""
+    def to_node(row: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        properties = {}
+        for fm in em.field_mappings:
+            csv_value = row.get(fm.csv_column)
+            if csv_value:
+                properties[fm.field_name] = csv_value
+        if not properties:  # Only add if has properties
+            return None
+        return {"labels": [em.entity_name], "properties": properties}
+    
+    state = ctx.deps.get("state")
+    
+    def on_batch(created: int):
+        if state:
+            state.nodes_created += created
+    
+    result = await run_write_pipeline(
+        ctx.deps.get("csv_rows", []), to_node, writer.batch_create_nodes,
+        limiter, batch_size, max_retries, on_batch
+    )
+    logger.info(f"Loaded {result.created}/{result.total} {em.entity_name} nodes")
+    return {
+        "entity_name": em.entity_name,
+        "created": result.created,
+        "total": result.total,
+        "errors": result.errors  # Limited to the first 10
+    }
+
+
+async def _load_relationships(
+    ctx: RunContext[Dict[str, Any]],
+    writer: GraphWriter,
+    limiter: AdaptiveConcurrency,
+    rm: RelationshipMapping,
+    batch_size: int,
+    max_retries: int
+) -> Dict[str, Any]:
+    """Stream one relationship mapping's relationships from the CSV rows into the graph."""
+    mapping: DataMapping = ctx.deps.get("mapping")
+    
+    # CSV columns holding the from/to identifier values
+    endpoints = relationship_endpoint_columns(mapping, rm)
+    if not endpoints:
+        # Skip if entity mappings or CSV columns not found
+        return {"relationship_type": rm.relationship_type, "created": 0, "total": 0, "errors": []}
+    from_csv_col, to_csv_col = endpoints
+    
+    def to_relationship(row: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        from_id = row.get(from_csv_col)
+        to_id = row.get(to_csv_col)
+        if not from_id or not to_id:
+            return None
+        return {
+            "fromId": from_id,
+            "toId": to_id,
+            "type": rm.relationship_type,
+            "fromIdentifierField": rm.from_identifier_field,
+            "toIdentifierField": rm.to_identifier_field,
+            "properties": {k: row.get(v) for k, v in rm.properties.items() if row.get(v)}
+        }
+    
+    state = ctx.deps.get("state")
+    
+    def on_batch(created: int):
+        if state:
+            state.relationships_created += created
+    
+    result = await run_write_pipeline(
+        ctx.deps.get("csv_rows", []), to_relationship, writer.batch_create_relationships,
+        limiter, batch_size, max_retries, on_batch
+    )
+    logger.info(f"Loaded {result.created}/{result.total} {rm.relationship_type} relationships")
+    return {
+        "relationship_type": rm.relationship_type,
+        "created": result.created,
+        "total": result.total,
+        "errors": result.errors
+    }
+
+
 @register_tool("create_graph_nodes")
 async def create_graph_nodes(
     ctx: RunContext[Dict[str, Any]],
@@ -491,8 +560,6 @@ async def create_graph_nodes(
     """
     mapping: DataMapping = ctx.deps.get("mapping")
     csv_rows: List[Dict[str, str]] = ctx.deps.get("csv_rows", [])
-    workspace_id = ctx.deps.get("workspace_id")
-    tenant_id = ctx.deps.get("tenant_id")
     
     if not mapping or not csv_rows:
         return {"error": "Missing mapping or CSV rows"}
@@ -502,65 +569,12 @@ async def create_graph_nodes(
     if not em:
         return {"error": f"Entity mapping not found for {entity_name}"}
     
-    # Get batch size from config or context
-    if batch_size is None:
-        from app.workflows.data_loading.config import load_config
-        config = load_config()
-        batch_size = config.max_batch_size
-    
-    # Create graph writer with per-ontology connection if available
-    neo4j_connection = ctx.deps.get("neo4j_connection")
-    if neo4j_connection:
-        writer = GraphWriter(
-            workspace_id,
-            tenant_id,
-            neo4j_uri=neo4j_connection.get("uri"),
-            neo4j_username=neo4j_connection.get("username"),
-            neo4j_password=neo4j_connection.get("password")
-        )
-    else:
-        writer = GraphWriter(workspace_id, tenant_id)
-    
-    # Build nodes
-    nodes = []
-    for row in csv_rows:
-        properties = {}
-        for fm in em.field_mappings:
-            csv_value = row.get(fm.csv_column)
-            if csv_value:
-                properties[fm.field_name] = csv_value
-        
-        if properties:  # Only add if has properties
-            nodes.append({
-                "labels": [entity_name],
-                "properties": properties
-            })
-    
-    # Create nodes in batches
-    created_count = 0
-    errors = []
-    
-    for i in range(0, len(nodes), batch_size):
-        batch = nodes[i:i + batch_size]
-        results = await writer.batch_create_nodes(batch)
-        
-        for result in results:
-            if result.get("success"):
-                created_count += 1
-            else:
-                errors.append(result.get("error", "Unknown error"))
-    
-    # Update state
-    state = ctx.deps.get("state")
-    if state:
-        state.nodes_created += created_count
-    
-    return {
-        "entity_name": entity_name,
-        "created": created_count,
-        "total": len(nodes),
-        "errors": errors[:10]  # Limit error messages
-    }
+    batch_size, limiter, max_retries = _write_settings(batch_size)
+    writer = _make_writer(ctx)
+    try:
+        return await _load_entity(ctx, writer, limiter, em, batch_size, max_retries)
+    finally:
+        await writer.close()
 
 
 @register_tool("create_graph_relationships")
@@ -582,98 +596,87 @@ async def create_graph_relationships(
     """
     mapping: DataMapping = ctx.deps.get("mapping")
     csv_rows: List[Dict[str, str]] = ctx.deps.get("csv_rows", [])
-    workspace_id = ctx.deps.get("workspace_id")
-    tenant_id = ctx.deps.get("tenant_id")
     
     if not mapping or not csv_rows:
         return {"error": "Missing mapping or CSV rows"}
     
-    # Get batch size from config
-    if batch_size is None:
-        from app.workflows.data_loading.config import load_config
-        config = load_config()
-        batch_size = config.max_batch_size
-    
-    # Create graph writer with per-ontology connection if available
-    neo4j_connection = ctx.deps.get("neo4j_connection")
-    if neo4j_connection:
-        writer = GraphWriter(
-            workspace_id,
-            tenant_id,
-            neo4j_uri=neo4j_connection.get("uri"),
-            neo4j_username=neo4j_connection.get("username"),
-            neo4j_password=neo4j_connection.get("password")
-        )
-    else:
-        writer = GraphWriter(workspace_id, tenant_id)
-    
     # Filter relationship mappings
     rel_mappings = mapping.relationship_mappings
     if relationship_type:
         rel_mappings = [rm for rm in rel_mappings if rm.relationship_type == relationship_type]
     
-    # Build relationships
-    relationships = []
-    for rm in rel_mappings:
-        # Find entity mappings to get CSV column names for identifier fields
-        from_em = next((em for em in mapping.entity_mappings if em.entity_name == rm.from_entity), None)
-        to_em = next((em for em in mapping.entity_mappings if em.entity_name == rm.to_entity), None)
-        
-        if not from_em or not to_em:
-            continue  # Skip if entity mappings not found
-        
-        # Find CSV column names for identifier fields
-        from_csv_col = None
-        for fm in from_em.field_mappings:
-            if fm.field_name == rm.from_identifier_field:
-                from_csv_col = fm.csv_column
-                break
-        
-        to_csv_col = None
-        for fm in to_em.field_mappings:
-            if fm.field_name == rm.to_identifier_field:
-                to_csv_col = fm.csv_column
-                break
-        
-        if not from_csv_col or not to_csv_col:
-            continue  # Skip if CSV columns not found
-        
-        for row in csv_rows:
-            from_id = row.get(from_csv_col)
-            to_id = row.get(to_csv_col)
-            
-            if from_id and to_id:
-                props = {k: row.get(v) for k, v in rm.properties.items() if row.get(v)}
-                relationships.append({
-                    "fromId": from_id,
-                    "toId": to_id,
-                    "type": rm.relationship_type,
-                    "fromIdentifierField": rm.from_identifier_field,
-                    "toIdentifierField": rm.to_identifier_field,
-                    "properties": props
-                })
+    batch_size, limiter, max_retries = _write_settings(batch_size)
+    writer = _make_writer(ctx)
+    # Relationship types are independent; they share the write limit
+    tasks = [
+        asyncio.create_task(_load_relationships(ctx, writer, limiter, rm, batch_size, max_retries))
+        for rm in rel_mappings
+    ]
+    try:
+        results = await asyncio.gather(*tasks)
+    finally:
+        await _cancel_and_wait(tasks)
+        await writer.close()
     
-    # Create relationships in batches
-    created_count = 0
-    errors = []
+    return {
+        "created": sum(r["created"] for r in results),
+        "total": sum(r["total"] for r in results),
+        "errors": [e for r in results for e in r["errors"]][:10]  # Limit error messages
+    }
+
+
+@register_tool("load_graph")
+async def load_graph(
+    ctx: RunContext[Dict[str, Any]],
+    batch_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Create all nodes and relationships for the confirmed mapping in one call.
     
-    for i in range(0, len(relationships), batch_size):
-        batch = relationships[i:i + batch_size]
-        results = await writer.batch_create_relationships(batch)
-        
-        for result in results:
-            if result.get("success"):
-                created_count += 1
-            else:
-                errors.append(result.get("error", "Unknown error"))
+    Entity types load concurrently, and each relationship type starts as soon
+    as the node types it connects are loaded. All writes share one limit on
+    in-flight transactions (config max_concurrent_writes).
     
-    # Update state
-    state = ctx.deps.get("state")
-    if state:
-        state.relationships_created += created_count
+    Args:
+        ctx: Pydantic AI context
+        batch_size: Batch size for insertion (defaults to config)
+    
+    Returns:
+        Per-entity and per-relationship results with created counts and errors
+    """
+    mapping: DataMapping = ctx.deps.get("mapping")
+    csv_rows: List[Dict[str, str]] = ctx.deps.get("csv_rows", [])
+    
+    if not mapping or not csv_rows:
+        return {"error": "Missing mapping or CSV rows"}
+    
+    batch_size, limiter, max_retries = _write_settings(batch_size)
+    writer = _make_writer(ctx)
+    
+    node_tasks = {
+        em.entity_name: asyncio.create_task(
+            _load_entity(ctx, writer, limiter, em, batch_size, max_retries)
+        )
+        for em in mapping.entity_mappings
+    }
+    
+    async def load_after_endpoints(rm: RelationshipMapping) -> Dict[str, Any]:
+        endpoints = {rm.from_entity, rm.to_entity}
+        await asyncio.gather(*(node_tasks[name] for name in endpoints if name in node_tasks))
+        return await _load_relationships(ctx, writer, limiter, rm, batch_size, max_retries)
+    
+    rel_tasks = [asyncio.create_task(load_after_endpoints(rm)) for rm in mapping.relationship_mappings]
+    try:
+        rel_results = await asyncio.gather(*rel_tasks)
+        node_results = await asyncio.gather(*node_tasks.values())
+    finally:
+        # On failure, stop sibling loads before the driver they share is closed
+        await _cancel_and_wait(rel_tasks + list(node_tasks.values()))
+        await writer.close()
     
     return {
-        "created": created_count,
-        "total": len(relationships),
-        "errors": errors[:10]  # Limit error messages
+        "nodes": node_results,
+        "relationships": rel_results,
+        "nodes_created": sum(r["created"] for r in node_results),
+        "relationships_created": sum(r["created"] for r in rel_results)
     }
@@ -0,0 +1,394 @@
+"""
+validator.py - Full-dataset validation of a CSV-to-ontology mapping
+
+A single pass over every row, before anything is written:
+- exact duplicate-identifier counts per entity (hash set of seen identifiers)
+- per-field type-coercion failure and null-violation rates
+- relationship rows whose endpoints are empty or match no node the entity
+  mappings will create (warnings only: relationships are matched against the
+  whole graph, so the endpoint may already exist from an earlier load)
+
+Cost is linear in rows x mapped columns. The sets hold references to strings
+already in the parsed rows, so the extra memory is one set entry per distinct
+identifier. Endpoint values not yet seen are parked until the end of the pass,
+so that set only grows with forward references. Reported example rows are
+capped at max_examples per issue.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.workflows.data_loading.csv_parser import match_date_format, value_matches_type
+from app.workflows.data_loading.models import (
+    DataMapping, EntityMapping, RelationshipMapping, ValidationError, ValidationResult
+)
+
+logger = logging.getLogger(__name__)
+
+
+def field_column(em: EntityMapping, field_name: Optional[str] = None) -> Optional[str]:
+    """CSV column mapped to field_name (default: the entity's identifier field)."""
+    field_name = field_name or em.identifier_field
+    if not field_name:
+        return None
+    return next((fm.csv_column for fm in em.field_mappings if fm.field_name == field_name), None)
+
+
+def relationship_endpoint_columns(
+    mapping: DataMapping,
+    rm: RelationshipMapping
+) -> Optional[Tuple[str, str]]:
+    """
+    CSV columns holding a relationship's from/to match values, resolved through
+    the endpoint entities' field mappings. None if either side can't be resolved.
+    """
+    from_em = next((em for em in mapping.entity_mappings if em.entity_name == rm.from_entity), None)
+    to_em = next((em for em in mapping.entity_mappings if em.entity_name == rm.to_entity), None)
+    if not from_em or not to_em:
+        return None
+    from_col = field_column(from_em, rm.from_identifier_field)
+    to_col = field_column(to_em, rm.to_identifier_field)
+    if not from_col or not to_col:
+        return None
+    return from_col, to_col
+
+
+@dataclass
+class _Issue:
+    """Rows hitting one problem: exact count plus the first few row numbers."""
+    count: int = 0
+    rows: List[int] = field(default_factory=list)
+
+    def add(self, row_number: int, max_examples: int):
+        self.count += 1
+        if len(self.rows) < max_examples:
+            self.rows.append(row_number)
+
+    def where(self) -> str:
+        return f"first at row{'s' if len(self.rows) > 1 else ''} {', '.join(map(str, self.rows))}"
+
+
+@dataclass
+class _FieldCheck:
+    csv_column: str
+    field_name: str
+    data_type: str
+    nullable: bool
+    checked: int = 0
+    type_failures: _Issue = field(default_factory=_Issue)
+    nulls: _Issue = field(default_factory=_Issue)
+    date_format: Optional[str] = None  # last format that parsed, tried first
+
+    def coerces(self, value: str) -> bool:
+        if self.data_type != "date":
+            return value_matches_type(value, self.data_type)
+        if self.date_format:
+            try:
+                datetime.strptime(value.strip(), self.date_format)
+                return True
+            except ValueError:
+                pass
+        fmt = match_date_format(value)
+        if fmt:
+            self.date_format = fmt
+        return fmt is not None
+
+
+@dataclass
+class _EntityCheck:
+    name: str
+    columns: List[str]
+    id_column: Optional[str]
+    fields: List[_FieldCheck]
+    # Non-identifier columns that relationships match on -> values seen
+    match_values: Dict[str, Set[str]] = field(default_factory=dict)
+    ids: Set[str] = field(default_factory=set)
+    nodes: int = 0
+    duplicates: _Issue = field(default_factory=_Issue)
+    duplicate_values: Set[str] = field(default_factory=set)
+    missing_id: _Issue = field(default_factory=_Issue)
+
+    def values_for(self, column: str) -> Set[str]:
+        return self.ids if column == self.id_column else self.match_values[column]
+
+
+@dataclass
+class _EndpointCheck:
+    """One side of a relationship; unresolved values wait here until the pass ends."""
+    entity: _EntityCheck
+    column: str
+    pending: Dict[str, _Issue] = field(default_factory=dict)
+
+    def check(self, value: str, row_number: int, max_examples: int):
+        if value not in self.entity.values_for(self.column):
+            self.pending.setdefault(value, _Issue()).add(row_number, max_examples)
+
+    def dangling(self, max_examples: int) -> _Issue:
+        """Rows whose value never appeared on a node row, anywhere in the file."""
+        values = self.entity.values_for(self.column)
+        total = _Issue()
+        for value, issue in self.pending.items():
+            if value not in values:
+                total.count += issue.count
+                total.rows.extend(issue.rows)
+        total.rows = sorted(total.rows)[:max_examples]
+        return total
+
+
+@dataclass
+class _RelationshipCheck:
+    mapping: RelationshipMapping
+    source: _EndpointCheck
+    target: _EndpointCheck
+    rows: int = 0
+    empty_endpoint: _Issue = field(default_factory=_Issue)
+
+    @property
+    def key(self) -> str:
+        rm = self.mapping
+        return f"({rm.from_entity})-[{rm.relationship_type}]->({rm.to_entity})"
+
+
+def _plan(
+    mapping: DataMapping,
+    csv_columns: List[str],
+    errors: List[ValidationError],
+    warnings: List[ValidationError]
+) -> Tuple[List[_EntityCheck], List[_RelationshipCheck]]:
+    """Mapping-level checks; returns the per-row checks to run."""
+    known_columns = set(csv_columns)
+    entity_checks: Dict[str, _EntityCheck] = {}
+
+    for em in mapping.entity_mappings:
+        if not em.identifier_field:
+            warnings.append(ValidationError(
+                error_type="missing_field",
+                message=f"Entity {em.entity_name} has no identifier field",
+                column_name=None
+            ))
+        fields = []
+        for fm in em.field_mappings:
+            if fm.csv_column not in known_columns:
+                errors.append(ValidationError(
+                    error_type="missing_field",
+                    message=f"CSV column '{fm.csv_column}' not found",
+                    column_name=fm.csv_column
+                ))
+                continue
+            fields.append(_FieldCheck(fm.csv_column, fm.field_name, fm.data_type, fm.nullable))
+        id_column = field_column(em)
+        if em.identifier_field and not id_column:
+            errors.append(ValidationError(
+                error_type="invalid_identifier",
+                message=f"Identifier field '{em.identifier_field}' of entity {em.entity_name} is not mapped to a CSV column",
+                column_name=None
+            ))
+        entity_checks[em.entity_name] = _EntityCheck(
+            name=em.entity_name,
+            columns=[fc.csv_column for fc in fields],
+            id_column=id_column if id_column in known_columns else None,
+            fields=fields,
+        )
+
+    rel_checks = []
+    for rm in mapping.relationship_mappings:
+        for col in rm.csv_columns:
+            if col not in known_columns:
+                errors.append(ValidationError(
+                    error_type="missing_field",
+                    message=f"CSV column '{col}' not found for relationship {rm.relationship_type}",
+                    column_name=col
+                ))
+        endpoints = relationship_endpoint_columns(mapping, rm)
+        if not endpoints or not set(endpoints) <= known_columns:
+            errors.append(ValidationError(
+                error_type="invalid_identifier",
+                message=(f"Relationship {rm.relationship_type}: no CSV columns for "
+                         f"{rm.from_entity}.{rm.from_identifier_field} -> {rm.to_entity}.{rm.to_identifier_field}, "
+                         f"so none of these relationships would be created"),
+                column_name=None
+            ))
+            continue
+        endpoint_checks = []
+        for entity_name, column in zip((rm.from_entity, rm.to_entity), endpoints):
+            ec = entity_checks[entity_name]
+            if column != ec.id_column:
+                ec.match_values.setdefault(column, set())
+            endpoint_checks.append(_EndpointCheck(ec, column))
+        rel_checks.append(_RelationshipCheck(rm, *endpoint_checks))
+
+    return list(entity_checks.values()), rel_checks
+
+
+def validate_rows(
+    rows: List[Dict[str, str]],
+    mapping: DataMapping,
+    csv_columns: List[str],
+    max_examples: int = 5
+) -> Tuple[ValidationResult, Dict[str, Any]]:
+    """
+    Validate a mapping against every row in one pass.
+
+    Returns the ValidationResult (errors should block the load, warnings
+    shouldn't) and per-entity, per-field and per-relationship counts.
+    """
+    errors: List[ValidationError] = []
+    warnings: List[ValidationError] = []
+    entity_checks, rel_checks = _plan(mapping, csv_columns, errors, warnings)
+
+    for row_number, row in enumerate(rows, start=1):
+        for ec in entity_checks:
+            # create_graph_nodes skips rows with no mapped values
+            if not any(row.get(col) for col in ec.columns):
+                continue
+            ec.nodes += 1
+
+            for fc in ec.fields:
+                value = row.get(fc.csv_column)
+                if not value:
+                    if not fc.nullable:
+                        fc.nulls.add(row_number, max_examples)
+                    continue
+                fc.checked += 1
+                if not fc.coerces(value):
+                    fc.type_failures.add(row_number, max_examples)
+
+            for col, values in ec.match_values.items():
+                value = row.get(col)
+                if value:
+                    values.add(value)
+
+            if ec.id_column:
+                id_value = row.get(ec.id_column)
+                if not id_value:
+                    ec.missing_id.add(row_number, max_examples)
+                elif id_value in ec.ids:
+                    ec.duplicates.add(row_number, max_examples)
+                    ec.duplicate_values.add(id_value)
+                else:
+                    ec.ids.add(id_value)
+
+        # After the entity checks, so a node defined on this same row resolves
+        for rc in rel_checks:
+            from_id, to_id = row.get(rc.source.column), row.get(rc.target.column)
+            if not from_id or not to_id:
+                if from_id or to_id:
+                    rc.empty_endpoint.add(row_number, max_examples)
+                continue
+            rc.rows += 1
+            rc.source.check(from_id, row_number, max_examples)
+            rc.target.check(to_id, row_number, max_examples)
+
+    return _summarize(len(rows), entity_checks, rel_checks, errors, warnings, max_examples)
+
+
+def _summarize(
+    row_count: int,
+    entity_checks: List[_EntityCheck],
+    rel_checks: List[_RelationshipCheck],
+    errors: List[ValidationError],
+    warnings: List[ValidationError],
+    max_examples: int
+) -> Tuple[ValidationResult, Dict[str, Any]]:
+    stats: Dict[str, Any] = {"rows": row_count, "entities": {}, "relationships": {}}
+
+    for ec in entity_checks:
+        if ec.duplicates.count:
+            errors.append(ValidationError(
+                error_type="duplicate_identifier",
+                message=(f"{ec.duplicates.count} {ec.name} rows repeat an identifier "
+                         f"({len(ec.duplicate_values)} distinct values duplicated; {ec.duplicates.where()})"),
+                row_number=ec.duplicates.rows[0],
+                column_name=ec.id_column
+            ))
+        if ec.missing_id.count:
+            warnings.append(ValidationError(
+                error_type="invalid_identifier",
+                message=(f"{ec.missing_id.count} {ec.name} rows have no identifier and can't be "
+                         f"matched by relationships ({ec.missing_id.where()})"),
+                row_number=ec.missing_id.rows[0],
+                column_name=ec.id_column
+            ))
+
+        field_stats = {}
+        for fc in ec.fields:
+            failure_rate = fc.type_failures.count / fc.checked if fc.checked else 0.0
+            if fc.type_failures.count:
+                warnings.append(ValidationError(
+                    error_type="type_mismatch",
+                    message=(f"{fc.type_failures.count}/{fc.checked} values ({failure_rate:.1%}) in column "
+                             f"'{fc.csv_column}' don't parse as {fc.data_type} for field "
+                             f"'{fc.field_name}' ({fc.type_failures.where()})"),
+                    row_number=fc.type_failures.rows[0],
+                    column_name=fc.csv_column
+                ))
+            if fc.nulls.count:
+                warnings.append(ValidationError(
+                    error_type="missing_field",
+                    message=(f"{fc.nulls.count} {ec.name} rows leave non-nullable field "
+                             f"'{fc.field_name}' empty ({fc.nulls.where()})"),
+                    row_number=fc.nulls.rows[0],
+                    column_name=fc.csv_column
+                ))
+            field_stats[fc.field_name] = {
+                "column": fc.csv_column,
+                "data_type": fc.data_type,
+                "checked": fc.checked,
+                "type_failures": fc.type_failures.count,
+                "failure_rate": round(failure_rate, 4),
+                "null_violations": fc.nulls.count,
+            }
+
+        stats["entities"][ec.name] = {
+            "nodes": ec.nodes,
+            "distinct_identifiers": len(ec.ids),
+            "duplicate_rows": ec.duplicates.count,
+            "duplicated_values": len(ec.duplicate_values),
+            "missing_identifier_rows": ec.missing_id.count,
+            "fields": field_stats,
+        }
+
+    for rc in rel_checks:
+        rm = rc.mapping
+        dangling = {
+            "from": rc.source.dangling(max_examples),
+            "to": rc.target.dangling(max_examples),
+        }
+        for side, issue in dangling.items():
+            if not issue.count:
+                continue
+            endpoint = rc.source if side == "from" else rc.target
+            warnings.append(ValidationError(
+                error_type="invalid_identifier",
+                message=(f"{issue.count} {rm.relationship_type} rows have a {side} value in column "
+                         f"'{endpoint.column}' that matches no {endpoint.entity.name} node in this file; "
+                         f"they are skipped unless that node is already in the graph ({issue.where()})"),
+                row_number=issue.rows[0],
+                column_name=endpoint.column
+            ))
+        if rc.empty_endpoint.count:
+            warnings.append(ValidationError(
+                error_type="missing_field",
+                message=(f"{rc.empty_endpoint.count} rows have only one {rm.relationship_type} endpoint "
+                         f"and will be skipped ({rc.empty_endpoint.where()})"),
+                row_number=rc.empty_endpoint.rows[0],
+                column_name=None
+            ))
+        stats["relationships"][rc.key] = {
+            "rows": rc.rows,
+            "empty_endpoint_rows": rc.empty_endpoint.count,
+            "dangling_from_rows": dangling["from"].count,
+            "dangling_to_rows": dangling["to"].count,
+        }
+
+    is_valid = len(errors) == 0
+    result = ValidationResult(
+        is_valid=is_valid,
+        errors=errors,
+        warnings=warnings,
+        summary=(f"Validation {'passed' if is_valid else 'failed'} on all {row_count} rows: "
+                 f"{len(errors)} errors, {len(warnings)} warnings")
+    )
+    return result, stats
@@ -0,0 +1,174 @@
+"""
+write_pipeline.py - Bounded producer/consumer pipeline for graph batch writes
+
+The producer turns CSV rows into nodes/relationships and fills batches while
+consumers write earlier batches, so row transformation overlaps with Neo4j
+commits. The queue is bounded, so at most a few batches are held in memory.
+Writes share an AdaptiveConcurrency limit: every pipeline in one load draws
+from the same pool of in-flight transactions, and the pool shrinks when the
+server reports transient errors.
+
+Each batch carries a key that stays the same across its retries, so a batch
+whose commit succeeded but whose acknowledgement was lost is not written twice
+(see GraphWriter batch markers).
+"""
+
+import asyncio
+import logging
+import random
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from app.workflows.data_loading.graph_writer import TRANSIENT_ERRORS
+
+logger = logging.getLogger(__name__)
+
+# Retry backoff for transient errors: base * 2^attempt seconds, plus jitter
+RETRY_BACKOFF_BASE = 0.5
+RETRY_BACKOFF_MAX = 10.0
+
+
+class AdaptiveConcurrency:
+    """
+    Limit on concurrent write transactions (AIMD).
+
+    Halves on a transient error (deadlock, leader switch, server overloaded)
+    and grows back by one after `limit` consecutive successes, up to
+    max_limit.
+    """
+
+    def __init__(self, max_limit: int):
+        self.max_limit = max(1, max_limit)
+        self.limit = self.max_limit
+        self._in_flight = 0
+        self._successes = 0
+        self._cond = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        return self
+
+    async def __aexit__(self, *exc):
+        async with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def on_success(self):
+        if self.limit >= self.max_limit:
+            return
+        self._successes += 1
+        if self._successes >= self.limit:
+            self._successes = 0
+            self.limit += 1
+            logger.info(f"Write concurrency raised to {self.limit}")
+
+    def on_transient_error(self):
+        self._successes = 0
+        if self.limit > 1:
+            self.limit = max(1, self.limit // 2)
+            logger.warning(f"Transient write error, concurrency lowered to {self.limit}")
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of one pipeline: items written, items attempted, first errors."""
+    created: int = 0
+    total: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+async def run_write_pipeline(
+    rows: Iterable[Dict[str, Any]],
+    transform: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]],
+    write_batch: Callable[[List[Dict[str, Any]], str], Awaitable[List[Dict[str, Any]]]],
+    limiter: AdaptiveConcurrency,
+    batch_size: int,
+    max_retries: int = 5,
+    on_batch: Optional[Callable[[int], None]] = None,
+    max_errors: int = 10
+) -> PipelineResult:
+    """
+    Transform rows and write them in batches with overlapping I/O.
+
+    Args:
+        rows: Source rows, consumed once
+        transform: Row -> item to write, or None to skip the row
+        write_batch: Writes one batch under a batch key that is stable across retries,
+            returns per-item results with 'success'/'error'; raises TRANSIENT_ERRORS
+            for retryable failures
+        limiter: Shared in-flight transaction limit
+        batch_size: Items per write transaction
+        max_retries: Retries per batch on transient errors
+        on_batch: Called with the created count after each batch commits
+        max_errors: Error messages to keep
+
+    Returns:
+        PipelineResult with created/total counts and the first errors
+    """
+    result = PipelineResult()
+    workers = limiter.max_limit
+    queue: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+
+    async def produce():
+        batch = []
+        for row in rows:
+            item = transform(row)
+            if item is None:
+                continue
+            batch.append(item)
+            if len(batch) >= batch_size:
+                result.total += len(batch)
+                await queue.put(batch)  # blocks while writers are behind
+                batch = []
+                await asyncio.sleep(0)  # let writers pick it up
+        if batch:
+            result.total += len(batch)
+            await queue.put(batch)
+        for _ in range(workers):
+            await queue.put(None)
+
+    async def write_with_retry(batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        batch_key = uuid.uuid4().hex
+        for attempt in range(max_retries + 1):
+            try:
+                async with limiter:
+                    results = await write_batch(batch, batch_key)
+                limiter.on_success()
+                return results
+            except TRANSIENT_ERRORS as e:
+                limiter.on_transient_error()
+                if attempt == max_retries:
+                    return [{"success": False, "error": f"Transient error after {max_retries} retries: {e}"}] * len(batch)
+                delay = min(RETRY_BACKOFF_BASE * 2 ** attempt, RETRY_BACKOFF_MAX)
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+            except Exception as e:
+                logger.error(f"Batch write failed: {e}")
+                return [{"success": False, "error": str(e)}] * len(batch)
+        return []
+
+    async def consume():
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                return
+            created = 0
+            for item_result in await write_with_retry(batch):
+                if item_result.get("success"):
+                    created += 1
+                elif len(result.errors) < max_errors:
+                    result.errors.append(item_result.get("error", "Unknown error"))
+            result.created += created
+            if on_batch:
+                on_batch(created)
+
+    tasks = [asyncio.create_task(produce())] + [asyncio.create_task(consume()) for _ in range(workers)]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return result
@@ -11,11 +11,20 @@ Query Patterns:
 - SINGLE_HOP: Two entities connected by one relationship
 - MULTI_HOP: Chain of entities connected by relationships
 - COMPLEX: Patterns that don't fit templates (requires LLM)
+
+Per-entity traversal queries are compiled once per scope *shape* (entity
+types, relationships, filter properties/operators) into parameterized
+templates, then bound to the scope's filter values. Compiled templates,
+BFS paths, rendered queries and LLM-generated/corrected queries are memoized
+at module level so repeated executions of the same scope skip regeneration.
 """
 
 import asyncio
+import hashlib
 import json
 import logging
+import re
+from collections import OrderedDict, deque
 from enum import Enum
 from typing import Optional, List, Any, Dict
 
@@ -67,6 +76,142 @@ class CypherGenerationResult(BaseModel):
     )
 
 
+class CompiledEntityQueries(BaseModel):
+    """Parameterized per-entity queries compiled for one scope shape."""
+    templates: Dict[str, str] = Field(
+        description="Mapping of entity type to Cypher template with $parameter placeholders"
+    )
+    aliases: Dict[str, str] = Field(
+        description="Mapping of entity types to their Cypher aliases"
+    )
+
+    def render(self, parameters: Dict[str, Any]) -> Dict[str, str]:
+        """Bind parameter values into every template (see render_cypher)."""
+        return {
+            entity_type: render_cypher(template, parameters)
+            for entity_type, template in self.templates.items()
+        }
+
+
+# =============================================================================
+# Generation Caches
+# =============================================================================
+
+# CypherGenerator instances are created per execute / update_scope call, so
+# memoized work is kept at module level and shared between instances.
+_CACHE_MAX_ENTRIES = 256
+
+# scope key -> rendered per-entity queries
+_entity_query_cache: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+# scope shape -> compiled parameterized templates
+_template_cache: "OrderedDict[str, CompiledEntityQueries]" = OrderedDict()
+# (primary, entity types, relationships) -> BFS parent map
+_path_cache: "OrderedDict[tuple, Dict[str, Optional[tuple]]]" = OrderedDict()
+# schema version + scope key -> LLM-generated result
+_llm_generation_cache: "OrderedDict[str, CypherGenerationResult]" = OrderedDict()
+# schema version + scope key + failed query -> LLM-corrected query
+_llm_correction_cache: "OrderedDict[str, str]" = OrderedDict()
+
+_PARAMETER_PATTERN = re.compile(r"\$([A-Za-z_][A-Za-z0-9_]*)")
+
+
+def _cache_get(cache: OrderedDict, key: Any) -> Any:
+    """Return a cached value (or None) and mark it most recently used."""
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+
+def _cache_put(cache: OrderedDict, key: Any, value: Any) -> None:
+    """Store a value, evicting the least recently used entries past the cap."""
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > _CACHE_MAX_ENTRIES:
+        cache.popitem(last=False)
+
+
+def clear_cypher_cache() -> None:
+    """Clear all memoized Cypher generation state. Useful for testing or after schema changes."""
+    for cache in (
+        _entity_query_cache,
+        _template_cache,
+        _path_cache,
+        _llm_generation_cache,
+        _llm_correction_cache,
+    ):
+        cache.clear()
+    logger.info("Cypher generation cache cleared")
+
+
+def _digest(payload: Any) -> str:
+    """Stable hash of a JSON-serializable payload."""
+    text = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def schema_version(schema: GraphSchema) -> str:
+    """Content hash identifying a GraphSchema; changes whenever the schema does."""
+    return _digest(schema.model_dump(mode="json"))
+
+
+def format_cypher_value(value: Any) -> str:
+    """
+    Format a Python value as a Cypher literal.
+
+    Args:
+        value: The value to format
+
+    Returns:
+        Cypher-formatted string
+    """
+    if value is None:
+        return "NULL"
+
+    if isinstance(value, bool):
+        # Cypher uses lowercase booleans
+        return "true" if value else "false"
+
+    if isinstance(value, str):
+        # Escape single quotes and wrap in quotes
+        escaped = value.replace("\\", "\\\\").replace("'", "\\'")
+        return f"'{escaped}'"
+
+    if isinstance(value, (int, float)):
+        return str(value)
+
+    if isinstance(value, list):
+        formatted = [format_cypher_value(v) for v in value]
+        return f"[{', '.join(formatted)}]"
+
+    # Fallback: stringify and quote
+    return f"'{str(value)}'"
+
+
+def render_cypher(template: str, parameters: Dict[str, Any]) -> str:
+    """
+    Bind $parameter placeholders in a compiled template to Cypher literals.
+
+    graphNodesByCypher accepts a query string only, so parameters are inlined
+    at render time. Templates contain no literal values, so placeholders are
+    the only `$` tokens present.
+
+    Args:
+        template: Cypher template with $name placeholders
+        parameters: Mapping of placeholder name to value
+
+    Returns:
+        Executable Cypher query string
+    """
+    if not parameters:
+        return template
+    return _PARAMETER_PATTERN.sub(
+        lambda m: format_cypher_value(parameters[m.group(1)])
+        if m.group(1) in parameters else m.group(0),
+        template,
+    )
+
+
 # =============================================================================
 # Cypher Generator
 # =============================================================================
@@ -108,6 +253,7 @@ class CypherGenerator:
         """
         self.schema = schema
         self.use_llm_fallback = use_llm_fallback
+        self.schema_version = schema_version(schema)
 
         # Build schema lookups for validation
         self._entity_names = {e.name for e in schema.entities}
@@ -449,33 +595,48 @@ class CypherGenerator:
                 return rel
         return None
 
-    def _build_where_conditions(self, entity: EntityScope, alias: str) -> List[str]:
+    def _build_where_conditions(
+        self,
+        entity: EntityScope,
+        alias: str,
+        parameters: Optional[Dict[str, Any]] = None
+    ) -> List[str]:
         """
         Build WHERE clause conditions for an entity's filters.
 
         Args:
             entity: Entity scope with filters
             alias: Cypher alias for this entity
+            parameters: If given, filter values are emitted as $placeholders
+                and collected here instead of being inlined as literals
 
         Returns:
             List of WHERE condition strings
         """
         conditions = []
 
-        for filter in entity.filters:
-            condition = self._filter_to_cypher(filter, alias)
+        for index, filter in enumerate(entity.filters):
+            condition = self._filter_to_cypher(filter, alias, parameters, index)
             if condition:
                 conditions.append(condition)
 
         return conditions
 
-    def _filter_to_cypher(self, filter: EntityFilter, alias: str) -> Optional[str]:
+    def _filter_to_cypher(
+        self,
+        filter: EntityFilter,
+        alias: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        index: int = 0
+    ) -> Optional[str]:
         """
         Convert a single filter to Cypher WHERE condition.
 
         Args:
             filter: The filter to convert
             alias: Node alias in the query
+            parameters: If given, values become $placeholders recorded here
+            index: Position of the filter on its entity (names the placeholder)
 
         Returns:
             Cypher condition string or None
@@ -483,6 +644,13 @@ class CypherGenerator:
         op = filter.operator
         prop = filter.property
 
+        def value_expr(value: Any, suffix: str = "") -> str:
+            if parameters is None:
+                return self._format_value(value)
+            name = f"{alias}_f{index}{suffix}"
+            parameters[name] = value
+            return f"${name}"
+
         if op == FilterOperator.IS_NULL:
             return f"{alias}.{prop} IS NULL"
 
@@ -493,8 +661,8 @@ class CypherGenerator:
             if not isinstance(filter.value, list) or len(filter.value) != 2:
                 logger.warning(f"BETWEEN filter requires list of 2 values, got: {filter.value}")
                 return None
-            val_min = self._format_value(filter.value[0])
-            val_max = self._format_value(filter.value[1])
+            val_min = value_expr(filter.value[0], "_min")
+            val_max = value_expr(filter.value[1], "_max")
             return f"{val_min} <= {alias}.{prop} <= {val_max}"
 
         if op == FilterOperator.IN:
@@ -502,7 +670,13 @@ class CypherGenerator:
                 logger.warning(f"IN filter requires list value, got: {filter.value}")
                 return None
             # Case-insensitive only when all values are strings
-            if all(isinstance(v, str) for v in filter.value):
+            all_strings = all(isinstance(v, str) for v in filter.value)
+            if parameters is not None:
+                values = value_expr(filter.value)
+                if all_strings:
+                    return f"toLower({alias}.{prop}) IN [v IN {values} | toLower(v)]"
+                return f"{alias}.{prop} IN {values}"
+            if all_strings:
                 formatted_values = [f"toLower({self._format_value(v)})" for v in filter.value]
                 return f"toLower({alias}.{prop}) IN [{', '.join(formatted_values)}]"
             else:
@@ -515,7 +689,7 @@ class CypherGenerator:
             logger.warning(f"Unknown operator: {op}")
             return None
 
-        formatted_value = self._format_value(filter.value)
+        formatted_value = value_expr(filter.value)
 
         # Case-insensitive wrapping for string values on EQ/NEQ
         if isinstance(filter.value, str) and op in (FilterOperator.EQ, FilterOperator.NEQ):
@@ -527,36 +701,69 @@ class CypherGenerator:
         return template.format(alias=alias, prop=prop, value=formatted_value)
 
     def _format_value(self, value: Any) -> str:
-        """
-        Format a Python value for Cypher query.
+        """Format a Python value for Cypher query (see format_cypher_value)."""
+        return format_cypher_value(value)
 
-        Args:
-            value: The value to format
+    # =========================================================================
+    # Cache Keys
+    # =========================================================================
 
-        Returns:
-            Cypher-formatted string
+    @staticmethod
+    def _filter_shape(filter: EntityFilter) -> List[str]:
         """
-        if value is None:
-            return "NULL"
-
-        if isinstance(value, bool):
-            # Cypher uses lowercase booleans
-            return "true" if value else "false"
-
-        if isinstance(value, str):
-            # Escape single quotes and wrap in quotes
-            escaped = value.replace("\\", "\\\\").replace("'", "\\'")
-            return f"'{escaped}'"
+        Describe the parts of a filter that determine its compiled template.
 
-        if isinstance(value, (int, float)):
-            return str(value)
+        Values only matter through their kind: string equality and all-string
+        IN lists are wrapped in toLower(), and BETWEEN needs exactly two values.
+        """
+        value = filter.value
+        if filter.operator == FilterOperator.BETWEEN:
+            kind = "pair" if isinstance(value, list) and len(value) == 2 else "invalid"
+        elif isinstance(value, list):
+            kind = "list_str" if all(isinstance(v, str) for v in value) else "list"
+        elif isinstance(value, str):
+            kind = "str"
+        else:
+            kind = "other"
+        return [filter.property, filter.operator.value, kind]
+
+    def _scope_shape(self, rec: ScopeRecommendation) -> Dict[str, Any]:
+        """Value-free description of a scope; equal shapes share compiled templates."""
+        primary = self._primary_entity(rec)
+        return {
+            "primary": primary.entity_type if primary else None,
+            "entities": [
+                [e.entity_type, [self._filter_shape(f) for f in e.filters]]
+                for e in rec.entities
+            ],
+            "relationships": [
+                [r.from_entity, r.relationship_type, r.to_entity]
+                for r in rec.relationships
+            ],
+        }
 
-        if isinstance(value, list):
-            formatted = [self._format_value(v) for v in value]
-            return f"[{', '.join(formatted)}]"
+    def _scope_key(self, rec: ScopeRecommendation) -> str:
+        """
+        Canonical hash of (schema version, query-relevant scope content).
 
-        # Fallback: stringify and quote
-        return f"'{str(value)}'"
+        Reasoning, summaries and fields of interest do not affect the generated
+        Cypher and are excluded, so rewording a scope does not miss the cache.
+        """
+        return _digest({
+            "schema": self.schema_version,
+            "shape": self._scope_shape(rec),
+            "values": [[f.value for f in e.filters] for e in rec.entities],
+        })
+
+    @staticmethod
+    def _primary_entity(rec: ScopeRecommendation) -> Optional[EntityScope]:
+        """First entity with relevance_level='primary', or just the first entity."""
+        if not rec.entities:
+            return None
+        return next(
+            (e for e in rec.entities if e.relevance_level == "primary"),
+            rec.entities[0]
+        )
 
     def _get_alias(self, entity_type: str, exclude: List[str] = None) -> str:
         """
@@ -661,6 +868,12 @@ class CypherGenerator:
         Returns:
             CypherGenerationResult with LLM-generated query
         """
+        cache_key = self._scope_key(recommendation)
+        cached = _cache_get(_llm_generation_cache, cache_key)
+        if cached is not None:
+            logger.info("Reusing cached LLM-generated Cypher for identical scope")
+            return cached.model_copy(update={"warnings": list(validation_errors)})
+
         logger.info("Using LLM fallback for Cypher generation")
 
         # Build the prompt
@@ -690,13 +903,15 @@ class CypherGenerator:
             # Extract aliases from the generated query (best effort)
             aliases = self._extract_aliases_from_query(query, recommendation)
 
-            return CypherGenerationResult(
+            result = CypherGenerationResult(
                 query=query,
                 method="llm",
                 pattern=QueryPattern.COMPLEX,
                 warnings=validation_errors,
                 entity_aliases=aliases
             )
+            _cache_put(_llm_generation_cache, cache_key, result)
+            return result
 
         except Exception as e:
             logger.error(f"LLM Cypher generation failed: {e}")
@@ -719,6 +934,14 @@ class CypherGenerator:
         Returns:
             Corrected Cypher query string
         """
+        # Keyed on the failed query rather than the error text, which can vary
+        # between runs (timings, server ids) for the same underlying problem.
+        cache_key = _digest([self._scope_key(recommendation), original_query])
+        cached = _cache_get(_llm_correction_cache, cache_key)
+        if cached is not None:
+            logger.info("Reusing cached LLM correction for failed query")
+            return cached
+
         logger.info(f"Attempting LLM correction for failed query")
 
         schema_summary = format_schema_for_prompt(self.schema)
@@ -743,6 +966,7 @@ class CypherGenerator:
             result = await agent.run(prompt)
             corrected_query = self._clean_llm_response(result.data)
             logger.debug(f"LLM corrected query: {corrected_query}")
+            _cache_put(_llm_correction_cache, cache_key, corrected_query)
             return corrected_query
 
         except Exception as e:
@@ -842,29 +1066,71 @@ class CypherGenerator:
         Each entity's query traverses from the primary entity to itself, applying
         ALL filters along the path. Only the RETURN clause differs per entity.
 
+        Results are memoized on (schema version, scope); scopes that differ only
+        in filter values reuse the same compiled templates.
+
         Returns:
             Dict mapping entity_type -> Cypher query string
         """
-        entity_queries: Dict[str, str] = {}
-
         if not recommendation.entities:
-            return entity_queries
+            return {}
+
+        cache_key = self._scope_key(recommendation)
+        cached = _cache_get(_entity_query_cache, cache_key)
+        if cached is not None:
+            logger.debug("Per-entity Cypher cache hit")
+            return dict(cached)
+
+        compiled, parameters = self.compile_entity_queries(recommendation)
+        entity_queries = compiled.render(parameters)
+        _cache_put(_entity_query_cache, cache_key, entity_queries)
+        return dict(entity_queries)
+
+    def compile_entity_queries(
+        self,
+        recommendation: ScopeRecommendation,
+    ) -> tuple[CompiledEntityQueries, Dict[str, Any]]:
+        """
+        Compile parameterized per-entity queries and bind this scope's values.
 
-        if not recommendation.relationships:
-            # No relationships — each entity gets its own simple query
-            for entity in recommendation.entities:
-                entity_queries[entity.entity_type] = self._build_simple_query(entity)
-            return entity_queries
+        Templates depend only on the scope shape and are cached by it; filter
+        values are returned separately as the parameter map.
 
-        # Build traversal tree from primary entity, generate path-based queries
-        entity_queries = self._build_path_queries(recommendation)
-        return entity_queries
+        Returns:
+            Tuple of (compiled templates, parameter values keyed by placeholder)
+        """
+        shape_key = _digest(self._scope_shape(recommendation))
+        compiled = _cache_get(_template_cache, shape_key)
+        if compiled is None:
+            parameters: Dict[str, Any] = {}
+            compiled = self._build_path_queries(recommendation, parameters)
+            _cache_put(_template_cache, shape_key, compiled)
+            return compiled, parameters
+
+        return compiled, self._collect_parameters(recommendation, compiled.aliases)
+
+    def _collect_parameters(
+        self,
+        rec: ScopeRecommendation,
+        aliases: Dict[str, str]
+    ) -> Dict[str, Any]:
+        """Bind filter values to the placeholder names used by compiled templates."""
+        parameters: Dict[str, Any] = {}
+        entity_lookup = {e.entity_type: e for e in rec.entities}
+        for entity_type, entity in entity_lookup.items():
+            self._build_where_conditions(entity, aliases[entity_type], parameters)
+        return parameters
 
-    def _build_simple_query(self, entity: EntityScope) -> str:
+    def _build_simple_query(
+        self,
+        entity: EntityScope,
+        alias: Optional[str] = None,
+        parameters: Optional[Dict[str, Any]] = None
+    ) -> str:
         """Build a simple single-entity query with filters."""
-        alias = self._get_alias(entity.entity_type)
+        alias = alias or self._get_alias(entity.entity_type)
         match_clause = f"MATCH ({alias}:{entity.entity_type})"
-        where_conditions = self._build_where_conditions(entity, alias)
+        where_conditions = self._build_where_conditions(entity, alias, parameters)
         where_clause = f"WHERE {' AND '.join(where_conditions)}" if where_conditions else ""
         parts = [match_clause]
         if where_clause:
@@ -872,49 +1138,76 @@ class CypherGenerator:
         parts.append(f"RETURN DISTINCT {alias}")
         return "\n".join(parts)
 
-    def _build_path_queries(self, rec: ScopeRecommendation) -> Dict[str, str]:
+    def _traversal_tree(
+        self,
+        rec: ScopeRecommendation,
+        primary_type: str,
+        entity_types: List[str]
+    ) -> Dict[str, Optional[tuple]]:
         """
-        Build per-entity queries by finding paths from primary entity to each target.
+        BFS shortest-path tree from the primary entity over scope relationships.
 
-        Uses BFS to build a tree of shortest paths from the primary entity,
-        then generates a MATCH pattern for each entity following its path.
-        Handles branching graphs correctly.
+        Returns:
+            parent map: entity_type -> (parent_type, relationship_type, is_forward),
+            None for the primary entity; unreachable entities are absent
         """
-        entity_lookup = {e.entity_type: e for e in rec.entities}
-        entity_types = set(entity_lookup.keys())
-
-        # Find primary entity (first with relevance_level='primary', or just first)
-        primary = next(
-            (e for e in rec.entities if e.relevance_level == "primary"),
-            rec.entities[0]
+        relationships = tuple(
+            (rel.from_entity, rel.relationship_type, rel.to_entity)
+            for rel in rec.relationships
         )
+        cache_key = (primary_type, tuple(entity_types), relationships)
+        cached = _cache_get(_path_cache, cache_key)
+        if cached is not None:
+            return cached
 
         # Build adjacency list (bidirectional for path finding)
         # Each entry: (neighbor_type, relationship_type, is_forward)
+        type_set = set(entity_types)
         adjacency: Dict[str, List[tuple]] = {et: [] for et in entity_types}
-        for rel in rec.relationships:
-            if rel.from_entity in entity_types and rel.to_entity in entity_types:
-                adjacency[rel.from_entity].append(
-                    (rel.to_entity, rel.relationship_type, True)
-                )
-                adjacency[rel.to_entity].append(
-                    (rel.from_entity, rel.relationship_type, False)
-                )
+        for from_entity, rel_type, to_entity in relationships:
+            if from_entity in type_set and to_entity in type_set:
+                adjacency[from_entity].append((to_entity, rel_type, True))
+                adjacency[to_entity].append((from_entity, rel_type, False))
 
-        # BFS from primary entity to find shortest path to every other entity
         # parent[entity_type] = (parent_type, relationship_type, is_forward)
-        parent: Dict[str, Optional[tuple]] = {primary.entity_type: None}
-        queue = [primary.entity_type]
-        visited = {primary.entity_type}
+        parent: Dict[str, Optional[tuple]] = {primary_type: None}
+        queue = deque([primary_type])
 
         while queue:
-            current = queue.pop(0)
+            current = queue.popleft()
             for neighbor, rel_type, is_forward in adjacency.get(current, []):
-                if neighbor not in visited:
-                    visited.add(neighbor)
+                if neighbor not in parent:
                     parent[neighbor] = (current, rel_type, is_forward)
                     queue.append(neighbor)
 
+        _cache_put(_path_cache, cache_key, parent)
+        return parent
+
+    def _build_path_queries(
+        self,
+        rec: ScopeRecommendation,
+        parameters: Dict[str, Any]
+    ) -> CompiledEntityQueries:
+        """
+        Build per-entity query templates by finding paths from primary entity to each target.
+
+        Uses BFS to build a tree of shortest paths from the primary entity,
+        then generates a MATCH pattern for each entity following its path.
+        Handles branching graphs correctly. Entities not reachable from the
+        primary entity (including every entity when there are no relationships)
+        get a simple single-entity query.
+
+        Args:
+            rec: Scope recommendation
+            parameters: Collects filter values keyed by template placeholder
+        """
+        entity_lookup = {e.entity_type: e for e in rec.entities}
+        # Preserve scope order so aliases and placeholders are deterministic
+        entity_types = list(entity_lookup.keys())
+        primary = self._primary_entity(rec)
+
+        parent = self._traversal_tree(rec, primary.entity_type, entity_types)
+
         # Generate aliases for all entities
         aliases: Dict[str, str] = {}
         used_aliases: List[str] = []
@@ -926,19 +1219,18 @@ class CypherGenerator:
         # Collect all WHERE conditions keyed by entity type
         all_conditions: Dict[str, List[str]] = {}
         for entity_type, entity in entity_lookup.items():
-            if entity_type in aliases:
-                conditions = self._build_where_conditions(entity, aliases[entity_type])
-                if conditions:
-                    all_conditions[entity_type] = conditions
+            conditions = self._build_where_conditions(entity, aliases[entity_type], parameters)
+            if conditions:
+                all_conditions[entity_type] = conditions
 
         # Generate one query per entity
-        entity_queries: Dict[str, str] = {}
+        templates: Dict[str, str] = {}
 
         for target_type in entity_types:
             if target_type not in parent:
                 # Disconnected entity — simple query
-                entity_queries[target_type] = self._build_simple_query(
-                    entity_lookup[target_type]
+                templates[target_type] = self._build_simple_query(
+                    entity_lookup[target_type], aliases[target_type], parameters
                 )
                 continue
 
@@ -983,9 +1275,9 @@ class CypherGenerator:
                 parts.append(where_clause)
             parts.append(f"RETURN DISTINCT {target_alias}")
 
-            entity_queries[target_type] = "\n".join(parts)
+            templates[target_type] = "\n".join(parts)
 
-        return entity_queries
+        return CompiledEntityQueries(templates=templates, aliases=aliases)
 
     # =========================================================================
     # Preview Query Methods (for Build Query / Preview Data UI)
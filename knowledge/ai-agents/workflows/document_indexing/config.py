@@ -42,11 +42,56 @@ class DocumentIndexingConfig(BaseModel):
         le=100,
         description="Maximum tool calls per entity resolution agent run",
     )
+    entity_resolution_batch_size: int = Field(
+        default=25,
+        ge=1,
+        le=200,
+        description="Ambiguous entities sent to the entity resolution agent per run",
+    )
     entity_resolution_phase2_enabled: bool = Field(
         default=False,
         description="Enable phase 2 entity resolution (resolving assertions to domain graph)",
     )
 
+    # Deterministic pre-matching before the entity resolution agent
+    entity_prematch_enabled: bool = Field(
+        default=True,
+        description="Resolve clear name matches without the LLM; send only ambiguous entities to the agent",
+    )
+    entity_prematch_auto_threshold: float = Field(
+        default=0.9,
+        ge=0.0,
+        le=1.0,
+        description="Minimum similarity for a match to be resolved without the agent",
+    )
+    entity_prematch_ambiguity_margin: float = Field(
+        default=0.1,
+        ge=0.0,
+        le=1.0,
+        description="Best candidate must beat the runner-up by this much to be auto-resolved",
+    )
+    entity_prematch_min_score: float = Field(
+        default=0.3,
+        ge=0.0,
+        le=1.0,
+        description="Candidates below this similarity are ignored; entities with none go to the agent with no candidates",
+    )
+    entity_prematch_max_candidates: int = Field(
+        default=5,
+        ge=1,
+        le=20,
+        description="Candidates shown to the agent per ambiguous entity",
+    )
+    entity_prematch_use_minhash: bool = Field(
+        default=False,
+        description="Block fuzzy matches with MinHash-LSH instead of trigram postings (very large domain graphs)",
+    )
+    entity_prematch_domain_node_limit: int = Field(
+        default=5000,
+        ge=1,
+        description="Maximum domain nodes loaded per ontology entity label for pre-matching",
+    )
+
     # Workflow settings
     chunk_max_chars: int = Field(
         default=6000,
@@ -0,0 +1,274 @@
+"""Deterministic candidate matching of document entities to domain graph nodes.
+
+Runs before the entity resolution agent. Domain nodes are indexed by normalized
+name (exact hash), word tokens and character trigrams, with optional MinHash-LSH
+buckets for very large graphs. Each document entity is scored against the few
+nodes that share a block with it (Jaccard similarity), so matching is linear in
+the number of entities rather than entities x nodes.
+
+Clear matches are resolved here; entities with several close candidates go to
+the agent together with their short candidate list, and entities with no
+candidate go to the agent with an empty list so it can search the domain graph.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+import zlib
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+# A trigram or token shared by more than this share of nodes is too common to block on
+_MAX_POSTING_FRACTION = 0.01
+_MIN_POSTING_CAP = 50
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, strip accents and punctuation, collapse whitespace."""
+    if not name:
+        return ""
+    text = unicodedata.normalize("NFKD", name)
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    return _NON_ALNUM.sub(" ", text).strip()
+
+
+def _tokens(norm: str) -> set[str]:
+    return set(norm.split())
+
+
+def _trigrams(norm: str) -> set[str]:
+    padded = f"  {norm} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _jaccard(shared: int, a: int, b: int) -> float:
+    union = a + b - shared
+    return shared / union if union else 0.0
+
+
+@dataclass
+class DomainCandidate:
+    """A domain graph node that a document entity may resolve to."""
+
+    node_id: str
+    name: str
+    node_label: str
+    norm: str = ""
+    tokens: set[str] = field(default_factory=set)
+    trigrams: set[str] = field(default_factory=set)
+
+
+@dataclass
+class CandidateMatch:
+    """A scored candidate for one document entity."""
+
+    candidate: DomainCandidate
+    score: float
+    method: str  # "exact" or "fuzzy"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "domain_node_id": self.candidate.node_id,
+            "domain_entity_name": self.candidate.name,
+            "domain_entity_type": self.candidate.node_label,
+            "score": round(self.score, 3),
+        }
+
+
+class _MinHasher:
+    """MinHash signatures over trigram sets, banded for LSH bucketing."""
+
+    _MASK = 0xFFFFFFFF
+
+    def __init__(self, num_perm: int = 16, bands: int = 8):
+        self.bands = bands
+        self.rows = num_perm // bands
+        # Fixed seeds so signatures are stable across processes
+        self._params = [(0x9E3779B1 * (2 * i + 1) & self._MASK, 7919 * i + 13) for i in range(self.rows * bands)]
+
+    def band_keys(self, trigrams: set[str]) -> list[tuple[int, tuple[int, ...]]]:
+        hashes = [zlib.crc32(t.encode("utf-8")) for t in trigrams]
+        if not hashes:
+            return []
+        mask = self._MASK
+        signature = [min((a * h + b) & mask for h in hashes) for a, b in self._params]
+        return [
+            (band, tuple(signature[band * self.rows:(band + 1) * self.rows]))
+            for band in range(self.bands)
+        ]
+
+
+class CandidateIndex:
+    """Blocking index over domain nodes for fast name matching."""
+
+    def __init__(self, candidates: Iterable[DomainCandidate], use_minhash: bool = False):
+        self.candidates: list[DomainCandidate] = []
+        self._exact: dict[str, list[int]] = defaultdict(list)
+        self._by_token: dict[str, list[int]] = defaultdict(list)
+        self._by_trigram: dict[str, list[int]] = defaultdict(list)
+        self._minhash = _MinHasher() if use_minhash else None
+        self._buckets: dict[tuple[int, tuple[int, ...]], list[int]] = defaultdict(list)
+
+        for cand in candidates:
+            cand.norm = normalize_name(cand.name)
+            if not cand.norm:
+                continue
+            cand.tokens = _tokens(cand.norm)
+            cand.trigrams = _trigrams(cand.norm)
+            idx = len(self.candidates)
+            self.candidates.append(cand)
+            self._exact[cand.norm].append(idx)
+            for tok in cand.tokens:
+                self._by_token[tok].append(idx)
+            if self._minhash is not None:
+                for key in self._minhash.band_keys(cand.trigrams):
+                    self._buckets[key].append(idx)
+            else:
+                for tri in cand.trigrams:
+                    self._by_trigram[tri].append(idx)
+        self._posting_cap = max(_MIN_POSTING_CAP, int(len(self.candidates) * _MAX_POSTING_FRACTION))
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def _shared_trigrams(self, tokens: set[str], trigrams: set[str]) -> Counter:
+        """Shared-trigram counts for nodes that share a token, trigram or LSH bucket with the name."""
+        shared: Counter = Counter()
+        found: set[int] = set()
+        if self._minhash is None:
+            for tri in trigrams:
+                posting = self._by_trigram.get(tri)
+                if posting and len(posting) <= self._posting_cap:
+                    shared.update(posting)
+        else:
+            for key in self._minhash.band_keys(trigrams):
+                found.update(self._buckets.get(key, ()))
+        for tok in tokens:
+            posting = self._by_token.get(tok)
+            if posting and len(posting) <= self._posting_cap:
+                found.update(posting)
+        for i in found:
+            if i not in shared:
+                shared[i] = len(trigrams & self.candidates[i].trigrams)
+        return shared
+
+    def match(self, name: str, max_candidates: int = 5, min_score: float = 0.3) -> list[CandidateMatch]:
+        """Best candidates for a name, highest score first."""
+        norm = normalize_name(name)
+        if not norm:
+            return []
+        exact = self._exact.get(norm)
+        if exact:
+            return [CandidateMatch(self.candidates[i], 1.0, "exact") for i in exact[:max_candidates]]
+
+        tokens = _tokens(norm)
+        trigrams = _trigrams(norm)
+        n_tri = len(trigrams)
+        scored: list[CandidateMatch] = []
+        for i, shared in self._shared_trigrams(tokens, trigrams).items():
+            cand = self.candidates[i]
+            score = _jaccard(shared, n_tri, len(cand.trigrams))
+            if score < min_score:
+                score = max(score, _jaccard(len(tokens & cand.tokens), len(tokens), len(cand.tokens)))
+            if score >= min_score:
+                scored.append(CandidateMatch(cand, score, "fuzzy"))
+        scored.sort(key=lambda m: m.score, reverse=True)
+        return scored[:max_candidates]
+
+
+@dataclass
+class PrematchResult:
+    """Outcome of the deterministic pass."""
+
+    resolved: list[dict[str, Any]] = field(default_factory=list)
+    ambiguous: list[dict[str, Any]] = field(default_factory=list)
+    stats: Counter = field(default_factory=Counter)
+
+
+def prematch_entities(
+    entities: list[dict[str, Any]],
+    index: CandidateIndex,
+    *,
+    auto_threshold: float = 0.9,
+    ambiguity_margin: float = 0.1,
+    min_score: float = 0.3,
+    max_candidates: int = 5,
+    incomplete_labels: Iterable[str] = (),
+) -> PrematchResult:
+    """
+    Resolve document entities against the index where the answer is clear.
+
+    An entity is auto-resolved when its best candidate scores at least
+    auto_threshold and no other candidate is within ambiguity_margin of it
+    (a unique exact name match always qualifies). A fuzzy best candidate from
+    an incomplete label is never auto-resolved, since the nodes that were not
+    loaded may hold a better match. Everything else, including entities
+    without any candidate above min_score, is returned as ambiguous with its
+    top candidates (possibly none) for the agent.
+
+    Args:
+        entities: Document entities with document_entity_id, document_entity_name, summary
+        index: CandidateIndex over domain nodes
+        incomplete_labels: Node labels whose domain nodes were only partly loaded
+
+    Returns:
+        PrematchResult with resolved records (ResolvedEntityRecord shape plus
+        match_method/match_score), ambiguous entities with "candidates", and counts.
+    """
+    result = PrematchResult()
+    incomplete_labels = set(incomplete_labels)
+    seen: set[tuple[Optional[str], str]] = set()
+    for ent in entities:
+        name = (ent.get("document_entity_name") or "").strip()
+        key = (ent.get("document_entity_id"), name)
+        if not name or key in seen:
+            continue
+        seen.add(key)
+        record = {
+            "document_entity_id": ent.get("document_entity_id"),
+            "document_entity_name": name,
+            "summary": ent.get("summary"),
+            "domain_node_id": None,
+            "domain_entity_name": None,
+            "domain_entity_type": None,
+        }
+        matches = index.match(name, max_candidates=max_candidates, min_score=min_score)
+        if not matches:
+            record["candidates"] = []
+            result.ambiguous.append(record)
+            result.stats["no_candidates"] += 1
+            continue
+
+        best = matches[0]
+        runner_up = matches[1].score if len(matches) > 1 else 0.0
+        complete = best.method == "exact" or best.candidate.node_label not in incomplete_labels
+        if best.score >= auto_threshold and best.score - runner_up >= ambiguity_margin and complete:
+            record.update(
+                domain_node_id=best.candidate.node_id,
+                domain_entity_name=best.candidate.name,
+                domain_entity_type=best.candidate.node_label,
+                match_method=best.method,
+                match_score=round(best.score, 3),
+            )
+            result.resolved.append(record)
+            result.stats[best.method] += 1
+            continue
+
+        record["candidates"] = [m.to_dict() for m in matches]
+        result.ambiguous.append(record)
+        result.stats["ambiguous"] += 1
+    return result
+
+
+__all__ = [
+    "CandidateIndex",
+    "CandidateMatch",
+    "DomainCandidate",
+    "PrematchResult",
+    "normalize_name",
+    "prematch_entities",
+]
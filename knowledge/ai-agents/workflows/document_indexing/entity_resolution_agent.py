@@ -2,16 +2,22 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
+import time
+from collections import OrderedDict
 from typing import Any, Optional
 
 from pydantic_ai import RunContext
 
 from app.config import Config
 from app.workflows.document_indexing import entity_cache
+from app.workflows.document_indexing import entity_matching
 from app.workflows.document_indexing import neo4j_document_graph
 from app.workflows.document_indexing import storage
-from app.workflows.document_indexing.config import load_config
+from app.workflows.document_indexing.config import DocumentIndexingConfig, load_config
+from app.workflows.document_indexing.models import SemanticEntity
 from app.workflows.document_indexing.status_tracker import update_attachment_status
 from app.core.authenticated_graphql_client import run_graphql
 
@@ -34,6 +40,24 @@ query ExecuteCypher($cypherQuery: String!, $workspaceId: UUID) {
 }
 """.strip()
 
+# Document entities for the deterministic pre-match (same shape the agent is prompted to fetch)
+_DOCUMENT_ENTITIES_CYPHER = """
+MATCH (ep:Episodic)-[:MENTIONS]->(ent:Entity)
+WHERE ep.group_id = $group_id AND ep.doc_id = $doc_id
+RETURN DISTINCT elementId(ent) AS document_entity_id, ent.name AS document_entity_name, ent.summary AS summary
+""".strip()
+_MAX_DOCUMENT_ENTITIES = 5000
+
+# Domain node properties tried, in order, for a node's display name
+_NAME_PROPERTIES = ("name", "title", "label", "display_name", "displayName")
+
+# Candidate indexes per (tenant, workspace, settings), reused across documents for a few minutes.
+# Entries are (expiry, index, labels loaded only up to the node limit); least recently
+# used entries are evicted beyond _MAX_CANDIDATE_INDEXES.
+_INDEX_TTL_SECONDS = 300
+_MAX_CANDIDATE_INDEXES = 16
+_candidate_indexes: OrderedDict[tuple, tuple[float, entity_matching.CandidateIndex, frozenset[str]]] = OrderedDict()
+
 
 # ---------------------------------------------------------------------------
 # Pydantic models for agent output (match user spec)
@@ -154,6 +178,172 @@ async def _run_agent_with_tool_limit(agent: Any, prompt: str, deps: dict[str, An
     return result
 
 
+async def _run_domain_cypher(
+    tenant_id: str, query: str, workspace_id: Optional[str] = None
+) -> list[dict[str, Any]]:
+    """Run Cypher against the domain graph via GraphQL; returns nodes as {id, labels, **properties}."""
+    variables = {"cypherQuery": query}
+    if workspace_id:
+        variables["workspaceId"] = workspace_id
+    result = await run_graphql(
+        _DOMAIN_CYPHER_QUERY,
+        variables,
+        tenant_id=tenant_id,
+        timeout=30,
+    )
+    formatted = []
+    for node in result.get("graphNodesByCypher", []):
+        if not node:
+            continue
+        props = {p["key"]: p["value"] for p in node.get("properties", [])}
+        formatted.append({"id": node.get("id"), "labels": node.get("labels", []), **props})
+    return formatted
+
+
+def _name_property(entity: SemanticEntity) -> str:
+    """Property holding a domain node's name, from the semantic entity's fields."""
+    field_names = [f.name for f in entity.fields if f.name]
+    for prop in _NAME_PROPERTIES:
+        if prop in field_names:
+            return prop
+    for name in field_names:
+        if "name" in name.lower():
+            return name
+    return "name"
+
+
+async def _load_domain_candidates(
+    tenant_id: str,
+    workspace_id: Optional[str],
+    entities: list[SemanticEntity],
+    limit: int,
+) -> Optional[tuple[list[entity_matching.DomainCandidate], frozenset[str]]]:
+    """
+    Domain nodes for every ontology entity label, and the labels that had more
+    than limit nodes (only the first limit, by element id, are loaded).
+
+    None if no label could be loaded.
+    """
+    truncated: set[str] = set()
+
+    async def load(entity: SemanticEntity) -> Optional[list[entity_matching.DomainCandidate]]:
+        label = entity.node_label.replace("`", "")
+        name_prop = _name_property(entity)
+        try:
+            # One extra row tells a label that fits the limit from one that does not
+            nodes = await _run_domain_cypher(
+                tenant_id, f"MATCH (n:`{label}`) RETURN n ORDER BY elementId(n) LIMIT {limit + 1}", workspace_id
+            )
+        except Exception as e:
+            logger.warning("Pre-match: failed to load domain nodes for %s: %s", label, e)
+            return None
+        if len(nodes) > limit:
+            nodes = nodes[:limit]
+            truncated.add(entity.node_label)
+            logger.warning(
+                "Pre-match: %s has more than %d domain nodes; loaded %d, its fuzzy matches go to the agent",
+                label, limit, limit,
+            )
+        out = []
+        for node in nodes:
+            name = node.get(name_prop) or next(
+                (node[p] for p in _NAME_PROPERTIES if isinstance(node.get(p), str) and node[p]), None
+            )
+            if node.get("id") and isinstance(name, str):
+                out.append(entity_matching.DomainCandidate(node_id=str(node["id"]), name=name, node_label=entity.node_label))
+        return out
+
+    loaded = await asyncio.gather(*(load(e) for e in entities if e.node_label))
+    if not loaded or all(nodes is None for nodes in loaded):
+        return None
+    return [cand for nodes in loaded if nodes for cand in nodes], frozenset(truncated)
+
+
+async def _get_candidate_index(
+    tenant_id: str,
+    workspace_id: Optional[str],
+    workflow_config: DocumentIndexingConfig,
+) -> Optional[tuple[entity_matching.CandidateIndex, frozenset[str]]]:
+    """
+    Cached blocking index over the tenant's domain nodes, with the labels that were
+    only partly loaded; None if the nodes cannot be loaded.
+    """
+    limit = workflow_config.entity_prematch_domain_node_limit
+    use_minhash = workflow_config.entity_prematch_use_minhash
+    key = (tenant_id, workspace_id, limit, use_minhash)
+    cached = _candidate_indexes.get(key)
+    if cached and cached[0] > time.monotonic():
+        _candidate_indexes.move_to_end(key)
+        return cached[1], cached[2]
+
+    entities = await entity_cache.get_semantic_entities(tenant_id)
+    if not entities:
+        return None
+    loaded = await _load_domain_candidates(tenant_id, workspace_id, entities, limit)
+    if loaded is None:
+        return None
+    candidates, truncated = loaded
+    index = await asyncio.to_thread(entity_matching.CandidateIndex, candidates, use_minhash)
+    _store_candidate_index(key, index, truncated)
+    return index, truncated
+
+
+def _store_candidate_index(
+    key: tuple, index: entity_matching.CandidateIndex, truncated: frozenset[str]
+) -> None:
+    """Cache an index, dropping expired entries and then the least recently used."""
+    now = time.monotonic()
+    for stale in [k for k, entry in _candidate_indexes.items() if entry[0] <= now]:
+        del _candidate_indexes[stale]
+    _candidate_indexes[key] = (now + _INDEX_TTL_SECONDS, index, truncated)
+    _candidate_indexes.move_to_end(key)
+    while len(_candidate_indexes) > _MAX_CANDIDATE_INDEXES:
+        _candidate_indexes.popitem(last=False)
+
+
+async def _prematch_document_entities(
+    tenant_id: str,
+    doc_id: str,
+    workspace_id: Optional[str],
+    workflow_config: DocumentIndexingConfig,
+) -> Optional[entity_matching.PrematchResult]:
+    """
+    Deterministic pass: match document entities to domain nodes by name.
+
+    Returns None when the document entities or domain nodes cannot be loaded, in
+    which case the agent resolves every entity itself.
+    """
+    doc = await neo4j_document_graph.run_document_cypher(
+        tenant_id, doc_id, _DOCUMENT_ENTITIES_CYPHER, max_results=_MAX_DOCUMENT_ENTITIES
+    )
+    if doc.get("error") or doc.get("truncated"):
+        logger.info("Pre-match skipped for doc %s: %s", doc_id[:8], doc.get("error") or "too many entities")
+        return None
+    cached = await _get_candidate_index(tenant_id, workspace_id, workflow_config)
+    if cached is None:
+        return None
+    index, truncated = cached
+    result = await asyncio.to_thread(
+        entity_matching.prematch_entities,
+        doc["results"],
+        index,
+        auto_threshold=workflow_config.entity_prematch_auto_threshold,
+        ambiguity_margin=workflow_config.entity_prematch_ambiguity_margin,
+        min_score=workflow_config.entity_prematch_min_score,
+        max_candidates=workflow_config.entity_prematch_max_candidates,
+        incomplete_labels=truncated,
+    )
+    logger.info(
+        "Pre-match doc %s: %d entities vs %d domain nodes (%d labels truncated) -> %s",
+        doc_id[:8],
+        len(doc["results"]),
+        len(index),
+        len(truncated),
+        dict(result.stats),
+    )
+    return result
+
+
 async def _run_entity_resolution_agent(
     tenant_id: str,
     doc_id: str,
@@ -193,7 +383,7 @@ async def _run_entity_resolution_agent(
     async def query_document_graph(
         ctx: RunContext[dict], query: str, max_results: int = 500
     ) -> dict[str, Any]:
-        """Execute read-only Cypher against the document's Neo4j subgraph. Scope with $episode_prefix and $group_id. Schema: Episodic (chunk nodes), Entity (name, summary), (ep)-[:MENTIONS]->(ent). Return entities with name and summary for reconciliation."""
+        """Execute read-only Cypher against the document's Neo4j subgraph. Scope with WHERE ep.group_id = $group_id AND ep.doc_id = $doc_id. Schema: Episodic (chunk nodes), Entity (name, summary), (ep)-[:MENTIONS]->(ent). Return entities with name and summary for reconciliation."""
         tid = ctx.deps.get("tenant_id") or tenant_id
         did = ctx.deps.get("doc_id") or doc_id
         return await neo4j_document_graph.run_document_cypher(
@@ -207,26 +397,10 @@ async def _run_entity_resolution_agent(
         q = query.strip()
         if "LIMIT" not in q.upper():
             q = f"{q} LIMIT {max_results + 1}"
-        workspace_id = ctx.deps.get("workspace_id")
-        variables = {"cypherQuery": q}
-        if workspace_id:
-            variables["workspaceId"] = workspace_id
         try:
-            result = await run_graphql(
-                _DOMAIN_CYPHER_QUERY,
-                variables,
-                tenant_id=tid,
-                timeout=30,
-            )
+            formatted = await _run_domain_cypher(tid, q, ctx.deps.get("workspace_id"))
         except Exception as e:
             return {"error": str(e), "results": [], "count": 0}
-        nodes = result.get("graphNodesByCypher", [])
-        formatted = []
-        for node in nodes:
-            if not node:
-                continue
-            props = {p["key"]: p["value"] for p in node.get("properties", [])}
-            formatted.append({"id": node.get("id"), "labels": node.get("labels", []), **props})
         return {"results": formatted, "count": len(formatted), "truncated": len(formatted) > max_results}
 
     async def write_note(ctx: RunContext[dict], key: str, content: str) -> dict[str, Any]:
@@ -243,6 +417,17 @@ async def _run_entity_resolution_agent(
 
     # Load workflow config (with fallback to environment variables for backward compatibility)
     workflow_config = load_config()
+
+    # Deterministic pre-pass: clear name matches never reach the LLM
+    prematch = None
+    if workflow_config.entity_prematch_enabled:
+        try:
+            prematch = await _prematch_document_entities(tenant_id, doc_id, workspace_id, workflow_config)
+        except Exception as e:
+            logger.warning("Entity pre-match failed; agent resolves all entities: %s", e)
+    if prematch is not None and not prematch.ambiguous:
+        return _with_provenance(prematch.resolved, source, source_url)
+
     try:
         model = workflow_config.entity_resolution_model.create()
     except Exception as e:
@@ -272,10 +457,10 @@ async def _run_entity_resolution_agent(
 
     system_prompt = """You are an entity resolution expert. Your job is to reconcile document entities to the domain graph.
 
-Document graph: Episodic nodes (chunks) link to Entity nodes via MENTIONS. Each Entity has name and summary (facts about that entity). Scope queries with WHERE ep.name STARTS WITH $episode_prefix AND ep.group_id = $group_id.
+Document graph: Episodic nodes (chunks) link to Entity nodes via MENTIONS. Each Entity has name and summary (facts about that entity). Scope queries with WHERE ep.group_id = $group_id AND ep.doc_id = $doc_id.
 
 Workflow:
-1. Use query_document_graph to run Cypher that returns all Entity nodes linked to this document's episodes—include entity id (element_id(ent)), name, and summary. Example: MATCH (ep:Episodic)-[:MENTIONS]->(ent:Entity) WHERE ep.name STARTS WITH $episode_prefix AND ep.group_id = $group_id RETURN elementId(ent) AS document_entity_id, ent.name AS document_entity_name, ent.summary AS summary LIMIT 500
+1. Use query_document_graph to run Cypher that returns all Entity nodes linked to this document's episodes—include entity id (element_id(ent)), name, and summary. Example: MATCH (ep:Episodic)-[:MENTIONS]->(ent:Entity) WHERE ep.group_id = $group_id AND ep.doc_id = $doc_id RETURN elementId(ent) AS document_entity_id, ent.name AS document_entity_name, ent.summary AS summary LIMIT 500
 2. For each document entity, use its summary as context. Use get_ontology and query_domain_graph to find a matching domain node when possible (by name, type, or description).
 3. Output one ResolvedEntityRecord per document entity. Set document_entity_id, document_entity_name, summary (optional). Set domain_node_id, domain_entity_name, domain_entity_type when you find a match; otherwise leave them null.
 
@@ -284,11 +469,19 @@ Output: ResolvedEntitiesOutput with entities list. Each ResolvedEntityRecord has
     prompt = f"""Reconcile document entities to the domain graph for this document. Document name: {source or doc_id}. Document URL: {source_url or ''}.
 
 Steps:
-1. Call query_document_graph with Cypher to fetch all Entity nodes for this document's episodes (include document_entity_id, document_entity_name, summary). Use $episode_prefix and $group_id in WHERE.
+1. Call query_document_graph with Cypher to fetch all Entity nodes for this document's episodes (include document_entity_id, document_entity_name, summary). Use $group_id and $doc_id in WHERE.
 2. For each entity, use its summary as context and query_domain_graph to find a matching domain node. Set domain_node_id, domain_entity_name, domain_entity_type when matched.
 3. Return ResolvedEntitiesOutput with one record per document entity; include domain_node_id when a match was found."""
 
     max_tool_calls = getattr(Config, "ENTITY_RESOLUTION_MAX_TOOL_CALLS", _DEFAULT_MAX_TOOL_CALLS)
+    if prematch is not None:
+        resolved = await _resolve_ambiguous_entities(
+            agent, deps, prematch.ambiguous, source, doc_id,
+            batch_size=workflow_config.entity_resolution_batch_size,
+            max_tool_calls=max_tool_calls,
+        )
+        return _with_provenance(prematch.resolved + resolved, source, source_url)
+
     result = await _run_agent_with_tool_limit(agent, prompt, deps, max_tool_calls)
     if result is None:
         return []
@@ -296,10 +489,79 @@ Steps:
     if not out_obj or not getattr(out_obj, "entities", None):
         return []
     out_list = [_resolved_entity_record_to_dict(r) for r in out_obj.entities]
-    for d in out_list:
+    return _with_provenance(out_list, source, source_url)
+
+
+def _with_provenance(records: list[dict[str, Any]], source: str, source_url: str) -> list[dict[str, Any]]:
+    for d in records:
         d.setdefault("source", source)
         d.setdefault("source_url", source_url)
-    return out_list
+    return records
+
+
+async def _resolve_ambiguous_entities(
+    agent: Any,
+    deps: dict[str, Any],
+    ambiguous: list[dict[str, Any]],
+    source: str,
+    doc_id: str,
+    *,
+    batch_size: int,
+    max_tool_calls: int,
+) -> list[dict[str, Any]]:
+    """
+    Ask the agent to pick among pre-matched candidates, batch_size entities per run.
+
+    Entities the agent does not return (run failed or hit the tool limit) are
+    recorded unmatched, keeping their candidates for review.
+    """
+    out: list[dict[str, Any]] = []
+    for start in range(0, len(ambiguous), batch_size):
+        batch = ambiguous[start:start + batch_size]
+        listing = json.dumps(
+            [
+                {
+                    "document_entity_id": e["document_entity_id"],
+                    "document_entity_name": e["document_entity_name"],
+                    "summary": (e.get("summary") or "")[:500],
+                    "candidates": e["candidates"],
+                }
+                for e in batch
+            ],
+            ensure_ascii=False,
+        )
+        prompt = f"""Reconcile these document entities to the domain graph. Document name: {source or doc_id}.
+
+Each entity lists candidate domain nodes found by name similarity (score 0-1). Using the entity's summary as context, pick the candidate it refers to. Call query_domain_graph only if you must inspect a candidate's properties to decide, or to search for an entity whose candidate list is empty or does not fit (it may be known under an alias or abbreviation); do not query the document graph. If no domain node fits, leave the domain fields null.
+
+Entities:
+{listing}
+
+Return ResolvedEntitiesOutput with exactly one record per entity above, copying document_entity_id and document_entity_name, and setting domain_node_id, domain_entity_name and domain_entity_type from the chosen candidate."""
+        try:
+            result = await _run_agent_with_tool_limit(agent, prompt, deps, max_tool_calls)
+        except Exception as e:
+            logger.warning("Entity resolution agent failed on ambiguous batch: %s", e)
+            result = None
+        answers: dict[Any, dict[str, Any]] = {}
+        if result is not None and getattr(result.output, "entities", None):
+            for rec in result.output.entities:
+                d = _resolved_entity_record_to_dict(rec)
+                answers[d.get("document_entity_id") or d.get("document_entity_name")] = d
+        for ent in batch:
+            chosen = answers.get(ent["document_entity_id"]) or answers.get(ent["document_entity_name"]) or {}
+            record = {k: v for k, v in ent.items() if k != "candidates"}
+            if chosen.get("domain_node_id"):
+                record.update(
+                    domain_node_id=chosen["domain_node_id"],
+                    domain_entity_name=chosen.get("domain_entity_name"),
+                    domain_entity_type=chosen.get("domain_entity_type"),
+                    match_method="agent",
+                )
+            else:
+                record.update(match_method="agent" if chosen else "unresolved", candidates=ent["candidates"])
+            out.append(record)
+    return out
 
 
 async def _run_assertion_mining_agent(
@@ -335,7 +597,7 @@ async def _run_assertion_mining_agent(
     async def query_document_graph(
         ctx: RunContext[dict], query: str, max_results: int = 500
     ) -> dict[str, Any]:
-        """Execute read-only Cypher against the document's Neo4j subgraph. Scope queries with $episode_prefix and $group_id. Schema: Episodic (chunk nodes: name, group_id); Entity (nodes with name, summary); (ep)-[:MENTIONS]->(ent). Each Entity's summary field contains facts about that entity—use these to derive assertions. Only MATCH/RETURN allowed."""
+        """Execute read-only Cypher against the document's Neo4j subgraph. Scope queries with WHERE ep.group_id = $group_id AND ep.doc_id = $doc_id. Schema: Episodic (chunk nodes: name, group_id, doc_id); Entity (nodes with name, summary); (ep)-[:MENTIONS]->(ent). Each Entity's summary field contains facts about that entity—use these to derive assertions. Only MATCH/RETURN allowed."""
         tid = ctx.deps.get("tenant_id") or tenant_id
         did = ctx.deps.get("doc_id") or doc_id
         return await neo4j_document_graph.run_document_cypher(
@@ -383,7 +645,7 @@ async def _run_assertion_mining_agent(
     system_prompt = """You are an assertion mining expert. Your job is to derive structured assertions from the document graph.
 
 Document graph schema:
-- Episodic: each node represents a chunk of the document (properties: name, group_id). Scope with WHERE ep.name STARTS WITH $episode_prefix AND ep.group_id = $group_id.
+- Episodic: each node represents a chunk of the document (properties: name, group_id, doc_id). Scope with WHERE ep.group_id = $group_id AND ep.doc_id = $doc_id.
 - Entity: nodes for people, things, concepts mentioned in the document (properties: name, summary). The summary field contains facts about that entity—this is your main source for assertions.
 - (ep:Episodic)-[:MENTIONS]->(ent:Entity) links each chunk to the entities it mentions.
 
@@ -392,9 +654,9 @@ Workflow:
 2. Read the summary text on each Entity; it contains facts (relationships, actions, attributes) about that entity and others.
 3. Turn those facts into assertions of the form "source_entity <assertion> terminal_entity".
 
-Example query to get entities by the episode they were mentioned in (use $episode_prefix and $group_id; the tool injects these):
+Example query to get entities by the episode they were mentioned in (use $group_id and $doc_id; the tool injects these):
   MATCH (ep:Episodic)-[:MENTIONS]->(ent:Entity)
-  WHERE ep.name STARTS WITH $episode_prefix AND ep.group_id = $group_id
+  WHERE ep.group_id = $group_id AND ep.doc_id = $doc_id
   RETURN ep.name AS episode_name, ent.name AS entity_name, ent.summary AS entity_summary
   LIMIT 500
 
@@ -407,7 +669,7 @@ Output: MiningAssertionOutput with assertions list. Each MiningAssertionRecord h
 Steps:
 1. Call query_document_graph with Cypher to fetch all Entity nodes linked to this document's Episodic (chunk) nodes. Example query (entities by episode):
    MATCH (ep:Episodic)-[:MENTIONS]->(ent:Entity)
-   WHERE ep.name STARTS WITH $episode_prefix AND ep.group_id = $group_id
+   WHERE ep.group_id = $group_id AND ep.doc_id = $doc_id
    RETURN ep.name AS episode_name, ent.name AS entity_name, ent.summary AS entity_summary
    LIMIT 500
 2. From each Entity's summary (facts about that entity), derive assertions: source_entity <assertion> terminal_entity.
@@ -474,26 +736,10 @@ async def _run_entity_resolution_phase2_agent(
         q = query.strip()
         if "LIMIT" not in q.upper():
             q = f"{q} LIMIT {max_results + 1}"
-        workspace_id = ctx.deps.get("workspace_id")
-        variables = {"cypherQuery": q}
-        if workspace_id:
-            variables["workspaceId"] = workspace_id
         try:
-            result = await run_graphql(
-                _DOMAIN_CYPHER_QUERY,
-                variables,
-                tenant_id=tid,
-                timeout=30,
-            )
+            formatted = await _run_domain_cypher(tid, q, ctx.deps.get("workspace_id"))
         except Exception as e:
             return {"error": str(e), "results": [], "count": 0}
-        nodes = result.get("graphNodesByCypher", [])
-        formatted = []
-        for node in nodes:
-            if not node:
-                continue
-            props = {p["key"]: p["value"] for p in node.get("properties", [])}
-            formatted.append({"id": node.get("id"), "labels": node.get("labels", []), **props})
         return {"results": formatted, "count": len(formatted), "truncated": len(formatted) > max_results}
 
     # Load workflow config (with fallback to environment variables for backward compatibility)
@@ -126,7 +126,8 @@ async def ingest_document_into_graphiti(
     """
     Ingest document text into Graphiti as episodes (one per chunk or per span).
 
-    Uses group_id for tenant isolation. Episode names include doc_id for provenance.
+    Uses group_id for tenant isolation. Episode names include doc_id for provenance,
+    and each added episode is stamped with a doc_id property for indexed lookup.
 
     Args:
         tenant_id: Tenant identifier (used as group_id namespace).
@@ -181,12 +182,15 @@ async def ingest_document_into_graphiti(
     workflow_config = load_config()
     semaphore_limit = getattr(Config, "SEMAPHORE_LIMIT", None) or workflow_config.semaphore_limit
     semaphore = asyncio.Semaphore(semaphore_limit)
+    # Added episodes, to stamp with doc_id once Graphiti has saved them
+    episode_uuids: list[str] = []
+    episode_names: list[str] = []
 
     async def add_episode_with_semaphore(text: str, name: str) -> bool:
         """Add episode with semaphore-controlled concurrency."""
         async with semaphore:
             try:
-                await client.add_episode(
+                result = await client.add_episode(
                     name=name,
                     episode_body=text,
                     source=EpisodeType.text,
@@ -194,6 +198,11 @@ async def ingest_document_into_graphiti(
                     reference_time=ref_time,
                     group_id=group,
                 )
+                uuid = getattr(getattr(result, "episode", None), "uuid", None)
+                if uuid:
+                    episode_uuids.append(uuid)
+                else:
+                    episode_names.append(name)
                 return True
             except Exception as e:
                 logger.warning("Graphiti add_episode failed for %s: %s", name, e)
@@ -205,6 +214,10 @@ async def ingest_document_into_graphiti(
     count = sum(1 for r in results if r is True and not isinstance(r, Exception))
 
     if count:
+        # Per-document reads look episodes up by the indexed (group_id, doc_id)
+        from app.workflows.document_indexing.neo4j_document_graph import stamp_episode_doc_id
+
+        await stamp_episode_doc_id(tenant_id, doc_id, episode_uuids, episode_names)
         logger.info(
             "Graphiti ingest doc_id=%s tenant_id=%s episodes=%d",
             doc_id[:8] if doc_id else "",
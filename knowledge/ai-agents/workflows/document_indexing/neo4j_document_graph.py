@@ -1,7 +1,9 @@
 """Neo4j read client for document subgraph (Graphiti knowledge graph).
 
 Queries the same Neo4j instance used by Graphiti to return nodes and edges
-for a document's episodes (group_id + doc_id episode name prefix).
+for a document's episodes. Episodes carry a doc_id property (stamped at ingest,
+backfilled for older episodes) under a composite (group_id, doc_id) index, so
+per-document reads are index seeks rather than a name-prefix scan.
 
 Supports run_document_cypher() for agent-defined read-only Cypher with guardrails.
 """
@@ -17,6 +19,14 @@ from app.config import Config
 logger = logging.getLogger(__name__)
 
 _neo4j_driver: Optional[Any] = None
+_doc_index_ready: bool = False
+# (group_id, doc_id) pairs already checked for legacy (unstamped) episodes
+_legacy_checked: set[tuple[str, str]] = set()
+
+EPISODE_DOC_INDEX_QUERY = """
+CREATE INDEX episodic_group_doc IF NOT EXISTS
+FOR (ep:Episodic) ON (ep.group_id, ep.doc_id)
+"""
 
 try:
     from neo4j import AsyncGraphDatabase
@@ -106,12 +116,153 @@ async def _get_driver():
             auth=(Config.NEO4J_USER, Config.NEO4J_PASSWORD),
         )
         await _neo4j_driver.verify_connectivity()
+        await _ensure_episode_doc_index(_neo4j_driver)
         return _neo4j_driver
     except Exception as e:
         logger.warning("Failed to create Neo4j driver: %s", e)
         return None
 
 
+async def _ensure_episode_doc_index(driver: Any) -> None:
+    """Create the (group_id, doc_id) index on Episodic once per process."""
+    global _doc_index_ready
+    if _doc_index_ready:
+        return
+    try:
+        async with driver.session() as session:
+            await session.run(EPISODE_DOC_INDEX_QUERY)
+        _doc_index_ready = True
+    except Exception as e:
+        logger.warning("Failed to create Episodic doc_id index: %s", e)
+
+
+async def stamp_episode_doc_id(
+    tenant_id: str,
+    doc_id: str,
+    episode_uuids: Optional[list[str]] = None,
+    episode_names: Optional[list[str]] = None,
+) -> int:
+    """
+    Set doc_id on a document's Episodic nodes after Graphiti has saved them.
+
+    Graphiti replaces all episode properties when it saves an episode, so this
+    must run after add_episode returns. Episodes are matched by uuid when known
+    (Graphiti indexes it), else by name within the tenant's group.
+
+    Returns:
+        Number of episodes stamped; 0 if Neo4j is not configured or the write fails.
+    """
+    driver = await _get_driver()
+    if driver is None or not doc_id or not (episode_uuids or episode_names):
+        return 0
+    group = _group_id(tenant_id or "")
+    stamped = 0
+    try:
+        async with driver.session() as session:
+            if episode_uuids:
+                result = await session.run(
+                    """
+                    MATCH (ep:Episodic) WHERE ep.uuid IN $uuids
+                    SET ep.doc_id = $doc_id
+                    RETURN count(ep) AS stamped
+                    """,
+                    {"uuids": episode_uuids, "doc_id": doc_id},
+                )
+                record = await result.single()
+                stamped += record.get("stamped", 0) if record else 0
+            if episode_names:
+                result = await session.run(
+                    """
+                    MATCH (ep:Episodic)
+                    WHERE ep.group_id = $group_id AND ep.name IN $names
+                    SET ep.doc_id = $doc_id
+                    RETURN count(ep) AS stamped
+                    """,
+                    {"group_id": group, "names": episode_names, "doc_id": doc_id},
+                )
+                record = await result.single()
+                stamped += record.get("stamped", 0) if record else 0
+    except Exception as e:
+        logger.warning("Failed to stamp doc_id on episodes for doc %s: %s", doc_id[:8], e)
+    return stamped
+
+
+# Episode names are doc_{doc_id}_chunk_{i} or doc_{doc_id}_span_{i}_{span}; unparseable
+# names get doc_id '' so they are not picked up again.
+_BACKFILL_BATCH_QUERY = """
+MATCH (ep:Episodic)
+WHERE ep.doc_id IS NULL AND ep.name STARTS WITH 'doc_'
+WITH ep LIMIT $batch_size
+WITH ep, substring(ep.name, 4) AS rest
+SET ep.doc_id = CASE
+    WHEN rest CONTAINS '_chunk_' THEN split(rest, '_chunk_')[0]
+    WHEN rest CONTAINS '_span_' THEN split(rest, '_span_')[0]
+    ELSE ''
+END
+RETURN count(ep) AS stamped
+"""
+
+
+async def backfill_episode_doc_ids(batch_size: int = 1000) -> int:
+    """
+    Stamp doc_id on episodes ingested before doc_id existed, parsed from the episode name.
+
+    Runs in batches of batch_size (one transaction each) until no unstamped
+    document episodes remain. Safe to re-run.
+
+    Returns:
+        Total episodes stamped.
+    """
+    driver = await _get_driver()
+    if driver is None:
+        return 0
+    total = 0
+    while True:
+        async with driver.session() as session:
+            result = await session.run(_BACKFILL_BATCH_QUERY, {"batch_size": batch_size})
+            record = await result.single()
+        stamped = record.get("stamped", 0) if record else 0
+        if not stamped:
+            break
+        total += stamped
+        logger.info("Backfilled doc_id on %d episodes (%d total)", stamped, total)
+    return total
+
+
+async def _stamp_legacy_episodes(driver: Any, group: str, doc_id: str) -> int:
+    """
+    Stamp doc_id on this document's episodes found by the old name-prefix scan.
+
+    Covers documents ingested before doc_id was stamped when the backfill has not
+    run yet. Checked at most once per document per process, so the prefix scan
+    is paid only on the first miss.
+    """
+    key = (group, doc_id)
+    if key in _legacy_checked:
+        return 0
+    _legacy_checked.add(key)
+    try:
+        async with driver.session() as session:
+            result = await session.run(
+                """
+                MATCH (ep:Episodic)
+                WHERE ep.group_id = $group_id AND ep.name STARTS WITH $episode_prefix
+                  AND ep.doc_id IS NULL
+                SET ep.doc_id = $doc_id
+                RETURN count(ep) AS stamped
+                """,
+                {"group_id": group, "episode_prefix": f"doc_{doc_id}_", "doc_id": doc_id},
+            )
+            record = await result.single()
+        stamped = record.get("stamped", 0) if record else 0
+        if stamped:
+            logger.info("Stamped doc_id on %d legacy episodes for doc %s", stamped, doc_id[:8])
+        return stamped
+    except Exception as e:
+        logger.warning("Legacy episode doc_id stamp failed: %s", e)
+        return 0
+
+
 async def run_document_cypher(
     tenant_id: str,
     doc_id: str,
@@ -125,8 +276,10 @@ async def run_document_cypher(
     Guardrails:
     - Rejects queries containing write clauses (CREATE, MERGE, SET, DELETE, REMOVE, DROP, DETACH, FOREACH).
     - Runs inside a read transaction (execute_read).
-    - Injects $episode_prefix and $group_id so the query can scope to this doc/tenant; the agent
-      must use these in WHERE (e.g. WHERE ep.name STARTS WITH $episode_prefix AND ep.group_id = $group_id).
+    - Injects $group_id and $doc_id so the query can scope to this doc/tenant through the
+      (group_id, doc_id) index; the agent must use these in WHERE
+      (e.g. WHERE ep.group_id = $group_id AND ep.doc_id = $doc_id). $episode_prefix is still
+      injected for older queries that filter on the episode name.
     - Adds LIMIT if the query does not already contain LIMIT (cap at max_results).
 
     Returns:
@@ -157,10 +310,11 @@ async def run_document_cypher(
         }
 
     group = _group_id(tenant_id or "")
-    episode_prefix = f"doc_{doc_id}_"
+    await _stamp_legacy_episodes(driver, group, doc_id)
     run_params: dict[str, Any] = dict(params) if params else {}
-    run_params["episode_prefix"] = episode_prefix
+    run_params["episode_prefix"] = f"doc_{doc_id}_"
     run_params["group_id"] = group
+    run_params["doc_id"] = doc_id
 
     run_cypher = cypher.strip().rstrip(";")
     if "LIMIT" not in run_cypher.upper():
@@ -204,25 +358,21 @@ async def count_document_episodes(tenant_id: str, doc_id: str) -> int:
         return 0
     
     group = _group_id(tenant_id or "")
-    episode_prefix = f"doc_{doc_id}_"
     
     count_query = """
     MATCH (ep:Episodic)
-    WHERE ep.name STARTS WITH $episode_prefix
-      AND ep.group_id = $group_id
+    WHERE ep.group_id = $group_id AND ep.doc_id = $doc_id
     RETURN count(ep) AS episode_count
     """
     
     try:
         async with driver.session() as session:
-            result = await session.run(
-                count_query,
-                {"episode_prefix": episode_prefix, "group_id": group}
-            )
+            result = await session.run(count_query, {"group_id": group, "doc_id": doc_id})
             record = await result.single()
-            if record:
-                return record.get("episode_count", 0)
-            return 0
+            count = record.get("episode_count", 0) if record else 0
+        if count == 0 and await _stamp_legacy_episodes(driver, group, doc_id):
+            return await count_document_episodes(tenant_id, doc_id)
+        return count
     except Exception as e:
         logger.warning("Failed to count document episodes: %s", e)
         return 0
@@ -232,7 +382,7 @@ async def get_document_subgraph(tenant_id: str, doc_id: str) -> dict[str, Any]:
     """
     Return nodes and edges for the document's subgraph in Graphiti's Neo4j.
 
-    Episodes are keyed by group_id (tenant_{tenant_id}) and name prefix doc_{doc_id}_.
+    Episodes are keyed by group_id (tenant_{tenant_id}) and doc_id (indexed together).
     Entities connected via MENTIONS; entity-entity edges included when present.
 
     Returns:
@@ -250,7 +400,7 @@ async def get_document_subgraph(tenant_id: str, doc_id: str) -> dict[str, Any]:
         }
 
     group = _group_id(tenant_id or "")
-    episode_prefix = f"doc_{doc_id}_"
+    scope = {"group_id": group, "doc_id": doc_id}
 
     # Graphiti: Episodic nodes have name, group_id; Entity nodes linked via MENTIONS.
     # Labels: Episodic (episode nodes), Entity.
@@ -284,19 +434,17 @@ async def get_document_subgraph(tenant_id: str, doc_id: str) -> dict[str, Any]:
             return list(records) if records else []
 
     try:
-        # 1) Find episodes for this doc (name starts with doc_{doc_id}_ and group_id)
+        # 1) Find episodes for this doc via the (group_id, doc_id) index
         # Graphiti uses label Episodic for episode nodes
         episode_query = """
         MATCH (ep:Episodic)
-        WHERE ep.name STARTS WITH $episode_prefix
-          AND ep.group_id = $group_id
+        WHERE ep.group_id = $group_id AND ep.doc_id = $doc_id
         RETURN ep
         LIMIT 500
         """
-        episode_records = await run_query(
-            episode_query,
-            {"episode_prefix": episode_prefix, "group_id": group},
-        )
+        episode_records = await run_query(episode_query, scope)
+        if not episode_records and await _stamp_legacy_episodes(driver, group, doc_id):
+            episode_records = await run_query(episode_query, scope)
         for rec in episode_records:
             ep = rec.get("ep")
             if not ep:
@@ -310,15 +458,12 @@ async def get_document_subgraph(tenant_id: str, doc_id: str) -> dict[str, Any]:
 
         # 2) Entities mentioned by these episodes (MENTIONS)
         mentions_query = """
-        MATCH (ep)-[r:MENTIONS]->(ent)
-        WHERE ep.name STARTS WITH $episode_prefix AND ep.group_id = $group_id
+        MATCH (ep:Episodic)-[r:MENTIONS]->(ent)
+        WHERE ep.group_id = $group_id AND ep.doc_id = $doc_id
         RETURN ep, r, ent
         LIMIT 2000
         """
-        mention_records = await run_query(
-            mentions_query,
-            {"episode_prefix": episode_prefix, "group_id": group},
-        )
+        mention_records = await run_query(mentions_query, scope)
         for rec in mention_records:
             ep = rec.get("ep")
             ent = rec.get("ent")
@@ -333,16 +478,13 @@ async def get_document_subgraph(tenant_id: str, doc_id: str) -> dict[str, Any]:
 
         # 3) Entity-entity edges (if Graphiti creates them)
         entity_edges_query = """
-        MATCH (ep)-[:MENTIONS]->(a:Entity)-[r]->(b:Entity)
-        WHERE ep.name STARTS WITH $episode_prefix AND ep.group_id = $group_id
+        MATCH (ep:Episodic)-[:MENTIONS]->(a:Entity)-[r]->(b:Entity)
+        WHERE ep.group_id = $group_id AND ep.doc_id = $doc_id
         RETURN a, type(r) AS rel_type, b
         LIMIT 1000
         """
         try:
-            entity_edge_records = await run_query(
-                entity_edges_query,
-                {"episode_prefix": episode_prefix, "group_id": group},
-            )
+            entity_edge_records = await run_query(entity_edges_query, scope)
         except Exception:
             entity_edge_records = []
         for rec in entity_edge_records:
@@ -359,3 +501,12 @@ async def get_document_subgraph(tenant_id: str, doc_id: str) -> dict[str, Any]:
         return {"nodes": [], "edges": [], "error": str(e)}
 
     return {"nodes": list(nodes_by_id.values()), "edges": edges}
+
+
+if __name__ == "__main__":
+    # One-off backfill for episodes ingested before doc_id was stamped:
+    #   python -m app.workflows.document_indexing.neo4j_document_graph
+    import asyncio
+
+    logging.basicConfig(level=logging.INFO)
+    print(f"Backfilled doc_id on {asyncio.run(backfill_episode_doc_ids())} episodes")
@@ -0,0 +1,126 @@
+"""
+Tests for deterministic entity pre-matching and the candidate index cache.
+
+Usage:
+    pytest app/workflows/document_indexing/test_entity_matching.py
+"""
+
+import pytest
+
+from app.workflows.document_indexing.entity_matching import (
+    CandidateIndex,
+    DomainCandidate,
+    normalize_name,
+    prematch_entities,
+)
+
+
+def _index(*nodes: tuple) -> CandidateIndex:
+    return CandidateIndex(DomainCandidate(node_id=i, name=n, node_label=label) for i, n, label in nodes)
+
+
+def _entity(name: str, entity_id: str = None) -> dict:
+    return {"document_entity_id": entity_id or name, "document_entity_name": name, "summary": f"About {name}"}
+
+
+@pytest.fixture
+def index() -> CandidateIndex:
+    return _index(
+        ("d1", "Acme Corporation", "Company"),
+        ("d2", "Globex Holdings", "Company"),
+        ("d3", "Globex Holding", "Company"),
+        ("d4", "Metformin", "Medication"),
+    )
+
+
+def test_normalize_name_strips_accents_case_and_punctuation():
+    assert normalize_name("  Café-Noir, Inc. ") == "cafe noir inc"
+
+
+def test_unique_exact_match_is_auto_resolved(index):
+    result = prematch_entities([_entity("ACME corporation")], index)
+
+    assert not result.ambiguous
+    [record] = result.resolved
+    assert record["domain_node_id"] == "d1"
+    assert record["match_method"] == "exact"
+    assert record["match_score"] == 1.0
+
+
+def test_close_runner_up_goes_to_agent_with_candidates(index):
+    # Scores ~0.81 (Holding) and ~0.77 (Holdings): both clear the threshold, neither wins
+    result = prematch_entities([_entity("Globex Holdin")], index, auto_threshold=0.5, ambiguity_margin=0.1)
+
+    assert not result.resolved
+    [record] = result.ambiguous
+    assert [c["domain_node_id"] for c in record["candidates"]][:2] == ["d3", "d2"]
+    assert result.stats["ambiguous"] == 1
+
+
+def test_fuzzy_match_below_auto_threshold_goes_to_agent(index):
+    result = prematch_entities([_entity("Metformin HCl")], index, auto_threshold=0.99)
+
+    [record] = result.ambiguous
+    assert record["candidates"][0]["domain_node_id"] == "d4"
+
+
+def test_fuzzy_match_above_threshold_is_resolved(index):
+    result = prematch_entities([_entity("Metformn")], index, auto_threshold=0.5, ambiguity_margin=0.1)
+
+    [record] = result.resolved
+    assert record["domain_node_id"] == "d4"
+    assert record["match_method"] == "fuzzy"
+
+
+def test_entity_without_candidates_goes_to_agent(index):
+    # An alias shares no name with its domain node; only the agent can resolve it
+    result = prematch_entities([_entity("Glucophage")], index)
+
+    assert not result.resolved
+    [record] = result.ambiguous
+    assert record["candidates"] == []
+    assert result.stats["no_candidates"] == 1
+
+
+def test_min_score_drops_weak_candidates(index):
+    result = prematch_entities([_entity("Acme Labs")], index, min_score=0.9)
+
+    [record] = result.ambiguous
+    assert record["candidates"] == []
+
+
+def test_fuzzy_match_in_incomplete_label_goes_to_agent(index):
+    kwargs = dict(auto_threshold=0.5, ambiguity_margin=0.1)
+    result = prematch_entities([_entity("Metformn")], index, incomplete_labels={"Medication"}, **kwargs)
+
+    assert not result.resolved
+    assert result.ambiguous[0]["candidates"][0]["domain_node_id"] == "d4"
+
+
+def test_exact_match_in_incomplete_label_is_still_resolved(index):
+    result = prematch_entities([_entity("Metformin")], index, incomplete_labels={"Medication"})
+
+    assert result.resolved[0]["domain_node_id"] == "d4"
+
+
+def test_duplicate_entities_are_matched_once(index):
+    result = prematch_entities([_entity("Acme Corporation", "e1"), _entity("Acme Corporation", "e1")], index)
+
+    assert len(result.resolved) == 1
+
+
+def test_candidate_index_cache_is_bounded(monkeypatch):
+    entity_resolution_agent = pytest.importorskip("app.workflows.document_indexing.entity_resolution_agent")
+    cache = entity_resolution_agent._candidate_indexes
+    monkeypatch.setattr(entity_resolution_agent, "_MAX_CANDIDATE_INDEXES", 2)
+    cache.clear()
+    try:
+        for tenant in ("t1", "t2", "t3"):
+            entity_resolution_agent._store_candidate_index((tenant,), _index(), frozenset())
+        assert list(cache) == [("t2",), ("t3",)]
+
+        cache.move_to_end(("t2",))  # t2 used again
+        entity_resolution_agent._store_candidate_index(("t4",), _index(), frozenset())
+        assert list(cache) == [("t2",), ("t4",)]
+    finally:
+        cache.clear()
@@ -0,0 +1,140 @@
+"""
+Tests for doc_id episode lookups, the legacy name-prefix fallback and the backfill.
+
+Usage:
+    pytest app/workflows/document_indexing/test_neo4j_document_graph.py
+"""
+
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from app.workflows.document_indexing import neo4j_document_graph as doc_graph
+
+GROUP = "tenant_t1"
+
+
+class FakeResult:
+    def __init__(self, record: Dict[str, Any]):
+        self._record = record
+
+    async def single(self) -> Dict[str, Any]:
+        return self._record
+
+
+class FakeEpisodeGraph:
+    """Episodic nodes as dicts; answers the module's queries and records which ran."""
+
+    def __init__(self, episodes: List[Dict[str, Any]]):
+        self.episodes = episodes
+        self.queries: List[str] = []
+
+    def session(self) -> "FakeEpisodeGraph":
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def run(self, query: str, params: Optional[Dict[str, Any]] = None) -> FakeResult:
+        params = params or {}
+        if query == doc_graph._BACKFILL_BATCH_QUERY:
+            self.queries.append("backfill")
+            batch = [ep for ep in self.episodes if ep.get("doc_id") is None and ep["name"].startswith("doc_")]
+            for ep in batch[:params["batch_size"]]:
+                rest = ep["name"][4:]
+                sep = "_chunk_" if "_chunk_" in rest else "_span_" if "_span_" in rest else None
+                ep["doc_id"] = rest.split(sep)[0] if sep else ""
+            return FakeResult({"stamped": len(batch[:params["batch_size"]])})
+        if "STARTS WITH $episode_prefix" in query:
+            self.queries.append("prefix_scan")
+            matched = [
+                ep for ep in self.episodes
+                if ep["group_id"] == params["group_id"] and ep["name"].startswith(params["episode_prefix"])
+                and ep.get("doc_id") is None
+            ]
+            for ep in matched:
+                ep["doc_id"] = params["doc_id"]
+            return FakeResult({"stamped": len(matched)})
+        if "ep.doc_id = $doc_id" in query and "count(ep) AS episode_count" in query:
+            self.queries.append("count")
+            count = sum(1 for ep in self.episodes if ep["group_id"] == params["group_id"] and ep.get("doc_id") == params["doc_id"])
+            return FakeResult({"episode_count": count})
+        if "ep.uuid IN $uuids" in query:
+            self.queries.append("stamp_uuids")
+            matched = [ep for ep in self.episodes if ep.get("uuid") in params["uuids"]]
+            for ep in matched:
+                ep["doc_id"] = params["doc_id"]
+            return FakeResult({"stamped": len(matched)})
+        raise AssertionError(f"Unexpected query: {query}")
+
+
+def _episode(name: str, doc_id: Optional[str] = None, group_id: str = GROUP, uuid: Optional[str] = None) -> Dict[str, Any]:
+    return {"name": name, "doc_id": doc_id, "group_id": group_id, "uuid": uuid}
+
+
+@pytest.fixture
+def use_graph(monkeypatch):
+    monkeypatch.setattr(doc_graph, "_legacy_checked", set())
+
+    def install(episodes: List[Dict[str, Any]]) -> FakeEpisodeGraph:
+        graph = FakeEpisodeGraph(episodes)
+
+        async def get_driver():
+            return graph
+
+        monkeypatch.setattr(doc_graph, "_get_driver", get_driver)
+        return graph
+
+    return install
+
+
+@pytest.mark.asyncio
+async def test_count_uses_doc_id_without_prefix_scan(use_graph):
+    graph = use_graph([
+        _episode("doc_abc_chunk_0", doc_id="abc"),
+        _episode("doc_abc_chunk_1", doc_id="abc"),
+        _episode("doc_abc_chunk_0", doc_id="abc", group_id="tenant_other"),
+        _episode("doc_xyz_chunk_0", doc_id="xyz"),
+    ])
+
+    assert await doc_graph.count_document_episodes("t1", "abc") == 2
+    assert graph.queries == ["count"]
+
+
+@pytest.mark.asyncio
+async def test_legacy_episodes_are_stamped_on_first_miss_only(use_graph):
+    graph = use_graph([_episode("doc_abc_chunk_0"), _episode("doc_abc_span_1_2")])
+
+    assert await doc_graph.count_document_episodes("t1", "abc") == 2
+    assert graph.queries == ["count", "prefix_scan", "count"]
+
+    graph.queries.clear()
+    assert await doc_graph.count_document_episodes("t1", "missing") == 0
+    assert await doc_graph.count_document_episodes("t1", "missing") == 0
+    assert graph.queries == ["count", "prefix_scan", "count"]  # second miss skips the scan
+
+
+@pytest.mark.asyncio
+async def test_stamp_by_uuid_after_ingest(use_graph):
+    graph = use_graph([_episode("doc_abc_chunk_0", uuid="u1"), _episode("doc_abc_chunk_1", uuid="u2")])
+
+    assert await doc_graph.stamp_episode_doc_id("t1", "abc", episode_uuids=["u1", "u2"]) == 2
+    assert [ep["doc_id"] for ep in graph.episodes] == ["abc", "abc"]
+
+
+@pytest.mark.asyncio
+async def test_backfill_parses_doc_id_from_episode_names_in_batches(use_graph):
+    graph = use_graph([
+        _episode("doc_abc_chunk_0"),
+        _episode("doc_abc_span_3_1"),
+        _episode("doc_odd"),
+        _episode("doc_xyz_chunk_0", doc_id="xyz"),
+        _episode("meeting notes"),
+    ])
+
+    assert await doc_graph.backfill_episode_doc_ids(batch_size=2) == 3
+    assert [ep["doc_id"] for ep in graph.episodes] == ["abc", "abc", "", "xyz", None]
+    assert graph.queries == ["backfill", "backfill", "backfill"]
@@ -9,8 +9,11 @@ Connection strings are never logged in full; use mask_connection_string().
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import re
+import threading
+import time
 from dataclasses import dataclass, field
 from typing import Any, Optional
 from urllib.parse import quote_plus
@@ -18,13 +21,14 @@ from urllib.parse import quote_plus
 logger = logging.getLogger(__name__)
 
 try:
-    from sqlalchemy import create_engine, inspect
+    from sqlalchemy import create_engine, inspect, text
     from sqlalchemy.engine import Engine
     _SQLALCHEMY_AVAILABLE = True
 except ImportError:
     _SQLALCHEMY_AVAILABLE = False
     create_engine = None
     inspect = None
+    text = None
     Engine = None
 
 
@@ -56,7 +60,7 @@ def mask_connection_string(connection_string: str) -> str:
                 out.append(part)
         else:
             out.append(part)
-        return "; ".join(out)
+    return "; ".join(out)
 
 
 def _parse_sqlserver_connection_string(connection_string: str) -> Optional[str]:
@@ -136,6 +140,11 @@ class TableInfo:
     """Table metadata from introspection."""
     name: str
     columns: list[ColumnInfo] = field(default_factory=list)
+    schema: Optional[str] = None
+
+    @property
+    def qualified_name(self) -> str:
+        return f"{self.schema}.{self.name}" if self.schema else self.name
 
 
 @dataclass
@@ -144,14 +153,23 @@ class SqlSchemaSummary:
     tables: list[TableInfo] = field(default_factory=list)
     dialect: str = ""
     error: Optional[str] = None
+    total_tables: Optional[int] = None  # set when the table list is a page
+    offset: int = 0
 
     def to_agent_friendly_str(self) -> str:
         """Format for inclusion in agent context."""
         if self.error:
             return f"Schema introspection failed: {self.error}"
-        lines = [f"Database dialect: {self.dialect or 'unknown'}", ""]
+        lines = [f"Database dialect: {self.dialect or 'unknown'}"]
+        if self.total_tables is not None and len(self.tables) < self.total_tables:
+            first = self.offset + 1 if self.tables else self.offset
+            lines.append(
+                f"Showing tables {first}-{self.offset + len(self.tables)} of {self.total_tables} "
+                f"(use offset/limit to page)"
+            )
+        lines.append("")
         for table in self.tables:
-            lines.append(f"Table: {table.name}")
+            lines.append(f"Table: {table.qualified_name}")
             for col in table.columns:
                 pk = " (PK)" if col.is_primary_key else ""
                 fk = f" (FK -> {col.foreign_key_ref})" if col.foreign_key_ref else ""
@@ -160,60 +178,164 @@ class SqlSchemaSummary:
         return "\n".join(lines).strip()
 
 
-def get_sql_schema(
-    connection_string: str,
-    dialect: Optional[str] = None,
-) -> SqlSchemaSummary:
-    """Introspect a SQL database and return a schema summary.
+# ---------------------------------------------------------------------------
+# Bulk catalog queries
+# ---------------------------------------------------------------------------
+# One query each for columns, primary keys and foreign keys across all tables,
+# instead of three inspector round-trips per table. Every query returns rows
+# keyed by (schema, table); FK rows additionally carry the referenced
+# (schema, table, column). "{schema_filter}" is replaced with an IN clause on
+# the given schema column when the caller restricts schemas.
 
-    Uses SQLAlchemy sync introspection. Does not log the connection string;
-    uses mask_connection_string for any log lines.
+_SYSTEM_SCHEMAS: dict[str, tuple[str, ...]] = {
+    "postgresql": ("pg_catalog", "information_schema", "pg_toast"),
+    "mssql": ("sys", "INFORMATION_SCHEMA", "guest"),
+    "mysql": ("mysql", "information_schema", "performance_schema", "sys"),
+}
 
-    Args:
-        connection_string: Database connection string (URL or key=value).
-        dialect: Optional hint: "postgresql", "sqlserver", "mysql", etc.
-                  If None, inferred from connection string where possible.
+_PK_QUERY = """
+SELECT kcu.table_schema, kcu.table_name, kcu.column_name
+FROM information_schema.table_constraints tc
+JOIN information_schema.key_column_usage kcu
+  ON kcu.constraint_name = tc.constraint_name
+ AND kcu.table_schema = tc.table_schema
+ AND kcu.table_name = tc.table_name
+WHERE tc.constraint_type = 'PRIMARY KEY' {schema_filter}
+"""
 
-    Returns:
-        SqlSchemaSummary with tables, columns, PKs, FKs; or error set on failure.
-    """
-    if not _SQLALCHEMY_AVAILABLE:
-        return SqlSchemaSummary(
-            error="sqlalchemy is not installed. Install with: pip install sqlalchemy"
-        )
+_COLUMNS_QUERY = """
+SELECT c.table_schema, c.table_name, c.column_name, c.data_type, c.is_nullable
+FROM information_schema.columns c
+JOIN information_schema.tables t
+  ON t.table_schema = c.table_schema AND t.table_name = c.table_name
+WHERE t.table_type = 'BASE TABLE' {schema_filter}
+ORDER BY c.table_schema, c.table_name, c.ordinal_position
+"""
 
-    masked = mask_connection_string(connection_string)
-    logger.info("Introspecting SQL schema (connection masked): %s", masked)
-
-    engine: Optional[Engine] = None
-    try:
-        # If it looks like a .NET/ADO.NET SQL Server connection string, convert to mssql+pyodbc URL
-        conn_str = connection_string.strip()
-        if dialect and dialect.lower() == "sqlserver":
-            parsed = _parse_sqlserver_connection_string(conn_str)
-            if parsed:
-                conn_str = parsed
-        elif not re.match(r"^[a-zA-Z][a-zA-Z0-9+.-]*://", conn_str) and "=" in conn_str:
-            parsed = _parse_sqlserver_connection_string(conn_str)
-            if parsed:
-                conn_str = parsed
-        engine = create_engine(conn_str)
-
-        insp = inspect(engine)
-        dialect_name = engine.dialect.name if engine else "unknown"
-        tables_out: list[TableInfo] = []
-
-        for table_name in insp.get_table_names():
+_BULK_QUERIES: dict[str, dict[str, tuple[str, str]]] = {
+    # query name -> (sql, schema column used by the filter)
+    "postgresql": {
+        "columns": (_COLUMNS_QUERY, "c.table_schema"),
+        "pks": (_PK_QUERY, "tc.table_schema"),
+        "fks": ("""
+SELECT ns.nspname, cl.relname, att.attname, rns.nspname, rcl.relname, ratt.attname
+FROM pg_constraint con
+JOIN pg_class cl ON cl.oid = con.conrelid
+JOIN pg_namespace ns ON ns.oid = cl.relnamespace
+JOIN pg_class rcl ON rcl.oid = con.confrelid
+JOIN pg_namespace rns ON rns.oid = rcl.relnamespace
+CROSS JOIN LATERAL unnest(con.conkey, con.confkey) AS k(col, refcol)
+JOIN pg_attribute att ON att.attrelid = con.conrelid AND att.attnum = k.col
+JOIN pg_attribute ratt ON ratt.attrelid = con.confrelid AND ratt.attnum = k.refcol
+WHERE con.contype = 'f' {schema_filter}
+""", "ns.nspname"),
+    },
+    "mssql": {
+        "columns": (_COLUMNS_QUERY, "c.table_schema"),
+        "pks": (_PK_QUERY, "tc.table_schema"),
+        "fks": ("""
+SELECT SCHEMA_NAME(pt.schema_id), pt.name, pc.name,
+       SCHEMA_NAME(rt.schema_id), rt.name, rc.name
+FROM sys.foreign_key_columns fkc
+JOIN sys.tables pt ON pt.object_id = fkc.parent_object_id
+JOIN sys.columns pc ON pc.object_id = fkc.parent_object_id AND pc.column_id = fkc.parent_column_id
+JOIN sys.tables rt ON rt.object_id = fkc.referenced_object_id
+JOIN sys.columns rc ON rc.object_id = fkc.referenced_object_id AND rc.column_id = fkc.referenced_column_id
+WHERE 1 = 1 {schema_filter}
+""", "SCHEMA_NAME(pt.schema_id)"),
+    },
+    "mysql": {
+        "columns": (_COLUMNS_QUERY, "c.table_schema"),
+        "pks": (_PK_QUERY, "tc.table_schema"),
+        "fks": ("""
+SELECT table_schema, table_name, column_name,
+       referenced_table_schema, referenced_table_name, referenced_column_name
+FROM information_schema.key_column_usage
+WHERE referenced_table_name IS NOT NULL {schema_filter}
+""", "table_schema"),
+    },
+}
+_BULK_QUERIES["mariadb"] = _BULK_QUERIES["mysql"]
+_SYSTEM_SCHEMAS["mariadb"] = _SYSTEM_SCHEMAS["mysql"]
+
+
+def _schema_filter_clause(column: str, schemas: list[str], exclude: bool) -> tuple[str, dict[str, str]]:
+    """Build an "AND col [NOT] IN (...)" clause with bound parameters."""
+    if not schemas:
+        return "", {}
+    params = {f"schema_{i}": s for i, s in enumerate(schemas)}
+    placeholders = ", ".join(f":{k}" for k in params)
+    op = "NOT IN" if exclude else "IN"
+    return f"AND {column} {op} ({placeholders})", params
+
+
+def _bulk_introspect(engine: Engine, schemas: Optional[list[str]]) -> list[TableInfo]:
+    """Introspect every table with a fixed number of catalog queries."""
+    dialect_name = engine.dialect.name
+    queries = _BULK_QUERIES[dialect_name]
+    if schemas:
+        filter_schemas, exclude = list(schemas), False
+    else:
+        filter_schemas, exclude = list(_SYSTEM_SCHEMAS.get(dialect_name, ())), True
+
+    pk_cols: set[tuple[str, str, str]] = set()
+    fk_refs: dict[tuple[str, str, str], str] = {}
+    tables: dict[tuple[str, str], TableInfo] = {}
+
+    with engine.connect() as conn:
+        if dialect_name in ("mysql", "mariadb") and not schemas:
+            # MySQL schemas are databases; default to the connected one
+            current = conn.execute(text("SELECT DATABASE()")).scalar()
+            if current:
+                filter_schemas, exclude = [current], False
+
+        def run(name: str):
+            sql, column = queries[name]
+            clause, params = _schema_filter_clause(column, filter_schemas, exclude)
+            return conn.execute(text(sql.format(schema_filter=clause)), params).fetchall()
+
+        for schema, table, column in run("pks"):
+            pk_cols.add((schema, table, column))
+
+        for schema, table, column, ref_schema, ref_table, ref_column in run("fks"):
+            ref_name = ref_table if ref_schema == schema else f"{ref_schema}.{ref_table}"
+            # Keep the first reference for composite keys, like the inspector path
+            fk_refs.setdefault((schema, table, column), f"{ref_name}.{ref_column}")
+
+        for schema, table, column, data_type, is_nullable in run("columns"):
+            info = tables.get((schema, table))
+            if info is None:
+                info = tables[(schema, table)] = TableInfo(name=table, schema=schema)
+            key = (schema, table, column)
+            info.columns.append(ColumnInfo(
+                name=column,
+                type_name=str(data_type),
+                nullable=str(is_nullable).upper() == "YES",
+                is_primary_key=key in pk_cols,
+                is_foreign_key=key in fk_refs,
+                foreign_key_ref=fk_refs.get(key),
+            ))
+
+    return sorted(tables.values(), key=lambda t: (t.schema or "", t.name))
+
+
+def _inspector_introspect(engine: Engine, schemas: Optional[list[str]]) -> list[TableInfo]:
+    """Per-table SQLAlchemy inspector introspection (fallback for other dialects)."""
+    insp = inspect(engine)
+    tables_out: list[TableInfo] = []
+
+    for schema in (schemas or [None]):
+        for table_name in insp.get_table_names(schema=schema):
             columns_out: list[ColumnInfo] = []
             try:
-                pk_constraint = insp.get_pk_constraint(table_name)
+                pk_constraint = insp.get_pk_constraint(table_name, schema=schema)
                 pk_cols = {c for c in (pk_constraint or {}).get("constrained_columns") or []}
             except Exception:
                 pk_cols = set()
 
             fk_refs: dict[str, str] = {}  # col_name -> "ref_table.ref_column"
             try:
-                for fk in insp.get_foreign_keys(table_name):
+                for fk in insp.get_foreign_keys(table_name, schema=schema):
                     constrained = fk.get("constrained_columns") or []
                     referred = fk.get("referred_table"), (fk.get("referred_columns") or [None])[0]
                     ref_str = f"{referred[0]}.{referred[1]}" if referred[1] else referred[0]
@@ -223,7 +345,7 @@ def get_sql_schema(
                 pass
 
             try:
-                for col in insp.get_columns(table_name):
+                for col in insp.get_columns(table_name, schema=schema):
                     name = col["name"]
                     type_obj = col.get("type")
                     type_name = getattr(type_obj, "name", str(type_obj)) if type_obj else "unknown"
@@ -239,18 +361,154 @@ def get_sql_schema(
             except Exception as e:
                 logger.warning("Failed to get columns for %s: %s", table_name, e)
 
-            tables_out.append(TableInfo(name=table_name, columns=columns_out))
+            tables_out.append(TableInfo(name=table_name, columns=columns_out, schema=schema))
+
+    return tables_out
+
+
+# ---------------------------------------------------------------------------
+# Cache (keyed by masked connection string, never the raw one)
+# ---------------------------------------------------------------------------
+
+SCHEMA_CACHE_TTL_SECONDS = 600.0
+
+_schema_cache: dict[tuple, tuple[float, str, list[TableInfo]]] = {}
+_schema_cache_lock = threading.Lock()
 
-        return SqlSchemaSummary(tables=tables_out, dialect=dialect_name)
-    except Exception as e:
-        logger.warning("SQL schema introspection failed: %s", e, exc_info=False)
+
+def clear_sql_schema_cache() -> None:
+    """Clear cached schema introspection results."""
+    with _schema_cache_lock:
+        _schema_cache.clear()
+
+
+def _create_engine_for(connection_string: str, dialect: Optional[str]) -> Engine:
+    # If it looks like a .NET/ADO.NET SQL Server connection string, convert to mssql+pyodbc URL
+    conn_str = connection_string.strip()
+    if dialect and dialect.lower() == "sqlserver":
+        parsed = _parse_sqlserver_connection_string(conn_str)
+        if parsed:
+            conn_str = parsed
+    elif not re.match(r"^[a-zA-Z][a-zA-Z0-9+.-]*://", conn_str) and "=" in conn_str:
+        parsed = _parse_sqlserver_connection_string(conn_str)
+        if parsed:
+            conn_str = parsed
+    return create_engine(conn_str)
+
+
+def get_sql_schema(
+    connection_string: str,
+    dialect: Optional[str] = None,
+    schemas: Optional[list[str]] = None,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    use_cache: bool = True,
+) -> SqlSchemaSummary:
+    """Introspect a SQL database and return a schema summary.
+
+    PostgreSQL, SQL Server and MySQL/MariaDB are read with a handful of bulk
+    catalog queries; other dialects fall back to per-table SQLAlchemy
+    inspection. Results are cached per masked connection string and schema
+    filter, so paging through a large database only introspects it once.
+    Does not log the connection string; uses mask_connection_string for any
+    log lines.
+
+    Args:
+        connection_string: Database connection string (URL or key=value).
+        dialect: Optional hint: "postgresql", "sqlserver", "mysql", etc.
+                  If None, inferred from connection string where possible.
+        schemas: Optional list of schemas to include. Defaults to all
+                 non-system schemas (the connected database on MySQL).
+        offset: Index of the first table to return (tables sorted by schema, name).
+        limit: Maximum number of tables to return; None returns all.
+        use_cache: Set False to force a fresh introspection.
+
+    Returns:
+        SqlSchemaSummary with tables, columns, PKs, FKs; or error set on failure.
+    """
+    if not _SQLALCHEMY_AVAILABLE:
         return SqlSchemaSummary(
-            dialect=dialect or "unknown",
-            error=str(e),
+            error="sqlalchemy is not installed. Install with: pip install sqlalchemy"
         )
-    finally:
-        if engine is not None:
-            try:
-                engine.dispose()
-            except Exception:
-                pass
+
+    masked = mask_connection_string(connection_string)
+    schema_key = tuple(sorted(schemas)) if schemas else ()
+    cache_key = (masked, (dialect or "").lower(), schema_key)
+
+    cached = None
+    if use_cache:
+        with _schema_cache_lock:
+            cached = _schema_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] > SCHEMA_CACHE_TTL_SECONDS:
+            cached = None
+
+    if cached:
+        logger.info("Using cached SQL schema (connection masked): %s", masked)
+        _, dialect_name, tables = cached
+    else:
+        logger.info("Introspecting SQL schema (connection masked): %s", masked)
+        engine: Optional[Engine] = None
+        try:
+            engine = _create_engine_for(connection_string, dialect)
+            dialect_name = engine.dialect.name if engine else "unknown"
+            started = time.monotonic()
+
+            if dialect_name in _BULK_QUERIES:
+                try:
+                    tables = _bulk_introspect(engine, schemas)
+                except Exception as e:
+                    logger.warning(
+                        "Bulk introspection failed for %s, falling back to inspector: %s",
+                        dialect_name, e,
+                    )
+                    tables = _inspector_introspect(engine, schemas)
+            else:
+                tables = _inspector_introspect(engine, schemas)
+
+            logger.info(
+                "Introspected %d tables (%s) in %.2fs",
+                len(tables), dialect_name, time.monotonic() - started,
+            )
+            with _schema_cache_lock:
+                _schema_cache[cache_key] = (time.monotonic(), dialect_name, tables)
+        except Exception as e:
+            logger.warning("SQL schema introspection failed: %s", e, exc_info=False)
+            return SqlSchemaSummary(
+                dialect=dialect or "unknown",
+                error=str(e),
+            )
+        finally:
+            if engine is not None:
+                try:
+                    engine.dispose()
+                except Exception:
+                    pass
+
+    offset = max(0, offset)
+    page = tables[offset:offset + limit] if limit is not None else tables[offset:]
+    return SqlSchemaSummary(
+        tables=page,
+        dialect=dialect_name,
+        total_tables=len(tables),
+        offset=offset,
+    )
+
+
+async def get_sql_schema_async(
+    connection_string: str,
+    dialect: Optional[str] = None,
+    schemas: Optional[list[str]] = None,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    use_cache: bool = True,
+) -> SqlSchemaSummary:
+    """Async wrapper: runs get_sql_schema in a worker thread so the event loop is not blocked."""
+    return await asyncio.to_thread(
+        get_sql_schema,
+        connection_string,
+        dialect,
+        schemas,
+        offset,
+        limit,
+        use_cache,
+    )
@@ -0,0 +1,91 @@
+"""
+Tests for chunked workspace staging and its progress record when staging fails part-way.
+
+Usage:
+    pytest app/workflows/test_workspace_setup_staging.py
+"""
+
+from typing import Any, Dict, List
+
+import pytest
+
+workspace_setup_workflow = pytest.importorskip("app.workflows.workspace_setup_workflow")
+from app.workflows.data_recommender.models import ScopeRecommendation
+
+WorkspaceSetupWorkflow = workspace_setup_workflow.WorkspaceSetupWorkflow
+
+
+class FakeStagingApi:
+    """Records stageWorkspaceItems calls; fails a chunk while it is listed in fail_chunks."""
+
+    def __init__(self, fail_chunks=()):
+        self.fail_chunks = set(fail_chunks)
+        self.staged: List[str] = []
+        self.confirmed: List[Dict[str, Any]] = []
+
+    async def __call__(self, query: str, variables: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        if query == workspace_setup_workflow.CONFIRM_DATA_REVIEW_MUTATION:
+            self.confirmed.append(variables)
+            return {"confirmDataReviewAndBuildTeam": {"message": "ok"}}
+        chunk_key = f"{variables['entityType']}:{variables['chunkIndex']}"
+        if chunk_key in self.fail_chunks:
+            raise RuntimeError("gateway timeout")
+        self.staged.append(chunk_key)
+        return {"stageWorkspaceItems": {"chunkIndex": variables["chunkIndex"]}}
+
+
+def _execution_results() -> Dict[str, Any]:
+    return {
+        "results": [
+            {"entity_type": "Claim", "node_ids": [f"claim_{i}" for i in range(5)], "sample_data": [], "total_count": 5},
+            {"entity_type": "Member", "node_ids": ["member_1"], "sample_data": [], "total_count": 1},
+        ],
+        "total_matches": 6,
+        "success": True,
+    }
+
+
+@pytest.fixture
+def workflow(monkeypatch):
+    monkeypatch.setattr(workspace_setup_workflow, "STAGING_CHUNK_SIZE", 2)
+    monkeypatch.setattr(workspace_setup_workflow, "STAGING_MAX_ATTEMPTS", 1)
+    wf = WorkspaceSetupWorkflow()
+
+    async def fake_execution(**kwargs):
+        return _execution_results()
+
+    monkeypatch.setattr(wf, "_run_data_execution", fake_execution)
+    return wf
+
+
+@pytest.mark.asyncio
+async def test_mid_staging_failure_stops_before_confirming(workflow, monkeypatch):
+    api = FakeStagingApi(fail_chunks={"Claim:2"})
+    monkeypatch.setattr(workspace_setup_workflow, "run_graphql", api)
+    scope = ScopeRecommendation.model_construct(entities=[], relationships=[], summary="claims", confidence_level="high")
+
+    result = await workflow._run_execution_and_staging(
+        data_scope=scope, workspace_id="ws-1", tenant_id="t-1", log_streamer=None
+    )
+
+    assert result == {"success": False, "error": "Staging to workspace failed"}
+    assert api.staged == ["Claim:0", "Claim:1"]
+    assert api.confirmed == []
+
+
+@pytest.mark.asyncio
+async def test_restaging_the_same_results_skips_staged_chunks(workflow, monkeypatch):
+    api = FakeStagingApi(fail_chunks={"Claim:2"})
+    monkeypatch.setattr(workspace_setup_workflow, "run_graphql", api)
+    execution_results = _execution_results()
+
+    assert not await workflow._stage_to_workspace(execution_results, "ws-1", "t-1")
+    assert execution_results["staging_progress"] == {"staged_chunks": ["Claim:0", "Claim:1"], "staged_nodes": 4}
+
+    api.fail_chunks.clear()
+    assert await workflow._stage_to_workspace(execution_results, "ws-1", "t-1")
+
+    assert api.staged == ["Claim:0", "Claim:1", "Claim:2", "Member:0"]
+    [confirm] = api.confirmed
+    assert '"total_count": 5' in confirm["executionResults"]
+    assert '"node_ids": []' in confirm["executionResults"]
@@ -5,6 +5,7 @@ import logging
 from datetime import datetime
 from typing import Optional
 
+from pydantic import BaseModel, Field
 from app.models.workflow_event import WorkflowEvent
 from app.core.base_workflow import BaseWorkflow, WorkflowResult
 from app.core.event_stream_reader import EventStreamReader
@@ -13,10 +14,12 @@ from app.core.chat_conductor import ChatConductor
 from app.core.conductor import Conductor, SubtaskSpec
 from app.core.registry import AgentRegistry
 from app.core.team_execution import TeamExecutionEngine
-from app.core.conversation_context import ConversationContext
+from app.core.conversation_context import ConversationContext, estimate_tokens
 from app.core.conversation_metrics import ConversationMetrics
 from app.core.model_config import model_config
+from app.core.agent_factory import get_helper_agent
 from app.models.task import Task, ActivityEvent
+from app.utils.streaming import BufferedLogStreamer
 from app.config import Config
 
 logger = logging.getLogger(__name__)
@@ -31,6 +34,24 @@ except Exception:
     logfire = None
 
 
+class FeedbackIntent(BaseModel):
+    """Intent of user feedback on a proposed plan."""
+    intent: str = Field(..., description="One of: approve, modify, question")
+    confidence: float = Field(..., description="Confidence 0-1")
+
+
+_FEEDBACK_CLASSIFIER_INSTRUCTIONS = """Classify user feedback into one of three categories:
+- "approve": User wants to proceed with the current plan (e.g., "looks good", "sounds good", "approve", "yes", "that works")
+- "modify": User wants to change the plan (e.g., "add a task", "remove task 2", "change X to Y")
+- "question": User is asking a question about the plan (e.g., "why is X?", "what does Y mean?", "how does Z work?")
+
+Be conservative - if unsure, default to "question"."""
+
+_PLAN_QUESTION_INSTRUCTIONS = """You are helping a user understand their current plan. 
+Answer their question clearly and helpfully. Reference specific tasks in the plan when relevant.
+Be concise but thorough."""
+
+
 class WorkspaceChatWorkflow(BaseWorkflow):
     """Workspace chat workflow with continuous conversation loop."""
     
@@ -82,7 +103,10 @@ class WorkspaceChatWorkflow(BaseWorkflow):
             ).__enter__()
 
         # Create isolated conversation context for this run
-        context = ConversationContext(run_id=run_id)
+        context = ConversationContext(
+            run_id=run_id,
+            summarizer=self.chat_conductor.summarize_history if Config.CONVERSATION_LLM_SUMMARY else None,
+        )
         ConversationMetrics.record_conversation_start(run_id)
 
         logger.info(
@@ -340,19 +364,44 @@ class WorkspaceChatWorkflow(BaseWorkflow):
         # Build enhanced conversation history with workflow results
         enhanced_history = context.get_enhanced_history()
         
-        # Decide: quick answer or decomposition
-        decision = await self.chat_conductor.decide(message, enhanced_history)
+        # Obvious messages are routed locally, without the decision LLM call
+        decision = None
+        if Config.CHAT_PRECLASSIFIER_ENABLED:
+            decision = self.chat_conductor.preclassify(message)
+            if decision:
+                ConversationMetrics.record_preclassified(decision.needs_decomposition)
+                logger.info(f"{decision.reasoning} (run_id={context.run_id})")
+        
+        speculative = None
+        if decision is None:
+            # Optionally start the quick answer while deciding; its output is held back
+            if Config.CHAT_SPECULATIVE_QUICK_ANSWER:
+                speculative = self._start_speculative_answer(message, enhanced_history, log_streamer)
+            # Decide: quick answer or decomposition (the decision only needs a compact view)
+            try:
+                decision = await self.chat_conductor.decide(message, context.get_decide_history())
+            except BaseException:
+                if speculative:
+                    await self._cancel_speculative_answer(context, speculative, message, enhanced_history)
+                raise
         
         if not decision.needs_decomposition:
             # Quick answer path
             logger.info("Decision: Quick answer")
             
-            # answer_quickly now streams text deltas if log_streamer is provided
-            answer = await self.chat_conductor.answer_quickly(
-                message, 
-                enhanced_history,
-                log_streamer=log_streamer
-            )
+            if speculative:
+                task, buffer = speculative
+                if buffer:
+                    await buffer.commit()
+                answer = await task
+                ConversationMetrics.record_speculation(context.run_id, hit=True)
+            else:
+                # answer_quickly now streams text deltas if log_streamer is provided
+                answer = await self.chat_conductor.answer_quickly(
+                    message, 
+                    enhanced_history,
+                    log_streamer=log_streamer
+                )
             
             if log_streamer:
                 await log_streamer.log_event(
@@ -364,6 +413,8 @@ class WorkspaceChatWorkflow(BaseWorkflow):
         else:
             # Multi-agent decomposition path
             logger.info("Decision: Multi-agent decomposition")
+            if speculative:
+                await self._cancel_speculative_answer(context, speculative, message, enhanced_history)
             await self._execute_multi_agent_workflow(
                 message,
                 context,
@@ -373,6 +424,48 @@ class WorkspaceChatWorkflow(BaseWorkflow):
                 tenant_id=tenant_id,
             )
     
+    def _start_speculative_answer(
+        self,
+        message: str,
+        enhanced_history: list[str],
+        log_streamer: Optional[ScenarioRunLogger],
+    ) -> tuple[asyncio.Task, Optional[BufferedLogStreamer]]:
+        """Start a quick answer whose streamed output is buffered until committed.
+        
+        Returns:
+            The running answer task and its buffer (None without a log streamer)
+        """
+        buffer = BufferedLogStreamer(log_streamer) if log_streamer else None
+        task = asyncio.create_task(
+            self.chat_conductor.answer_quickly(message, enhanced_history, log_streamer=buffer)
+        )
+        return task, buffer
+    
+    async def _cancel_speculative_answer(
+        self,
+        context: ConversationContext,
+        speculative: tuple[asyncio.Task, Optional[BufferedLogStreamer]],
+        message: str,
+        enhanced_history: list[str],
+    ):
+        """Cancel an unneeded speculative answer and record the tokens it cost."""
+        task, buffer = speculative
+        if buffer:
+            buffer.discard()
+        task.cancel()
+        output_chars = buffer.buffered_chars if buffer else 0
+        try:
+            answer = await task
+            output_chars = max(output_chars, len(answer or ""))
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.debug(f"Speculative quick answer failed before cancellation: {e}")
+        prompt_tokens = estimate_tokens(message) + sum(estimate_tokens(h) for h in enhanced_history)
+        ConversationMetrics.record_speculation(
+            context.run_id, hit=False, wasted_tokens=prompt_tokens + output_chars // 4
+        )
+    
     async def _classify_feedback_intent(
         self, 
         feedback_text: str, 
@@ -387,34 +480,17 @@ class WorkspaceChatWorkflow(BaseWorkflow):
         Returns:
             "approve", "modify", or "question"
         """
-        from pydantic_ai import Agent
-        from pydantic import BaseModel, Field
-        from app.core.model_factory import create_model
-        
-        class FeedbackIntent(BaseModel):
-            intent: str = Field(..., description="One of: approve, modify, question")
-            confidence: float = Field(..., description="Confidence 0-1")
-        
         # Get configuration from central model config
         config = model_config.get("feedback_classifier")
-        model_instance = create_model(config.model, config.provider)
-
-        classifier = Agent(
-            model=model_instance,
+        classifier = get_helper_agent(
+            "feedback_classifier",
+            _FEEDBACK_CLASSIFIER_INSTRUCTIONS,
+            config.model,
+            config.provider,
             output_type=FeedbackIntent,
-            name="feedback_classifier",
             retries=config.retries,
         )
         
-        @classifier.instructions
-        def classifier_instructions() -> str:
-            return """Classify user feedback into one of three categories:
-- "approve": User wants to proceed with the current plan (e.g., "looks good", "sounds good", "approve", "yes", "that works")
-- "modify": User wants to change the plan (e.g., "add a task", "remove task 2", "change X to Y")
-- "question": User is asking a question about the plan (e.g., "why is X?", "what does Y mean?", "how does Z work?")
-
-Be conservative - if unsure, default to "question"."""
-        
         plan_summary = "\n".join([
             f"{i+1}. {st.agent_id}: {st.description}"
             for i, st in enumerate(current_plan)
@@ -444,25 +520,16 @@ Classify the user's intent."""
             current_plan: Current list of subtasks
             log_streamer: GraphQL logger for streaming responses
         """
-        from pydantic_ai import Agent
-        from app.core.model_factory import create_model
-        
         # Get configuration from central model config
         config = model_config.get("answer_agent")
-        model_instance = create_model(config.model, config.provider)
-
-        answer_agent = Agent(
-            model=model_instance,
-            name="plan_question_answerer",
+        answer_agent = get_helper_agent(
+            "plan_question_answerer",
+            _PLAN_QUESTION_INSTRUCTIONS,
+            config.model,
+            config.provider,
             retries=config.retries,
         )
         
-        @answer_agent.instructions
-        def answer_instructions() -> str:
-            return """You are helping a user understand their current plan. 
-Answer their question clearly and helpfully. Reference specific tasks in the plan when relevant.
-Be concise but thorough."""
-        
         plan_text = "\n".join([
             f"{i+1}. **{st.agent_id}**: {st.description}"
             for i, st in enumerate(current_plan)
@@ -780,6 +847,7 @@ Provide a helpful answer."""
             # Store workflow result in conversation context for future questions
             if final_result:
                 context.add_workflow_result(final_result)
+                await context.compact()
 
             # Set workflow span attributes
             if logfire and workflow_span:
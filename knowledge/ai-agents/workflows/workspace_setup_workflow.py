@@ -8,8 +8,8 @@ ScenarioRun with persistent Theo context. It handles:
 2. Data Scoping (Stage 2) - Conversational data scope building with ScopeBuilder
    - Includes Build Query / Preview Data UI with real-time scope updates
    - Preview data can be fetched without finalizing scope
-3. Data Execution & Staging (Stage 3) - Executes scope queries and stages data
-   to workspace via confirmDataReviewAndBuildTeam mutation
+3. Data Execution & Staging (Stage 3) - Executes scope queries, stages node IDs
+   in chunks via stageWorkspaceItems, then confirmDataReviewAndBuildTeam
 4. Team Building (Stage 4) - Generates AI team configuration
 
 Stages run: Intent → Scoping → (Execute & Stage || Team Building) in parallel
@@ -79,7 +79,28 @@ STAGE_DATA_SCOPING = "data_scoping"
 STAGE_DATA_REVIEW = "data_review"
 STAGE_TEAM_BUILDING = "team_building"
 
-# GraphQL mutation for staging data to workspace
+# GraphQL mutation for staging one bounded chunk of node IDs (idempotent server-side)
+STAGE_WORKSPACE_ITEMS_MUTATION = """
+mutation StageWorkspaceItems(
+    $workspaceId: UUID!,
+    $entityType: String!,
+    $nodeIds: [String!]!,
+    $chunkIndex: Int!
+) {
+    stageWorkspaceItems(
+        workspaceId: $workspaceId,
+        entityType: $entityType,
+        nodeIds: $nodeIds,
+        chunkIndex: $chunkIndex
+    ) {
+        chunkIndex
+        inserted
+        alreadyStaged
+    }
+}
+""".strip()
+
+# GraphQL mutation that flips the workspace to team_building once all chunks are staged
 CONFIRM_DATA_REVIEW_MUTATION = """
 mutation ConfirmDataReviewAndBuildTeam(
     $workspaceId: UUID!,
@@ -87,7 +108,8 @@ mutation ConfirmDataReviewAndBuildTeam(
 ) {
     confirmDataReviewAndBuildTeam(
         workspaceId: $workspaceId,
-        executionResults: $executionResults
+        executionResults: $executionResults,
+        itemsStaged: true
     ) {
         runId
         stage
@@ -96,6 +118,11 @@ mutation ConfirmDataReviewAndBuildTeam(
 }
 """.strip()
 
+# Staging limits: node IDs per stageWorkspaceItems call and attempts per chunk
+STAGING_CHUNK_SIZE = 5000
+STAGING_CHUNK_TIMEOUT = 30.0
+STAGING_MAX_ATTEMPTS = 3
+
 
 class WorkspaceSetupWorkflow(BaseWorkflow):
     """
@@ -378,7 +405,7 @@ class WorkspaceSetupWorkflow(BaseWorkflow):
             # Handle data execution failure (fatal)
             if not execution_results or not execution_results.get("success"):
                 error_msg = "Data execution/staging failed"
-                logger.error(f"Data execution failed: {execution_results}")
+                logger.error(f"Data execution failed: {(execution_results or {}).get('error')}")
 
                 if log_streamer:
                     await log_streamer.log_event(
@@ -833,24 +860,34 @@ class WorkspaceSetupWorkflow(BaseWorkflow):
         execution_results: Dict[str, Any],
         workspace_id: str,
         tenant_id: str,
+        log_streamer: Optional[ScenarioRunLogger] = None,
     ) -> bool:
-        """Stage execution results to workspace via confirmDataReviewAndBuildTeam mutation.
+        """Stage execution results to workspace in bounded chunks.
+
+        Node IDs are sent per entity type in chunks of STAGING_CHUNK_SIZE via
+        the idempotent stageWorkspaceItems mutation, then a final
+        confirmDataReviewAndBuildTeam(itemsStaged: true) call with a per-entity
+        summary transitions the workspace to team_building.
 
-        Transforms execution results into the format expected by the C# mutation
-        and calls it to create WorkspaceItems and transition to team_building stage.
+        Completed chunks are recorded in execution_results["staging_progress"],
+        so calling this again with the same execution_results after a failure
+        resumes with the first unstaged chunk. Resending a chunk is harmless; the API skips already-staged IDs.
 
         Args:
             execution_results: Dict from _run_data_execution with "results" list
             workspace_id: Workspace to stage into
             tenant_id: Tenant for authentication
+            log_streamer: Optional GraphQL logger for staging progress events
 
         Returns:
             True if staging succeeded, False otherwise
         """
+        stage_streamer = _StageAwareLogger(log_streamer, STAGE_DATA_REVIEW) if log_streamer else None
+
         # Pass through as-is — C# ExecutionResultItem uses snake_case JsonPropertyName
         results_list = execution_results.get("results", [])
         execution_items = [
-            {"entity_type": r["entity_type"], "node_ids": r["node_ids"]}
+            {"entity_type": r["entity_type"], "node_ids": list(dict.fromkeys(r["node_ids"]))}
             for r in results_list
             if r.get("node_ids")
         ]
@@ -859,24 +896,96 @@ class WorkspaceSetupWorkflow(BaseWorkflow):
             logger.warning("No node IDs to stage")
             return False
 
-        execution_json = json.dumps(execution_items)
+        chunks = [
+            (item["entity_type"], chunk_index, item["node_ids"][start:start + STAGING_CHUNK_SIZE])
+            for item in execution_items
+            for chunk_index, start in enumerate(range(0, len(item["node_ids"]), STAGING_CHUNK_SIZE))
+        ]
         total_nodes = sum(len(item["node_ids"]) for item in execution_items)
-        logger.info(f"Staging {len(execution_items)} entity types, {total_nodes} total nodes")
+        progress = execution_results.setdefault("staging_progress", {"staged_chunks": [], "staged_nodes": 0})
+        staged_chunks = set(progress["staged_chunks"])
+
+        logger.info(
+            f"Staging {len(execution_items)} entity types, {total_nodes} total nodes "
+            f"in {len(chunks)} chunks ({len(staged_chunks)} already staged)"
+        )
+
+        async def report(status: str, message: str) -> None:
+            if stage_streamer:
+                await stage_streamer.log_event(
+                    event_type="setup_task",
+                    message=message,
+                    metadata={
+                        "task_id": "staging",
+                        "task_type": "staging",
+                        "title": "Staging data",
+                        "status": status,
+                        "progress": {"current": progress["staged_nodes"], "total": total_nodes},
+                    }
+                )
+
+        await report("running", f"Staging {total_nodes:,} records to workspace...")
+
+        for entity_type, chunk_index, node_ids in chunks:
+            chunk_key = f"{entity_type}:{chunk_index}"
+            if chunk_key in staged_chunks:
+                continue
+
+            for attempt in range(1, STAGING_MAX_ATTEMPTS + 1):
+                try:
+                    await run_graphql(
+                        STAGE_WORKSPACE_ITEMS_MUTATION,
+                        {
+                            "workspaceId": workspace_id,
+                            "entityType": entity_type,
+                            "nodeIds": node_ids,
+                            "chunkIndex": chunk_index,
+                        },
+                        tenant_id=tenant_id,
+                        timeout=STAGING_CHUNK_TIMEOUT,
+                    )
+                    break
+                except Exception as e:
+                    if attempt == STAGING_MAX_ATTEMPTS:
+                        logger.error(f"Failed to stage chunk {chunk_key} after {attempt} attempts: {e}")
+                        await report(
+                            "failed",
+                            f"Staging stopped at {progress['staged_nodes']:,} of {total_nodes:,} records",
+                        )
+                        return False
+                    logger.warning(f"Staging chunk {chunk_key} failed (attempt {attempt}), retrying: {e}")
+                    await asyncio.sleep(2 ** (attempt - 1))
+
+            staged_chunks.add(chunk_key)
+            progress["staged_chunks"].append(chunk_key)
+            progress["staged_nodes"] += len(node_ids)
+            await report(
+                "running",
+                f"Staged {progress['staged_nodes']:,} of {total_nodes:,} records",
+            )
+
+        # Final step: summary only, node IDs are already staged
+        summary_json = json.dumps([
+            {"entity_type": item["entity_type"], "node_ids": [], "total_count": len(item["node_ids"])}
+            for item in execution_items
+        ])
 
         try:
             result = await run_graphql(
                 CONFIRM_DATA_REVIEW_MUTATION,
-                {"workspaceId": workspace_id, "executionResults": execution_json},
+                {"workspaceId": workspace_id, "executionResults": summary_json},
                 tenant_id=tenant_id,
                 timeout=60.0,
             )
 
             response = result.get("confirmDataReviewAndBuildTeam", {})
             logger.info(f"Staging complete: {response.get('message')}")
+            await report("completed", f"Staged {total_nodes:,} records to workspace")
             return True
 
         except Exception as e:
             logger.error(f"Failed to stage data to workspace: {e}")
+            await report("failed", "Staged records but failed to confirm data review")
             return False
 
     async def _run_execution_and_staging(
@@ -917,6 +1026,7 @@ class WorkspaceSetupWorkflow(BaseWorkflow):
             execution_results=execution_results,
             workspace_id=workspace_id,
             tenant_id=tenant_id,
+            log_streamer=log_streamer,
         )
 
         if not staging_success:
@@ -10,14 +10,21 @@ Core improvements over artax-kg prototype:
 - Temporal metadata on everything
 """
 
-from fastapi import FastAPI, HTTPException, Depends, Header, Request
+from fastapi import FastAPI, HTTPException, Depends, Header, Request, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
-from neo4j import GraphDatabase
+from neo4j import AsyncGraphDatabase
+from neo4j.exceptions import ClientError
 from typing import Optional, List, Dict, Any
+from collections import Counter, OrderedDict
+from contextlib import asynccontextmanager
+import asyncio
+import httpx
 from datetime import datetime
 import os
 import re
+import json
+import time
 import hashlib
 import secrets
 from dotenv import load_dotenv
@@ -52,8 +59,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Neo4j connection
-driver = GraphDatabase.driver(
+# Neo4j connection (async: routes never block the event loop on Bolt I/O)
+driver = AsyncGraphDatabase.driver(
     os.getenv("NEO4J_URI", "bolt://localhost:7687"),
     auth=(
         os.getenv("NEO4J_USER", "neo4j"),
@@ -61,69 +68,193 @@ driver = GraphDatabase.driver(
     ),
 )
 
-# ============ Auth ============
+# Shared HTTP client for LLM and email calls (connection reuse); opened in startup
+http_client: Optional[httpx.AsyncClient] = None
+
+# LLM-backed routes (/v1/extract, /v1/ask) share a concurrency limit so slow
+# model calls queue among themselves instead of crowding out graph reads.
+LLM_CONCURRENCY = int(os.getenv("DEJAVIEW_LLM_CONCURRENCY", "8"))
+LLM_QUEUE_TIMEOUT = float(os.getenv("DEJAVIEW_LLM_QUEUE_TIMEOUT", "30"))
+_llm_slots = asyncio.Semaphore(LLM_CONCURRENCY)
 
-# For MVP: API keys stored in memory / env. Production: database.
-API_KEYS: Dict[str, dict] = {}
 
-def _load_keys():
-    """Load API keys — from Neo4j first, fallback to env dev key."""
+@asynccontextmanager
+async def _llm_slot():
+    """Hold one LLM concurrency slot; 503 if none frees up within LLM_QUEUE_TIMEOUT."""
+    try:
+        await asyncio.wait_for(_llm_slots.acquire(), timeout=LLM_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=503, detail="LLM capacity busy, retry shortly")
+    try:
+        yield
+    finally:
+        _llm_slots.release()
+
+# ============ Auth ============
+
+# API keys live in Neo4j as (:ApiKey {key_hash}) nodes holding a SHA-256 of
+# the key, never the key itself. Keys are 192-bit random tokens, so an
+# unsalted hash is enough. Verification goes through a bounded in-process
+# cache; every replica polls recent revocations and evicts them.
+KEY_CACHE_TTL = float(os.getenv("DEJAVIEW_KEY_CACHE_TTL", "300"))
+KEY_NEGATIVE_TTL = float(os.getenv("DEJAVIEW_KEY_NEGATIVE_TTL", "10"))
+KEY_CACHE_MAX = int(os.getenv("DEJAVIEW_KEY_CACHE_MAX", "10000"))
+KEY_REVOCATION_POLL = float(os.getenv("DEJAVIEW_KEY_REVOCATION_POLL", "5"))
+
+# key_hash -> (expires_at, user context or None for a known-invalid key)
+_key_cache: "OrderedDict[str, tuple]" = OrderedDict()
+# Keys that bypass Neo4j (the DEJAVIEW_API_KEY dev key)
+_static_keys: Dict[str, dict] = {}
+_revocation_task: Optional[asyncio.Task] = None
+
+
+def _hash_key(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+def _cache_key(key_hash: str, user: Optional[dict]):
+    ttl = KEY_CACHE_TTL if user else KEY_NEGATIVE_TTL
+    _key_cache[key_hash] = (time.monotonic() + ttl, user)
+    _key_cache.move_to_end(key_hash)
+    while len(_key_cache) > KEY_CACHE_MAX:
+        _key_cache.popitem(last=False)
+
+
+async def _lookup_key(key_hash: str) -> Optional[dict]:
+    async with driver.session() as session:
+        result = await session.run("""
+            MATCH (k:ApiKey {key_hash: $hash})
+            WHERE k.status = 'active'
+            RETURN k.user_id as user_id, k.graph_id as graph_id,
+                   k.email as email, k.tier as tier
+        """, {"hash": key_hash})
+        record = await result.single()
+    return dict(record) if record else None
+
+
+async def _migrate_legacy_keys():
+    """Move plaintext DejaViewUser.api_key values into hashed :ApiKey nodes."""
+    async with driver.session() as session:
+        result = await session.run("""
+            MATCH (u:DejaViewUser) WHERE u.api_key IS NOT NULL
+            RETURN u.api_key as key, u.user_id as user_id, u.graph_id as graph_id,
+                   u.email as email, u.tier as tier, coalesce(u.status, 'active') as status
+        """)
+        rows = [
+            {"key_hash": _hash_key(r["key"]), "user_id": r["user_id"], "graph_id": r["graph_id"],
+             "email": r["email"], "tier": r["tier"], "status": r["status"]}
+            async for r in result
+        ]
+        if not rows:
+            return
+        result = await session.run("""
+            UNWIND $rows AS row
+            MERGE (k:ApiKey {key_hash: row.key_hash})
+            ON CREATE SET k.user_id = row.user_id, k.graph_id = row.graph_id,
+                k.email = row.email, k.tier = row.tier, k.status = row.status,
+                k.created_at = datetime()
+            WITH row
+            MATCH (u:DejaViewUser {user_id: row.user_id})
+            REMOVE u.api_key
+        """, {"rows": rows})
+        await result.consume()
+    print(f"🔐 Migrated {len(rows)} API keys to hashed :ApiKey nodes")
+
+
+async def _load_keys():
+    """Hash any legacy plaintext keys and register the env dev key."""
     try:
-        with driver.session() as session:
-            result = session.run("""
-                MATCH (u:DejaViewUser {status: 'active'})
-                RETURN u.api_key as key, u.user_id as user_id,
-                       u.graph_id as graph_id, u.email as email, u.tier as tier
-            """)
-            loaded = 0
-            for record in result:
-                API_KEYS[record["key"]] = {
-                    "user_id": record["user_id"],
-                    "graph_id": record["graph_id"],
-                    "email": record["email"],
-                    "tier": record["tier"],
-                }
-                loaded += 1
-            if loaded:
-                print(f"✅ Loaded {loaded} API keys from Neo4j")
+        await _migrate_legacy_keys()
     except Exception as e:
-        print(f"⚠️  Could not load keys from Neo4j: {e}")
+        print(f"⚠️  Could not migrate API keys in Neo4j: {e}")
 
     # Always ensure dev key works
     dev_key = os.getenv("DEJAVIEW_API_KEY", "dv_dev_" + secrets.token_hex(16))
-    if dev_key not in API_KEYS:
-        API_KEYS[dev_key] = {"user_id": "default", "graph_id": "default", "email": "dev", "tier": "pro"}
-        print(f"🔑 Dev key: {dev_key}")
+    _static_keys[_hash_key(dev_key)] = {"user_id": "default", "graph_id": "default", "email": "dev", "tier": "pro"}
+    print(f"🔑 Dev key: {dev_key}")
 
 
-def _create_user(email: str, tier: str = "pro", source: str = "lemonsqueezy") -> dict:
-    """Create a new user, generate API key, store in Neo4j."""
+async def _create_user(email: str, tier: str = "pro", source: str = "lemonsqueezy") -> dict:
+    """Create a new user, generate API key, store its hash in Neo4j."""
     import hashlib as _hl
     api_key = "dv_" + secrets.token_hex(24)
     user_id = "usr_" + _hl.md5(email.encode()).hexdigest()[:12]
     graph_id = "graph_" + secrets.token_hex(8)
-    with driver.session() as session:
-        session.run("""
+    async with driver.session() as session:
+        result = await session.run("""
             MERGE (u:DejaViewUser {email: $email})
-            SET u.api_key = $api_key, u.user_id = $user_id,
+            SET u.user_id = $user_id,
                 u.graph_id = $graph_id, u.tier = $tier,
                 u.source = $source, u.status = 'active',
                 u.created_at = datetime()
-        """, {"email": email, "api_key": api_key, "user_id": user_id,
+            WITH u
+            // A repeat purchase issues a fresh key; the previous one stops working
+            OPTIONAL MATCH (old:ApiKey {email: $email, status: 'active'})
+            SET old.status = 'revoked', old.revoked_at = timestamp()
+            WITH u, collect(old.key_hash) as revoked_hashes
+            CREATE (k:ApiKey {key_hash: $key_hash, user_id: $user_id, graph_id: $graph_id,
+                email: $email, tier: $tier, status: 'active', created_at: datetime()})
+            RETURN revoked_hashes
+        """, {"email": email, "key_hash": _hash_key(api_key), "user_id": user_id,
               "graph_id": graph_id, "tier": tier, "source": source})
+        record = await result.single()
     user = {"user_id": user_id, "graph_id": graph_id, "email": email, "tier": tier}
-    API_KEYS[api_key] = user
+    # Evict the replaced keys here rather than waiting for the revocation poll,
+    # and any negative entry from a lookup that raced the creation
+    for key_hash in (record["revoked_hashes"] if record else []):
+        _key_cache.pop(key_hash, None)
+    _key_cache.pop(_hash_key(api_key), None)
     print(f"✅ Created user: {email} -> {api_key[:12]}...")
     return {"api_key": api_key, **user}
 
 
-def _send_welcome_email(email: str, api_key: str):
-    """Send welcome email with API key via Resend."""
+async def _revoke_keys(where: str, params: dict) -> int:
+    """
+    Revoke active keys matching a WHERE clause on k. revoked_at (server epoch
+    ms) is what other replicas poll to evict their cached copies.
+    """
+    async with driver.session() as session:
+        result = await session.run(f"""
+            MATCH (k:ApiKey)
+            WHERE k.status = 'active' AND {where}
+            SET k.status = 'revoked', k.revoked_at = timestamp()
+            RETURN k.key_hash as key_hash
+        """, params)
+        hashes = [r["key_hash"] async for r in result]
+    for key_hash in hashes:
+        _key_cache.pop(key_hash, None)
+    return len(hashes)
+
+
+async def _poll_revocations():
+    """Evict keys revoked on any replica since the last poll."""
+    since = None
+    while True:
+        try:
+            async with driver.session() as session:
+                if since is None:
+                    # Start from the server clock; retried each round until Neo4j answers
+                    result = await session.run("RETURN timestamp() as now")
+                    since = (await result.single())["now"]
+                else:
+                    result = await session.run("""
+                        MATCH (k:ApiKey) WHERE k.revoked_at > $since
+                        RETURN k.key_hash as key_hash, k.revoked_at as revoked_at
+                    """, {"since": since})
+                    async for record in result:
+                        _key_cache.pop(record["key_hash"], None)
+                        since = max(since, record["revoked_at"])
+        except Exception as e:
+            print(f"⚠️  Revocation poll failed: {e}")
+        await asyncio.sleep(KEY_REVOCATION_POLL)
+
+
+async def _send_welcome_email(email: str, api_key: str):
+    """Send welcome email with API key via Resend. Runs as a background task."""
     resend_key = os.getenv("RESEND_API_KEY")
     if not resend_key:
         print(f"⚠️  No RESEND_API_KEY — skipping welcome email to {email}")
         return
-    import urllib.request as _ur, json as _js
     html = f"""<div style="font-family:system-ui,sans-serif;max-width:600px;margin:0 auto;padding:40px 20px">
 <h1 style="color:#7c5cfc">Welcome to DejaView 🔮</h1>
 <p>Your personal knowledge graph is ready. Here's your API key:</p>
@@ -135,13 +266,13 @@ def _send_welcome_email(email: str, api_key: str):
 • API: <code>https://api.dejaview.io</code><br>
 • Docs: <a href="https://api.dejaview.io/docs">api.dejaview.io/docs</a></p>
 <p style="color:#aaa;font-size:13px">— The DejaView team</p></div>"""
-    payload = _js.dumps({"from": "DejaView <hello@dejaview.io>", "to": [email],
-                          "subject": "Your DejaView API Key 🔮", "html": html}).encode()
-    req = _ur.Request("https://api.resend.com/emails", data=payload,
-                      headers={"Authorization": f"Bearer {resend_key}", "Content-Type": "application/json"})
+    payload = {"from": "DejaView <hello@dejaview.io>", "to": [email],
+               "subject": "Your DejaView API Key 🔮", "html": html}
     try:
-        with _ur.urlopen(req, timeout=10) as r:
-            print(f"📧 Welcome email sent to {email}")
+        r = await http_client.post("https://api.resend.com/emails", json=payload, timeout=10,
+                                   headers={"Authorization": f"Bearer {resend_key}"})
+        r.raise_for_status()
+        print(f"📧 Welcome email sent to {email}")
     except Exception as e:
         print(f"❌ Email failed for {email}: {e}")
 
@@ -150,11 +281,20 @@ async def verify_api_key(authorization: str = Header(None)) -> dict:
     if not authorization:
         raise HTTPException(status_code=401, detail="Missing Authorization header")
     
-    key = authorization.replace("Bearer ", "").strip()
-    if key not in API_KEYS:
+    key_hash = _hash_key(authorization.replace("Bearer ", "").strip())
+    if key_hash in _static_keys:
+        return _static_keys[key_hash]
+
+    cached = _key_cache.get(key_hash)
+    if cached and cached[0] > time.monotonic():
+        _key_cache.move_to_end(key_hash)
+        user = cached[1]
+    else:
+        user = await _lookup_key(key_hash)
+        _cache_key(key_hash, user)
+    if not user:
         raise HTTPException(status_code=401, detail="Invalid API key")
-    
-    return API_KEYS[key]
+    return user
 
 
 # ============ Models ============
@@ -245,10 +385,216 @@ def _predicate_to_rel_type(predicate: str) -> str:
     return clean.upper()
 
 
+# ============ Graph Statistics ============
+# One (:DVGraphStats {graph_id}) node per graph holds entity/relationship counts,
+# a degree-ranked top list and recent facts. Writes update it in their own
+# transaction; reads are a single node lookup behind a short TTL cache. Graphs
+# without a stats node (created before it existed) are built by
+# migrate_graph_stats.py; one that is still missing is computed read-only on
+# first read while a background job builds the node and entity _degree values.
+
+STATS_TOP_K = 20        # entities tracked by degree (agent-context shows 7)
+STATS_RECENT = 20       # recent facts tracked (agent-context shows 10)
+STATS_CACHE_TTL = float(os.getenv("DEJAVIEW_STATS_CACHE_TTL", "10"))
+STATS_CACHE_MAX = 10000
+
+_stats_cache: Dict[str, tuple] = {}  # graph_id -> (expires_at, stats)
+_stats_rebuilds: Dict[str, asyncio.Task] = {}  # graph_id -> background rebuild
+
+
+def _invalidate_stats_cache(graph_id: str):
+    _stats_cache.pop(graph_id, None)
+
+
+def _new_stats_delta() -> dict:
+    return {
+        "labels": Counter(),        # label -> entity count change
+        "rel_types": Counter(),     # relationship type -> count change
+        "degrees": {},              # (name, label) -> new degree
+        "recent_add": [],           # [subject, REL_TYPE, object], oldest first
+        "recent_remove": [],        # triples no longer in the graph
+        "removed_names": set(),     # entity names whose facts are all gone
+        "recompute_top": False,     # degrees decreased; top list must be re-ranked
+    }
+
+
+def _decode_stats(node) -> dict:
+    props = dict(node)
+    return {
+        "label_counts": json.loads(props.get("label_counts") or "{}"),
+        "rel_type_counts": json.loads(props.get("rel_type_counts") or "{}"),
+        "top": json.loads(props.get("top") or "[]"),
+        "recent": json.loads(props.get("recent") or "[]"),
+    }
+
+
+def _encode_stats(stats: dict) -> dict:
+    return {
+        "entities": sum(stats["label_counts"].values()),
+        "relationships": sum(stats["rel_type_counts"].values()),
+        "label_counts": json.dumps(stats["label_counts"]),
+        "rel_type_counts": json.dumps(stats["rel_type_counts"]),
+        "top": json.dumps(stats["top"]),
+        "recent": json.dumps(stats["recent"]),
+    }
+
+
+async def _top_by_degree(tx, graph_id: str) -> list:
+    result = await tx.run("""
+        MATCH (n:DVEntity {_graph_id: $gid})
+        WHERE n._degree > 0
+        RETURN n.name as name, coalesce(n.label, 'Entity') as label, n._degree as degree
+        ORDER BY degree DESC
+        LIMIT $k
+    """, {"gid": graph_id, "k": STATS_TOP_K})
+    return [[r["name"], r["label"], r["degree"]] async for r in result]
+
+
+async def _compute_graph_stats(tx, graph_id: str) -> dict:
+    """Compute a graph's statistics from its entities and relationships (read-only)."""
+    label_counts = {
+        r["label"]: r["count"] async for r in await tx.run("""
+            MATCH (n:DVEntity {_graph_id: $gid})
+            RETURN coalesce(n.label, 'Entity') as label, count(n) as count
+        """, {"gid": graph_id})
+    }
+    rel_type_counts = {
+        r["type"]: r["count"] async for r in await tx.run("""
+            MATCH (:DVEntity {_graph_id: $gid})-[r]->(:DVEntity {_graph_id: $gid})
+            RETURN type(r) as type, count(r) as count
+        """, {"gid": graph_id})
+    }
+    recent = [
+        [r["subject"], r["rel"], r["object"]] async for r in await tx.run("""
+            MATCH (s:DVEntity {_graph_id: $gid})-[r]->(o:DVEntity {_graph_id: $gid})
+            WHERE r.created_at IS NOT NULL
+            RETURN s.name as subject, type(r) as rel, o.name as object
+            ORDER BY r.created_at DESC
+            LIMIT $n
+        """, {"gid": graph_id, "n": STATS_RECENT})
+    ]
+    top = [
+        [r["name"], r["label"], r["degree"]] async for r in await tx.run("""
+            MATCH (n:DVEntity {_graph_id: $gid})
+            WITH n, COUNT { (n)-[]-() } as degree
+            WHERE degree > 0
+            RETURN n.name as name, coalesce(n.label, 'Entity') as label, degree
+            ORDER BY degree DESC
+            LIMIT $k
+        """, {"gid": graph_id, "k": STATS_TOP_K})
+    ]
+    return {
+        "label_counts": label_counts,
+        "rel_type_counts": rel_type_counts,
+        "top": top,
+        "recent": recent,
+    }
+
+
+async def _rebuild_graph_stats(tx, graph_id: str) -> dict:
+    """Recompute a graph's statistics (and every entity's _degree) and store them."""
+    await tx.run("""
+        MATCH (n:DVEntity {_graph_id: $gid})
+        SET n._degree = COUNT { (n)-[]-() }
+    """, {"gid": graph_id})
+    stats = await _compute_graph_stats(tx, graph_id)
+    await tx.run("""
+        MERGE (st:DVGraphStats {graph_id: $gid})
+        SET st += $props, st.version = coalesce(st.version, 0) + 1, st.rebuilt_at = datetime()
+    """, {"gid": graph_id, "props": _encode_stats(stats)})
+    return stats
+
+
+async def _apply_stats_delta(tx, graph_id: str, delta: dict):
+    """Fold a write's delta into the graph's stats node, inside the write's transaction."""
+    # SET first so the node is write-locked before its values are read;
+    # concurrent writers then serialize instead of losing updates.
+    result = await tx.run("""
+        MATCH (st:DVGraphStats {graph_id: $gid})
+        SET st.version = coalesce(st.version, 0) + 1
+        RETURN st
+    """, {"gid": graph_id})
+    record = await result.single()
+    if not record:
+        return  # Not built yet: the first read rebuilds from the graph, including this write
+
+    stats = _decode_stats(record["st"])
+    for key, counts in (("label_counts", delta["labels"]), ("rel_type_counts", delta["rel_types"])):
+        merged = Counter(stats[key])
+        merged.update(counts)
+        stats[key] = {k: v for k, v in merged.items() if v > 0}
+
+    if delta["recompute_top"]:
+        stats["top"] = await _top_by_degree(tx, graph_id)
+    elif delta["degrees"]:
+        top = {(name, label): degree for name, label, degree in stats["top"]}
+        top.update(delta["degrees"])
+        ranked = sorted(top.items(), key=lambda item: item[1], reverse=True)[:STATS_TOP_K]
+        stats["top"] = [[name, label, degree] for (name, label), degree in ranked if degree > 0]
+
+    removed = {tuple(t) for t in delta["recent_remove"]}
+    added = [list(t) for t in reversed(delta["recent_add"])]
+    added_keys = {tuple(t) for t in added}
+    recent = [
+        t for t in stats["recent"]
+        if tuple(t) not in removed and tuple(t) not in added_keys
+        and t[0] not in delta["removed_names"] and t[2] not in delta["removed_names"]
+    ]
+    deduped = []
+    for t in added:
+        if t not in deduped:
+            deduped.append(t)
+    stats["recent"] = (deduped + recent)[:STATS_RECENT]
+
+    await tx.run("MATCH (st:DVGraphStats {graph_id: $gid}) SET st += $props",
+                 {"gid": graph_id, "props": _encode_stats(stats)})
+
+
+def _schedule_stats_rebuild(graph_id: str):
+    """Build a graph's stats node in the background (once at a time per graph)."""
+    if graph_id in _stats_rebuilds:
+        return
+
+    async def rebuild():
+        try:
+            async with driver.session() as session:
+                await session.execute_write(_rebuild_graph_stats, graph_id)
+            _invalidate_stats_cache(graph_id)
+        except Exception as e:
+            print(f"⚠️  Stats rebuild failed for graph {graph_id}: {e}")
+        finally:
+            _stats_rebuilds.pop(graph_id, None)
+
+    _stats_rebuilds[graph_id] = asyncio.create_task(rebuild())
+
+
+async def _get_graph_stats(graph_id: str) -> dict:
+    """Graph statistics for one graph: TTL cache, then the stats node, then a read-only computation."""
+    cached = _stats_cache.get(graph_id)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    async with driver.session() as session:
+        result = await session.run(
+            "MATCH (st:DVGraphStats {graph_id: $gid}) RETURN st", {"gid": graph_id}
+        )
+        record = await result.single()
+        if record:
+            stats = _decode_stats(record["st"])
+        else:
+            stats = await session.execute_read(_compute_graph_stats, graph_id)
+            _schedule_stats_rebuild(graph_id)
+
+    if len(_stats_cache) >= STATS_CACHE_MAX:
+        _stats_cache.pop(next(iter(_stats_cache)))
+    _stats_cache[graph_id] = (time.monotonic() + STATS_CACHE_TTL, stats)
+    return stats
+
+
 # ============ Core Endpoints ============
 
 @app.get("/")
-def root():
+async def root():
     return {
         "service": "DejaView",
         "version": "1.0.0",
@@ -258,97 +604,215 @@ def root():
 
 
 @app.get("/v1/health")
-def health():
+async def health():
     try:
-        with driver.session() as session:
-            session.run("RETURN 1")
+        async with driver.session() as session:
+            await session.run("RETURN 1")
         return {"status": "healthy", "graph": "connected"}
     except Exception as e:
         return {"status": "unhealthy", "error": str(e)}
 
 
+# One statement per (subject label, object label, relationship type) group.
+# Labels and relationship types can't be parameterized, so they are injected
+# from the validated group key; everything else comes from $rows.
+FACT_MERGE_QUERY = """
+UNWIND $rows AS row
+MERGE (s:{subj_label} {{_norm_name: row.subj_norm, _graph_id: $graph_id}})
+ON CREATE SET s.name = row.subject, s.created_at = datetime(), s.label = $subj_label,
+    s._degree = 0, s._write_id = $write_id
+ON MATCH SET s.updated_at = datetime()
+SET s:DVEntity
+
+MERGE (o:{obj_label} {{_norm_name: row.obj_norm, _graph_id: $graph_id}})
+ON CREATE SET o.name = row.object, o.created_at = datetime(), o.label = $obj_label,
+    o._degree = 0, o._write_id = $write_id
+ON MATCH SET o.updated_at = datetime()
+SET o:DVEntity
+
+MERGE (s)-[r:{rel_type}]->(o)
+ON CREATE SET r._write_id = $write_id,
+    s._degree = coalesce(s._degree, 0) + 1,
+    o._degree = coalesce(o._degree, 0) + 1
+SET r.confidence = row.confidence,
+    r.source = row.source,
+    r.source_url = row.source_url,
+    r.context = row.context,
+    r.created_at = datetime(),
+    r._graph_id = $graph_id
+
+RETURN row.index as index, s.name as subject, type(r) as relationship, o.name as object,
+    s._write_id = $write_id as subject_created, o._write_id = $write_id as object_created,
+    r._write_id = $write_id as relationship_created,
+    s._degree as subject_degree, o._degree as object_degree
+"""
+
+WRITE_ID_NODE_CLEANUP_QUERY = """
+UNWIND $norms AS norm
+MATCH (n:DVEntity {_graph_id: $graph_id, _norm_name: norm})
+WHERE n._write_id = $write_id
+REMOVE n._write_id
+"""
+
+WRITE_ID_REL_CLEANUP_QUERY = """
+UNWIND $pairs AS pair
+MATCH (:DVEntity {_graph_id: $graph_id, _norm_name: pair.subj})-[r]->(:DVEntity {_graph_id: $graph_id, _norm_name: pair.obj})
+WHERE r._write_id = $write_id
+REMOVE r._write_id
+"""
+
+
+def _group_facts(facts: List[Fact]) -> Dict[tuple, List[dict]]:
+    """Group facts by (subject label, object label, relationship type), keeping their batch index."""
+    groups: Dict[tuple, List[dict]] = {}
+    for index, fact in enumerate(facts):
+        rel_type = _predicate_to_rel_type(fact.predicate)
+        # Since Neo4j doesn't allow parameterized rel types, we validate and inject
+        if not re.match(r"^[A-Z][A-Z0-9_]*$", rel_type):
+            rel_type = "RELATED_TO"
+        key = (
+            _infer_label(fact.subject, "subject", fact.predicate),
+            _infer_label(fact.object, "object", fact.predicate),
+            rel_type,
+        )
+        groups.setdefault(key, []).append({
+            "index": index,
+            "subject": fact.subject,
+            "object": fact.object,
+            "subj_norm": _normalize_name(fact.subject),
+            "obj_norm": _normalize_name(fact.object),
+            "confidence": fact.confidence,
+            "source": fact.source,
+            "source_url": fact.source_url,
+            "context": fact.context,
+        })
+    return groups
+
+
+async def _merge_fact_groups(tx, graph_id: str, groups: Dict[tuple, List[dict]]) -> Dict[int, dict]:
+    """
+    Write every group inside one transaction and apply the resulting graph
+    statistics delta in the same transaction. Returns results keyed by batch index.
+    """
+    stored = {}
+    # _write_id marks what this transaction created; a node or relationship
+    # hit by several rows reports created each time, so dedupe by identity.
+    # The markers are removed again before the transaction commits.
+    write_id = secrets.token_hex(8)
+    created_nodes = set()
+    created_rels = set()
+    delta = _new_stats_delta()
+    for (subj_label, obj_label, rel_type), rows in groups.items():
+        query = FACT_MERGE_QUERY.format(subj_label=subj_label, obj_label=obj_label, rel_type=rel_type)
+        result = await tx.run(query, {
+            "rows": rows,
+            "graph_id": graph_id,
+            "subj_label": subj_label,
+            "obj_label": obj_label,
+            "write_id": write_id,
+        })
+        norms = {row["index"]: (row["subj_norm"], row["obj_norm"]) for row in rows}
+        async for record in result:
+            subj_norm, obj_norm = norms[record["index"]]
+            subj_key, obj_key = (subj_label, subj_norm), (obj_label, obj_norm)
+            for key, created in ((subj_key, record["subject_created"]), (obj_key, record["object_created"])):
+                if created and key not in created_nodes:
+                    created_nodes.add(key)
+                    delta["labels"][key[0]] += 1
+            rel_key = (subj_key, rel_type, obj_key)
+            if record["relationship_created"] and rel_key not in created_rels:
+                created_rels.add(rel_key)
+                delta["rel_types"][rel_type] += 1
+            # Later rows see earlier rows' degree updates, so the last value wins
+            delta["degrees"][(record["subject"], subj_label)] = record["subject_degree"]
+            delta["degrees"][(record["object"], obj_label)] = record["object_degree"]
+            delta["recent_add"].append([record["subject"], rel_type, record["object"]])
+            stored[record["index"]] = {
+                "subject": record["subject"],
+                "relationship": record["relationship"],
+                "object": record["object"],
+                "subject_label": subj_label,
+                "object_label": obj_label,
+            }
+    await _clear_write_ids(tx, graph_id, write_id, created_nodes, created_rels)
+    await _apply_stats_delta(tx, graph_id, delta)
+    return stored
+
+
+async def _clear_write_ids(tx, graph_id: str, write_id: str, created_nodes: set, created_rels: set):
+    """Remove the _write_id markers this transaction set, once its results are read."""
+    if created_nodes:
+        await tx.run(WRITE_ID_NODE_CLEANUP_QUERY, {
+            "graph_id": graph_id,
+            "write_id": write_id,
+            "norms": sorted({norm for _, norm in created_nodes}),
+        })
+    if created_rels:
+        await tx.run(WRITE_ID_REL_CLEANUP_QUERY, {
+            "graph_id": graph_id,
+            "write_id": write_id,
+            "pairs": [{"subj": subj[1], "obj": obj[1]} for subj, _, obj in created_rels],
+        })
+
+
+async def _write_facts(session, graph_id: str, facts: List[Fact]) -> List[dict]:
+    """
+    Store a batch of facts in a single write transaction.
+
+    If the transaction fails, it is replayed one fact per transaction so the
+    error is reported against the fact(s) that caused it, as before.
+    """
+    groups = _group_facts(facts)
+    try:
+        stored = await session.execute_write(_merge_fact_groups, graph_id, groups)
+    except Exception as e:
+        print(f"⚠️  Batched fact write failed, retrying per fact: {e}")
+        stored = {}
+        for key, rows in groups.items():
+            for row in rows:
+                try:
+                    stored.update(await session.execute_write(_merge_fact_groups, graph_id, {key: [row]}))
+                except Exception as row_error:
+                    stored[row["index"]] = {"error": str(row_error)}
+
+    results = []
+    for index, fact in enumerate(facts):
+        entry = stored.get(index) or {"error": "Fact was not written"}
+        if "error" in entry:
+            entry = {**entry, "fact": f"{fact.subject} → {fact.predicate} → {fact.object}"}
+        results.append(entry)
+    return results
+
+
 @app.post("/v1/facts")
-def store_facts(batch: FactsBatch, user: dict = Depends(verify_api_key)):
+async def store_facts(batch: FactsBatch, user: dict = Depends(verify_api_key)):
     """
     Store one or more facts as subject-predicate-object triples.
     
     Entities are automatically created, labeled, and deduplicated.
     The predicate becomes a typed relationship (not generic RELATES_TO).
+    The whole batch is written in one transaction with one UNWIND statement
+    per (label, label, relationship type) group.
     """
     graph_id = user["graph_id"]
-    stored = []
-    
-    with driver.session() as session:
-        for fact in batch.facts:
-            rel_type = _predicate_to_rel_type(fact.predicate)
-            subj_label = _infer_label(fact.subject, "subject", fact.predicate)
-            obj_label = _infer_label(fact.object, "object", fact.predicate)
-            subj_norm = _normalize_name(fact.subject)
-            obj_norm = _normalize_name(fact.object)
-            
-            # Use dynamic relationship type via APOC or string interpolation
-            # Since Neo4j doesn't allow parameterized rel types, we validate and inject
-            if not re.match(r"^[A-Z][A-Z0-9_]*$", rel_type):
-                rel_type = "RELATED_TO"
-            
-            query = f"""
-            MERGE (s:{subj_label} {{_norm_name: $subj_norm, _graph_id: $graph_id}})
-            ON CREATE SET s.name = $subject, s.created_at = datetime(), s.label = $subj_label
-            ON MATCH SET s.updated_at = datetime()
-            
-            MERGE (o:{obj_label} {{_norm_name: $obj_norm, _graph_id: $graph_id}})
-            ON CREATE SET o.name = $object, o.created_at = datetime(), o.label = $obj_label
-            ON MATCH SET o.updated_at = datetime()
-            
-            MERGE (s)-[r:{rel_type}]->(o)
-            SET r.confidence = $confidence,
-                r.source = $source,
-                r.source_url = $source_url,
-                r.context = $context,
-                r.created_at = datetime(),
-                r._graph_id = $graph_id
-            
-            RETURN s.name as subject, type(r) as relationship, o.name as object
-            """
-            
-            try:
-                result = session.run(query, {
-                    "subject": fact.subject,
-                    "object": fact.object,
-                    "subj_norm": subj_norm,
-                    "obj_norm": obj_norm,
-                    "subj_label": subj_label,
-                    "obj_label": obj_label,
-                    "confidence": fact.confidence,
-                    "source": fact.source,
-                    "source_url": fact.source_url,
-                    "context": fact.context,
-                    "graph_id": graph_id,
-                })
-                record = result.single()
-                stored.append({
-                    "subject": record["subject"],
-                    "relationship": record["relationship"],
-                    "object": record["object"],
-                    "subject_label": subj_label,
-                    "object_label": obj_label,
-                })
-            except Exception as e:
-                stored.append({"error": str(e), "fact": f"{fact.subject} → {fact.predicate} → {fact.object}"})
-    
+
+    async with driver.session() as session:
+        stored = await _write_facts(session, graph_id, batch.facts)
+    _invalidate_stats_cache(graph_id)
+
     return {"stored": len([s for s in stored if "error" not in s]), "total": len(stored), "results": stored}
 
 
 @app.get("/v1/entities/{name}")
-def get_entity(name: str, user: dict = Depends(verify_api_key)):
+async def get_entity(name: str, user: dict = Depends(verify_api_key)):
     """Get everything about an entity — properties and all relationships."""
     graph_id = user["graph_id"]
     norm = _normalize_name(name)
     
-    with driver.session() as session:
+    async with driver.session() as session:
         # Find entity
-        result = session.run("""
-            MATCH (n {_norm_name: $norm, _graph_id: $graph_id})
+        result = await session.run("""
+            MATCH (n:DVEntity {_norm_name: $norm, _graph_id: $graph_id})
             OPTIONAL MATCH (n)-[r_out]->(target)
             OPTIONAL MATCH (source)-[r_in]->(n)
             RETURN n,
@@ -358,7 +822,7 @@ def get_entity(name: str, user: dict = Depends(verify_api_key)):
                     confidence: r_in.confidence, context: r_in.context, created: toString(r_in.created_at)}) as incoming
         """, {"norm": norm, "graph_id": graph_id})
         
-        record = result.single()
+        record = await result.single()
         if not record:
             raise HTTPException(status_code=404, detail=f"Entity '{name}' not found")
         
@@ -371,105 +835,248 @@ def get_entity(name: str, user: dict = Depends(verify_api_key)):
         }
 
 
+# ============ Subgraph Extraction ============
+# Subgraphs are expanded breadth-first, one frontier per round trip, with
+# node-level dedupe in Cypher: a hub at depth 3 costs its distinct neighbours,
+# not every path through it. apoc.path.subgraphAll does the same server-side
+# and is used when the plugin is installed.
+
+SUBGRAPH_MAX_NODES = int(os.getenv("DEJAVIEW_SUBGRAPH_MAX_NODES", "500"))
+SUBGRAPH_MAX_EDGES = int(os.getenv("DEJAVIEW_SUBGRAPH_MAX_EDGES", "2000"))
+SUBGRAPH_CACHE_MAX = 1000
+
+# (graph_id, norm, depth) -> (stats version, subgraph). An entry is served only
+# while the graph's DVGraphStats.version is unchanged, so writes on any
+# replica invalidate it.
+_subgraph_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_apoc_available: Optional[bool] = None  # probed on first use
+
+SUBGRAPH_APOC_QUERY = """
+MATCH (start:DVEntity {_norm_name: $norm, _graph_id: $gid})
+WITH collect(start) as starts
+WHERE size(starts) > 0
+CALL apoc.path.subgraphAll(starts, {maxLevel: $depth, labelFilter: '+DVEntity', limit: $max_nodes + 1})
+YIELD nodes, relationships
+RETURN [n IN nodes | {name: n.name, label: n.label}] as nodes,
+       [r IN relationships[..$max_edges + 1] |
+           {source: startNode(r).name, type: type(r), target: endNode(r).name}] as edges
+"""
+
+SUBGRAPH_START_QUERY = """
+MATCH (n:DVEntity {_norm_name: $norm, _graph_id: $gid})
+RETURN elementId(n) as id, n.name as name, n.label as label
+"""
+
+SUBGRAPH_LEVEL_QUERY = """
+UNWIND $frontier AS id
+MATCH (n:DVEntity) WHERE elementId(n) = id
+MATCH (n)--(m:DVEntity {_graph_id: $gid})
+WHERE NOT elementId(m) IN $seen
+RETURN DISTINCT elementId(m) as id, m.name as name, m.label as label
+LIMIT $limit
+"""
+
+SUBGRAPH_EDGES_QUERY = """
+UNWIND $ids AS id
+MATCH (n:DVEntity) WHERE elementId(n) = id
+MATCH (n)-[r]->(m:DVEntity)
+WHERE elementId(m) IN $ids
+RETURN n.name as source, type(r) as type, m.name as target
+LIMIT $limit
+"""
+
+
+def _trim_subgraph(nodes: List[dict], edges: List[dict]) -> dict:
+    """Apply the node/edge caps; edges must connect kept nodes."""
+    truncated = len(nodes) > SUBGRAPH_MAX_NODES
+    nodes = nodes[:SUBGRAPH_MAX_NODES]
+    names = {n["name"] for n in nodes}
+    edges = [e for e in edges if e["source"] in names and e["target"] in names]
+    if len(edges) > SUBGRAPH_MAX_EDGES:
+        truncated = True
+        edges = edges[:SUBGRAPH_MAX_EDGES]
+    return {"nodes": nodes, "edges": edges, "truncated": truncated}
+
+
+async def _bfs_subgraph(session, graph_id: str, norm: str, depth: int) -> Optional[dict]:
+    """Native expansion: one UNWIND query per level, then one query for the edges."""
+    result = await session.run(SUBGRAPH_START_QUERY, {"norm": norm, "gid": graph_id})
+    found = {r["id"]: {"name": r["name"], "label": r["label"]} async for r in result}
+    if not found:
+        return None
+
+    frontier = list(found)
+    for _ in range(depth):
+        if not frontier or len(found) > SUBGRAPH_MAX_NODES:
+            break
+        result = await session.run(SUBGRAPH_LEVEL_QUERY, {
+            "frontier": frontier, "seen": list(found), "gid": graph_id,
+            "limit": SUBGRAPH_MAX_NODES + 1 - len(found),
+        })
+        frontier = []
+        async for r in result:
+            found[r["id"]] = {"name": r["name"], "label": r["label"]}
+            frontier.append(r["id"])
+
+    # Over the cap by one at most: _trim_subgraph drops it and flags truncation
+    ids = list(found)[:SUBGRAPH_MAX_NODES]
+    result = await session.run(SUBGRAPH_EDGES_QUERY, {"ids": ids, "limit": SUBGRAPH_MAX_EDGES + 1})
+    edges = [dict(r) async for r in result]
+    return _trim_subgraph(list(found.values()), edges)
+
+
+async def _get_subgraph(graph_id: str, norm: str, depth: int) -> Optional[dict]:
+    """
+    Nodes and edges within `depth` hops of an entity, capped at
+    SUBGRAPH_MAX_NODES / SUBGRAPH_MAX_EDGES with a truncated flag.
+    Returns None if the entity doesn't exist.
+    """
+    global _apoc_available
+    key = (graph_id, norm, depth)
+    async with driver.session() as session:
+        result = await session.run(
+            "MATCH (st:DVGraphStats {graph_id: $gid}) RETURN st.version as version", {"gid": graph_id}
+        )
+        record = await result.single()
+        version = record["version"] if record else None
+        cached = _subgraph_cache.get(key)
+        if cached and version is not None and cached[0] == version:
+            _subgraph_cache.move_to_end(key)
+            return cached[1]
+
+        subgraph = None
+        if _apoc_available is not False:
+            try:
+                result = await session.run(SUBGRAPH_APOC_QUERY, {
+                    "norm": norm, "gid": graph_id, "depth": depth,
+                    "max_nodes": SUBGRAPH_MAX_NODES, "max_edges": SUBGRAPH_MAX_EDGES,
+                })
+                record = await result.single()
+                _apoc_available = True
+                if record:
+                    subgraph = _trim_subgraph(list(record["nodes"]), list(record["edges"]))
+            except ClientError as e:
+                if e.code != "Neo.ClientError.Procedure.ProcedureNotFound":
+                    raise
+                print("ℹ️  APOC not installed, using native BFS for subgraphs")
+                _apoc_available = False
+        if _apoc_available is False:
+            subgraph = await _bfs_subgraph(session, graph_id, norm, depth)
+
+    # Graphs without a stats node have no version to validate against
+    if subgraph is not None and version is not None:
+        _subgraph_cache[key] = (version, subgraph)
+        if len(_subgraph_cache) > SUBGRAPH_CACHE_MAX:
+            _subgraph_cache.popitem(last=False)
+    return subgraph
+
+
 @app.get("/v1/graph/{name}")
-def get_subgraph(name: str, depth: int = 2, user: dict = Depends(verify_api_key)):
+async def get_subgraph(name: str, depth: int = 2, user: dict = Depends(verify_api_key)):
     """Get subgraph around an entity for visualization. Returns nodes and edges."""
     graph_id = user["graph_id"]
     norm = _normalize_name(name)
     depth = min(depth, 3)  # Cap at 3 hops
-    
-    with driver.session() as session:
-        result = session.run(f"""
-            MATCH (start {{_norm_name: $norm, _graph_id: $graph_id}})
-            CALL apoc.path.subgraphAll(start, {{maxLevel: $depth}})
-            YIELD nodes, relationships
-            RETURN nodes, relationships
-        """, {"norm": norm, "graph_id": graph_id, "depth": depth})
-        
-        record = result.single()
-        if not record:
-            # Fallback without APOC
-            result = session.run(f"""
-                MATCH (start {{_norm_name: $norm, _graph_id: $graph_id}})
-                MATCH path = (start)-[*1..{depth}]-(connected)
-                WHERE connected._graph_id = $graph_id
-                WITH start, collect(DISTINCT connected) as cnodes,
-                     collect(DISTINCT relationships(path)) as rel_lists
-                RETURN start, cnodes, rel_lists
-            """, {"norm": norm, "graph_id": graph_id})
-            record = result.single()
-            if not record:
-                raise HTTPException(status_code=404, detail=f"Entity '{name}' not found")
-            all_nodes = [dict(record["start"])] + [dict(n) for n in record["cnodes"]]
-            nodes = []
-            seen_nodes = set()
-            for n in all_nodes:
-                n_name = n.get("name", "unknown")
-                if n_name not in seen_nodes:
-                    seen_nodes.add(n_name)
-                    nodes.append({"id": n_name, "name": n_name,
-                                  "label": n.get("label", "Entity"),
-                                  "type": n.get("label", "Entity")})
-            links = []
-            seen_links = set()
-            for rel_list in record["rel_lists"]:
-                for r in (rel_list if isinstance(rel_list, list) else [rel_list]):
-                    try:
-                        src = dict(r.start_node).get("name", "")
-                        tgt = dict(r.end_node).get("name", "")
-                        key = f"{src}-{r.type}-{tgt}"
-                        if key not in seen_links:
-                            seen_links.add(key)
-                            links.append({"source": src, "target": tgt,
-                                         "type": r.type,
-                                         "predicate": r.type.lower().replace("_"," ")})
-                    except Exception:
-                        pass
-            return {"nodes": nodes, "edges": links, "links": links, "center": name}
-    
-    # Format APOC result
-    nodes = []
-    for n in record["nodes"]:
-        props = dict(n)
-        nodes.append({
-            "id": props.get("name"),
-            "label": props.get("label", "Entity"),
-            "name": props.get("name"),
-        })
-    
-    links = []
-    for r in record["relationships"]:
-        links.append({
-            "source": dict(r.start_node).get("name"),
-            "target": dict(r.end_node).get("name"),
-            "type": r.type,
-            "predicate": r.type.lower().replace("_", " "),
-        })
-    return {"nodes": nodes, "edges": links, "links": links, "center": name}
+
+    subgraph = await _get_subgraph(graph_id, norm, depth)
+    if subgraph is None:
+        raise HTTPException(status_code=404, detail=f"Entity '{name}' not found")
+
+    nodes = {}
+    for n in subgraph["nodes"]:
+        label = n["label"] or "Entity"
+        nodes.setdefault(n["name"], {"id": n["name"], "name": n["name"], "label": label, "type": label})
+    links = [
+        {"source": e["source"], "target": e["target"], "type": e["type"],
+         "predicate": e["type"].lower().replace("_", " ")}
+        for e in subgraph["edges"]
+    ]
+    return {"nodes": list(nodes.values()), "edges": links, "links": links, "center": name,
+            "truncated": subgraph["truncated"]}
+
+
+# Full-text index over entity names. _graph_id is indexed alongside so the
+# tenant filter runs inside Lucene instead of over every tenant's matches.
+ENTITY_FULLTEXT_INDEX = "dv_entity_fulltext"
+
+FULLTEXT_SEARCH_QUERY = """
+CALL db.index.fulltext.queryNodes($index, $lucene, {limit: $limit})
+YIELD node AS n, score
+WHERE n._graph_id = $graph_id
+OPTIONAL MATCH (n)-[r]->(m:DVEntity {_graph_id: $graph_id})
+WITH n, score, collect(DISTINCT {type: type(r), target: m.name})[..5] as connections
+RETURN n.name as name, n.label as label, score, connections
+ORDER BY score DESC
+LIMIT $limit
+"""
+
+CONTAINS_SEARCH_QUERY = """
+MATCH (n:DVEntity {_graph_id: $graph_id})
+WHERE toLower(n.name) CONTAINS toLower($q)
+OPTIONAL MATCH (n)-[r]->(m:DVEntity {_graph_id: $graph_id})
+RETURN n.name as name, n.label as label, null as score,
+    collect(DISTINCT {type: type(r), target: m.name})[..5] as connections
+LIMIT $limit
+"""
+
+
+def _search_terms(text: str) -> List[str]:
+    """Lowercased word tokens, with Lucene syntax characters stripped."""
+    return re.findall(r"\w+", text.lower())
+
+
+def _fulltext_query(graph_id: str, terms: List[str], match_all: bool) -> str:
+    """
+    Build a Lucene query over entity names for one graph.
+
+    Each term matches exactly (boosted), as a prefix, or — for terms of four
+    or more characters — within edit distance 1.
+    """
+    clauses = []
+    for term in terms:
+        options = [f"{term}^3", f"{term}*"]
+        if len(term) >= 4:
+            options.append(f"{term}~1")
+        clauses.append(f"({' OR '.join(options)})")
+    names = (" AND " if match_all else " OR ").join(clauses)
+    escaped_gid = graph_id.replace("\\", "\\\\").replace('"', '\\"')
+    return f'_graph_id:"{escaped_gid}" AND name:({names})'
 
 
 @app.post("/v1/search")
-def search(query: SearchQuery, user: dict = Depends(verify_api_key)):
-    """Full-text search across entities."""
+async def search(query: SearchQuery, user: dict = Depends(verify_api_key)):
+    """Full-text search across entities, ranked by relevance."""
     graph_id = user["graph_id"]
-    
-    with driver.session() as session:
-        result = session.run("""
-            MATCH (n {_graph_id: $graph_id})
-            WHERE toLower(n.name) CONTAINS toLower($q)
-            OPTIONAL MATCH (n)-[r]->(m {_graph_id: $graph_id})
-            RETURN n.name as name, n.label as label,
-                collect(DISTINCT {type: type(r), target: m.name})[..5] as connections
-            LIMIT $limit
-        """, {"q": query.q, "graph_id": graph_id, "limit": query.limit})
-        
+    terms = _search_terms(query.q)
+
+    async with driver.session() as session:
+        records = None
+        if terms:
+            try:
+                result = await session.run(FULLTEXT_SEARCH_QUERY, {
+                    "index": ENTITY_FULLTEXT_INDEX,
+                    "lucene": _fulltext_query(graph_id, terms, match_all=True),
+                    "graph_id": graph_id,
+                    "limit": query.limit,
+                })
+                records = [r async for r in result]
+            except Exception as e:
+                # Index missing or still populating: fall back to a scan
+                print(f"⚠️  Full-text search unavailable, using CONTAINS scan: {e}")
+        if records is None:
+            result = await session.run(CONTAINS_SEARCH_QUERY, {
+                "q": query.q, "graph_id": graph_id, "limit": query.limit,
+            })
+            records = [r async for r in result]
+
         results = []
-        for record in result:
+        for record in records:
             conns = [c for c in record["connections"] if c["target"]]
             results.append({
                 "name": record["name"],
                 "label": record["label"],
                 "type": record["label"] or "Entity",
+                "score": record["score"],
                 "connections": len(conns),
                 "connection_list": conns,
             })
@@ -478,13 +1085,13 @@ def search(query: SearchQuery, user: dict = Depends(verify_api_key)):
 
 
 @app.get("/v1/timeline")
-def timeline(limit: int = 50, user: dict = Depends(verify_api_key)):
+async def timeline(limit: int = 50, user: dict = Depends(verify_api_key)):
     """Get recent facts chronologically."""
     graph_id = user["graph_id"]
     
-    with driver.session() as session:
-        result = session.run("""
-            MATCH (s {_graph_id: $graph_id})-[r]->(o {_graph_id: $graph_id})
+    async with driver.session() as session:
+        result = await session.run("""
+            MATCH (s:DVEntity {_graph_id: $graph_id})-[r]->(o:DVEntity {_graph_id: $graph_id})
             WHERE r.created_at IS NOT NULL
             RETURN s.name as subject, type(r) as relationship,
                    toLower(type(r)) as predicate, o.name as object,
@@ -494,31 +1101,19 @@ def timeline(limit: int = 50, user: dict = Depends(verify_api_key)):
             LIMIT $limit
         """, {"graph_id": graph_id, "limit": limit})
         
-        return {"facts": [dict(r) for r in result]}
+        return {"facts": [dict(r) async for r in result]}
 
 
 @app.get("/v1/stats")
-def stats(user: dict = Depends(verify_api_key)):
+async def stats(user: dict = Depends(verify_api_key)):
     """Get graph statistics."""
-    graph_id = user["graph_id"]
-    
-    with driver.session() as session:
-        entities = session.run(
-            "MATCH (n {_graph_id: $gid}) RETURN count(n) as count, collect(DISTINCT n.label) as labels",
-            {"gid": graph_id}
-        ).single()
-        
-        rels = session.run(
-            "MATCH ({_graph_id: $gid})-[r]->({_graph_id: $gid}) RETURN count(r) as count, collect(DISTINCT type(r)) as types",
-            {"gid": graph_id}
-        ).single()
-        
-        return {
-            "entities": entities["count"],
-            "entity_types": entities["labels"],
-            "relationships": rels["count"],
-            "relationship_types": rels["types"],
-        }
+    graph_stats = await _get_graph_stats(user["graph_id"])
+    return {
+        "entities": sum(graph_stats["label_counts"].values()),
+        "entity_types": list(graph_stats["label_counts"]),
+        "relationships": sum(graph_stats["rel_type_counts"].values()),
+        "relationship_types": list(graph_stats["rel_type_counts"]),
+    }
 
 
 # ============ Backward Compatibility ============
@@ -532,7 +1127,7 @@ class LegacyMemory(BaseModel):
     source: Optional[str] = "api"
 
 @app.post("/remember")
-def legacy_remember(memory: LegacyMemory):
+async def legacy_remember(memory: LegacyMemory):
     """Legacy endpoint — redirects to /v1/facts."""
     batch = FactsBatch(facts=[Fact(
         subject=memory.subject,
@@ -543,14 +1138,14 @@ def legacy_remember(memory: LegacyMemory):
     )])
     # Use default graph for legacy endpoint
     user = {"user_id": "default", "graph_id": "default", "tier": "pro"}
-    return store_facts(batch, user)
+    return await store_facts(batch, user)
 
 @app.get("/context/{entity}")
-def legacy_context(entity: str):
+async def legacy_context(entity: str):
     """Legacy endpoint — redirects to /v1/entities."""
     user = {"user_id": "default", "graph_id": "default", "tier": "pro"}
     try:
-        return get_entity(entity, user)
+        return await get_entity(entity, user)
     except HTTPException:
         return {"entity": None, "outgoing": [], "incoming": []}
 
@@ -558,12 +1153,12 @@ def legacy_context(entity: str):
 
 
 @app.get("/v1/graph")
-def get_full_graph(limit: int = 100, user: dict = Depends(verify_api_key)):
+async def get_full_graph(limit: int = 100, user: dict = Depends(verify_api_key)):
     """Get the full graph for visualization (all nodes and relationships)."""
     graph_id = user["graph_id"]
-    with driver.session() as session:
-        result = session.run("""
-            MATCH (s {_graph_id: $gid})-[r]->(o {_graph_id: $gid})
+    async with driver.session() as session:
+        result = await session.run("""
+            MATCH (s:DVEntity {_graph_id: $gid})-[r]->(o:DVEntity {_graph_id: $gid})
             RETURN s.name as sname, s.label as slabel,
                    type(r) as rtype,
                    o.name as oname, o.label as olabel
@@ -571,7 +1166,7 @@ def get_full_graph(limit: int = 100, user: dict = Depends(verify_api_key)):
         """, {"gid": graph_id, "limit": limit})
         nodes = {}
         links = []
-        for rec in result:
+        async for rec in result:
             sn, sl = rec["sname"], rec["slabel"] or "Entity"
             on, ol = rec["oname"], rec["olabel"] or "Entity"
             rt = rec["rtype"]
@@ -585,40 +1180,25 @@ def get_full_graph(limit: int = 100, user: dict = Depends(verify_api_key)):
 
 
 @app.get("/v1/agent-context")
-def agent_context_endpoint(user: dict = Depends(verify_api_key)):
+async def agent_context_endpoint(user: dict = Depends(verify_api_key)):
     """
     Returns a natural-language context block summarizing the knowledge graph.
     Designed for injection into agent system prompts at session start.
     """
-    graph_id = user["graph_id"]
-    with driver.session() as session:
-        type_counts = list(session.run("""
-            MATCH (n {_graph_id: $gid})
-            RETURN coalesce(n.label, 'Entity') as label, count(n) as count
-            ORDER BY count DESC
-        """, {"gid": graph_id}))
-
-        rel_count_result = session.run("""
-            MATCH ({_graph_id: $gid})-[r]->({_graph_id: $gid})
-            RETURN count(r) as count
-        """, {"gid": graph_id}).single()
-        rel_count = rel_count_result["count"] if rel_count_result else 0
-
-        top_entities = list(session.run("""
-            MATCH (n {_graph_id: $gid})
-            OPTIONAL MATCH (n)-[r]-()
-            RETURN n.name as name, coalesce(n.label, 'Entity') as label, count(r) as conns
-            ORDER BY conns DESC
-            LIMIT 7
-        """, {"gid": graph_id}))
-
-        recent = list(session.run("""
-            MATCH (s {_graph_id: $gid})-[r]->(o {_graph_id: $gid})
-            WHERE r.created_at IS NOT NULL
-            RETURN s.name as subject, type(r) as rel, o.name as object
-            ORDER BY r.created_at DESC
-            LIMIT 10
-        """, {"gid": graph_id}))
+    graph_stats = await _get_graph_stats(user["graph_id"])
+    type_counts = [
+        {"label": label, "count": count}
+        for label, count in sorted(graph_stats["label_counts"].items(), key=lambda item: item[1], reverse=True)
+    ]
+    rel_count = sum(graph_stats["rel_type_counts"].values())
+    top_entities = [
+        {"name": name, "label": label, "conns": degree}
+        for name, label, degree in graph_stats["top"][:7]
+    ]
+    recent = [
+        {"subject": subject, "rel": rel, "object": obj}
+        for subject, rel, obj in graph_stats["recent"][:10]
+    ]
 
     total_entities = sum(r["count"] for r in type_counts)
     lines = ["## DejaView Knowledge Graph", ""]
@@ -651,7 +1231,7 @@ def agent_context_endpoint(user: dict = Depends(verify_api_key)):
 # ============ LemonSqueezy Webhook ============
 
 @app.post("/webhooks/lemonsqueezy")
-async def lemonsqueezy_webhook(request: Request):
+async def lemonsqueezy_webhook(request: Request, background_tasks: BackgroundTasks):
     """Handle LemonSqueezy webhooks — auto-provision users on payment."""
     import hmac as _hmac, hashlib as _hl, json as _js
     secret = os.getenv("LEMONSQUEEZY_WEBHOOK_SECRET", "")
@@ -669,9 +1249,16 @@ async def lemonsqueezy_webhook(request: Request):
         email = attrs.get("user_email") or attrs.get("customer_email", "")
         if not email:
             return {"status": "skipped", "reason": "no email"}
-        user = _create_user(email=email, tier="pro", source="lemonsqueezy")
-        _send_welcome_email(email, user["api_key"])
+        user = await _create_user(email=email, tier="pro", source="lemonsqueezy")
+        # Sent after the response so the payment provider is acknowledged immediately
+        background_tasks.add_task(_send_welcome_email, email, user["api_key"])
         return {"status": "ok", "provisioned": email}
+    if event_name == "subscription_expired":
+        email = attrs.get("user_email") or attrs.get("customer_email", "")
+        if not email:
+            return {"status": "skipped", "reason": "no email"}
+        revoked = await _revoke_keys("k.email = $email", {"email": email})
+        return {"status": "ok", "revoked": revoked}
     return {"status": "ok", "event": event_name}
 
 
@@ -689,13 +1276,13 @@ class PageExtract(BaseModel):
     max_facts: int = Field(default=8, ge=1, le=20)
 
 @app.post("/v1/extract")
-def extract_facts(body: PageExtract, user: dict = Depends(verify_api_key)):
+async def extract_facts(body: PageExtract, user: dict = Depends(verify_api_key)):
     """
     Extract facts from arbitrary text using LLM.
     Designed for the browser extension — send page content, get back
     suggested subject-predicate-object triples ready to save.
     """
-    import urllib.request as _ur, json as _js
+    import json as _js
 
     context_hint = ""
     if body.title:
@@ -717,59 +1304,58 @@ Text:
 
 Return only valid JSON, no explanation:"""
 
-    # Try Anthropic
+    # Try Anthropic, then OpenAI, holding one LLM slot for the whole exchange
     anthropic_key = os.getenv("ANTHROPIC_API_KEY")
     facts = []
 
-    if anthropic_key:
-        payload = _js.dumps({
-            "model": "claude-3-5-haiku-20241022",
-            "max_tokens": 1024,
-            "messages": [{"role": "user", "content": prompt}]
-        }).encode()
-        req = _ur.Request(
-            "https://api.anthropic.com/v1/messages",
-            data=payload,
-            headers={
-                "x-api-key": anthropic_key,
-                "anthropic-version": "2023-06-01",
-                "content-type": "application/json",
-            }
-        )
-        try:
-            with _ur.urlopen(req, timeout=20) as r:
-                text = _js.load(r)["content"][0]["text"].strip()
+    async with _llm_slot():
+        if anthropic_key:
+            try:
+                r = await http_client.post(
+                    "https://api.anthropic.com/v1/messages",
+                    json={
+                        "model": "claude-3-5-haiku-20241022",
+                        "max_tokens": 1024,
+                        "messages": [{"role": "user", "content": prompt}]
+                    },
+                    headers={
+                        "x-api-key": anthropic_key,
+                        "anthropic-version": "2023-06-01",
+                    },
+                    timeout=20,
+                )
+                r.raise_for_status()
+                text = r.json()["content"][0]["text"].strip()
                 # Parse JSON from response
                 start = text.find("[")
                 end = text.rfind("]") + 1
                 if start >= 0 and end > start:
                     facts = _js.loads(text[start:end])
-        except Exception as e:
-            print(f"Extract LLM error: {e}")
+            except Exception as e:
+                print(f"Extract LLM error: {e}")
 
-    # Try OpenAI fallback
-    if not facts:
-        openai_key = os.getenv("OPENAI_API_KEY")
-        if openai_key:
-            payload = _js.dumps({
-                "model": "gpt-4o-mini",
-                "messages": [{"role": "user", "content": prompt}],
-                "max_tokens": 1024,
-                "response_format": {"type": "json_object"},
-            }).encode()
-            req = _ur.Request(
-                "https://api.openai.com/v1/chat/completions",
-                data=payload,
-                headers={"Authorization": f"Bearer {openai_key}", "Content-Type": "application/json"}
-            )
-            try:
-                with _ur.urlopen(req, timeout=20) as r:
-                    result = _js.load(r)
-                    text = result["choices"][0]["message"]["content"]
+        # Try OpenAI fallback
+        if not facts:
+            openai_key = os.getenv("OPENAI_API_KEY")
+            if openai_key:
+                try:
+                    r = await http_client.post(
+                        "https://api.openai.com/v1/chat/completions",
+                        json={
+                            "model": "gpt-4o-mini",
+                            "messages": [{"role": "user", "content": prompt}],
+                            "max_tokens": 1024,
+                            "response_format": {"type": "json_object"},
+                        },
+                        headers={"Authorization": f"Bearer {openai_key}"},
+                        timeout=20,
+                    )
+                    r.raise_for_status()
+                    text = r.json()["choices"][0]["message"]["content"]
                     parsed = _js.loads(text)
                     facts = parsed if isinstance(parsed, list) else parsed.get("facts", [])
-            except Exception as e:
-                print(f"Extract OpenAI error: {e}")
+                except Exception as e:
+                    print(f"Extract OpenAI error: {e}")
 
     if not facts:
         raise HTTPException(status_code=503, detail="No LLM available for extraction. Set ANTHROPIC_API_KEY or OPENAI_API_KEY.")
@@ -789,10 +1375,8 @@ Return only valid JSON, no explanation:"""
 
 # ============ Natural Language Query ============
 
-def _llm_synthesize(question: str, graph_context: str) -> str:
+async def _llm_synthesize(question: str, graph_context: str) -> str:
     """Call available LLM to synthesize an answer from graph context."""
-    import urllib.request as _ur, json as _js
-
     system = (
         "You are a knowledge graph assistant. The user has a personal knowledge graph. "
         "Answer their question using ONLY the graph context provided. "
@@ -809,49 +1393,45 @@ Answer based only on the above context:"""
     # Try Anthropic first
     anthropic_key = os.getenv("ANTHROPIC_API_KEY")
     if anthropic_key:
-        payload = _js.dumps({
-            "model": "claude-3-5-haiku-20241022",
-            "max_tokens": 1024,
-            "system": system,
-            "messages": [{"role": "user", "content": prompt}]
-        }).encode()
-        req = _ur.Request(
-            "https://api.anthropic.com/v1/messages",
-            data=payload,
-            headers={
-                "x-api-key": anthropic_key,
-                "anthropic-version": "2023-06-01",
-                "content-type": "application/json",
-            }
-        )
         try:
-            with _ur.urlopen(req, timeout=20) as r:
-                return _js.load(r)["content"][0]["text"].strip()
+            r = await http_client.post(
+                "https://api.anthropic.com/v1/messages",
+                json={
+                    "model": "claude-3-5-haiku-20241022",
+                    "max_tokens": 1024,
+                    "system": system,
+                    "messages": [{"role": "user", "content": prompt}]
+                },
+                headers={
+                    "x-api-key": anthropic_key,
+                    "anthropic-version": "2023-06-01",
+                },
+                timeout=20,
+            )
+            r.raise_for_status()
+            return r.json()["content"][0]["text"].strip()
         except Exception as e:
             print(f"Anthropic error: {e}")
 
     # Try OpenAI
     openai_key = os.getenv("OPENAI_API_KEY")
     if openai_key:
-        payload = _js.dumps({
-            "model": "gpt-4o-mini",
-            "messages": [
-                {"role": "system", "content": system},
-                {"role": "user", "content": prompt}
-            ],
-            "max_tokens": 1024,
-        }).encode()
-        req = _ur.Request(
-            "https://api.openai.com/v1/chat/completions",
-            data=payload,
-            headers={
-                "Authorization": f"Bearer {openai_key}",
-                "Content-Type": "application/json",
-            }
-        )
         try:
-            with _ur.urlopen(req, timeout=20) as r:
-                return _js.load(r)["choices"][0]["message"]["content"].strip()
+            r = await http_client.post(
+                "https://api.openai.com/v1/chat/completions",
+                json={
+                    "model": "gpt-4o-mini",
+                    "messages": [
+                        {"role": "system", "content": system},
+                        {"role": "user", "content": prompt}
+                    ],
+                    "max_tokens": 1024,
+                },
+                headers={"Authorization": f"Bearer {openai_key}"},
+                timeout=20,
+            )
+            r.raise_for_status()
+            return r.json()["choices"][0]["message"]["content"].strip()
         except Exception as e:
             print(f"OpenAI error: {e}")
 
@@ -859,7 +1439,7 @@ Answer based only on the above context:"""
 
 
 @app.post("/v1/ask")
-def ask(query: NLQuery, user: dict = Depends(verify_api_key)):
+async def ask(query: NLQuery, user: dict = Depends(verify_api_key)):
     """
     Natural language query against the knowledge graph.
 
@@ -883,25 +1463,41 @@ def ask(query: NLQuery, user: dict = Depends(verify_api_key)):
     citations = []
     seen_entities = set()
 
-    with driver.session() as session:
-        for token in tokens[:5]:  # limit to top 5 tokens
-            result = session.run("""
-                MATCH (n {_graph_id: $gid})
-                WHERE toLower(n.name) CONTAINS toLower($q)
-                RETURN n.name as name, n.label as label
-                LIMIT 3
-            """, {"q": token, "gid": graph_id})
-            for rec in result:
-                name = rec["name"]
-                if name and name not in seen_entities:
-                    seen_entities.add(name)
+    async with driver.session() as session:
+        # One relevance-ranked query covering all tokens (top 5 tokens)
+        tokens = [t for token in tokens[:5] for t in _search_terms(token)]
+        records = []
+        if tokens:
+            try:
+                result = await session.run("""
+                    CALL db.index.fulltext.queryNodes($index, $lucene, {limit: 8})
+                    YIELD node AS n, score
+                    WHERE n._graph_id = $gid
+                    RETURN n.name as name, n.label as label
+                    ORDER BY score DESC
+                """, {"index": ENTITY_FULLTEXT_INDEX, "gid": graph_id,
+                      "lucene": _fulltext_query(graph_id, tokens, match_all=False)})
+                records = [r async for r in result]
+            except Exception as e:
+                print(f"⚠️  Full-text search unavailable, using CONTAINS scan: {e}")
+                result = await session.run("""
+                    MATCH (n:DVEntity {_graph_id: $gid})
+                    WHERE any(t IN $tokens WHERE toLower(n.name) CONTAINS t)
+                    RETURN n.name as name, n.label as label
+                    LIMIT 8
+                """, {"tokens": tokens, "gid": graph_id})
+                records = [r async for r in result]
+        for rec in records:
+            name = rec["name"]
+            if name and name not in seen_entities:
+                seen_entities.add(name)
 
         # 3. Pull full context for each matched entity
         for entity_name in list(seen_entities)[:8]:  # cap at 8 entities
-            result = session.run("""
-                MATCH (n {_norm_name: $norm, _graph_id: $gid})
-                OPTIONAL MATCH (n)-[r_out]->(target {_graph_id: $gid})
-                OPTIONAL MATCH (source {_graph_id: $gid})-[r_in]->(n)
+            result = await session.run("""
+                MATCH (n:DVEntity {_norm_name: $norm, _graph_id: $gid})
+                OPTIONAL MATCH (n)-[r_out]->(target:DVEntity {_graph_id: $gid})
+                OPTIONAL MATCH (source:DVEntity {_graph_id: $gid})-[r_in]->(n)
                 RETURN n.name as name, n.label as label,
                     collect(DISTINCT {rel: type(r_out), target: target.name,
                         ctx: r_out.context, src: r_out.source,
@@ -909,7 +1505,7 @@ def ask(query: NLQuery, user: dict = Depends(verify_api_key)):
                     collect(DISTINCT {rel: type(r_in), source: source.name,
                         ctx: r_in.context, src: r_in.source}) as incoming
             """, {"norm": _normalize_name(entity_name), "gid": graph_id})
-            rec = result.single()
+            rec = await result.single()
             if rec:
                 out = [r for r in rec["outgoing"] if r["target"]]
                 inc = [r for r in rec["incoming"] if r["source"]]
@@ -944,7 +1540,8 @@ def ask(query: NLQuery, user: dict = Depends(verify_api_key)):
     graph_context = "\n".join(context_lines)
 
     # 5. Synthesize answer
-    llm_answer = _llm_synthesize(question, graph_context)
+    async with _llm_slot():
+        llm_answer = await _llm_synthesize(question, graph_context)
     llm_used = "anthropic" if os.getenv("ANTHROPIC_API_KEY") and llm_answer else (
                "openai" if os.getenv("OPENAI_API_KEY") and llm_answer else None)
 
@@ -963,7 +1560,7 @@ def ask(query: NLQuery, user: dict = Depends(verify_api_key)):
 import hashlib as _share_hashlib
 
 @app.post("/v1/share")
-def create_share(
+async def create_share(
     name: str,
     depth: int = 2,
     title: Optional[str] = None,
@@ -977,44 +1574,19 @@ def create_share(
     depth = min(depth, 3)
     norm = _normalize_name(name)
 
-    # Fetch the subgraph
-    with driver.session() as session:
-        result = session.run(f"""
-            MATCH (start {{_norm_name: $norm, _graph_id: $gid}})
-            MATCH path = (start)-[*0..{depth}]-(connected)
-            WHERE connected._graph_id = $gid
-            WITH start, collect(DISTINCT connected) as cnodes,
-                 collect(DISTINCT relationships(path)) as rel_lists
-            RETURN start, cnodes, rel_lists
-        """, {"norm": norm, "gid": graph_id})
-
-        record = result.single()
-        if not record:
-            raise HTTPException(status_code=404, detail=f"Entity '{name}' not found")
+    subgraph = await _get_subgraph(graph_id, norm, depth)
+    if subgraph is None:
+        raise HTTPException(status_code=404, detail=f"Entity '{name}' not found")
 
-        all_nodes = [dict(record["start"])] + [dict(n) for n in record["cnodes"]]
-        nodes = []
-        seen_nodes = set()
-        for n in all_nodes:
-            n_name = n.get("name", "unknown")
-            if n_name not in seen_nodes:
-                seen_nodes.add(n_name)
-                nodes.append({"id": n_name, "type": n.get("label", "Entity")})
-
-        links = []
-        seen_links = set()
-        for rel_list in record["rel_lists"]:
-            for r in (rel_list if isinstance(rel_list, list) else [rel_list]):
-                try:
-                    src = dict(r.start_node).get("name", "")
-                    tgt = dict(r.end_node).get("name", "")
-                    key = f"{src}-{r.type}-{tgt}"
-                    if key not in seen_links and src and tgt:
-                        seen_links.add(key)
-                        links.append({"source": src, "target": tgt,
-                                     "predicate": r.type.lower().replace("_", " ")})
-                except Exception:
-                    pass
+    nodes = {}
+    for n in subgraph["nodes"]:
+        nodes.setdefault(n["name"], {"id": n["name"], "type": n["label"] or "Entity"})
+    nodes = list(nodes.values())
+    links = [
+        {"source": e["source"], "target": e["target"],
+         "predicate": e["type"].lower().replace("_", " ")}
+        for e in subgraph["edges"] if e["source"] and e["target"]
+    ]
 
     import secrets as _sec
     share_id = _sec.token_urlsafe(12)
@@ -1023,8 +1595,8 @@ def create_share(
     import json as _json
     graph_snapshot = _json.dumps({"nodes": nodes, "links": links})
 
-    with driver.session() as session:
-        session.run("""
+    async with driver.session() as session:
+        await session.run("""
             CREATE (s:DejaViewShare {
                 share_id: $sid,
                 entity: $entity,
@@ -1050,22 +1622,23 @@ def create_share(
         "url": f"{base_url}/share.html#{share_id}",
         "nodes": len(nodes),
         "links": len(links),
+        "truncated": subgraph["truncated"],
     }
 
 
 @app.get("/v1/public/{share_id}")
-def get_share(share_id: str):
+async def get_share(share_id: str):
     """Get a public shared subgraph — no auth required."""
     import json as _json
-    with driver.session() as session:
-        result = session.run("""
+    async with driver.session() as session:
+        result = await session.run("""
             MATCH (s:DejaViewShare {share_id: $sid})
             SET s.views = coalesce(s.views, 0) + 1
             RETURN s.entity as entity, s.title as title,
                    s.graph_snapshot as snapshot, s.created_at as created,
                    s.views as views, s.depth as depth
         """, {"sid": share_id})
-        record = result.single()
+        record = await result.single()
         if not record:
             raise HTTPException(status_code=404, detail="Share not found or expired")
 
@@ -1083,15 +1656,15 @@ def get_share(share_id: str):
 
 
 @app.delete("/v1/share/{share_id}")
-def delete_share(share_id: str, user: dict = Depends(verify_api_key)):
+async def delete_share(share_id: str, user: dict = Depends(verify_api_key)):
     """Delete a share you created."""
-    with driver.session() as session:
-        result = session.run("""
+    async with driver.session() as session:
+        result = await session.run("""
             MATCH (s:DejaViewShare {share_id: $sid, user_id: $uid})
             DELETE s
             RETURN count(s) as deleted
         """, {"sid": share_id, "uid": user["user_id"]})
-        record = result.single()
+        record = await result.single()
         if not record or record["deleted"] == 0:
             raise HTTPException(status_code=404, detail="Share not found or not yours")
     return {"deleted": share_id}
@@ -1103,8 +1676,26 @@ class FactDelete(BaseModel):
     predicate: str = Field(..., description="Relationship type to delete")
     object: str = Field(..., description="Object entity name")
 
+async def _delete_relationships_tx(tx, query: str, params: dict) -> int:
+    """
+    Run a relationship-deleting query and update graph statistics in the same
+    transaction. The query must decrement endpoint _degree values and RETURN
+    one row per deleted relationship with subject, rel and object.
+    """
+    delta = _new_stats_delta()
+    deleted = 0
+    async for record in await tx.run(query, params):
+        deleted += 1
+        delta["rel_types"][record["rel"]] -= 1
+        delta["recent_remove"].append([record["subject"], record["rel"], record["object"]])
+    if deleted:
+        delta["recompute_top"] = True
+        await _apply_stats_delta(tx, params["gid"], delta)
+    return deleted
+
+
 @app.delete("/v1/facts")
-def delete_fact(fact: FactDelete, user: dict = Depends(verify_api_key)):
+async def delete_fact(fact: FactDelete, user: dict = Depends(verify_api_key)):
     """
     Delete a specific fact (subject-predicate-object triple).
     Removes the relationship but leaves the entities intact.
@@ -1114,22 +1705,65 @@ def delete_fact(fact: FactDelete, user: dict = Depends(verify_api_key)):
     subj_norm = _normalize_name(fact.subject)
     obj_norm   = _normalize_name(fact.object)
 
-    with driver.session() as session:
-        result = session.run(f"""
-            MATCH (s {{_norm_name: $sn, _graph_id: $gid}})-[r:{rel_type}]->(o {{_norm_name: $on, _graph_id: $gid}})
+    async with driver.session() as session:
+        deleted = await session.execute_write(_delete_relationships_tx, f"""
+            MATCH (s:DVEntity {{_norm_name: $sn, _graph_id: $gid}})-[r:{rel_type}]->(o:DVEntity {{_norm_name: $on, _graph_id: $gid}})
+            SET s._degree = coalesce(s._degree, 0) - 1, o._degree = coalesce(o._degree, 0) - 1
+            WITH s, r, o, type(r) as rel
             DELETE r
-            RETURN count(r) as deleted
+            RETURN s.name as subject, rel, o.name as object
         """, {"sn": subj_norm, "on": obj_norm, "gid": graph_id})
-        record = result.single()
-        deleted = record["deleted"] if record else 0
+    _invalidate_stats_cache(graph_id)
 
     if deleted == 0:
         raise HTTPException(status_code=404, detail=f"Fact not found: {fact.subject} -{fact.predicate}-> {fact.object}")
     return {"deleted": deleted, "fact": f"{fact.subject} -{fact.predicate}-> {fact.object}"}
 
 
+async def _delete_entity_tx(tx, graph_id: str, norm: str) -> Optional[dict]:
+    """Detach-delete an entity and update graph statistics in the same transaction."""
+    # Count first so we can report what was removed
+    result = await tx.run("""
+        MATCH (n:DVEntity {_norm_name: $norm, _graph_id: $gid})
+        OPTIONAL MATCH (n)-[r]-()
+        RETURN count(DISTINCT n) as nodes, count(r) as rels
+    """, {"norm": norm, "gid": graph_id})
+    count = await result.single()
+
+    if not count or count["nodes"] == 0:
+        return None
+
+    delta = _new_stats_delta()
+    # Neighbours lose one degree per relationship to the deleted node(s)
+    async for record in await tx.run("""
+        MATCH (n:DVEntity {_norm_name: $norm, _graph_id: $gid})-[r]-(m:DVEntity)
+        WHERE m._norm_name <> $norm OR m._graph_id <> $gid
+        SET m._degree = coalesce(m._degree, 0) - 1
+        RETURN type(r) as rel
+    """, {"norm": norm, "gid": graph_id}):
+        delta["rel_types"][record["rel"]] -= 1
+    # Relationships between two deleted nodes (incl. self-loops) are counted once
+    async for record in await tx.run("""
+        MATCH (a:DVEntity {_norm_name: $norm, _graph_id: $gid})-[r]->(b:DVEntity {_norm_name: $norm, _graph_id: $gid})
+        RETURN type(r) as rel
+    """, {"norm": norm, "gid": graph_id}):
+        delta["rel_types"][record["rel"]] -= 1
+
+    async for record in await tx.run("""
+        MATCH (n:DVEntity {_norm_name: $norm, _graph_id: $gid})
+        WITH n, n.name as name, coalesce(n.label, 'Entity') as label
+        DETACH DELETE n
+        RETURN name, label
+    """, {"norm": norm, "gid": graph_id}):
+        delta["labels"][record["label"]] -= 1
+        delta["removed_names"].add(record["name"])
+    delta["recompute_top"] = True
+    await _apply_stats_delta(tx, graph_id, delta)
+    return {"nodes": count["nodes"], "rels": count["rels"]}
+
+
 @app.delete("/v1/entities/{name}")
-def delete_entity(name: str, user: dict = Depends(verify_api_key)):
+async def delete_entity(name: str, user: dict = Depends(verify_api_key)):
     """
     Delete an entity and ALL its relationships.
     Use with care — this removes the node and every edge connected to it.
@@ -1137,35 +1771,23 @@ def delete_entity(name: str, user: dict = Depends(verify_api_key)):
     graph_id = user["graph_id"]
     norm = _normalize_name(name)
 
-    with driver.session() as session:
-        # Count first so we can report what was removed
-        count = session.run("""
-            MATCH (n {_norm_name: $norm, _graph_id: $gid})
-            OPTIONAL MATCH (n)-[r]-()
-            RETURN count(DISTINCT n) as nodes, count(r) as rels
-        """, {"norm": norm, "gid": graph_id}).single()
+    async with driver.session() as session:
+        count = await session.execute_write(_delete_entity_tx, graph_id, norm)
+    _invalidate_stats_cache(graph_id)
 
-        if not count or count["nodes"] == 0:
-            raise HTTPException(status_code=404, detail=f"Entity '{name}' not found")
-
-        nodes_count = count["nodes"]
-        rels_count  = count["rels"]
-
-        session.run("""
-            MATCH (n {_norm_name: $norm, _graph_id: $gid})
-            DETACH DELETE n
-        """, {"norm": norm, "gid": graph_id})
+    if not count:
+        raise HTTPException(status_code=404, detail=f"Entity '{name}' not found")
 
     return {
         "deleted": name,
-        "nodes_removed": nodes_count,
-        "relationships_removed": rels_count,
+        "nodes_removed": count["nodes"],
+        "relationships_removed": count["rels"],
     }
 
 
 
 @app.delete("/v1/facts/by-source")
-def delete_facts_by_source(source: str = None, source_url: str = None, user: dict = Depends(verify_api_key)):
+async def delete_facts_by_source(source: str = None, source_url: str = None, user: dict = Depends(verify_api_key)):
     """
     Bulk-delete facts by source or source_url.
     Useful for cleaning up browser extension imports from a specific page.
@@ -1178,37 +1800,93 @@ def delete_facts_by_source(source: str = None, source_url: str = None, user: dic
     if not source and not source_url:
         raise HTTPException(status_code=400, detail="Provide source or source_url")
 
-    with driver.session() as session:
-        if source_url:
-            result = session.run("""
-                MATCH ({_graph_id: $gid})-[r {source_url: $url}]->({_graph_id: $gid})
-                DELETE r
-                RETURN count(r) as deleted
-            """, {"gid": graph_id, "url": source_url})
-        else:
-            result = session.run("""
-                MATCH ({_graph_id: $gid})-[r {source: $src}]->({_graph_id: $gid})
-                DELETE r
-                RETURN count(r) as deleted
-            """, {"gid": graph_id, "src": source})
+    if source_url:
+        match, params = "[r {source_url: $url}]", {"gid": graph_id, "url": source_url}
+    else:
+        match, params = "[r {source: $src}]", {"gid": graph_id, "src": source}
 
-        deleted = result.single()["deleted"]
+    async with driver.session() as session:
+        deleted = await session.execute_write(_delete_relationships_tx, f"""
+            MATCH (s:DVEntity {{_graph_id: $gid}})-{match}->(o:DVEntity {{_graph_id: $gid}})
+            SET s._degree = coalesce(s._degree, 0) - 1, o._degree = coalesce(o._degree, 0) - 1
+            WITH s, r, o, type(r) as rel
+            DELETE r
+            RETURN s.name as subject, rel, o.name as object
+        """, params)
+    _invalidate_stats_cache(graph_id)
 
     return {"deleted": deleted, "source": source, "source_url": source_url}
 
 # ============ Startup ============
 
+# Every entity node carries :DVEntity in addition to its inferred label, so
+# reads can use one (_graph_id, _norm_name) index across all labels. Existing
+# graphs are labeled by migrate_dventity_label.py.
+ENTITY_LABEL = "DVEntity"
+
+# Labels store_facts can assign. MERGE matches on (label, _graph_id, _norm_name),
+# so each gets a uniqueness constraint on that identity (which also indexes it).
+ENTITY_LABELS = sorted(
+    {label for hint in LABEL_HINTS.values() for label in hint if label}
+    | set(NAME_PATTERNS)
+    | {"Entity"}
+)
+
+SCHEMA_STATEMENTS = [
+    # Not unique: the same name can exist under two labels (e.g. Person and Entity)
+    "CREATE INDEX dv_entity_graph_norm IF NOT EXISTS FOR (n:DVEntity) ON (n._graph_id, n._norm_name)",
+    "CREATE INDEX dv_entity_graph IF NOT EXISTS FOR (n:DVEntity) ON (n._graph_id)",
+    f"CREATE FULLTEXT INDEX {ENTITY_FULLTEXT_INDEX} IF NOT EXISTS FOR (n:DVEntity) ON EACH [n.name, n._graph_id]",
+    "CREATE CONSTRAINT dv_share_id IF NOT EXISTS FOR (s:DejaViewShare) REQUIRE s.share_id IS UNIQUE",
+    "CREATE CONSTRAINT dv_graph_stats_id IF NOT EXISTS FOR (st:DVGraphStats) REQUIRE st.graph_id IS UNIQUE",
+    "CREATE INDEX dv_entity_degree IF NOT EXISTS FOR (n:DVEntity) ON (n._graph_id, n._degree)",
+    "CREATE CONSTRAINT dv_api_key_hash IF NOT EXISTS FOR (k:ApiKey) REQUIRE k.key_hash IS UNIQUE",
+    "CREATE INDEX dv_api_key_email IF NOT EXISTS FOR (k:ApiKey) ON (k.email)",
+    "CREATE INDEX dv_api_key_revoked IF NOT EXISTS FOR (k:ApiKey) ON (k.revoked_at)",
+] + [
+    f"CREATE CONSTRAINT dv_{label.lower()}_identity IF NOT EXISTS "
+    f"FOR (n:{label}) REQUIRE (n._graph_id, n._norm_name) IS UNIQUE"
+    for label in ENTITY_LABELS
+]
+
+
+async def _ensure_schema():
+    """Create DejaView indexes and constraints. Idempotent; safe on every startup."""
+    created = 0
+    async with driver.session() as session:
+        for statement in SCHEMA_STATEMENTS:
+            try:
+                result = await session.run(statement)
+                await result.consume()
+                created += 1
+            except Exception as e:
+                # e.g. pre-existing duplicates block a uniqueness constraint;
+                # the API still works, just without that index.
+                print(f"⚠️  Schema statement failed: {statement.split(' IF ')[0]}: {e}")
+    print(f"✅ Neo4j schema ensured ({created}/{len(SCHEMA_STATEMENTS)} indexes/constraints)")
+
+
 @app.on_event("startup")
-def startup():
-    _load_keys()
+async def startup():
+    global http_client
+    # One pooled client for LLM and email calls (keep-alive across requests)
+    http_client = httpx.AsyncClient(timeout=20)
+    global _revocation_task
     try:
-        with driver.session() as session:
-            session.run("RETURN 1")
+        async with driver.session() as session:
+            await session.run("RETURN 1")
         print("✅ DejaView connected to Neo4j")
+        await _ensure_schema()
+        _revocation_task = asyncio.create_task(_poll_revocations())
     except Exception as e:
         print(f"❌ Neo4j connection failed: {e}")
+    await _load_keys()
 
 
 @app.on_event("shutdown")
-def shutdown():
-    driver.close()
+async def shutdown():
+    if _revocation_task is not None:
+        _revocation_task.cancel()
+    await driver.close()
+    if http_client is not None:
+        await http_client.aclose()
@@ -0,0 +1,102 @@
+"""
+Microbenchmark: per-fact vs batched fact ingestion for /v1/facts.
+
+Runs against a local Neo4j (NEO4J_URI / NEO4J_USER / NEO4J_PASSWORD, same as
+api.py) and writes into a throwaway graph id that is deleted afterwards.
+
+    docker run -d -p 7687:7687 -e NEO4J_AUTH=neo4j/benchpass neo4j:5
+    NEO4J_PASSWORD=benchpass python bench_store_facts.py --rounds 20
+"""
+
+import argparse
+import asyncio
+import secrets
+import time
+
+import api
+from api import Fact, driver, _write_facts, _infer_label, _normalize_name, _predicate_to_rel_type
+
+PREDICATES = ["works_at", "knows", "works_on", "uses", "located_in", "expert_in"]
+
+
+def _make_facts(n: int, seed: int) -> list:
+    return [
+        Fact(
+            subject=f"Person {seed}-{i % 17}",
+            predicate=PREDICATES[i % len(PREDICATES)],
+            object=f"Thing {seed}-{i}",
+            source="bench",
+        )
+        for i in range(n)
+    ]
+
+
+async def _legacy_write(session, graph_id: str, facts: list) -> None:
+    """Previous implementation: one auto-commit session.run per fact."""
+    for fact in facts:
+        rel_type = _predicate_to_rel_type(fact.predicate)
+        subj_label = _infer_label(fact.subject, "subject", fact.predicate)
+        obj_label = _infer_label(fact.object, "object", fact.predicate)
+        result = await session.run(f"""
+            MERGE (s:{subj_label} {{_norm_name: $subj_norm, _graph_id: $graph_id}})
+            ON CREATE SET s.name = $subject, s.created_at = datetime(), s.label = $subj_label
+            ON MATCH SET s.updated_at = datetime()
+            MERGE (o:{obj_label} {{_norm_name: $obj_norm, _graph_id: $graph_id}})
+            ON CREATE SET o.name = $object, o.created_at = datetime(), o.label = $obj_label
+            ON MATCH SET o.updated_at = datetime()
+            MERGE (s)-[r:{rel_type}]->(o)
+            SET r.confidence = $confidence, r.source = $source, r.source_url = $source_url,
+                r.context = $context, r.created_at = datetime(), r._graph_id = $graph_id
+            RETURN s.name as subject, type(r) as relationship, o.name as object
+        """, {
+            "subject": fact.subject, "object": fact.object,
+            "subj_norm": _normalize_name(fact.subject), "obj_norm": _normalize_name(fact.object),
+            "subj_label": subj_label, "obj_label": obj_label,
+            "confidence": fact.confidence, "source": fact.source,
+            "source_url": fact.source_url, "context": fact.context,
+            "graph_id": graph_id,
+        })
+        await result.single()
+
+
+async def _batched_write(session, graph_id: str, facts: list) -> None:
+    results = await _write_facts(session, graph_id, facts)
+    errors = [r for r in results if "error" in r]
+    if errors:
+        raise RuntimeError(f"{len(errors)} facts failed: {errors[0]}")
+
+
+async def _run(name: str, writer, graph_id: str, batch_size: int, rounds: int) -> float:
+    async with driver.session() as session:
+        start = time.perf_counter()
+        for r in range(rounds):
+            await writer(session, graph_id, _make_facts(batch_size, seed=r))
+        elapsed = time.perf_counter() - start
+    facts_per_sec = batch_size * rounds / elapsed
+    print(f"  {name:<8} batch={batch_size:<4} {elapsed * 1000 / rounds:8.1f} ms/batch  {facts_per_sec:9.0f} facts/s")
+    return facts_per_sec
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=10, help="Batches per measurement")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args()
+
+    print(f"🔬 Neo4j: {api.os.getenv('NEO4J_URI', 'bolt://localhost:7687')}")
+    for size in args.sizes:
+        graph_ids = {"legacy": "bench_" + secrets.token_hex(6), "batched": "bench_" + secrets.token_hex(6)}
+        try:
+            legacy = await _run("legacy", _legacy_write, graph_ids["legacy"], size, args.rounds)
+            batched = await _run("batched", _batched_write, graph_ids["batched"], size, args.rounds)
+            print(f"  → speedup x{batched / legacy:.1f}\n")
+        finally:
+            async with driver.session() as session:
+                for gid in graph_ids.values():
+                    result = await session.run("MATCH (n {_graph_id: $gid}) DETACH DELETE n", {"gid": gid})
+                    await result.consume()
+    await driver.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
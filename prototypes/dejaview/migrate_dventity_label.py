@@ -0,0 +1,57 @@
+"""
+One-off migration: add the :DVEntity label to existing entity nodes.
+
+Entity nodes are every node with a _graph_id property (users and shares use
+graph_id instead). Runs in batches, each in its own transaction, and is safe
+to re-run or interrupt: already-labeled nodes are skipped.
+
+    python migrate_dventity_label.py --batch-size 10000
+"""
+
+import argparse
+import asyncio
+import time
+
+from api import driver, _ensure_schema
+
+BACKFILL_BATCH_QUERY = """
+MATCH (n)
+WHERE n._graph_id IS NOT NULL AND NOT n:DVEntity
+WITH n LIMIT $batch_size
+SET n:DVEntity
+RETURN count(n) as labeled
+"""
+
+
+async def _label_batch(tx, batch_size: int) -> int:
+    result = await tx.run(BACKFILL_BATCH_QUERY, {"batch_size": batch_size})
+    record = await result.single()
+    return record["labeled"]
+
+
+async def backfill(batch_size: int) -> int:
+    total = 0
+    start = time.perf_counter()
+    async with driver.session() as session:
+        while True:
+            labeled = await session.execute_write(_label_batch, batch_size)
+            if not labeled:
+                break
+            total += labeled
+            print(f"  labeled {total} nodes ({time.perf_counter() - start:.1f}s)")
+    return total
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    await _ensure_schema()
+    total = await backfill(args.batch_size)
+    print(f"✅ Backfill complete: {total} nodes labeled :DVEntity")
+    await driver.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,93 @@
+"""
+One-off migration: build graph statistics and clean up write markers.
+
+Rebuilds the (:DVGraphStats) node and every entity's _degree for each graph,
+one transaction per graph, so /v1/stats and /v1/agent-context never have to
+rebuild on a read. Also removes _write_id properties left on nodes and
+relationships by fact writes made before the markers were cleared in-transaction.
+Safe to re-run or interrupt.
+
+    python migrate_graph_stats.py                  # every graph
+    python migrate_graph_stats.py --missing-only   # graphs without a stats node
+"""
+
+import argparse
+import asyncio
+import time
+
+from api import driver, _ensure_schema, _rebuild_graph_stats
+
+GRAPH_IDS_QUERY = """
+MATCH (n:DVEntity)
+RETURN DISTINCT n._graph_id as graph_id
+"""
+
+MISSING_GRAPH_IDS_QUERY = """
+MATCH (n:DVEntity)
+WITH DISTINCT n._graph_id as graph_id
+WHERE NOT EXISTS { MATCH (:DVGraphStats {graph_id: graph_id}) }
+RETURN graph_id
+"""
+
+NODE_WRITE_ID_BATCH_QUERY = """
+MATCH (n:DVEntity)
+WHERE n._write_id IS NOT NULL
+WITH n LIMIT $batch_size
+REMOVE n._write_id
+RETURN count(n) as cleared
+"""
+
+REL_WRITE_ID_BATCH_QUERY = """
+MATCH (:DVEntity)-[r]->(:DVEntity)
+WHERE r._write_id IS NOT NULL
+WITH r LIMIT $batch_size
+REMOVE r._write_id
+RETURN count(r) as cleared
+"""
+
+
+async def _run_batch(tx, query: str, batch_size: int) -> int:
+    result = await tx.run(query, {"batch_size": batch_size})
+    record = await result.single()
+    return record["cleared"]
+
+
+async def clear_write_ids(batch_size: int) -> int:
+    total = 0
+    async with driver.session() as session:
+        for query in (NODE_WRITE_ID_BATCH_QUERY, REL_WRITE_ID_BATCH_QUERY):
+            while True:
+                cleared = await session.execute_write(_run_batch, query, batch_size)
+                if not cleared:
+                    break
+                total += cleared
+                print(f"  cleared _write_id on {total} nodes/relationships")
+    return total
+
+
+async def rebuild_stats(missing_only: bool) -> int:
+    start = time.perf_counter()
+    async with driver.session() as session:
+        result = await session.run(MISSING_GRAPH_IDS_QUERY if missing_only else GRAPH_IDS_QUERY)
+        graph_ids = [r["graph_id"] async for r in result]
+        for i, graph_id in enumerate(graph_ids, 1):
+            await session.execute_write(_rebuild_graph_stats, graph_id)
+            print(f"  rebuilt stats for {graph_id} ({i}/{len(graph_ids)}, {time.perf_counter() - start:.1f}s)")
+    return len(graph_ids)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--missing-only", action="store_true", help="Only graphs without a stats node")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    await _ensure_schema()
+    cleared = await clear_write_ids(args.batch_size)
+    graphs = await rebuild_stats(args.missing_only)
+    print(f"✅ Migration complete: {graphs} graphs rebuilt, {cleared} write markers cleared")
+    await driver.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
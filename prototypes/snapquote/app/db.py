@@ -1,13 +1,22 @@
 """
 SQLite persistence for SnapQuote
-Stores completed quotes for admin dashboard + history
+Stores completed quotes for admin dashboard + history, in-flight
+conversations, and the IDs of inbound messages already handled
+
+Connections are long-lived and pooled, in WAL mode so the admin dashboard's
+reads never block webhook writes. Queries run in worker threads via the
+async wrappers so the event loop never waits on disk.
 """
 
+import asyncio
+import base64
 import sqlite3
 import json
 import os
+import queue
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
 
 # DB lives in data/ dir relative to app root
@@ -15,19 +24,57 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(BASE_DIR, "data")
 DB_PATH = os.path.join(DATA_DIR, "snapquote.db")
 
+DB_POOL_SIZE = int(os.getenv("SNAPQUOTE_DB_POOL_SIZE", "4"))
+PAGE_SIZE_DEFAULT = 50
+PAGE_SIZE_MAX = 200
+
+# Inbound message IDs remembered for dedupe; older ones are pruned
+DEDUPE_MAX_IDS = int(os.getenv("SNAPQUOTE_DEDUPE_MAX_IDS", "10000"))
+DEDUPE_PRUNE_EVERY = 100
+_claims_since_prune = 0
+
+_pool: Optional[queue.LifoQueue] = None
 
-def _get_conn() -> sqlite3.Connection:
-    """Get a sqlite3 connection with row_factory set"""
-    conn = sqlite3.connect(DB_PATH)
+
+def _connect() -> sqlite3.Connection:
+    """Open a pooled connection: WAL, wait on locks instead of failing"""
+    conn = sqlite3.connect(DB_PATH, timeout=5.0, check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    # Safe with WAL: a crash can lose the last commits, never corrupt the file
+    conn.execute("PRAGMA synchronous=NORMAL")
     return conn
 
 
+@contextmanager
+def _get_conn():
+    """Borrow a connection from the pool (blocks while all are in use)"""
+    global _pool
+    if _pool is None:
+        _pool = queue.LifoQueue()
+        for _ in range(DB_POOL_SIZE):
+            _pool.put(_connect())
+    conn = _pool.get()
+    try:
+        yield conn
+    finally:
+        _pool.put(conn)
+
+
+def close_pool():
+    """Close pooled connections (app shutdown)"""
+    global _pool
+    if _pool is None:
+        return
+    while not _pool.empty():
+        _pool.get_nowait().close()
+    _pool = None
+
+
 def init_db():
-    """Create tables if they don't exist. Call at app startup."""
+    """Create tables and indexes if they don't exist. Call at app startup."""
     os.makedirs(DATA_DIR, exist_ok=True)
-    conn = _get_conn()
-    try:
+    with _get_conn() as conn:
         conn.execute("""
             CREATE TABLE IF NOT EXISTS quotes (
                 id           INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -44,10 +91,55 @@ def init_db():
                 created_at   TEXT NOT NULL
             )
         """)
+        # Listing order is (created_at, id) newest first; id breaks timestamp ties
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_quotes_created
+            ON quotes (created_at DESC, id DESC)
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_quotes_phone_created
+            ON quotes (phone, created_at DESC, id DESC)
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS conversations (
+                phone       TEXT PRIMARY KEY,
+                data_json   TEXT NOT NULL,
+                updated_at  TEXT NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_conversations_updated
+            ON conversations (updated_at)
+        """)
+        # rowid order is claim order, which is what pruning keeps the tail of
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS processed_messages (
+                message_id   TEXT PRIMARY KEY,
+                source       TEXT,
+                processed_at TEXT NOT NULL
+            )
+        """)
         conn.commit()
         print(f"[db] initialized at {DB_PATH}", flush=True)
-    finally:
-        conn.close()
+
+
+def _row_to_quote(row: sqlite3.Row) -> Dict[str, Any]:
+    d = dict(row)
+    try:
+        d["items"] = json.loads(d.get("items_json") or "[]")
+    except Exception:
+        d["items"] = []
+    return d
+
+
+def _encode_cursor(created_at: str, row_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{created_at}|{row_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Raises ValueError for a malformed cursor"""
+    created_at, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit("|", 1)
+    return created_at, int(row_id)
 
 
 def save_quote(quote_id: str, phone: str, quote_data) -> bool:
@@ -56,56 +148,113 @@ def save_quote(quote_id: str, phone: str, quote_data) -> bool:
     quote_data is a QuoteData instance from state.py
     """
     try:
-        conn = _get_conn()
-        try:
-            conn.execute("""
-                INSERT OR REPLACE INTO quotes
-                  (quote_id, phone, customer_name, customer_address,
-                   project_description, items_json, total, grand_total,
-                   tax_rate, pdf_path, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                quote_id,
-                phone,
-                getattr(quote_data, "customer_name", None),
-                getattr(quote_data, "customer_address", None),
-                getattr(quote_data, "project_description", None),
-                json.dumps(getattr(quote_data, "items", []) or []),
-                getattr(quote_data, "total", None),
-                getattr(quote_data, "grand_total", None),
-                getattr(quote_data, "tax_rate", None),
-                f"quotes/{quote_id}.pdf",
-                datetime.utcnow().isoformat(),
-            ))
-            conn.commit()
-            print(f"[db] saved quote {quote_id}", flush=True)
-            return True
-        finally:
-            conn.close()
+        with _get_conn() as conn:
+            with conn:
+                conn.execute("""
+                    INSERT OR REPLACE INTO quotes
+                      (quote_id, phone, customer_name, customer_address,
+                       project_description, items_json, total, grand_total,
+                       tax_rate, pdf_path, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    quote_id,
+                    phone,
+                    getattr(quote_data, "customer_name", None),
+                    getattr(quote_data, "customer_address", None),
+                    getattr(quote_data, "project_description", None),
+                    json.dumps(getattr(quote_data, "items", []) or []),
+                    getattr(quote_data, "total", None),
+                    getattr(quote_data, "grand_total", None),
+                    getattr(quote_data, "tax_rate", None),
+                    f"quotes/{quote_id}.pdf",
+                    datetime.utcnow().isoformat(),
+                ))
+        print(f"[db] saved quote {quote_id}", flush=True)
+        return True
     except Exception as e:
         print(f"[db] ERROR saving quote {quote_id}: {e}", flush=True)
         return False
 
 
+def list_quotes(
+    limit: int = PAGE_SIZE_DEFAULT,
+    cursor: Optional[str] = None,
+    phone: Optional[str] = None,
+    customer: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    One page of quotes, newest first.
+
+    Keyset pagination: pass the returned next_cursor to get the following
+    page. Each page is an index range scan, however deep into history it is.
+    since/until are ISO timestamps or dates (UTC); customer matches a
+    substring of the customer name.
+    """
+    limit = max(1, min(limit, PAGE_SIZE_MAX))
+    where, params = [], []
+    if cursor:
+        created_at, row_id = _decode_cursor(cursor)
+        # Row-value comparison so SQLite walks idx_quotes_created directly
+        where.append("(created_at, id) < (?, ?)")
+        params += [created_at, row_id]
+    if phone:
+        where.append("phone = ?")
+        params.append(phone)
+    if customer:
+        where.append("customer_name LIKE ?")
+        params.append(f"%{customer}%")
+    if since:
+        where.append("created_at >= ?")
+        params.append(since)
+    if until:
+        where.append("created_at < ?")
+        params.append(until)
+
+    sql = "SELECT * FROM quotes"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY created_at DESC, id DESC LIMIT ?"
+    params.append(limit + 1)
+
+    try:
+        with _get_conn() as conn:
+            rows = conn.execute(sql, params).fetchall()
+    except Exception as e:
+        print(f"[db] ERROR fetching quotes: {e}", flush=True)
+        return {"quotes": [], "next_cursor": None}
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = _encode_cursor(rows[-1]["created_at"], rows[-1]["id"]) if has_more else None
+    return {"quotes": [_row_to_quote(row) for row in rows], "next_cursor": next_cursor}
+
+
+def quote_stats(today: str) -> Dict[str, Any]:
+    """Totals for the admin summary cards; today is a UTC date (YYYY-MM-DD)"""
+    try:
+        with _get_conn() as conn:
+            row = conn.execute("""
+                SELECT COUNT(*) AS total,
+                       COALESCE(SUM(grand_total), 0) AS revenue,
+                       (SELECT COUNT(*) FROM quotes WHERE created_at >= ?) AS today
+                FROM quotes
+            """, (today,)).fetchone()
+            return dict(row)
+    except Exception as e:
+        print(f"[db] ERROR fetching quote stats: {e}", flush=True)
+        return {"total": 0, "revenue": 0, "today": 0}
+
+
 def get_all_quotes() -> List[Dict[str, Any]]:
-    """Return all quotes ordered by newest first"""
+    """Return all quotes ordered by newest first (scripts/exports; admin pages use list_quotes)"""
     try:
-        conn = _get_conn()
-        try:
+        with _get_conn() as conn:
             rows = conn.execute("""
-                SELECT * FROM quotes ORDER BY created_at DESC
+                SELECT * FROM quotes ORDER BY created_at DESC, id DESC
             """).fetchall()
-            result = []
-            for row in rows:
-                d = dict(row)
-                try:
-                    d["items"] = json.loads(d.get("items_json") or "[]")
-                except Exception:
-                    d["items"] = []
-                result.append(d)
-            return result
-        finally:
-            conn.close()
+        return [_row_to_quote(row) for row in rows]
     except Exception as e:
         print(f"[db] ERROR fetching quotes: {e}", flush=True)
         return []
@@ -114,21 +263,101 @@ def get_all_quotes() -> List[Dict[str, Any]]:
 def get_quote(quote_id: str) -> Optional[Dict[str, Any]]:
     """Return a single quote by quote_id"""
     try:
-        conn = _get_conn()
-        try:
+        with _get_conn() as conn:
             row = conn.execute(
                 "SELECT * FROM quotes WHERE quote_id = ?", (quote_id,)
             ).fetchone()
-            if not row:
-                return None
-            d = dict(row)
-            try:
-                d["items"] = json.loads(d.get("items_json") or "[]")
-            except Exception:
-                d["items"] = []
-            return d
-        finally:
-            conn.close()
+        return _row_to_quote(row) if row else None
     except Exception as e:
         print(f"[db] ERROR fetching quote {quote_id}: {e}", flush=True)
         return None
+
+
+# ── Conversations ───────────────────────────────────────────────────────────
+
+def load_conversation(phone: str) -> Optional[Dict[str, Any]]:
+    """Return the stored conversation dict for a phone, if any"""
+    with _get_conn() as conn:
+        row = conn.execute(
+            "SELECT data_json FROM conversations WHERE phone = ?", (phone,)
+        ).fetchone()
+    return json.loads(row["data_json"]) if row else None
+
+
+def save_conversation(phone: str, data: Dict[str, Any], updated_at: str):
+    with _get_conn() as conn:
+        with conn:
+            conn.execute("""
+                INSERT INTO conversations (phone, data_json, updated_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT (phone) DO UPDATE SET
+                    data_json = excluded.data_json, updated_at = excluded.updated_at
+            """, (phone, json.dumps(data), updated_at))
+
+
+def delete_conversation(phone: str):
+    with _get_conn() as conn:
+        with conn:
+            conn.execute("DELETE FROM conversations WHERE phone = ?", (phone,))
+
+
+def purge_conversations(before: str) -> int:
+    """Delete conversations idle since before `before` (ISO timestamp)"""
+    with _get_conn() as conn:
+        with conn:
+            cur = conn.execute("DELETE FROM conversations WHERE updated_at < ?", (before,))
+    if cur.rowcount:
+        print(f"[db] purged {cur.rowcount} stale conversations", flush=True)
+    return cur.rowcount
+
+
+# ── Inbound message dedupe ──────────────────────────────────────────────────
+
+def claim_message(message_id: str, source: str) -> bool:
+    """
+    Record an inbound message ID; True if this caller is the first to see it.
+
+    The insert is atomic, so the webhook and the poller (separate processes
+    sharing this DB) never both handle the same message. Only the newest
+    DEDUPE_MAX_IDS IDs are kept.
+    """
+    global _claims_since_prune
+    if not message_id:
+        return True  # nothing to dedupe on
+    with _get_conn() as conn:
+        with conn:
+            cur = conn.execute("""
+                INSERT OR IGNORE INTO processed_messages (message_id, source, processed_at)
+                VALUES (?, ?, ?)
+            """, (str(message_id), source, datetime.utcnow().isoformat()))
+            claimed = cur.rowcount == 1
+            _claims_since_prune += claimed
+            if _claims_since_prune >= DEDUPE_PRUNE_EVERY:
+                _claims_since_prune = 0
+                conn.execute("""
+                    DELETE FROM processed_messages
+                    WHERE rowid <= (SELECT MAX(rowid) FROM processed_messages) - ?
+                """, (DEDUPE_MAX_IDS,))
+    return claimed
+
+
+# ── Async wrappers (run queries in worker threads, off the event loop) ──────
+
+async def save_quote_async(quote_id: str, phone: str, quote_data) -> bool:
+    return await asyncio.to_thread(save_quote, quote_id, phone, quote_data)
+
+
+async def list_quotes_async(**filters) -> Dict[str, Any]:
+    return await asyncio.to_thread(list_quotes, **filters)
+
+
+async def quote_stats_async(today: str) -> Dict[str, Any]:
+    return await asyncio.to_thread(quote_stats, today)
+
+
+async def claim_message_async(message_id: str, source: str) -> bool:
+    return await asyncio.to_thread(claim_message, message_id, source)
+
+
+async def get_quote_async(quote_id: str) -> Optional[Dict[str, Any]]:
+    return await asyncio.to_thread(get_quote, quote_id)
@@ -4,11 +4,19 @@ Store and retrieve contractor logos by phone number
 """
 
 import os
-from typing import Optional
+from io import BytesIO
+from typing import Dict, Optional, Tuple
 
 
 LOGOS_DIR = os.getenv("LOGOS_DIR", "logos")
 
+# Logos are drawn at 1.5in; 450px is 300dpi at that size
+LOGO_MAX_PX = 450
+LOGO_CACHE_MAX = 256
+
+# path -> (mtime, PNG bytes); a replaced file has a new mtime and is re-decoded
+_logo_cache: Dict[str, Tuple[float, bytes]] = {}
+
 
 def get_logo_path(phone: str) -> Optional[str]:
     """Get logo path for a phone number if it exists"""
@@ -23,6 +31,38 @@ def get_logo_path(phone: str) -> Optional[str]:
     return None
 
 
+def load_logo(path: str) -> Optional[bytes]:
+    """
+    Logo at path as print-sized PNG bytes.
+    Phone photos are decoded and downscaled once, then served from cache.
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    
+    cached = _logo_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    
+    from PIL import Image
+    try:
+        with Image.open(path) as img:
+            img.thumbnail((LOGO_MAX_PX, LOGO_MAX_PX))
+            if img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGBA")
+            buf = BytesIO()
+            img.save(buf, format="PNG", optimize=True)
+    except Exception as e:
+        print(f"[logos] Could not decode {path}: {e}", flush=True)
+        return None
+    
+    if len(_logo_cache) >= LOGO_CACHE_MAX:
+        _logo_cache.pop(next(iter(_logo_cache)))
+    _logo_cache[path] = (mtime, buf.getvalue())
+    return buf.getvalue()
+
+
 def save_logo(phone: str, image_data: bytes, extension: str = 'png') -> str:
     """Save logo image for a phone number"""
     os.makedirs(LOGOS_DIR, exist_ok=True)
@@ -32,6 +72,7 @@ def save_logo(phone: str, image_data: bytes, extension: str = 'png') -> str:
     
     with open(path, 'wb') as f:
         f.write(image_data)
+    _logo_cache.pop(path, None)
     
     return path
 
@@ -41,5 +82,6 @@ def delete_logo(phone: str) -> bool:
     path = get_logo_path(phone)
     if path and os.path.exists(path):
         os.remove(path)
+        _logo_cache.pop(path, None)
         return True
     return False
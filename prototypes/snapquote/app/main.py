@@ -7,17 +7,18 @@ import base64
 import os
 import json
 import secrets
+from datetime import datetime
 
-from fastapi import FastAPI, Request, HTTPException, Depends
+from fastapi import FastAPI, Request, HTTPException, Depends, Query
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse, HTMLResponse, JSONResponse
 from pydantic import BaseModel
 from typing import Optional
 
-from .sms import handle_inbound_sms, send_sms
+from .sms import handle_inbound_sms, send_sms, drain_deliveries, close_http_client
 from .state import ConversationState
-from .pdf_gen import generate_quote_pdf
+from .pdf_gen import generate_quote_pdf, warm_render_pool, shutdown_render_pool
 from . import db
 
 
@@ -36,6 +37,16 @@ ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "snapquote2026")
 @app.on_event("startup")
 async def startup_event():
     db.init_db()
+    await warm_render_pool()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Let in-flight quotes render and send their links before workers stop
+    await drain_deliveries()
+    await close_http_client()
+    shutdown_render_pool()
+    db.close_pool()
 
 
 # ── Auth helper ──────────────────────────────────────────────────────────────
@@ -120,7 +131,13 @@ async def sms_webhook(request: Request):
     if not sender or not body:
         print(f"Missing fields! Keys available: {list(data.keys())}", flush=True)
         return {"status": "missing_fields", "keys": list(data.keys())}
-    
+
+    # ClickSend retries webhooks, and the poller may have picked this one up already
+    message_id = data.get("message_id") or data.get("messageid")
+    if message_id and not await db.claim_message_async(message_id, "webhook"):
+        print(f"Duplicate message {message_id}, skipping", flush=True)
+        return {"status": "duplicate"}
+
     # Process the message
     response = await handle_inbound_sms(sender, body.strip())
     
@@ -158,7 +175,30 @@ async def admin_dashboard(_: str = Depends(require_admin)):
 
 
 @app.get("/admin/api/quotes")
-async def admin_api_quotes(_: str = Depends(require_admin)):
-    """Return all quotes as JSON (requires basic auth)"""
-    quotes = db.get_all_quotes()
-    return JSONResponse(content={"quotes": quotes})
+async def admin_api_quotes(
+    limit: int = Query(db.PAGE_SIZE_DEFAULT, ge=1, le=db.PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    phone: Optional[str] = None,
+    customer: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    _: str = Depends(require_admin),
+):
+    """
+    One page of quotes, newest first (requires basic auth).
+    Pass next_cursor back as ?cursor= for the next page.
+    """
+    try:
+        page = await db.list_quotes_async(
+            limit=limit, cursor=cursor, phone=phone, customer=customer, since=since, until=until
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return JSONResponse(content=page)
+
+
+@app.get("/admin/api/stats")
+async def admin_api_stats(_: str = Depends(require_admin)):
+    """Totals for the dashboard summary cards (requires basic auth)"""
+    today = datetime.utcnow().date().isoformat()
+    return JSONResponse(content=await db.quote_stats_async(today))
@@ -5,7 +5,12 @@ Creates professional-looking quote PDFs
 
 import os
 import uuid
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache, partial
+from io import BytesIO
 from typing import List, Dict, Optional
 
 from reportlab.lib import colors
@@ -15,9 +20,99 @@ from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
 from reportlab.lib.enums import TA_RIGHT, TA_CENTER
 
+from .logos import load_logo
+
 
 QUOTES_DIR = os.getenv("QUOTES_DIR", "quotes")
 
+# Renders run in worker processes so reportlab never blocks the event loop
+PDF_RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", "2"))
+_render_pool: Optional[ProcessPoolExecutor] = None
+
+# Line item table styling; rows are addressed from the end so it fits any item count
+QUOTE_TABLE_STYLE = TableStyle([
+    # Header row
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f1f5f9')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#0f172a')),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 11),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('TOPPADDING', (0, 0), (-1, 0), 12),
+    
+    # Data rows
+    ('FONTNAME', (0, 1), (-1, -4), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -4), 10),
+    ('TEXTCOLOR', (0, 1), (-1, -4), colors.HexColor('#334155')),
+    ('BOTTOMPADDING', (0, 1), (-1, -4), 10),
+    ('TOPPADDING', (0, 1), (-1, -4), 10),
+    
+    # Subtotal row
+    ('FONTNAME', (0, -3), (-1, -3), 'Helvetica'),
+    ('TEXTCOLOR', (0, -3), (-1, -3), colors.HexColor('#64748b')),
+    
+    # Tax row (if present)
+    ('FONTNAME', (0, -2), (-1, -2), 'Helvetica'),
+    ('TEXTCOLOR', (0, -2), (-1, -2), colors.HexColor('#64748b')),
+    
+    # Total row
+    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, -1), (-1, -1), 14),
+    ('TEXTCOLOR', (0, -1), (-1, -1), colors.HexColor('#0f172a')),
+    ('TOPPADDING', (0, -1), (-1, -1), 15),
+    ('LINEABOVE', (0, -1), (-1, -1), 2, colors.HexColor('#f97316')),
+    
+    # Alignment
+    ('ALIGN', (-1, 0), (-1, -1), 'RIGHT'),
+    
+    # Grid
+    ('LINEBELOW', (0, 0), (-1, 0), 1, colors.HexColor('#e2e8f0')),
+    ('LINEBELOW', (0, 1), (-1, -4), 0.5, colors.HexColor('#f1f5f9')),
+])
+
+
+@lru_cache(maxsize=1)
+def _quote_styles() -> Dict[str, ParagraphStyle]:
+    """Paragraph styles for quotes, built once per process"""
+    styles = getSampleStyleSheet()
+    return {
+        "title": ParagraphStyle(
+            'QuoteTitle',
+            parent=styles['Heading1'],
+            fontSize=28,
+            textColor=colors.HexColor('#0f172a'),
+            spaceAfter=6
+        ),
+        "subtitle": ParagraphStyle(
+            'QuoteSubtitle',
+            parent=styles['Normal'],
+            fontSize=12,
+            textColor=colors.HexColor('#64748b'),
+            spaceAfter=20
+        ),
+        "header": ParagraphStyle(
+            'Header',
+            parent=styles['Heading2'],
+            fontSize=14,
+            textColor=colors.HexColor('#0f172a'),
+            spaceBefore=20,
+            spaceAfter=10
+        ),
+        "body": ParagraphStyle(
+            'Body',
+            parent=styles['Normal'],
+            fontSize=11,
+            textColor=colors.HexColor('#334155'),
+            leading=16
+        ),
+        "footer": ParagraphStyle(
+            'Footer',
+            parent=styles['Normal'],
+            fontSize=9,
+            textColor=colors.HexColor('#94a3b8'),
+            alignment=TA_CENTER
+        ),
+    }
+
 
 def generate_quote_pdf(
     customer_name: str,
@@ -62,44 +157,20 @@ def generate_quote_pdf(
     )
     
     # Styles
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'QuoteTitle',
-        parent=styles['Heading1'],
-        fontSize=28,
-        textColor=colors.HexColor('#0f172a'),
-        spaceAfter=6
-    )
-    subtitle_style = ParagraphStyle(
-        'QuoteSubtitle',
-        parent=styles['Normal'],
-        fontSize=12,
-        textColor=colors.HexColor('#64748b'),
-        spaceAfter=20
-    )
-    header_style = ParagraphStyle(
-        'Header',
-        parent=styles['Heading2'],
-        fontSize=14,
-        textColor=colors.HexColor('#0f172a'),
-        spaceBefore=20,
-        spaceAfter=10
-    )
-    body_style = ParagraphStyle(
-        'Body',
-        parent=styles['Normal'],
-        fontSize=11,
-        textColor=colors.HexColor('#334155'),
-        leading=16
-    )
+    styles = _quote_styles()
+    title_style = styles["title"]
+    subtitle_style = styles["subtitle"]
+    header_style = styles["header"]
+    body_style = styles["body"]
     
     # Build content
     content = []
     
-    # Logo (if provided)
-    if logo_path and os.path.exists(logo_path):
+    # Logo (if provided) — decoded and downscaled once per file, then reused
+    logo_png = load_logo(logo_path) if logo_path else None
+    if logo_png:
         try:
-            logo = Image(logo_path, width=1.5*inch, height=1.5*inch)
+            logo = Image(BytesIO(logo_png), width=1.5*inch, height=1.5*inch)
             logo.hAlign = 'LEFT'
             content.append(logo)
             content.append(Spacer(1, 12))
@@ -144,44 +215,7 @@ def generate_quote_pdf(
     table_data.append(['Total', f"${total:,.2f}"])
     
     table = Table(table_data, colWidths=[4.5*inch, 1.5*inch])
-    table.setStyle(TableStyle([
-        # Header row
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f1f5f9')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#0f172a')),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 11),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('TOPPADDING', (0, 0), (-1, 0), 12),
-        
-        # Data rows
-        ('FONTNAME', (0, 1), (-1, -4), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -4), 10),
-        ('TEXTCOLOR', (0, 1), (-1, -4), colors.HexColor('#334155')),
-        ('BOTTOMPADDING', (0, 1), (-1, -4), 10),
-        ('TOPPADDING', (0, 1), (-1, -4), 10),
-        
-        # Subtotal row
-        ('FONTNAME', (0, -3), (-1, -3), 'Helvetica'),
-        ('TEXTCOLOR', (0, -3), (-1, -3), colors.HexColor('#64748b')),
-        
-        # Tax row (if present)
-        ('FONTNAME', (0, -2), (-1, -2), 'Helvetica'),
-        ('TEXTCOLOR', (0, -2), (-1, -2), colors.HexColor('#64748b')),
-        
-        # Total row
-        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, -1), (-1, -1), 14),
-        ('TEXTCOLOR', (0, -1), (-1, -1), colors.HexColor('#0f172a')),
-        ('TOPPADDING', (0, -1), (-1, -1), 15),
-        ('LINEABOVE', (0, -1), (-1, -1), 2, colors.HexColor('#f97316')),
-        
-        # Alignment
-        ('ALIGN', (-1, 0), (-1, -1), 'RIGHT'),
-        
-        # Grid
-        ('LINEBELOW', (0, 0), (-1, 0), 1, colors.HexColor('#e2e8f0')),
-        ('LINEBELOW', (0, 1), (-1, -4), 0.5, colors.HexColor('#f1f5f9')),
-    ]))
+    table.setStyle(QUOTE_TABLE_STYLE)
     content.append(table)
     
     # Notes
@@ -192,16 +226,49 @@ def generate_quote_pdf(
     
     # Footer
     content.append(Spacer(1, 40))
-    footer_style = ParagraphStyle(
-        'Footer',
-        parent=styles['Normal'],
-        fontSize=9,
-        textColor=colors.HexColor('#94a3b8'),
-        alignment=TA_CENTER
-    )
+    footer_style = styles["footer"]
     content.append(Paragraph("Generated by SnapQuote • snapquote.haventechsolutions.com", footer_style))
     
     # Build PDF
     doc.build(content)
     
     return quote_id
+
+
+def _get_render_pool() -> ProcessPoolExecutor:
+    global _render_pool
+    if _render_pool is None:
+        # spawn: forking a process that runs an event loop and threads isn't safe
+        _render_pool = ProcessPoolExecutor(
+            max_workers=PDF_RENDER_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _render_pool
+
+
+async def render_quote_pdf(**kwargs) -> str:
+    """
+    generate_quote_pdf in the bounded render pool.
+    Renders beyond PDF_RENDER_WORKERS queue instead of blocking the caller.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_render_pool(), partial(generate_quote_pdf, **kwargs))
+
+
+def _warm_worker():
+    _quote_styles()
+
+
+async def warm_render_pool():
+    """Start render workers and build their styles before the first quote"""
+    loop = asyncio.get_running_loop()
+    pool = _get_render_pool()
+    await asyncio.gather(*(loop.run_in_executor(pool, _warm_worker) for _ in range(PDF_RENDER_WORKERS)))
+
+
+def shutdown_render_pool():
+    """Stop render workers (app shutdown)"""
+    global _render_pool
+    if _render_pool is not None:
+        _render_pool.shutdown(wait=True, cancel_futures=True)
+        _render_pool = None
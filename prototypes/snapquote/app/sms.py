@@ -5,12 +5,13 @@ Conversational quote builder via text
 
 import os
 import json
+import asyncio
 import httpx
 from typing import Optional
 
 from .state import state, ConvoStage, QuoteData
 from .parser import parse_estimate
-from .pdf_gen import generate_quote_pdf
+from .pdf_gen import render_quote_pdf
 from .logos import get_logo_path
 from .tax import get_tax_rate, format_tax_rate
 from . import db
@@ -18,11 +19,30 @@ from . import db
 
 CLICKSEND_USERNAME = os.getenv("CLICKSEND_USERNAME")
 CLICKSEND_API_KEY = os.getenv("CLICKSEND_API_KEY")
+CLICKSEND_API_URL = os.getenv("CLICKSEND_API_URL", "https://rest.clicksend.com/v3")
 SNAPQUOTE_NUMBER = os.getenv("SNAPQUOTE_NUMBER", "+18335154305")
 BASE_URL = os.getenv("BASE_URL", "https://snapquote.haventechsolutions.com")
 RESEND_API_KEY = os.getenv("RESEND_API_KEY", "")
 ADMIN_EMAILS = os.getenv("ADMIN_EMAILS", "jake0christensen@gmail.com,jrcarlson77@gmail.com")
 
+# Shared client: building one per message loads certificates on the event loop
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(timeout=10.0)
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared client (app shutdown)"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 async def send_sms(to: str, message: str) -> bool:
     """Send SMS via ClickSend"""
@@ -30,9 +50,9 @@ async def send_sms(to: str, message: str) -> bool:
         print(f"[DEV MODE] Would send to {to}: {message}")
         return True
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            "https://rest.clicksend.com/v3/sms/send",
+    try:
+        response = await _client().post(
+            f"{CLICKSEND_API_URL}/sms/send",
             auth=(CLICKSEND_USERNAME, CLICKSEND_API_KEY),
             json={
                 "messages": [{
@@ -42,8 +62,11 @@ async def send_sms(to: str, message: str) -> bool:
                 }]
             }
         )
-        print(f"SMS send response: {response.status_code}", flush=True)
-        return response.status_code == 200
+    except httpx.HTTPError as e:
+        print(f"SMS send ERROR to {to}: {e!r}", flush=True)
+        return False
+    print(f"SMS send response: {response.status_code}", flush=True)
+    return response.status_code == 200
 
 
 async def send_quote_email(quote_id: str, quote, quote_url: str) -> bool:
@@ -134,7 +157,7 @@ async def handle_inbound_sms(sender: str, body: str) -> Optional[str]:
     # Reset commands
     reset_keywords = ["reset", "start over", "cancel", "new", "new quote", "start", "begin", "clear"]
     if lower_body in reset_keywords:
-        state.clear(sender)
+        await state.clear_async(sender)
         response = "Hey! Let's build a quote. Who's the customer?"
         await send_sms(sender, response)
         return response
@@ -149,22 +172,25 @@ async def handle_inbound_sms(sender: str, body: str) -> Optional[str]:
         return response
     
     # Get or create conversation
-    convo = state.get(sender)
+    convo = await state.get_async(sender)
     convo.raw_messages.append(body)
     
     # Route based on conversation stage
-    if convo.stage == ConvoStage.NEW:
-        return await handle_new_conversation(sender, body, convo)
-    elif convo.stage == ConvoStage.NEED_CUSTOMER:
-        return await handle_customer_name(sender, body, convo)
+    if convo.stage == ConvoStage.NEED_CUSTOMER:
+        response = await handle_customer_name(sender, body, convo)
     elif convo.stage == ConvoStage.NEED_ADDRESS:
-        return await handle_address(sender, body, convo)
+        response = await handle_address(sender, body, convo)
     elif convo.stage == ConvoStage.NEED_ITEMS:
-        return await handle_items(sender, body, convo)
+        response = await handle_items(sender, body, convo)
     elif convo.stage == ConvoStage.NEED_DESCRIPTION:
-        return await handle_description(sender, body, convo)
+        response = await handle_description(sender, body, convo)
     else:
-        return await handle_new_conversation(sender, body, convo)
+        response = await handle_new_conversation(sender, body, convo)
+    
+    # Persist whatever the handler changed (a finished quote already cleared it)
+    if convo.stage != ConvoStage.COMPLETE:
+        await state.update_async(sender, convo)
+    return response
 
 
 async def handle_new_conversation(sender: str, body: str, convo) -> str:
@@ -218,7 +244,6 @@ async def ask_for_missing(sender: str, convo, field: str) -> str:
     else:
         response = "Hmm, something got confused. Text 'new' to start fresh!"
     
-    state.update(sender, convo)
     await send_sms(sender, response)
     return response
 
@@ -326,28 +351,57 @@ async def handle_description(sender: str, body: str, convo) -> str:
     return await generate_and_send_quote(sender, convo)
 
 
+# Quote renders in flight (held so the event loop doesn't garbage-collect them)
+_delivery_tasks: set = set()
+
+
 async def generate_and_send_quote(sender: str, convo) -> str:
-    """Generate PDF and send link"""
+    """Acknowledge right away; the PDF renders off the event loop and the link follows"""
     quote = convo.quote
     quote.calculate_total()
     
-    logo_path = get_logo_path(sender)
-    
-    quote_id = generate_quote_pdf(
-        customer_name=quote.customer_name,
-        customer_address=quote.customer_address,
-        items=quote.items,
-        project_description=quote.project_description,
-        subtotal=quote.total,
-        tax_rate=quote.tax_rate,
-        tax_amount=quote.tax_amount,
-        total=quote.grand_total,
-        notes=quote.notes,
-        logo_path=logo_path
-    )
+    response = (f"Got it! Building the quote for {quote.customer_name} now — "
+                f"I'll text you the link in a moment.")
+    await send_sms(sender, response)
+    
+    # The conversation is done; a new text during the render starts a fresh one
+    convo.stage = ConvoStage.COMPLETE
+    await state.clear_async(sender)
+    
+    task = asyncio.create_task(deliver_quote(sender, quote))
+    _delivery_tasks.add(task)
+    task.add_done_callback(_delivery_tasks.discard)
+    return response
+
+
+async def drain_deliveries():
+    """Wait for in-flight quote deliveries (app shutdown)"""
+    if _delivery_tasks:
+        await asyncio.gather(*_delivery_tasks, return_exceptions=True)
+
+
+async def deliver_quote(sender: str, quote: QuoteData) -> Optional[str]:
+    """Render the PDF in the render pool, persist it, and text the link"""
+    try:
+        quote_id = await render_quote_pdf(
+            customer_name=quote.customer_name,
+            customer_address=quote.customer_address,
+            items=quote.items,
+            project_description=quote.project_description,
+            subtotal=quote.total,
+            tax_rate=quote.tax_rate,
+            tax_amount=quote.tax_amount,
+            total=quote.grand_total,
+            notes=quote.notes,
+            logo_path=get_logo_path(sender)
+        )
+    except Exception as e:
+        print(f"[pdf] ERROR rendering quote for {sender}: {e}", flush=True)
+        await send_sms(sender, "Sorry — something went wrong building that quote. Text 'new' to try again.")
+        return None
 
     # Persist to SQLite
-    db.save_quote(quote_id, sender, quote)
+    await db.save_quote_async(quote_id, sender, quote)
 
     quote_url = f"{BASE_URL}/quote/{quote_id}"
 
@@ -374,8 +428,5 @@ async def generate_and_send_quote(sender: str, convo) -> str:
     
     await send_sms(sender, response)
     
-    convo.stage = ConvoStage.COMPLETE
-    state.clear(sender)
-    
     print(f"Quote generated: {quote_id}", flush=True)
     return response
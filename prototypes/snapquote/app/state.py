@@ -3,13 +3,19 @@ Conversation state management for SnapQuote
 Tracks ongoing quote conversations by phone number
 """
 
-from dataclasses import dataclass, field
-from typing import Optional, Dict, List
+from dataclasses import dataclass, field, asdict
+from typing import Optional, Dict, List, Any
 from datetime import datetime, timedelta
 from enum import Enum
-import json
+import asyncio
 import os
 
+from . import db
+
+# Conversations idle longer than this start over (and are purged from the DB)
+CONVO_TIMEOUT_MINUTES = int(os.getenv("SNAPQUOTE_CONVO_TIMEOUT_MINUTES", "30"))
+PURGE_INTERVAL = timedelta(minutes=5)
+
 
 class ConvoStage(Enum):
     """Stages of a quote conversation"""
@@ -86,48 +92,87 @@ class Conversation:
         """Update last activity time"""
         self.updated_at = datetime.utcnow()
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "phone": self.phone,
+            "stage": self.stage.value,
+            "quote": asdict(self.quote),
+            "raw_messages": self.raw_messages,
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Conversation":
+        return cls(
+            phone=data["phone"],
+            stage=ConvoStage(data["stage"]),
+            quote=QuoteData(**data["quote"]),
+            raw_messages=data.get("raw_messages", []),
+            created_at=datetime.fromisoformat(data["created_at"]),
+            updated_at=datetime.fromisoformat(data["updated_at"]),
+        )
+
 
 class ConversationState:
     """
     Manages all active conversations
-    Simple in-memory store with optional persistence
+
+    Stored in the SQLite DB, so half-finished quotes survive restarts and the
+    web server and poller see the same conversation. Every call is a single
+    primary-key read or write; async handlers use the *_async variants, which
+    run it in a worker thread. Idle conversations expire after
+    timeout_minutes and are purged periodically.
     """
     
-    def __init__(self, persist_path: Optional[str] = None):
-        self.conversations: Dict[str, Conversation] = {}
-        self.persist_path = persist_path
-        self._load()
+    def __init__(self, timeout_minutes: int = CONVO_TIMEOUT_MINUTES):
+        self.timeout_minutes = timeout_minutes
+        self._last_purge: Optional[datetime] = None
     
     def get(self, phone: str) -> Conversation:
         """Get or create conversation for a phone number"""
         phone = self._normalize_phone(phone)
+        self._purge_if_due()
         
-        if phone in self.conversations:
-            convo = self.conversations[phone]
-            if convo.is_expired():
-                convo = Conversation(phone=phone)
-                self.conversations[phone] = convo
-            convo.touch()
-        else:
+        convo = self._load(phone)
+        if convo is None or convo.is_expired(self.timeout_minutes):
             convo = Conversation(phone=phone)
-            self.conversations[phone] = convo
+        convo.touch()
         
-        self._save()
+        self._save(convo)
         return convo
     
     def update(self, phone: str, convo: Conversation):
         """Update a conversation"""
-        phone = self._normalize_phone(phone)
+        convo.phone = self._normalize_phone(phone)
         convo.touch()
-        self.conversations[phone] = convo
-        self._save()
+        self._save(convo)
     
     def clear(self, phone: str):
         """Clear a conversation (after quote complete)"""
-        phone = self._normalize_phone(phone)
-        if phone in self.conversations:
-            del self.conversations[phone]
-            self._save()
+        db.delete_conversation(self._normalize_phone(phone))
+    
+    async def get_async(self, phone: str) -> Conversation:
+        return await asyncio.to_thread(self.get, phone)
+
+    async def update_async(self, phone: str, convo: Conversation):
+        await asyncio.to_thread(self.update, phone, convo)
+
+    async def clear_async(self, phone: str):
+        await asyncio.to_thread(self.clear, phone)
+    
+    def purge_expired(self) -> int:
+        """Delete conversations idle past the timeout"""
+        self._last_purge = datetime.utcnow()
+        cutoff = self._last_purge - timedelta(minutes=self.timeout_minutes)
+        return db.purge_conversations(cutoff.isoformat())
+    
+    def _purge_if_due(self):
+        if self._last_purge is None or datetime.utcnow() - self._last_purge > PURGE_INTERVAL:
+            try:
+                self.purge_expired()
+            except Exception as e:
+                print(f"[state] ERROR purging conversations: {e}", flush=True)
     
     def _normalize_phone(self, phone: str) -> str:
         """Normalize phone number format"""
@@ -136,13 +181,18 @@ class ConversationState:
             cleaned = '+1' + cleaned
         return cleaned
     
-    def _save(self):
-        if not self.persist_path:
-            return
+    def _save(self, convo: Conversation):
+        db.save_conversation(convo.phone, convo.to_dict(), convo.updated_at.isoformat())
     
-    def _load(self):
-        if not self.persist_path or not os.path.exists(self.persist_path):
-            return
+    def _load(self, phone: str) -> Optional[Conversation]:
+        data = db.load_conversation(phone)
+        if data is None:
+            return None
+        try:
+            return Conversation.from_dict(data)
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"[state] discarding unreadable conversation for {phone}: {e}", flush=True)
+            return None
 
 
 # Global state instance
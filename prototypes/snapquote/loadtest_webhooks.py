@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Load test: concurrent inbound SMS webhooks against a local stub SMS gateway
+
+Starts a stub ClickSend endpoint on localhost, points the app at it, and has
+N contractors walk through a quote conversation on /webhook/sms at the same
+time. Reports webhook latency, time from the final text to the
+acknowledgement SMS and to the quote link, and the longest event-loop stall
+seen while the PDFs render.
+
+    python loadtest_webhooks.py --senders 50
+    python loadtest_webhooks.py --senders 50 --inline   # render on the event loop (old behaviour)
+    python loadtest_webhooks.py --logo-px 0             # quotes without logos
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Name + items, then the address, then the job description (which triggers the quote)
+CONVERSATION = [
+    "John Smith - deck repair $500, railing $275",
+    "123 Main St, Seattle, WA 98101",
+    "Back deck refinish",
+]
+
+
+def _serve_stub_gateway(port: int):
+    """ClickSend /sms/send stand-in; GET /messages returns (to, body, received_at)"""
+    messages = []
+    app = FastAPI()
+
+    @app.post("/v3/sms/send")
+    async def send(request: Request):
+        payload = await request.json()
+        now = time.time()
+        for msg in payload.get("messages", []):
+            messages.append((msg["to"], msg["body"], now))
+        return {"response_code": "SUCCESS"}
+
+    @app.get("/messages")
+    async def sent():
+        return messages
+
+    @app.delete("/messages")
+    async def clear():
+        messages.clear()
+
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+class StubGateway:
+    """Runs the stub in its own process so a blocked app event loop can't stall it"""
+
+    def __init__(self, port: int):
+        self.url = f"http://127.0.0.1:{port}"
+        self._process = multiprocessing.get_context("spawn").Process(
+            target=_serve_stub_gateway, args=(port,), daemon=True
+        )
+
+    def start(self):
+        self._process.start()
+        for _ in range(100):
+            try:
+                httpx.get(f"{self.url}/messages")
+                return
+            except httpx.TransportError:
+                time.sleep(0.1)
+        raise RuntimeError("stub SMS gateway did not start")
+
+    def messages(self):
+        return httpx.get(f"{self.url}/messages").json()
+
+    def clear(self):
+        httpx.delete(f"{self.url}/messages")
+
+    def stop(self):
+        self._process.terminate()
+
+
+def _percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _report(name: str, seconds):
+    ms = [s * 1000 for s in seconds]
+    print(f"  {name:<16} p50 {_percentile(ms, 50):8.1f} ms   p95 {_percentile(ms, 95):8.1f} ms   "
+          f"max {max(ms) if ms else 0:8.1f} ms   (n={len(ms)})")
+
+
+async def _watch_loop_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """Longest delay beyond `interval` before the event loop got back to us"""
+    worst = 0.0
+    while not stop.is_set():
+        before = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - before - interval)
+    return worst
+
+
+def _write_logos(logos_dir: str, phones, px: int):
+    """A phone-camera-sized JPEG per contractor"""
+    from PIL import Image
+    os.makedirs(logos_dir, exist_ok=True)
+    first = None
+    for phone in phones:
+        path = os.path.join(logos_dir, "".join(c for c in phone if c.isdigit()) + ".jpg")
+        if first is None:
+            Image.effect_noise((px, px), 64).convert("RGB").save(path, quality=90)
+            first = path
+        else:
+            shutil.copyfile(first, path)
+
+
+async def run(senders: int, port: int, inline: bool, logo_px: int):
+    workdir = tempfile.mkdtemp(prefix="snapquote-loadtest-")
+    os.environ.update({
+        "CLICKSEND_USERNAME": "loadtest",
+        "CLICKSEND_API_KEY": "loadtest",
+        "CLICKSEND_API_URL": f"http://127.0.0.1:{port}/v3",
+        "QUOTES_DIR": os.path.join(workdir, "quotes"),
+        "LOGOS_DIR": os.path.join(workdir, "logos"),
+        "BASE_URL": "http://snapquote.test",
+    })
+    # Deterministic regex parsing, no email side effects
+    os.environ.pop("ANTHROPIC_API_KEY", None)
+    os.environ.pop("RESEND_API_KEY", None)
+
+    gateway = StubGateway(port)
+    gateway.start()
+
+    from app import db, sms, pdf_gen
+    from app.main import app
+
+    db.DATA_DIR = workdir
+    db.DB_PATH = os.path.join(workdir, "snapquote.db")
+    db.init_db()
+
+    if inline:
+        async def render_inline(**kwargs):
+            return pdf_gen.generate_quote_pdf(**kwargs)
+        sms.render_quote_pdf = render_inline
+
+    phones = [f"+1555{i + 1:07d}" for i in range(senders)]
+    if logo_px:
+        _write_logos(os.environ["LOGOS_DIR"], phones + ["+15550000000"], logo_px)
+    sent_at = {}
+    webhook_latency = []
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://snapquote", timeout=300) as client:
+        async def converse(phone: str):
+            for text in CONVERSATION:
+                sent_at[phone] = time.time()
+                response = await client.post("/webhook/sms", json={"from": phone, "body": text})
+                webhook_latency.append(time.time() - sent_at[phone])
+                response.raise_for_status()
+
+        # Warm-up (what app startup does, plus one full conversation), not measured
+        if not inline:
+            await pdf_gen.warm_render_pool()
+        await converse("+15550000000")
+        await sms.drain_deliveries()
+        webhook_latency.clear()
+        gateway.clear()
+
+        stop = asyncio.Event()
+        lag_task = asyncio.create_task(_watch_loop_lag(stop))
+        start = time.perf_counter()
+        await asyncio.gather(*(converse(p) for p in phones))
+        await sms.drain_deliveries()
+        elapsed = time.perf_counter() - start
+
+    stop.set()
+    worst_lag = await lag_task
+    messages = gateway.messages()
+    gateway.stop()
+    pdf_gen.shutdown_render_pool()
+
+    ack, link = [], []
+    # sent_at holds each sender's final text, which both messages answer
+    for to, body, received_at in messages:
+        if "/quote/" in body:
+            link.append(received_at - sent_at[to])
+        elif body.startswith("Got it! Building"):
+            ack.append(received_at - sent_at[to])
+
+    mode = "inline (event loop)" if inline else f"render pool ({pdf_gen.PDF_RENDER_WORKERS} workers)"
+    logos = f"{logo_px}px logos" if logo_px else "no logos"
+    print(f"🔬 {senders} concurrent conversations, {mode}, {logos}")
+    _report("webhook", webhook_latency)
+    _report("ack SMS", ack)
+    _report("quote link SMS", link)
+    print(f"  {'loop stall':<16} max {worst_lag * 1000:8.1f} ms")
+    print(f"  {'total':<16} {elapsed:.2f}s, {senders / elapsed:.1f} quotes/s")
+
+    shutil.rmtree(workdir, ignore_errors=True)
+    if len(link) != senders:
+        raise SystemExit(f"❌ expected {senders} quote links, got {len(link)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--senders", type=int, default=25, help="Concurrent contractors texting in")
+    parser.add_argument("--port", type=int, default=8765, help="Stub SMS gateway port")
+    parser.add_argument("--inline", action="store_true", help="Render PDFs on the event loop for comparison")
+    parser.add_argument("--logo-px", type=int, default=2400, help="Logo size per contractor (0 = no logos)")
+    args = parser.parse_args()
+    asyncio.run(run(args.senders, args.port, args.inline, args.logo_px))
+
+
+if __name__ == "__main__":
+    main()
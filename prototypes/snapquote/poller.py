@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
 """
 Polling fallback for ClickSend inbound SMS
-Checks for new messages every 5 seconds
+
+Polls quickly while messages are arriving and backs off (up to
+SNAPQUOTE_POLL_MAX seconds) while it's quiet. Message IDs are claimed in the
+shared SQLite dedupe table, so a message the webhook already handled (or one
+seen before a restart) isn't processed twice.
 """
 
 import os
-import time
+import random
 import httpx
 import asyncio
 from datetime import datetime
@@ -13,81 +17,102 @@ from datetime import datetime
 # Import our handlers
 import sys
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from app.sms import handle_inbound_sms
+from app.sms import handle_inbound_sms, drain_deliveries, close_http_client
+from app import db
 
 CLICKSEND_USERNAME = os.getenv("CLICKSEND_USERNAME")
 CLICKSEND_API_KEY = os.getenv("CLICKSEND_API_KEY")
 SNAPQUOTE_NUMBER = os.getenv("SNAPQUOTE_NUMBER", "+18335154305")
 
-# Track processed messages
-processed_ids = set()
-last_check = int(time.time()) - 300  # Start 5 min ago
+# Adaptive poll interval: reset to the minimum on activity, doubled while idle
+POLL_MIN = float(os.getenv("SNAPQUOTE_POLL_MIN", "2"))
+POLL_MAX = float(os.getenv("SNAPQUOTE_POLL_MAX", "60"))
+PAGE_SIZE = 20
 
-async def check_inbound():
-    global last_check, processed_ids
-    
+
+def next_interval(interval: float, new_messages: int, page_full: bool) -> float:
+    """Seconds to wait before the next poll"""
+    if new_messages:
+        # A full page of new messages means more are waiting: drain right away
+        return 0 if page_full else POLL_MIN
+    return min(max(interval, POLL_MIN) * 2, POLL_MAX)
+
+
+async def check_inbound(client: httpx.AsyncClient) -> tuple:
+    """Process unseen inbound messages; returns (new message count, page was full)"""
     auth = (CLICKSEND_USERNAME, CLICKSEND_API_KEY)
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            "https://rest.clicksend.com/v3/sms/inbound",
-            auth=auth,
-            params={"limit": 20}
-        )
+    response = await client.get(
+        "https://rest.clicksend.com/v3/sms/inbound",
+        auth=auth,
+        params={"limit": PAGE_SIZE}
+    )
+    
+    if response.status_code != 200:
+        raise RuntimeError(f"Error fetching inbound: {response.status_code}")
+    
+    data = response.json()
+    messages = data.get("data", {}).get("data", [])
+    new_messages = 0
+    
+    for msg in messages:
+        msg_id = msg.get("message_id")
         
-        if response.status_code != 200:
-            print(f"Error fetching inbound: {response.status_code}")
-            return
+        # Check if it's for our number
+        to_number = msg.get("to")
+        if to_number != SNAPQUOTE_NUMBER:
+            continue
         
-        data = response.json()
-        messages = data.get("data", {}).get("data", [])
+        # Skip if already processed (here, before a restart, or by the webhook)
+        if not await db.claim_message_async(msg_id, "poller"):
+            continue
+        new_messages += 1
         
-        for msg in messages:
-            msg_id = msg.get("message_id")
-            
-            # Skip if already processed
-            if msg_id in processed_ids:
-                continue
-                
-            # Check if it's for our number
-            to_number = msg.get("to")
-            if to_number != SNAPQUOTE_NUMBER:
-                continue
-            
-            sender = msg.get("from")
-            body = msg.get("body", "").strip()
-            
-            print(f"[{datetime.now()}] New message from {sender}: {body}")
-            
-            # Process it
-            try:
-                response = await handle_inbound_sms(sender, body)
-                print(f"  -> Response sent: {bool(response)}")
-            except Exception as e:
-                print(f"  -> Error: {e}")
-            
-            processed_ids.add(msg_id)
-            
-            # Mark as read
-            try:
-                await client.put(
-                    f"https://rest.clicksend.com/v3/sms/inbound-read/{msg_id}",
-                    auth=auth
-                )
-            except:
-                pass
+        sender = msg.get("from")
+        body = msg.get("body", "").strip()
+        
+        print(f"[{datetime.now()}] New message from {sender}: {body}")
+        
+        # Process it
+        try:
+            response = await handle_inbound_sms(sender, body)
+            print(f"  -> Response sent: {bool(response)}")
+        except Exception as e:
+            print(f"  -> Error: {e}")
+        
+        # Mark as read
+        try:
+            await client.put(
+                f"https://rest.clicksend.com/v3/sms/inbound-read/{msg_id}",
+                auth=auth
+            )
+        except:
+            pass
+    
+    return new_messages, len(messages) >= PAGE_SIZE
+
 
 async def main():
     print(f"Starting SnapQuote poller for {SNAPQUOTE_NUMBER}")
-    print(f"Checking every 5 seconds...")
+    print(f"Polling every {POLL_MIN:g}-{POLL_MAX:g} seconds depending on traffic...")
+    db.init_db()
     
-    while True:
-        try:
-            await check_inbound()
-        except Exception as e:
-            print(f"Error in poll loop: {e}")
-        
-        await asyncio.sleep(5)
+    interval = POLL_MIN
+    try:
+        async with httpx.AsyncClient(timeout=10) as client:
+            while True:
+                try:
+                    new_messages, page_full = await check_inbound(client)
+                    interval = next_interval(interval, new_messages, page_full)
+                except Exception as e:
+                    print(f"Error in poll loop: {e}")
+                    interval = next_interval(interval, 0, False)
+                
+                # Jitter so a restarted fleet doesn't poll in lockstep
+                await asyncio.sleep(interval * random.uniform(0.8, 1.0))
+    finally:
+        await drain_deliveries()
+        await close_http_client()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -10,6 +10,8 @@ import httpx
 from datetime import datetime
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from app import db
+from poller import next_interval, POLL_MIN, POLL_MAX
 
 CLICKSEND_USERNAME = os.environ.get("CLICKSEND_USERNAME")
 CLICKSEND_API_KEY = os.environ.get("CLICKSEND_API_KEY")
@@ -19,24 +21,27 @@ BASE_URL = os.environ.get("BASE_URL", "http://localhost:8080")
 print(f"SnapQuote Poller Starting", flush=True)
 print(f"  Number: {SNAPQUOTE_NUMBER}", flush=True)
 print(f"  Base URL: {BASE_URL}", flush=True)
+print(f"  Poll interval: {POLL_MIN:g}-{POLL_MAX:g}s", flush=True)
 print(flush=True)
 
-processed = set()
+PAGE_SIZE = 10
 last_timestamp = int(time.time()) - 60
 
 def check_messages():
+    """Process unseen inbound messages; returns (new message count, page was full)"""
     global last_timestamp
+    new_messages = 0
     
     try:
         r = httpx.get(
             "https://rest.clicksend.com/v3/sms/history",
             auth=(CLICKSEND_USERNAME, CLICKSEND_API_KEY),
-            params={"limit": 10, "direction": "in"},
+            params={"limit": PAGE_SIZE, "direction": "in"},
             timeout=10
         )
         
         if r.status_code != 200:
-            return
+            return 0, False
             
         data = r.json()
         messages = data.get("data", {}).get("data", [])
@@ -45,14 +50,18 @@ def check_messages():
             msg_id = msg.get("message_id")
             msg_time = msg.get("date", 0)
             
-            if msg_time <= last_timestamp or msg_id in processed:
+            if msg_time <= last_timestamp:
                 continue
             
             to_num = msg.get("to", "")
             if to_num != SNAPQUOTE_NUMBER:
-                processed.add(msg_id)
                 continue
             
+            # Shared with the webhook and persisted, so restarts don't reprocess
+            if not db.claim_message(msg_id, "poller"):
+                continue
+            new_messages += 1
+            
             sender = msg.get("from", "")
             body = msg.get("body", "").strip()
             
@@ -63,11 +72,13 @@ def check_messages():
             except Exception as e:
                 print(f"  ERROR: {e}", flush=True)
             
-            processed.add(msg_id)
             last_timestamp = max(last_timestamp, msg_time)
+        
+        return new_messages, len(messages) >= PAGE_SIZE
                 
     except Exception as e:
         print(f"[ERROR] {e}", flush=True)
+        return new_messages, False
 
 def process_message(sender, body):
     from app.state import state
@@ -118,6 +129,8 @@ def send_reply(to, message):
     status = r.json().get("data", {}).get("messages", [{}])[0].get("status", "?")
     print(f"  [SMS: {status}]", flush=True)
 
+db.init_db()
+interval = POLL_MIN
 while True:
-    check_messages()
-    time.sleep(3)
+    interval = next_interval(interval, *check_messages())
+    time.sleep(interval)